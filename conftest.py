@@ -8,9 +8,9 @@ import os
 import os.path
 import pathlib
 import re
-import shlex
 import shutil
-import traceback
+import time
+from functools import partial
 from typing import Any
 
 import pytest
@@ -20,9 +20,7 @@ from _pytest.nodes import Collector, Node
 from _pytest.reports import CollectReport, TestReport
 from _pytest.runner import CallInfo
 from kubernetes.dynamic.exceptions import ConflictError
-from ocp_resources.network_config_openshift_io import Network
 from packaging.version import Version
-from pyhelper_utils.shell import run_command
 from pytest import Item
 from pytest_testconfig import config as py_config
 
@@ -31,7 +29,6 @@ import utilities.cluster
 # TODO: Remove this import when utilities modules are refactored...
 import utilities.infra  # noqa
 from libs.storage.config import StorageClassConfig
-from utilities.bitwarden import get_cnv_tests_secret_by_name
 from utilities.constants.architecture import AMD_64
 from utilities.constants.namespaces import NamespacesNames
 from utilities.constants.pytest import (
@@ -39,8 +36,9 @@ from utilities.constants.pytest import (
     SETUP_ERROR,
 )
 from utilities.constants.timeouts import TIMEOUT_5MIN
+from utilities.control_plane_profiling import ControlPlaneProfiler
 from utilities.data_collector import (
-    collect_default_cnv_must_gather_with_vm_gather,
+    get_data_collector_base_directory,
     get_data_collector_dir,
     get_scope_identifier,
     set_data_collector_directory,
@@ -48,28 +46,38 @@ from utilities.data_collector import (
 )
 from utilities.database import Database
 from utilities.exceptions import MissingEnvironmentVariableError, StorageSanityError
+from utilities.failure_collection import (
+    FAILURE_COLLECTION_MAX_GATHERS,
+    FAILURE_COLLECTION_MAX_SIZE,
+    FAILURE_COLLECTION_WORKERS,
+    FailureCollectionQueue,
+)
+from utilities.fixture_cost_ordering import load_fixture_setup_costs, order_items_by_fixture_cost
+from utilities.fixture_timing import FixtureTimingRecorder
 from utilities.junit_ai_utils import enrich_junit_xml, setup_ai_analysis
 from utilities.logger import setup_logging
+from utilities.preflight import PREFLIGHT_CACHE_TTL
+from utilities.prometheus_client import get_prometheus_client
 from utilities.pytest_utils import (
+    MATRIX_SCOPE_REGEX,
+    CollectionTimingReport,
     _inject_failure_junit,
     assert_incremental_classes_fully_collected,
     config_default_storage_class,
-    deploy_run_in_progress_config_map,
     deploy_run_in_progress_namespace,
     filter_hpp_tests,
     filter_multiarch_tests,
-    get_artifactory_server_url,
     get_base_matrix_name,
-    get_cnv_version_explorer_url,
     get_matrix_params,
     get_tests_cluster_markers,
     mark_nmstate_dependent_tests,
+    measure_collection_phase,
     remove_tests_from_list,
     reorder_early_fixtures,
     run_in_progress_config_map,
+    run_session_preflight,
     separator,
     skip_if_pytest_flags_exists,
-    stop_if_run_in_progress,
     update_cpu_arch_related_config,
     update_latest_os_config,
     validate_collected_tests_arch_params,
@@ -126,7 +134,6 @@ MUST_GATHER_IGNORE_EXCEPTION_LIST = [
     StorageSanityError,
     ConflictError,
 ]
-INSPECT_BASE_COMMAND = "oc adm inspect"
 
 
 def pytest_addoption(parser):
@@ -267,6 +274,10 @@ def pytest_addoption(parser):
              `online_resize`, 'snapshot' and `wffc` allowed values: False, True. Default: False
              """,
     )
+    storage_group.addoption(
+        "--storage-io-benchmark-baseline",
+        help="Directory with results of a previous storage I/O benchmark run to compare the current results against",
+    )
 
     # Cluster sanity addoption
     cluster_sanity_group.addoption(
@@ -299,6 +310,23 @@ def pytest_addoption(parser):
         "--data-collector-output-dir",
         help="Must-gather/alert output dir if `--data-collector` is set and will overwrite `CNV_TESTS_CONTAINER` env.",
     )
+    data_collector_group.addoption(
+        "--data-collector-workers",
+        help="Number of concurrent must-gather collections for failed tests, run in the background",
+        type=int,
+        default=FAILURE_COLLECTION_WORKERS,
+    )
+    data_collector_group.addoption(
+        "--data-collector-max-gathers",
+        help="Maximum number of must-gather collections per session; failures in a burst share one collection",
+        type=int,
+        default=FAILURE_COLLECTION_MAX_GATHERS,
+    )
+    data_collector_group.addoption(
+        "--data-collector-max-size",
+        help="Maximum total size of must-gather collections per session, e.g. 20GiB",
+        default=FAILURE_COLLECTION_MAX_SIZE,
+    )
     data_collector_group.addoption(
         "--pytest-log-file",
         help="Path to pytest log file",
@@ -325,6 +353,10 @@ def pytest_addoption(parser):
         help="Path to scale test params file, default is tests/scale/scale_params.yaml",
         default="tests/scale/scale_params.yaml",
     )
+    scale_group.addoption(
+        "--metric-cardinality-baseline",
+        help="Directory with the metric cardinality report of a previous scale run to compare the current run against",
+    )
 
     # Session group
     session_group.addoption(
@@ -332,6 +364,29 @@ def pytest_addoption(parser):
         help="Session id to use for the test run.",
         default=shortuuid.uuid(),
     )
+    session_group.addoption(
+        "--fixture-timing",
+        help="Record fixture setup and teardown timing; write a slowest fixtures report and a Chrome trace of the session",
+        action="store_true",
+    )
+    session_group.addoption(
+        "--control-plane-profiling",
+        help="Profile the CPU and memory usage of the control plane namespace containers per test; "
+        "write a report of the most expensive tests",
+        action="store_true",
+    )
+    session_group.addoption(
+        "--fixture-cost-ordering",
+        help="Path to a fixture_timing_report.json of a previous session (see --fixture-timing); "
+        "reorder tests to reuse expensive class, module and session scoped fixtures",
+    )
+    session_group.addoption(
+        "--preflight-cache-ttl",
+        help="Seconds to reuse cached session startup results of the cluster, such as the artifactory server; "
+        "0 disables the cache",
+        type=int,
+        default=PREFLIGHT_CACHE_TTL,
+    )
     # TODO: Remove this option, once tests are marked explicitly with artifactory and bitwarden markers
     session_group.addoption(
         "--skip-artifactory-check",
@@ -609,10 +664,14 @@ def pytest_collection_modifyitems(session, config, items):
         config (pytest.Config): The pytest configuration object.
         items (list): A list of pytest.Item objects representing the tests.
     """
-    scope_match = re.compile(r"__(module|class|function)__$")
+    with measure_collection_phase(pytest_config=config, phase="modifyitems"):
+        _modify_collected_items(config=config, items=items)
+
+
+def _modify_collected_items(config, items):
     for item in items:
         for fixture_name in [fixture_name for fixture_name in item.fixturenames if "_matrix" in fixture_name]:
-            _matrix_name = scope_match.sub("", fixture_name)
+            _matrix_name = MATRIX_SCOPE_REGEX.sub("", fixture_name)
             # In case we got dynamic matrix (see get_matrix_params() in infra.py)
             matrix_name = get_base_matrix_name(matrix_name=_matrix_name)
 
@@ -653,6 +712,10 @@ def pytest_collection_modifyitems(session, config, items):
     items[:] = filter_multiarch_tests(items=items, config=config)
     items[:] = filter_hpp_tests(items=items, config=config)
     items[:] = mark_nmstate_dependent_tests(items=items)
+    if fixture_timing_report := config.getoption("--fixture-cost-ordering"):
+        order_items_by_fixture_cost(
+            items=items, setup_costs=load_fixture_setup_costs(fixture_timing_report=fixture_timing_report)
+        )
 
 
 def pytest_report_teststatus(report, config):
@@ -728,8 +791,54 @@ def pytest_runtest_makereport(item, call):
                     setattr(report, SETUP_ERROR, message)
 
 
+@pytest.hookimpl(hookwrapper=True)
 def pytest_fixture_setup(fixturedef, request):
     LOGGER.info(f"Executing {fixturedef.scope} fixture: {fixturedef.argname}")
+    fixture_timing_recorder = request.config.option.fixture_timing_recorder
+    if not fixture_timing_recorder:
+        yield
+        return
+
+    start = time.perf_counter()
+    yield
+    fixture_timing_recorder.record_setup(
+        argname=fixturedef.argname,
+        scope=fixturedef.scope,
+        node_id=request.node.nodeid,
+        start=start,
+        end=time.perf_counter(),
+    )
+    # Finalizers run last-in first-out, so this one marks the start of the fixture teardown
+    fixturedef.addfinalizer(partial(fixture_timing_recorder.start_teardown, fixture_id=id(fixturedef)))
+
+
+def pytest_fixture_post_finalizer(fixturedef, request):
+    if fixture_timing_recorder := request.config.option.fixture_timing_recorder:
+        fixture_timing_recorder.record_teardown(
+            fixture_id=id(fixturedef), argname=fixturedef.argname, scope=fixturedef.scope
+        )
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    fixture_timing_recorder = item.config.option.fixture_timing_recorder
+    control_plane_profiler = item.config.option.control_plane_profiler
+    if fixture_timing_recorder:
+        fixture_timing_recorder.start_test()
+    if control_plane_profiler:
+        control_plane_profiler.start_test()
+    yield
+    if fixture_timing_recorder:
+        fixture_timing_recorder.finish_test(node_id=item.nodeid, fixture_names=item.fixturenames)
+    if control_plane_profiler:
+        control_plane_profiler.finish_test(
+            node_id=item.nodeid,
+            start_time=item.config.option.data_collector_database.get_start_time(
+                name=get_scope_identifier(node=item, scope_value=None)
+            )
+            if item.config.getoption("--data-collector")
+            else None,
+        )
 
 
 def pytest_runtest_setup(item):
@@ -741,7 +850,7 @@ def pytest_runtest_setup(item):
     if item.config.getoption("--data-collector"):
         # before the setup work starts, insert current epoch time into the database
         try:
-            db = Database(base_dir=item.config.getoption("--data-collector-output-dir"))
+            db = item.config.option.data_collector_database
             scope_marker = item.get_closest_marker(name="data_collector_scope")
             scope_value = scope_marker.kwargs.get("scope") if scope_marker else None
 
@@ -766,16 +875,27 @@ def pytest_runtest_teardown(item):
     BASIC_LOGGER.info(f"{separator(symbol_='-', val='TEARDOWN')}")
     # reset data collector after each tests
     py_config["data_collector"]["collector_directory"] = py_config["data_collector"]["data_collector_base_directory"]
+    if item.config.getoption("--data-collector"):
+        try:
+            item.config.option.data_collector_database.flush()
+        except Exception as db_exception:
+            LOGGER.error(f"[DATA_COLLECTOR] Database error: {db_exception}. Must-gather collection may not be accurate")
 
 
 def pytest_generate_tests(metafunc):
-    scope_match = re.compile(r"__(module|class|function)__$")
+    with measure_collection_phase(pytest_config=metafunc.config, phase="generate_tests"):
+        _parametrize_matrix_fixtures(metafunc=metafunc)
+
+    reorder_early_fixtures(metafunc=metafunc)
+
+
+def _parametrize_matrix_fixtures(metafunc):
     for fixture_name in [fname for fname in metafunc.fixturenames if "_matrix" in fname]:
-        scope = scope_match.findall(fixture_name)
+        scope = MATRIX_SCOPE_REGEX.findall(fixture_name)
         if not scope:
             raise ValueError(f"{fixture_name} is missing scope (__<scope>__)")
 
-        matrix_name = scope_match.sub("", fixture_name)
+        matrix_name = MATRIX_SCOPE_REGEX.sub("", fixture_name)
         matrix_params = get_matrix_params(pytest_config=metafunc.config, matrix_name=matrix_name)
         ids = []
         for matrix_param in matrix_params:
@@ -792,8 +912,6 @@ def pytest_generate_tests(metafunc):
                 scope=scope[0],
             )
 
-    reorder_early_fixtures(metafunc=metafunc)
-
 
 def pytest_sessionstart(session):
     data_collector_dict = set_data_collector_values(base_dir=session.config.getoption("data_collector_output_dir"))
@@ -802,6 +920,24 @@ def pytest_sessionstart(session):
         ignore_errors=True,
     )
 
+    session.config.option.fixture_timing_recorder = (
+        FixtureTimingRecorder() if session.config.getoption("--fixture-timing") else None
+    )
+    session.config.option.control_plane_profiler = (
+        ControlPlaneProfiler(namespace=py_config["hco_namespace"])
+        if session.config.getoption("--control-plane-profiling")
+        else None
+    )
+    if session.config.getoption("--data-collector"):
+        session.config.option.failure_collection_queue = FailureCollectionQueue(
+            max_workers=session.config.getoption("--data-collector-workers"),
+            max_gathers=session.config.getoption("--data-collector-max-gathers"),
+            max_size=session.config.getoption("--data-collector-max-size"),
+        )
+        session.config.option.data_collector_database = Database(
+            base_dir=session.config.getoption("--data-collector-output-dir")
+        )
+
     tests_log_file = session.config.getoption("pytest_log_file")
     if os.path.exists(tests_log_file):
         pathlib.Path(tests_log_file).unlink()
@@ -840,24 +976,7 @@ def pytest_sessionstart(session):
     # Set py_config["servers"] and py_config["os_login_param"]
     # Send --tc=server_url:<url> to override servers URL
     if not skip_if_pytest_flags_exists(pytest_config=session.config):
-        admin_client = utilities.cluster.cache_admin_client()
-        py_config["version_explorer_url"] = get_cnv_version_explorer_url(pytest_config=session.config)
-        py_config["cluster_service_network"] = Network(
-            client=admin_client, name="cluster"
-        ).instance.status.serviceNetwork
-        if not session.config.getoption("--skip-artifactory-check"):
-            py_config["server_url"] = py_config["server_url"] or get_artifactory_server_url(
-                cluster_host_url=admin_client.configuration.host, session=session
-            )
-            py_config["servers"] = {
-                name: _server.format(server=py_config["server_url"]) for name, _server in py_config["servers"].items()
-            }
-            py_config["os_login_param"] = get_cnv_tests_secret_by_name(secret_name="os_login", session=session)
-
-        # must be at the end to make sure we create it only after all pytest_sessionstart checks pass.
-        stop_if_run_in_progress(client=admin_client)
-        deploy_run_in_progress_namespace(client=admin_client)
-        deploy_run_in_progress_config_map(client=admin_client, session=session)
+        run_session_preflight(session=session, admin_client=utilities.cluster.cache_admin_client())
 
     # Set up AI analysis if --analyze-with-ai is passed.
     # Source: https://github.com/myk-org/jenkins-job-insight/blob/main/examples/pytest-junitxml/conftest_junit_ai.py
@@ -865,6 +984,17 @@ def pytest_sessionstart(session):
         setup_ai_analysis(session=session)
 
 
+@pytest.hookimpl(hookwrapper=True)
+def pytest_collection(session):
+    # Not reported for runs that only list the tests or the fixtures
+    session.config.option.collection_timing = (
+        None if skip_if_pytest_flags_exists(pytest_config=session.config) else CollectionTimingReport()
+    )
+    yield
+    if session.config.option.collection_timing:
+        session.config.option.collection_timing.write(session=session)
+
+
 def pytest_collection_finish(session):
     assert_incremental_classes_fully_collected(items=session.items)
     validate_collected_tests_arch_params(session=session)
@@ -875,6 +1005,9 @@ def pytest_collection_finish(session):
 
 def pytest_sessionfinish(session, exitstatus):
     try:
+        if session.config.getoption("--data-collector"):
+            # Background must-gather jobs of failed tests must finish while the cluster state is still relevant
+            session.config.option.failure_collection_queue.wait_for_completion()
         shutil.rmtree(path=session.config.option.basetemp, ignore_errors=True)
         if not skip_if_pytest_flags_exists(pytest_config=session.config):
             admin_client = utilities.cluster.cache_admin_client()
@@ -883,8 +1016,17 @@ def pytest_sessionfinish(session, exitstatus):
 
         reporter = session.config.pluginmanager.get_plugin("terminalreporter")
         reporter.summary_stats()
+        if fixture_timing_recorder := session.config.option.fixture_timing_recorder:
+            fixture_timing_recorder.write(base_directory=get_data_collector_base_directory())
+        control_plane_profiler = session.config.option.control_plane_profiler
+        if control_plane_profiler and control_plane_profiler.windows:
+            control_plane_profiler.write(
+                prometheus=get_prometheus_client(),
+                base_directory=get_data_collector_base_directory(),
+            )
         if session.config.getoption("--data-collector"):
-            db = Database(base_dir=session.config.getoption("--data-collector-output-dir"))
+            db = session.config.option.data_collector_database
+            db.close()
             file_path = db.database_file_path
             LOGGER.info(f"Removing database file path {file_path}")
             os.remove(file_path)
@@ -925,14 +1067,14 @@ def is_skip_must_gather(node: Node) -> bool:
     return "skip_must_gather_collection" in get_all_node_markers(node=node)
 
 
-def get_inspect_command_namespace_string(node: Node, test_name: str) -> str:
-    namespace_str = ""
+def get_inspect_namespaces(node: Node, test_name: str) -> list[str]:
+    namespaces_to_collect: list[str] = []
     components = [key for key in NAMESPACE_COLLECTION if f"tests/{key}/" in test_name]
     if not components:
         LOGGER.warning(f"{test_name} does not require special data collection on failure")
     else:
         component = components[0]
-        namespaces_to_collect: list[str] = NAMESPACE_COLLECTION[component].copy()
+        namespaces_to_collect = NAMESPACE_COLLECTION[component].copy()
         all_markers = get_all_node_markers(node=node)
         if component == "virt":
             if "gpu" in all_markers:
@@ -947,8 +1089,7 @@ def get_inspect_command_namespace_string(node: Node, test_name: str) -> str:
                 namespaces_to_collect.append(NamespacesNames.OPENSHIFT_MTV)
             if "nmstate" in all_markers:
                 namespaces_to_collect.append(NamespacesNames.OPENSHIFT_NMSTATE)
-        namespace_str = " ".join([f"namespace/{namespace}" for namespace in namespaces_to_collect])
-    return namespace_str
+    return namespaces_to_collect
 
 
 def calculate_must_gather_timer(test_start_time):
@@ -972,31 +1113,17 @@ def pytest_exception_interact(node: Item | Collector, call: CallInfo[Any], repor
                 f"[DATA_COLLECTOR] Must-gather collection would be skipped for exception: {call.excinfo.type}"
             )
         else:
-            db = Database(base_dir=node.config.getoption("--data-collector-output-dir"))
-            test_start_time = db.get_start_time_for_collection(node=node)
-
+            test_start_time = node.config.option.data_collector_database.get_start_time_for_collection(node=node)
+            since_time = calculate_must_gather_timer(test_start_time=test_start_time)
             try:
-                collection_dir = os.path.join(get_data_collector_dir(), "pytest_exception_interact")
-                collect_default_cnv_must_gather_with_vm_gather(
-                    since_time=calculate_must_gather_timer(test_start_time=test_start_time),
-                    target_dir=collection_dir,
+                node.config.option.failure_collection_queue.submit(
+                    test_name=test_name,
+                    since_timestamp=int(datetime.datetime.now().strftime("%s")) - since_time,
+                    inspect_namespaces=get_inspect_namespaces(test_name=test_name, node=node),
                     admin_client=utilities.cluster.cache_admin_client(),
                 )
-                if inspect_str := get_inspect_command_namespace_string(test_name=test_name, node=node):
-                    target_dir = os.path.join(collection_dir, "inspect_collection")
-                    inspect_command = (
-                        f"{INSPECT_BASE_COMMAND} {inspect_str} "
-                        f"--since={calculate_must_gather_timer(test_start_time=test_start_time)}s "
-                        f"--dest-dir={target_dir}"
-                    )
-                    LOGGER.info(f"running inspect command on {inspect_command}")
-                    run_command(
-                        command=shlex.split(inspect_command),
-                        check=False,
-                        verify_stderr=False,
-                    )
             except Exception as current_exception:
-                LOGGER.warning(f"Failed to collect logs: {test_name}: {current_exception} {traceback.format_exc()}")
+                LOGGER.warning(f"Failed to queue logs collection: {test_name}: {current_exception}")
 
 
 @pytest.hookimpl(optionalhook=True)
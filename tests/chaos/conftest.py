@@ -9,7 +9,7 @@ from pytest_testconfig import py_config
 
 from tests.chaos.constants import CHAOS_LABEL, CHAOS_LABEL_KEY, HOST_LABEL
 from tests.chaos.utils import (
-    create_cluster_monitoring_process,
+    ClusterHealthRecorder,
     create_nginx_monitoring_process,
     create_pod_deleting_process,
     create_vm_with_nginx_service,
@@ -209,17 +209,16 @@ def pod_deleting_process(request, admin_client):
 
 
 @pytest.fixture()
-def cluster_monitoring_process(admin_client, hco_namespace, chaos_namespace):
-    LOGGER.info(f"Monitoring pods in namespaces: {hco_namespace.name}, {chaos_namespace.name}")
+def cluster_health_recorder(admin_client, hco_namespace, chaos_namespace):
+    LOGGER.info(f"Monitoring cluster health in namespaces: {hco_namespace.name}, {chaos_namespace.name}")
 
-    cluster_monitoring_process = create_cluster_monitoring_process(
+    with ClusterHealthRecorder(
         client=admin_client,
         hco_namespace=hco_namespace,
         additional_namespaces=[chaos_namespace],
-    )
-    cluster_monitoring_process.start()
-    yield cluster_monitoring_process
-    terminate_process(process=cluster_monitoring_process)
+        target_dir=py_config["data_collector"]["collector_directory"],
+    ) as recorder:
+        yield recorder
 
 
 @pytest.fixture()
@@ -6,3 +6,7 @@ HOST_LABEL = {"host": TRUE_STR}
 
 # Processes names
 STRESS_NG = "stress-ng"
+
+# Cluster health recorder files
+CHAOS_HEALTH_EVENTS_FILE = "chaos-health-events.ndjson"
+CHAOS_HEALTH_SUMMARY_FILE = "chaos-health-summary.json"
@@ -17,7 +17,7 @@ pytestmark = [
         "skip_if_no_storage_class_for_snapshot",
         "multiprocessing_start_method_fork",
         "chaos_namespace",
-        "cluster_monitoring_process",
+        "cluster_health_recorder",
     ),
 ]
 
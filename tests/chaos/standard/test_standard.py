@@ -16,7 +16,7 @@ from utilities.virt import VirtualMachineForTests, running_vm
 pytestmark = [
     pytest.mark.chaos,
     pytest.mark.usefixtures(
-        "multiprocessing_start_method_fork", "chaos_namespace", "cluster_monitoring_process", "skip_on_aws_cluster"
+        "multiprocessing_start_method_fork", "chaos_namespace", "cluster_health_recorder", "skip_on_aws_cluster"
     ),
 ]
 
@@ -2,24 +2,25 @@ import http
 import json
 import logging
 import multiprocessing
+import os
 import random
 import threading
 import time
-from contextlib import contextmanager
-from datetime import UTC, datetime
 
+from kubernetes.client.rest import ApiException
 from kubernetes.dynamic.exceptions import ResourceNotFoundError
 from ocp_resources.daemonset import DaemonSet
 from ocp_resources.deployment import Deployment
+from ocp_resources.hyperconverged import HyperConverged
 from ocp_resources.node import Node
 from ocp_resources.pod import Pod
 from ocp_resources.service import Service
 from ocp_resources.virtual_machine_cluster_instancetype import (
     VirtualMachineClusterInstancetype,
 )
-from pytest_testconfig import py_config
 from timeout_sampler import TimeoutExpiredError, TimeoutSampler, TimeoutWatch
 
+from tests.chaos.constants import CHAOS_HEALTH_EVENTS_FILE, CHAOS_HEALTH_SUMMARY_FILE
 from utilities.constants.hco import DEFAULT_HCO_CONDITIONS
 from utilities.constants.networking import PORT_80
 from utilities.constants.timeouts import (
@@ -29,19 +30,14 @@ from utilities.constants.timeouts import (
     TIMEOUT_5SEC,
     TIMEOUT_10MIN,
     TIMEOUT_10SEC,
-    TIMEOUT_30MIN,
     TIMEOUT_30SEC,
 )
 from utilities.constants.virt import MIGRATION_POLICY_VM_LABEL
 from utilities.data_collector import write_to_file
 from utilities.infra import (
     ExecCommandOnPod,
-    get_daemonsets,
-    get_deployments,
     get_hco_mismatch_statuses,
-    get_hyperconverged_resource,
     get_pod_by_name_prefix,
-    get_pods,
     get_resources_by_name_prefix,
     wait_for_node_status,
 )
@@ -157,127 +153,231 @@ def create_nginx_monitoring_process(
     )
 
 
-def get_pods_status(admin_client, namespaces):
-    pods_status = {"pod_status": {}}
-    for namespace in namespaces:
-        pods = get_pods(client=admin_client, namespace=namespace)
-        pods_status["pod_status"][namespace.name] = {}
-        for pod in pods:
-            # Set the log level to ERROR to avoid cluttering the console
-            with resource_log_level_error(resource=pod) as _pod:
-                pods_status["pod_status"][namespace.name][_pod.name] = _pod.status
-
-    return pods_status
-
-
-def get_deployment_replicas(admin_client, namespaces):
-    deployments_replicas = {"deployment_replicas": {}}
-    for namespace in namespaces:
-        deployments = get_deployments(admin_client=admin_client, namespace=namespace.name)
-        deployments_replicas["deployment_replicas"][namespace.name] = {}
-        for deployment in deployments:
-            # Set the log level to ERROR to avoid cluttering the console
-            with resource_log_level_error(resource=deployment) as _deployment:
-                deployment_instance = _deployment.instance
-                deployments_replicas["deployment_replicas"][namespace.name][_deployment.name] = {
-                    "desired": deployment_instance.spec.replicas,
-                    "available": deployment_instance.status.availableReplicas,
-                }
-
-    return deployments_replicas
-
-
-def get_daemonset_replicas(admin_client, namespaces):
-    daemonsets_replicas = {"daemonset_replicas": {}}
-    for namespace in namespaces:
-        daemonsets = get_daemonsets(admin_client=admin_client, namespace=namespace.name)
-        daemonsets_replicas["daemonset_replicas"][namespace.name] = {}
-        for daemonset in daemonsets:
-            # Set the log level to ERROR to avoid cluttering the console
-            with resource_log_level_error(resource=daemonset) as _daemonset:
-                daemonset_instance = _daemonset.instance
-                daemonsets_replicas["daemonset_replicas"][namespace.name][_daemonset.name] = {
-                    "desired": daemonset_instance.status.desiredNumberScheduled,
-                    "ready": daemonset_instance.status.numberReady,
-                }
-
-    return daemonsets_replicas
-
-
-def get_nodes_status(client):
-    nodes_status = {"nodes": {}}
-    for node in Node.get(client=client):
-        # Set loglevel to ERROR to avoid cluttering with the logs resulting from getting node status
-        with resource_log_level_error(resource=node) as _node:
-            nodes_status["nodes"][node.name] = "ready" if _node.kubelet_ready else "not ready"
-
-    return nodes_status
-
-
-def get_hyperconverged_status_conditions(client, hco_namespace):
-    hco_instance = get_hyperconverged_resource(client=client, hco_ns_name=hco_namespace.name).instance
-    hco_status_summary = (
-        "OK" if not get_hco_mismatch_statuses(hco_instance.status.conditions, DEFAULT_HCO_CONDITIONS) else "NOK"
-    )
+def _get_owner_workload(pod_dict):
+    """
+    Get the Deployment or DaemonSet owning a pod, as (kind, name).
 
-    return {
-        "hco_status": {
-            "summary": hco_status_summary,
-            "hco_status_conditions": hco_instance.to_dict()["status"]["conditions"],
+    Deployment pods are owned by a ReplicaSet named `<deployment name>-<pod template hash>`.
+    """
+    for owner in pod_dict["metadata"].get("ownerReferences", []):
+        if owner["kind"] == "ReplicaSet":
+            return Deployment.kind, owner["name"].rsplit("-", 1)[0]
+        if owner["kind"] == DaemonSet.kind:
+            return DaemonSet.kind, owner["name"]
+    return None
+
+
+def _get_health_state(kind, resource_dict):
+    status = resource_dict.get("status") or {}
+    if kind == Pod.kind:
+        container_statuses = status.get("containerStatuses") or []
+        return {
+            "phase": status.get("phase"),
+            "ready": bool(container_statuses) and all(container["ready"] for container in container_statuses),
+            "restarts": sum(container["restartCount"] for container in container_statuses),
         }
+    if kind == Deployment.kind:
+        desired = resource_dict["spec"].get("replicas", 0)
+        available = status.get("availableReplicas") or 0
+        return {"desired": desired, "available": available, "healthy": available >= desired}
+    if kind == DaemonSet.kind:
+        desired = status.get("desiredNumberScheduled") or 0
+        ready = status.get("numberReady") or 0
+        return {"desired": desired, "ready": ready, "healthy": ready >= desired}
+    if kind == Node.kind:
+        conditions = {condition["type"]: condition["status"] for condition in status.get("conditions", [])}
+        return {"ready": conditions.get(Node.Condition.READY) == Node.Condition.Status.TRUE}
+
+    # HyperConverged
+    conditions = status.get("conditions", [])
+    return {
+        "healthy": bool(conditions)
+        and not get_hco_mismatch_statuses(hco_status_conditions=conditions, expected_hco_status=DEFAULT_HCO_CONDITIONS),
+        "conditions": {condition["type"]: condition["status"] for condition in conditions},
     }
 
 
-def collect_cluster_health_info(client, hco_namespace, additional_namespaces):
-    namespaces_to_monitor = additional_namespaces + [hco_namespace]
-    pods_status = get_pods_status(admin_client=client, namespaces=namespaces_to_monitor)
-    deployments_replicas = get_deployment_replicas(admin_client=client, namespaces=namespaces_to_monitor)
-    daemonset_replicas = get_daemonset_replicas(admin_client=client, namespaces=namespaces_to_monitor)
-    nodes_status = get_nodes_status(client=client)
-    hco_status_conditions = get_hyperconverged_status_conditions(client=client, hco_namespace=hco_namespace)
-
-    log_content = json.dumps(
-        {
-            f"{datetime.now(tz=UTC).strftime('%Y/%m/%d %H:%M:%S')}": [
-                pods_status,
-                deployments_replicas,
-                daemonset_replicas,
-                nodes_status,
-                hco_status_conditions,
-            ]
-        },
-        indent=4,
-    )
+def get_workload_outage_windows(events, end_time):
+    """
+    Compute outage windows per Deployment/DaemonSet from cluster health events.
 
-    write_to_file(
-        file_name="chaos-monitoring.txt",
-        content=f"{log_content}\n",
-        base_directory=py_config["data_collector"]["collector_directory"],
-        mode="a",
-    )
+    A workload is unavailable while it has less available/ready replicas than desired; its restarts are the
+    container restarts and deletions of its pods.
 
+    Args:
+        events (list): Health events, as recorded by ClusterHealthRecorder.
+        end_time (float): End of the chaos scenario, epoch seconds; open outages end at this time.
 
-def create_cluster_monitoring_process(
-    client,
-    hco_namespace,
-    additional_namespaces,
-    interval=TIMEOUT_10SEC,
-    max_duration=TIMEOUT_30MIN,
-):
-    def _monitor_cluster():
-        timeout_watch = TimeoutWatch(timeout=max_duration)
-        while timeout_watch.remaining_time() > 0:
-            collect_cluster_health_info(
-                client=client,
-                hco_namespace=hco_namespace,
-                additional_namespaces=additional_namespaces,
+    Returns:
+        dict: Per workload (`<kind>/<namespace>/<name>`), its outage windows (start, end, duration, recovered),
+            total unavailable seconds, max recovery latency and restarts.
+    """
+    workloads = {}
+    pod_restarts = {}
+
+    def _get_workload(kind, namespace, name):
+        return workloads.setdefault(
+            f"{kind}/{namespace}/{name}",
+            {"outages": [], "unavailable_seconds": 0.0, "max_recovery_latency": 0.0, "restarts": 0},
+        )
+
+    for event in events:
+        kind, namespace, name, state = event["kind"], event["namespace"], event["name"], event["state"]
+        if kind == Pod.kind:
+            if not event["owner"]:
+                continue
+            workload = _get_workload(kind=event["owner"][0], namespace=namespace, name=event["owner"][1])
+            pod_key = f"{namespace}/{name}"
+            if event["type"] == "DELETED":
+                workload["restarts"] += 1
+            elif pod_key in pod_restarts:
+                workload["restarts"] += max(state["restarts"] - pod_restarts[pod_key], 0)
+            pod_restarts[pod_key] = state["restarts"]
+
+        elif kind in (Deployment.kind, DaemonSet.kind):
+            workload = _get_workload(kind=kind, namespace=namespace, name=name)
+            open_outage = (
+                workload["outages"][-1] if workload["outages"] and not workload["outages"][-1]["end"] else None
             )
-            time.sleep(interval)
+            unavailable = event["type"] == "DELETED" or not state["healthy"]
+            if unavailable and not open_outage:
+                workload["outages"].append({"start": event["timestamp"], "end": None})
+            elif not unavailable and open_outage:
+                open_outage["end"] = event["timestamp"]
+
+    for workload in workloads.values():
+        for outage in workload["outages"]:
+            outage["recovered"] = outage["end"] is not None
+            outage["duration"] = round((outage["end"] or end_time) - outage["start"], 2)
+            workload["unavailable_seconds"] = round(workload["unavailable_seconds"] + outage["duration"], 2)
+            workload["max_recovery_latency"] = max(workload["max_recovery_latency"], outage["duration"])
+    return workloads
+
+
+class ClusterHealthRecorder:
+    """
+    Record cluster health changes during a chaos scenario.
 
-    return multiprocessing.Process(
-        name="cluster_monitoring",
-        target=_monitor_cluster,
-    )
+    Pods, Deployments and DaemonSets in the monitored namespaces, Nodes and the HyperConverged resource are
+    watched, one thread per watch. Every health change is appended to an NDJSON file as a compact event with
+    its timestamp. When stopped, the outage windows per workload are written to a summary file.
+    """
+
+    def __init__(self, client, hco_namespace, additional_namespaces, target_dir):
+        """
+        Args:
+            client (DynamicClient): Admin client.
+            hco_namespace (Namespace): HCO namespace.
+            additional_namespaces (list): Additional namespaces to watch.
+            target_dir (str): Directory of the events and summary files.
+        """
+        self.client = client
+        self.target_dir = target_dir
+        self.events = []
+        self._watches = [
+            (kind, api_version, namespace.name)
+            for namespace in additional_namespaces + [hco_namespace]
+            for kind, api_version in ((Pod.kind, "v1"), (Deployment.kind, "apps/v1"), (DaemonSet.kind, "apps/v1"))
+        ] + [(Node.kind, "v1", None), (HyperConverged.kind, None, hco_namespace.name)]
+        self._states = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._threads = []
+        self._events_file = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def start(self):
+        os.makedirs(self.target_dir, exist_ok=True)
+        self._events_file = open(os.path.join(self.target_dir, CHAOS_HEALTH_EVENTS_FILE), "a", buffering=1)
+        for kind, api_version, namespace in self._watches:
+            thread = threading.Thread(
+                target=self._watch,
+                kwargs={"kind": kind, "api_version": api_version, "namespace": namespace},
+                name=f"chaos-health-{kind}-{namespace}",
+                daemon=True,
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        self._stop_event.set()
+        for thread in self._threads:
+            thread.join(timeout=TIMEOUT_30SEC + TIMEOUT_5SEC)
+        self._events_file.close()
+
+        with self._lock:
+            outage_windows = get_workload_outage_windows(events=self.events, end_time=time.time())
+        write_to_file(
+            file_name=CHAOS_HEALTH_SUMMARY_FILE,
+            content=json.dumps(outage_windows, indent=2),
+            base_directory=self.target_dir,
+        )
+        for workload, summary in outage_windows.items():
+            if summary["outages"] or summary["restarts"]:
+                LOGGER.info(
+                    f"{workload}: {len(summary['outages'])} outage(s), {summary['unavailable_seconds']}s unavailable, "
+                    f"max recovery latency {summary['max_recovery_latency']}s, {summary['restarts']} restart(s)"
+                )
+
+    def _watch(self, kind, api_version, namespace):
+        if kind == HyperConverged.kind:
+            resource = self.client.resources.get(group=HyperConverged.api_group, kind=kind)
+        else:
+            resource = self.client.resources.get(api_version=api_version, kind=kind)
+        resource_version = None
+        while not self._stop_event.is_set():
+            try:
+                # The server closes the watch after the timeout, so that the stop event is checked periodically
+                for event in self.client.watch(
+                    resource=resource,
+                    namespace=namespace,
+                    resource_version=resource_version,
+                    timeout=TIMEOUT_30SEC,
+                ):
+                    resource_version = event["raw_object"]["metadata"]["resourceVersion"]
+                    self._record(event_type=event["type"], kind=kind, resource_dict=event["raw_object"])
+                    if self._stop_event.is_set():
+                        break
+            except ApiException as exp:
+                if exp.status != http.HTTPStatus.GONE:
+                    LOGGER.warning(f"Watch on {kind} in {namespace} failed: {exp}")
+                    time.sleep(TIMEOUT_5SEC)
+                # Watch from the current state
+                resource_version = None
+            except Exception as exp:
+                LOGGER.warning(f"Watch on {kind} in {namespace} failed: {exp}")
+                time.sleep(TIMEOUT_5SEC)
+
+    def _record(self, event_type, kind, resource_dict):
+        if event_type not in ("ADDED", "MODIFIED", "DELETED"):
+            return
+
+        namespace = resource_dict["metadata"].get("namespace")
+        name = resource_dict["metadata"]["name"]
+        state = _get_health_state(kind=kind, resource_dict=resource_dict)
+        key = (kind, namespace, name)
+        with self._lock:
+            if event_type != "DELETED" and self._states.get(key) == state:
+                return
+
+            self._states[key] = state
+            event = {
+                "timestamp": time.time(),
+                "type": event_type,
+                "kind": kind,
+                "namespace": namespace,
+                "name": name,
+                "state": state,
+                "owner": _get_owner_workload(pod_dict=resource_dict) if kind == Pod.kind else None,
+            }
+            self.events.append(event)
+            self._events_file.write(f"{json.dumps(event, separators=(',', ':'))}\n")
 
 
 def terminate_process(process):
@@ -286,13 +386,6 @@ def terminate_process(process):
         process.kill()
 
 
-@contextmanager
-def resource_log_level_error(resource):
-    resource.logger.setLevel(level=logging.ERROR)
-    yield resource
-    resource.logger.setLevel(level=logging.INFO)
-
-
 def create_vm_with_nginx_service(chaos_namespace, admin_client, utility_pods, node, node_selector_label=None):
     name = "nginx"
     with VirtualMachineForTests(
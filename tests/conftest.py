@@ -64,7 +64,6 @@ from ocp_resources.virtual_machine_instance_migration import (
 )
 from ocp_resources.virtual_machine_instancetype import VirtualMachineInstancetype
 from ocp_resources.virtual_machine_preference import VirtualMachinePreference
-from ocp_utilities.monitoring import Prometheus
 from packaging.version import parse
 from pytest_testconfig import config as py_config
 from timeout_sampler import TimeoutSampler
@@ -74,6 +73,7 @@ from libs.net.cluster import ipv4_supported_cluster, ipv6_supported_cluster, sup
 from libs.net.ip import filter_link_local_addresses, random_cidr_addresses_by_family
 from libs.net.vmspec import lookup_iface_status
 from tests.utils import download_and_extract_tar
+from utilities.alert_poller import write_alert_timeline
 from utilities.artifactory import get_artifactory_header, get_test_artifact_server_url
 from utilities.cluster import cache_admin_client, get_oc_whoami_username
 from utilities.constants import Images
@@ -150,6 +150,7 @@ from utilities.cpu import (
     get_host_model_cpu,
     get_nodes_cpu_model,
 )
+from utilities.data_collector import get_data_collector_base_directory
 from utilities.data_utils import base64_encode_str, name_prefix
 from utilities.infra import (
     ClusterHosts,
@@ -193,6 +194,7 @@ from utilities.operator import (
     get_hco_csv_name_by_version,
     get_machine_config_pool_by_name,
 )
+from utilities.prometheus_client import get_prometheus_client
 from utilities.pytest_utils import exit_pytest_execution
 from utilities.sanity import cluster_sanity
 from utilities.ssp import get_data_import_crons, get_ssp_resource
@@ -1470,10 +1472,10 @@ def cdi_config(admin_client):
 
 @pytest.fixture(scope="session")
 def prometheus():
-    return Prometheus(
-        verify_ssl=False,
-        bearer_token=utilities.infra.get_prometheus_k8s_token(duration="86400s"),
-    )
+    prometheus = get_prometheus_client()
+    yield prometheus
+    write_alert_timeline(prometheus=prometheus, base_directory=get_data_collector_base_directory())
+    prometheus.write_request_timing(base_directory=get_data_collector_base_directory())
 
 
 @pytest.fixture()
@@ -4,6 +4,8 @@ from ocp_resources.resource import Resource
 from timeout_sampler import TimeoutExpiredError, TimeoutSampler
 
 from tests.install_upgrade_operators.json_patch.constants import DISABLE_TLS, PATH_CDI
+from utilities.alert_poller import get_alert_poller
+from utilities.constants.monitoring import FIRING_STATE
 from utilities.constants.timeouts import (
     TIMEOUT_5MIN,
     TIMEOUT_30SEC,
@@ -22,36 +24,24 @@ def get_annotation_name_for_component(component_name):
 
 def wait_for_alert(prometheus, alert_name, component_name):
     annotation_name = get_annotation_name_for_component(component_name=component_name)
-    samples = TimeoutSampler(
-        wait_timeout=TIMEOUT_5MIN,
-        sleep=TIMEOUT_30SEC,
-        func=prometheus.get_firing_alerts,
-        alert_name=alert_name,
-    )
-    sample = None
+    alert_poller = get_alert_poller(prometheus=prometheus)
     try:
-        for sample in samples:
-            if sample and sample[0]["labels"]["annotation_name"] == annotation_name:
-                LOGGER.info(f"Found alert: {sample} in firing state.")
-                return
+        alert_poller.wait_for_alerts(
+            alert_name=alert_name,
+            timeout=TIMEOUT_5MIN,
+            state=FIRING_STATE,
+            labels={"annotation_name": annotation_name},
+        )
     except TimeoutExpiredError:
         LOGGER.error(
             f"Alert: {alert_name} did not get created for {annotation_name} in {TIMEOUT_5MIN} seconds."
-            f"Current firing alerts are:\n {sample}"
+            f"Current firing alerts are:\n {alert_poller.get_alerts(alert_name=alert_name, state=FIRING_STATE)}"
         )
 
 
 def wait_for_firing_alert_clean_up(prometheus, alert_name):
-    samples = TimeoutSampler(
-        wait_timeout=TIMEOUT_5MIN,
-        sleep=TIMEOUT_30SEC,
-        func=prometheus.get_firing_alerts,
-        alert_name=alert_name,
-    )
     try:
-        for sample in samples:
-            if not sample:
-                return
+        get_alert_poller(prometheus=prometheus).wait_for_alert_resolved(alert_name=alert_name, timeout=TIMEOUT_5MIN)
     except TimeoutExpiredError:
         LOGGER.error(f"Alert: {alert_name} did not get clear in {TIMEOUT_5MIN} seconds.")
 
@@ -5,7 +5,6 @@ from datetime import UTC, datetime
 import pytest
 from ocp_resources.cluster_version import ClusterVersion
 from ocp_resources.resource import ResourceEditor
-from ocp_utilities.monitoring import Prometheus
 from packaging.version import Version
 from pytest_testconfig import py_config
 
@@ -49,7 +48,6 @@ from utilities.data_collector import (
 )
 from utilities.infra import (
     generate_openshift_pull_secret_file,
-    get_prometheus_k8s_token,
     get_related_images_name_and_version,
     get_subscription,
 )
@@ -60,6 +58,7 @@ from utilities.operator import (
     update_subscription_source,
     wait_for_mcp_update_completion,
 )
+from utilities.prometheus_client import get_prometheus_client
 from utilities.pytest_utils import exit_pytest_execution
 from utilities.virt import get_oc_image_info
 
@@ -289,7 +288,7 @@ def alert_dir():
 
 @pytest.fixture()
 def prometheus_scope_function():
-    return Prometheus(verify_ssl=False, bearer_token=get_prometheus_k8s_token())
+    return get_prometheus_client()
 
 
 @pytest.fixture(scope="session")
@@ -24,12 +24,10 @@ from tests.observability.metrics.constants import (
     GUEST_LOAD_TIME_PERIODS,
     KUBEVIRT_CONSOLE_ACTIVE_CONNECTIONS_BY_VMI,
     KUBEVIRT_VM_CREATED_BY_POD_TOTAL,
-    KUBEVIRT_VMI_PHASE_TRANSITION_TIME_FROM_DELETION_SECONDS_COUNT_SUCCEEDED,
-    KUBEVIRT_VMI_PHASE_TRANSITION_TIME_FROM_DELETION_SECONDS_SUM_SUCCEEDED,
+    KUBEVIRT_VMI_PHASE_TRANSITION_TIME_FROM_DELETION_SECONDS_SUCCEEDED_SELECTOR,
     KUBEVIRT_VMI_STATUS_ADDRESSES,
     KUBEVIRT_VMI_SYNC_TOTAL,
     KUBEVIRT_VNC_ACTIVE_CONNECTIONS_BY_VMI,
-    SUM_KUBEVIRT_VMI_PHASE_TRANSITION_TIME_FROM_DELETION_SECONDS_BUCKET_SUCCEEDED,
 )
 from tests.observability.metrics.utils import (
     SINGLE_VM,
@@ -85,6 +83,7 @@ from utilities.infra import (
     get_pod_by_name_prefix,
     unique_name,
 )
+from utilities.metric_snapshot import take_metric_snapshot
 from utilities.monitoring import get_metrics_value, validate_metrics_value
 from utilities.network import assert_ping_successful, get_ip_from_vm_or_virt_handler_pod, ping
 from utilities.ssp import verify_ssp_pod_is_running
@@ -654,15 +653,10 @@ def vm_created_pod_total_initial_metric_value(prometheus, namespace):
 
 
 @pytest.fixture(scope="class")
-def initial_vmi_deletion_metrics_values(prometheus):
-    return {
-        metric: int(get_metrics_value(prometheus=prometheus, metrics_name=metric))
-        for metric in [
-            KUBEVIRT_VMI_PHASE_TRANSITION_TIME_FROM_DELETION_SECONDS_SUM_SUCCEEDED,
-            SUM_KUBEVIRT_VMI_PHASE_TRANSITION_TIME_FROM_DELETION_SECONDS_BUCKET_SUCCEEDED,
-            KUBEVIRT_VMI_PHASE_TRANSITION_TIME_FROM_DELETION_SECONDS_COUNT_SUCCEEDED,
-        ]
-    }
+def vmi_deletion_metrics_snapshot(prometheus):
+    return take_metric_snapshot(
+        prometheus=prometheus, selectors=[KUBEVIRT_VMI_PHASE_TRANSITION_TIME_FROM_DELETION_SECONDS_SUCCEEDED_SELECTOR]
+    )
 
 
 @pytest.fixture(scope="class")
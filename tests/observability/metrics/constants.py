@@ -28,11 +28,9 @@ KUBEVIRT_VMI_MIGRATION_DATA_TOTAL_BYTES = "kubevirt_vmi_migration_data_total_byt
 KUBEVIRT_VMI_PHASE_TRANSITION_TIME_FROM_DELETION_SECONDS_SUM_SUCCEEDED = (
     "kubevirt_vmi_phase_transition_time_from_deletion_seconds_sum{phase='Succeeded'}"
 )
-SUM_KUBEVIRT_VMI_PHASE_TRANSITION_TIME_FROM_DELETION_SECONDS_BUCKET_SUCCEEDED = (
-    "sum(kubevirt_vmi_phase_transition_time_from_deletion_seconds_bucket{phase='Succeeded'})"
-)
-KUBEVIRT_VMI_PHASE_TRANSITION_TIME_FROM_DELETION_SECONDS_COUNT_SUCCEEDED = (
-    "kubevirt_vmi_phase_transition_time_from_deletion_seconds_count{phase='Succeeded'}"
+KUBEVIRT_VMI_PHASE_TRANSITION_TIME_FROM_DELETION_SECONDS = "kubevirt_vmi_phase_transition_time_from_deletion_seconds"
+KUBEVIRT_VMI_PHASE_TRANSITION_TIME_FROM_DELETION_SECONDS_SUCCEEDED_SELECTOR = (
+    f'{{__name__=~"{KUBEVIRT_VMI_PHASE_TRANSITION_TIME_FROM_DELETION_SECONDS}_.*",phase="Succeeded"}}'
 )
 KUBEVIRT_VM_CREATED_BY_POD_TOTAL = "sum(kubevirt_vm_created_by_pod_total{{namespace='{namespace}'}})"
 BINDING_NAME = "binding_name"
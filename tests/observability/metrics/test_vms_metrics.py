@@ -15,11 +15,10 @@ from tests.observability.metrics.constants import (
     KUBEVIRT_CONSOLE_ACTIVE_CONNECTIONS_BY_VMI,
     KUBEVIRT_VM_CREATED_BY_POD_TOTAL,
     KUBEVIRT_VM_DISK_ALLOCATED_SIZE_BYTES,
-    KUBEVIRT_VMI_PHASE_TRANSITION_TIME_FROM_DELETION_SECONDS_COUNT_SUCCEEDED,
+    KUBEVIRT_VMI_PHASE_TRANSITION_TIME_FROM_DELETION_SECONDS,
     KUBEVIRT_VMI_PHASE_TRANSITION_TIME_FROM_DELETION_SECONDS_SUM_SUCCEEDED,
     KUBEVIRT_VMI_SYNC_TOTAL,
     KUBEVIRT_VNC_ACTIVE_CONNECTIONS_BY_VMI,
-    SUM_KUBEVIRT_VMI_PHASE_TRANSITION_TIME_FROM_DELETION_SECONDS_BUCKET_SUCCEEDED,
 )
 from tests.observability.metrics.utils import (
     compare_metric_file_system_values_with_vm_file_system_values,
@@ -43,6 +42,7 @@ from utilities.constants.timeouts import (
 )
 from utilities.constants.virt import MIGRATION_POLICY_VM_LABEL
 from utilities.infra import get_node_selector_dict
+from utilities.metric_snapshot import wait_for_metric_snapshot_diff
 from utilities.monitoring import get_metrics_value, validate_metrics_value
 from utilities.virt import VirtualMachineForTests, fedora_vm_body, running_vm
 
@@ -502,21 +502,17 @@ class TestVmVnicInfo:
 class TestVmiPhaseTransitionFromDeletion:
     @pytest.mark.polarion("CNV-12990")
     def test_kubevirt_vmi_phase_transition_from_deletion_seconds_linux(
-        self, prometheus, initial_vmi_deletion_metrics_values, running_metric_vm, deleted_vmi, subtests
+        self, prometheus, vmi_deletion_metrics_snapshot, running_metric_vm, deleted_vmi
     ):
-        metrics_to_check = [
-            KUBEVIRT_VMI_PHASE_TRANSITION_TIME_FROM_DELETION_SECONDS_SUM_SUCCEEDED,
-            SUM_KUBEVIRT_VMI_PHASE_TRANSITION_TIME_FROM_DELETION_SECONDS_BUCKET_SUCCEEDED,
-            KUBEVIRT_VMI_PHASE_TRANSITION_TIME_FROM_DELETION_SECONDS_COUNT_SUCCEEDED,
-        ]
-
-        for metric in metrics_to_check:
-            with subtests.test(msg=metric):
-                validate_metric_value_greater_than_initial_value(
-                    prometheus=prometheus,
-                    metric_name=metric,
-                    initial_value=initial_vmi_deletion_metrics_values[metric],
-                )
+        wait_for_metric_snapshot_diff(
+            prometheus=prometheus,
+            before=vmi_deletion_metrics_snapshot,
+            condition=lambda snapshot_diff: all(
+                snapshot_diff.counter_delta(name=f"{KUBEVIRT_VMI_PHASE_TRANSITION_TIME_FROM_DELETION_SECONDS}{suffix}")
+                > 0
+                for suffix in ("_sum", "_bucket", "_count")
+            ),
+        )
 
     @pytest.mark.parametrize(
         "initial_metric_value",
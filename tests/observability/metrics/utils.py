@@ -6,6 +6,7 @@ import urllib
 from collections.abc import Generator
 from contextlib import contextmanager
 from datetime import UTC, datetime
+from functools import partial
 from typing import Any
 
 import bitmath
@@ -59,7 +60,9 @@ from utilities.constants.timeouts import (
     TIMEOUT_30SEC,
     TIMEOUT_40MIN,
 )
-from utilities.monitoring import get_metrics_value
+from utilities.metric_transitions import MetricTransition, wait_for_metric_transitions
+from utilities.metrics_exposition import parse_metrics_exposition
+from utilities.monitoring import get_metrics_value, wait_for_queries
 from utilities.storage import construct_datavolume_source_dict
 from utilities.virt import VirtualMachineForTests, running_vm
 
@@ -69,6 +72,10 @@ SINGLE_VM = 1
 COUNT_THREE = 3
 
 
+def _has_vm_metric(query_results: list[dict[str, Any]], vm_name: str) -> bool:
+    return vm_name in [result.get("metric").get("name") for result in query_results]
+
+
 def get_vm_metrics(prometheus: Prometheus, query: str, vm_name: str, timeout: int = TIMEOUT_5MIN) -> list[dict] | None:
     """
     Performs Prometheus query, waits for the expected vm related metrics to show up in results,
@@ -88,21 +95,15 @@ def get_vm_metrics(prometheus: Prometheus, query: str, vm_name: str, timeout: in
         TimeoutExpiredError: if a given vm name does not show up in prometheus query results
 
     """
-    sampler = TimeoutSampler(
-        wait_timeout=timeout,
-        sleep=5,
-        func=prometheus.query_sampler,
-        query=query,
-    )
-    sample = None
     try:
-        for sample in sampler:
-            if sample and vm_name in [name.get("metric").get("name") for name in sample]:
-                return sample
+        return wait_for_queries(
+            prometheus=prometheus,
+            conditions={query: partial(_has_vm_metric, vm_name=vm_name)},
+            timeout=timeout,
+        )[query]
     except TimeoutExpiredError:
-        LOGGER.error(f'vm {vm_name} not found via prometheus query: "{query}" result: {sample}')
+        LOGGER.error(f'vm {vm_name} not found via prometheus query: "{query}"')
         raise
-    return None
 
 
 def assert_vm_metric(prometheus: Prometheus, query: str, vm_name: str):
@@ -111,42 +112,6 @@ def assert_vm_metric(prometheus: Prometheus, query: str, vm_name: str):
     )
 
 
-def parse_vm_metric_results(raw_output: str) -> dict[str, Any]:
-    """
-    Parse metrics received from virt-handler pod
-
-    Args:
-        raw_output (str): raw metric output received from virt-handler pods
-
-    Returns:
-        dict: Dictionary of parsed output
-    """
-    regex_metrics = r"(?P<metric>\S+)\{(?P<labels>[^\}]+)\}[ ](?P<value>\d+)"
-    metric_results: dict[str, Any] = {}
-    for line in raw_output.splitlines():
-        if line.startswith("# HELP"):
-            metric, description = line[7:].split(" ", 1)
-            metric_results.setdefault(metric, {})["help"] = description
-        elif line.startswith("# TYPE"):
-            metric, metric_type = line[7:].split(" ", 1)
-            metric_results.setdefault(metric, {})["type"] = metric_type
-        elif re.match(regex_metrics, line):
-            match = re.match(regex_metrics, line)
-            if match:
-                metric_instance_dict = match.groupdict()
-                metric_instance_dict["labeldict"] = {
-                    val[0]: val[-1]
-                    for val in [label.partition("=") for label in metric_instance_dict["labels"].split(",")]
-                }
-                metric_results.setdefault(metric_instance_dict["metric"], {}).setdefault("results", []).append(
-                    metric_instance_dict
-                )
-        else:
-            metric, metric_type = line.split(" ", 1)
-            metric_results.setdefault(metric, {})["type"] = metric_type
-    return metric_results
-
-
 def assert_vm_metric_virt_handler_pod(query: str, vm: VirtualMachineForTests, admin_client: DynamicClient):
     """
     Get vm metric information from virt-handler pod
@@ -158,15 +123,13 @@ def assert_vm_metric_virt_handler_pod(query: str, vm: VirtualMachineForTests, ad
 
     """
     pod = vm.vmi.get_virt_handler_pod(privileged_client=admin_client)
-    output = parse_vm_metric_results(raw_output=pod.execute(command=["bash", "-c", f"{CURL_QUERY}"]))
+    output = pod.execute(command=["bash", "-c", f"{CURL_QUERY}"])
     assert output, f'No query output found from {VIRT_HANDLER} pod "{pod.name}" for query: "{CURL_QUERY}"'
-    metrics_list = []
-    if query in output:
-        metrics_list = [
-            result["labeldict"]
-            for result in output[query]["results"]
-            if "labeldict" in result and vm.name in result["labeldict"]["name"]
-        ]
+    metrics_list = [
+        sample.labels
+        for sample in parse_metrics_exposition(exposition=output, metric_names=[query]).find(name=query)
+        if vm.name in sample.labels.get("name", "")
+    ]
     assert metrics_list, (
         f'{VIRT_HANDLER} pod query:"{CURL_QUERY}" did not return any vm metric information for vm: {vm.name} '
         f"from {VIRT_HANDLER} pod: {pod.name}. "
@@ -415,6 +378,20 @@ def metric_result_output_dict_by_mountpoint(
     }
 
 
+def _vm_info_metric_matches(query_results: list[dict[str, Any]], expected_value: str, values_to_compare: dict) -> bool:
+    if not (query_results and query_results[0].get("metric")):
+        return False
+    metric_fields = query_results[0]["metric"]
+    values_mismatch = {
+        field_name: f"Value from vm: {vm_command_value}, value from prometheus query: {metric_fields.get(field_name)}"
+        for field_name, vm_command_value in values_to_compare.items()
+        if metric_fields.get(field_name) != vm_command_value
+    }
+    if values_mismatch:
+        LOGGER.info(f"The following values has a mismatch between metric and vm values: {values_mismatch}")
+    return query_results[0].get("value")[1] == expected_value and not values_mismatch
+
+
 def compare_kubevirt_vmi_info_metric_with_vm_info(
     prometheus: Prometheus, query: str, expected_value: str, values_to_compare: dict
 ) -> None:
@@ -427,41 +404,21 @@ def compare_kubevirt_vmi_info_metric_with_vm_info(
         values_to_compare (dict): entries with values from the vm to compare with prometheus
 
     """
-    sampler = TimeoutSampler(
-        wait_timeout=TIMEOUT_1MIN,
-        sleep=TIMEOUT_20SEC,
-        func=prometheus.query_sampler,
-        query=query,
-    )
-    missing_entries = None
-    metric_value_field = None
-    values_mismatch = None
-    expected_entries = values_to_compare.keys()
     try:
-        for sample in sampler:
-            if sample and sample[0].get("metric"):
-                query_result = sample[0]
-                metric_fields = query_result["metric"]
-                metric_value_field = query_result.get("value")[1]
-                missing_entries = [entry for entry in expected_entries if entry not in metric_fields]
-                if not missing_entries:
-                    values_mismatch = {
-                        field_name: (
-                            f"Value from vm: {vm_command_value}, value from prometheus query: "
-                            f"{metric_fields.get(field_name)}"
-                        )
-                        for field_name, vm_command_value in values_to_compare.items()
-                        if metric_fields.get(field_name) != vm_command_value
-                    }
-                    if metric_value_field == expected_value and not values_mismatch:
-                        return
-                missing_entries = None
+        wait_for_queries(
+            prometheus=prometheus,
+            conditions={
+                query: partial(
+                    _vm_info_metric_matches, expected_value=expected_value, values_to_compare=values_to_compare
+                )
+            },
+            timeout=TIMEOUT_1MIN,
+            sleep=TIMEOUT_20SEC,
+        )
     except TimeoutExpiredError:
         LOGGER.error(
             f"timeout exception waiting Prometheus query to match expected value: {expected_value}\n"
-            f"query: {query}, results: {metric_value_field}\n"
-            f"missing entries: {missing_entries}, expected entries: {expected_entries}\n"
-            f"The following values has a mismatch between metric and vm values: {values_mismatch}\n"
+            f"query: {query}, expected entries: {values_to_compare}\n"
         )
         raise
 
@@ -596,27 +553,32 @@ def binding_name_and_type_from_vm_or_vmi(vm_interface: dict[str, str]) -> dict[s
     return binding_name_and_type
 
 
+def _vnic_info_matches(query_results: list[dict[str, Any]], vnic_info_to_compare: dict[str, str]) -> bool:
+    if not query_results:
+        return False
+    vnic_info_metric_result = query_results[0].get("metric")
+    mismatch_vnic_info = {
+        info: {f"Expected: {expected_value}", f"Actual: {vnic_info_metric_result.get(info)}"}
+        for info, expected_value in vnic_info_to_compare.items()
+        if vnic_info_metric_result.get(info) != expected_value
+    }
+    if mismatch_vnic_info:
+        LOGGER.info(f"There is a mismatch between expected and actual results:\n {mismatch_vnic_info}")
+    return not mismatch_vnic_info
+
+
 def validate_vnic_info(prometheus: Prometheus, vnic_info_to_compare: dict[str, str], metric_name: str) -> None:
-    samples = TimeoutSampler(
-        wait_timeout=TIMEOUT_5MIN,
-        sleep=TIMEOUT_30SEC,
-        func=prometheus.query,
-        query=metric_name,
-    )
-    mismatch_vnic_info = None
     try:
-        for sample in samples:
-            if sample and (result := sample.get("data", {}).get("result")):
-                vnic_info_metric_result = result[0].get("metric")
-                mismatch_vnic_info = {}
-                for info, expected_value in vnic_info_to_compare.items():
-                    actual_value = vnic_info_metric_result.get(info)
-                    if actual_value != expected_value:
-                        mismatch_vnic_info[info] = {f"Expected: {expected_value}", f"Actual: {actual_value}"}
-                if not mismatch_vnic_info:
-                    return
+        wait_for_queries(
+            prometheus=prometheus,
+            conditions={metric_name: partial(_vnic_info_matches, vnic_info_to_compare=vnic_info_to_compare)},
+            timeout=TIMEOUT_5MIN,
+            sleep=TIMEOUT_30SEC,
+        )
     except TimeoutExpiredError:
-        LOGGER.error(f"There is a mismatch between expected and actual results:\n {mismatch_vnic_info}")
+        LOGGER.error(
+            f"There is a mismatch between expected and actual results of {metric_name}: {vnic_info_to_compare}"
+        )
         raise
 
 
@@ -749,27 +711,24 @@ def get_pvc_size_bytes(vm: VirtualMachineForTests) -> str:
     )
 
 
+def _is_greater_than(value: str | int, initial_value: float) -> bool:
+    return bool(value) and float(value) > initial_value
+
+
 def validate_metric_value_greater_than_initial_value(
     prometheus: Prometheus,
     metric_name: str,
     initial_value: float,
     timeout: int = TIMEOUT_4MIN,
-) -> None:
-    samples = TimeoutSampler(
-        wait_timeout=timeout,
-        sleep=TIMEOUT_15SEC,
-        func=get_metrics_value,
-        prometheus=prometheus,
-        metrics_name=metric_name,
-    )
-    sample = None
+) -> MetricTransition:
     try:
-        for sample in samples:
-            if sample:
-                if float(sample) > initial_value:
-                    return
+        return wait_for_metric_transitions(
+            prometheus=prometheus,
+            conditions={metric_name: partial(_is_greater_than, initial_value=initial_value)},
+            timeout=timeout,
+        )[metric_name]
     except TimeoutExpiredError:
-        LOGGER.error(f"{sample} should be greater than {initial_value}")
+        LOGGER.error(f"{metric_name} should be greater than {initial_value}")
         raise
 
 
@@ -3,6 +3,7 @@ import logging
 from ocp_utilities.monitoring import Prometheus
 
 from tests.observability.constants import SSP_COMMON_TEMPLATES_MODIFICATION_REVERTED
+from utilities.alert_poller import get_alert_poller
 
 LOGGER = logging.getLogger(__name__)
 ALLOW_ALERTS_ON_HEALTHY_CLUSTER_LIST = [SSP_COMMON_TEMPLATES_MODIFICATION_REVERTED]
@@ -13,8 +14,9 @@ def verify_no_listed_alerts_on_cluster(prometheus: Prometheus, alerts_list: list
     It gets a list of alerts and verifies that none of them are firing on a cluster.
     """
     fired_alerts = {}
+    alert_poller = get_alert_poller(prometheus=prometheus)
     for alert in alerts_list:
-        alerts_by_name = prometheus.get_all_alerts_by_alert_name(alert_name=alert)
+        alerts_by_name = alert_poller.get_alerts(alert_name=alert)
         if alerts_by_name and alerts_by_name[0]["state"] == "firing":
             if alert in ALLOW_ALERTS_ON_HEALTHY_CLUSTER_LIST:
                 continue
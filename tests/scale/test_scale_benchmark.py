@@ -2,9 +2,7 @@ import datetime
 import logging
 import os
 import re
-import shlex
 import time
-from collections import Counter
 
 import pytest
 import yaml
@@ -15,7 +13,6 @@ from ocp_resources.template import Template
 from ocp_resources.virtual_machine_instance_migration import (
     VirtualMachineInstanceMigration,
 )
-from pyhelper_utils.shell import run_command
 from timeout_sampler import TimeoutExpiredError, TimeoutSampler
 
 from tests.os_params import (
@@ -42,16 +39,24 @@ from utilities.constants.timeouts import (
     TIMEOUT_1MIN,
     TIMEOUT_30MIN,
 )
+from utilities.data_collector import get_data_collector_base_directory
 from utilities.infra import (
     create_ns,
 )
+from utilities.metric_cardinality import (
+    MetricCardinalityProfiler,
+    get_cardinality_regressions,
+    load_cardinality_baseline,
+)
 from utilities.must_gather import run_must_gather
+from utilities.node_load import NodeLoadSampler
 from utilities.storage import construct_datavolume_source_dict, generate_data_source_dict, get_test_artifact_server_url
 from utilities.virt import (
     VirtualMachineForTestsFromTemplate,
     verify_vm_migrated,
     wait_for_migration_finished,
 )
+from utilities.vm_diagnostics import collect_vms_diagnostics
 
 LOGGER = logging.getLogger(__name__)
 OCS = "ocs"
@@ -66,22 +71,6 @@ SCALE_STORAGE_TYPES = {
 pytestmark = [pytest.mark.scale, pytest.mark.windows]
 
 
-def log_nodes_load_data(vms=None):
-    """
-    Log the distribution of VM's on the nodes, and the cluster memory/cpu statistics
-
-    Args:
-        vms (list): List of vms to log statistics on
-    """
-    nodes_load_distribute = Counter([vm.vmi.node.name for vm in vms or []])
-    LOGGER.info(f"Nodes vm load distribution: {nodes_load_distribute or 'no scale VMs running'}")
-    cmd_succeeded, nodes_load_statistics, _ = run_command(
-        command=shlex.split("oc adm top nodes --use-protocol-buffers")
-    )
-    assert cmd_succeeded, "Failed to get nodes status"
-    LOGGER.info(f"Nodes load statistics:\n {nodes_load_statistics}")
-
-
 def all_vms_running(vms):
     """
     Check if all VMIs are in running state
@@ -121,11 +110,22 @@ def save_must_gather_logs(must_gather_image_url):
     )
 
 
-def failure_finalizer(vms_list, must_gather_image_url):
-    log_nodes_load_data(vms=vms_list)
+def save_vms_diagnostics(vms_list, admin_client):
+    diagnostics_path = os.path.join(
+        os.path.expanduser("~"),
+        f"vm_diagnostics_{datetime.datetime.now(tz=datetime.UTC).strftime('%Y_%m_%d_%H_%M_%S')}",
+    )
+    collect_vms_diagnostics(vms=vms_list, admin_client=admin_client, target_dir=diagnostics_path)
+    return diagnostics_path
+
+
+def failure_finalizer(vms_list, must_gather_image_url, admin_client, node_load_sampler):
+    node_load_sampler.record_vm_density(checkpoint="failure", vms=vms_list)
+    diagnostics_path = save_vms_diagnostics(vms_list=vms_list, admin_client=admin_client)
     logs_folders = save_must_gather_logs(must_gather_image_url=must_gather_image_url)
     pytest.fail(
-        reason=f"Test failed, keeping the test environment. the must-gather logs are saved under {logs_folders}"
+        reason=f"Test failed, keeping the test environment. the must-gather logs are saved under {logs_folders}, "
+        f"the VMs diagnostics are saved under {diagnostics_path}"
     )
 
 
@@ -140,6 +140,24 @@ def start_live_migration(vm, client):
         return migration
 
 
+@pytest.fixture(scope="class")
+def node_load_sampler(prometheus):
+    """
+    Node load over the scale run, written with the VM density timeline when the class ends
+    """
+    node_load_sampler = NodeLoadSampler(prometheus=prometheus)
+    yield node_load_sampler
+    node_load_sampler.write(base_directory=get_data_collector_base_directory())
+
+
+@pytest.fixture(scope="class")
+def metric_cardinality_profiler(prometheus, admin_client, hco_namespace):
+    """
+    KubeVirt metrics cardinality and scrape cost, profiled as the scale VMs start
+    """
+    return MetricCardinalityProfiler(prometheus=prometheus, client=admin_client, namespace=hco_namespace)
+
+
 @pytest.fixture(scope="class")
 def fail_if_param_vms_zero(expected_num_of_vms):
     if expected_num_of_vms == 0:
@@ -389,9 +407,12 @@ class TestScale:
     def test_create_vms(
         self,
         fail_if_param_vms_zero,
+        node_load_sampler,
+        metric_cardinality_profiler,
         scale_vms,
     ):
-        log_nodes_load_data()
+        node_load_sampler.record_vm_density(checkpoint="create_vms")
+        metric_cardinality_profiler.profile(vmi_count=0)
         for batch in scale_vms:
             for vm in batch:
                 vm.deploy()
@@ -401,14 +422,25 @@ class TestScale:
         depends=["test_create_vms"],
     )
     @pytest.mark.polarion("CNV-8448")
-    def test_start_vms(self, scale_test_param, scale_vms, all_vms_objects, must_gather_image_url):
-        for batch in scale_vms:
+    def test_start_vms(
+        self,
+        admin_client,
+        scale_test_param,
+        scale_vms,
+        all_vms_objects,
+        must_gather_image_url,
+        node_load_sampler,
+        metric_cardinality_profiler,
+    ):
+        running_vms = 0
+        for batch_index, batch in enumerate(scale_vms):
+            if batch_index:
+                time.sleep(scale_test_param["seconds_between_batches"])
             for vm in batch:
                 if vm.instance.spec.runStrategy == vm.RunStrategy.ALWAYS:
                     continue
                 vm.start()
-            time.sleep(scale_test_param["seconds_between_batches"])
-        for batch in scale_vms:
+            # Profile each batch once it is running, before the next batch adds its series
             for vm in batch:
                 try:
                     vm.vmi.wait(timeout=TIMEOUT_30MIN)
@@ -418,18 +450,43 @@ class TestScale:
                     failure_finalizer(
                         vms_list=all_vms_objects,
                         must_gather_image_url=must_gather_image_url,
+                        admin_client=admin_client,
+                        node_load_sampler=node_load_sampler,
                     )
+            running_vms += len(batch)
+            metric_cardinality_profiler.profile(vmi_count=running_vms)
+
+    @pytest.mark.dependency(depends=["test_start_vms"])
+    def test_metric_cardinality(self, pytestconfig, metric_cardinality_profiler):
+        """
+        Test that the KubeVirt metrics cardinality and scrape cost do not regress against the stored baseline.
+
+        Steps:
+            1. Write the cardinality report of the VMI counts profiled while the VMs started
+            2. Compare the report with the baseline, if provided
+
+        Expected:
+            - No metric family has more series, and no component scrape is slower or larger, than in the baseline
+              beyond the regression tolerance
+        """
+        regressions = get_cardinality_regressions(
+            report=metric_cardinality_profiler.write(base_directory=get_data_collector_base_directory()),
+            baseline=load_cardinality_baseline(baseline_dir=pytestconfig.getoption("metric_cardinality_baseline")),
+        )
+        assert not regressions, f"Metric cardinality regressions: {regressions}"
 
     # TODO check the os internally to see if it didn't reboot
     @pytest.mark.dependency(name="test_scale_vms_running_stability", depends=["test_start_vms"])
     @pytest.mark.polarion("CNV-8449")
     def test_scale_vms_running_stability(
         self,
+        admin_client,
         scale_test_param,
         all_vms_objects,
         must_gather_image_url,
+        node_load_sampler,
     ):
-        log_nodes_load_data(vms=all_vms_objects)
+        node_load_sampler.record_vm_density(checkpoint="vms_running_stability", vms=all_vms_objects)
         LOGGER.info("Verifying all VMS are running")
         try:
             sampler = TimeoutSampler(
@@ -444,6 +501,8 @@ class TestScale:
                     failure_finalizer(
                         vms_list=all_vms_objects,
                         must_gather_image_url=must_gather_image_url,
+                        admin_client=admin_client,
+                        node_load_sampler=node_load_sampler,
                     )
         except TimeoutExpiredError:
             return
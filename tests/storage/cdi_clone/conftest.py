@@ -1,13 +1,17 @@
 import pytest
 from ocp_resources.datavolume import DataVolume
+from ocp_resources.resource import ResourceEditor
+from ocp_resources.storage_class import StorageClass
+from ocp_resources.storage_profile import StorageProfile
 
+from tests.storage.cdi_clone.utils import wait_for_storage_profile_clone_strategy
 from tests.storage.constants import QUAY_FEDORA_CONTAINER_IMAGE
 from tests.storage.stop_status_utils import dv_stop_status_restart_threshold
 from utilities.constants import Images
 from utilities.constants.storage import REGISTRY_STR
 from utilities.constants.timeouts import TIMEOUT_40MIN
 from utilities.constants.virt import WIN_2K22
-from utilities.storage import create_dv, data_volume, get_dv_size_from_datasource
+from utilities.storage import create_dv, data_volume, get_dv_size_from_datasource, is_snapshot_supported_by_sc
 
 
 @pytest.fixture()
@@ -86,3 +90,38 @@ def cloned_windows_dv_multi_storage_scope_class(
     ) as cdv:
         cdv.wait_for_dv_success(timeout=TIMEOUT_40MIN)
         yield cdv
+
+
+@pytest.fixture(scope="module")
+def clone_benchmark_source_dv(unprivileged_client, namespace, storage_class_name_scope_module):
+    with create_dv(
+        dv_name=f"dv-clone-benchmark-source-{storage_class_name_scope_module}",
+        namespace=namespace.name,
+        source=REGISTRY_STR,
+        url=QUAY_FEDORA_CONTAINER_IMAGE,
+        size=Images.Fedora.DEFAULT_DV_SIZE,
+        storage_class=storage_class_name_scope_module,
+        client=unprivileged_client,
+    ) as dv:
+        dv.wait_for_dv_success(stop_status_func=dv_stop_status_restart_threshold, dv=dv)
+        yield dv
+
+
+@pytest.fixture()
+def storage_profile_with_clone_strategy(
+    request, admin_client, cluster_csi_drivers_names, storage_class_name_scope_module
+):
+    clone_strategy = request.param
+    if clone_strategy != "copy":
+        provisioner = StorageClass(name=storage_class_name_scope_module, client=admin_client).instance.provisioner
+        if provisioner not in cluster_csi_drivers_names:
+            pytest.skip(f"{clone_strategy} clone requires a CSI storage class, {provisioner} is not a CSI driver")
+        if clone_strategy == "snapshot" and not is_snapshot_supported_by_sc(
+            sc_name=storage_class_name_scope_module, client=admin_client
+        ):
+            pytest.skip(f"Storage class {storage_class_name_scope_module} does not support snapshots")
+
+    storage_profile = StorageProfile(name=storage_class_name_scope_module, client=admin_client)
+    with ResourceEditor(patches={storage_profile: {"spec": {"cloneStrategy": clone_strategy}}}):
+        wait_for_storage_profile_clone_strategy(storage_profile=storage_profile, clone_strategy=clone_strategy)
+        yield storage_profile
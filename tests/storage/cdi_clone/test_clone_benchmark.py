@@ -0,0 +1,76 @@
+"""
+Clone strategy timing benchmark
+
+Clones a fixed-size source DataVolume several times with each StorageProfile clone strategy
+(host-assisted copy, CSI clone, snapshot) and reports p50/p95 clone phase latency and effective throughput
+per storage class and strategy.
+"""
+
+import logging
+
+import pytest
+
+from tests.storage.cdi_clone.utils import (
+    get_dv_clone_phase_durations,
+    save_clone_benchmark_results,
+    summarize_clone_durations,
+)
+from tests.storage.utils import assert_pvc_snapshot_clone_annotation
+from utilities.storage import create_dv
+
+LOGGER = logging.getLogger(__name__)
+
+CLONE_BENCHMARK_ITERATIONS = 5
+
+pytestmark = pytest.mark.benchmark
+
+
+@pytest.mark.parametrize(
+    "storage_profile_with_clone_strategy",
+    [
+        pytest.param("copy", id="host_assisted"),
+        pytest.param("csi-clone", id="csi_clone"),
+        pytest.param("snapshot", id="snapshot"),
+    ],
+    indirect=True,
+)
+def test_clone_strategy_benchmark(
+    unprivileged_client,
+    namespace,
+    storage_class_name_scope_module,
+    clone_benchmark_source_dv,
+    storage_profile_with_clone_strategy,
+):
+    """
+    Test that the source DataVolume is cloned repeatedly using the configured clone strategy and report clone timings.
+
+    Steps:
+        1. Clone the source DataVolume CLONE_BENCHMARK_ITERATIONS times, one clone at a time
+        2. Record clone phase durations from each DataVolume's events and conditions
+        3. Store p50/p95 latency and effective throughput
+
+    Expected:
+        - All clones succeed using the configured clone strategy
+    """
+    clone_strategy = storage_profile_with_clone_strategy.instance.spec.cloneStrategy
+    clone_durations = []
+    for iteration in range(CLONE_BENCHMARK_ITERATIONS):
+        with create_dv(
+            dv_name=f"dv-clone-benchmark-{iteration}",
+            namespace=namespace.name,
+            client=unprivileged_client,
+            source="pvc",
+            source_pvc_name=clone_benchmark_source_dv.name,
+            source_pvc_namespace=namespace.name,
+            size=clone_benchmark_source_dv.size,
+            storage_class=storage_class_name_scope_module,
+        ) as cdv:
+            cdv.wait_for_dv_success()
+            assert_pvc_snapshot_clone_annotation(pvc=cdv.pvc, storage_class=storage_class_name_scope_module)
+            clone_durations.append(get_dv_clone_phase_durations(dv=cdv))
+
+    summary = summarize_clone_durations(clone_durations=clone_durations, source_size=clone_benchmark_source_dv.size)
+    LOGGER.info(f"Clone benchmark for {storage_class_name_scope_module}/{clone_strategy}: {summary}")
+    save_clone_benchmark_results(
+        storage_class=storage_class_name_scope_module, clone_strategy=clone_strategy, summary=summary
+    )
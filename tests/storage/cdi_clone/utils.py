@@ -0,0 +1,124 @@
+import datetime
+import json
+import logging
+import os
+import statistics
+from typing import Any
+
+import bitmath
+from ocp_resources.datavolume import DataVolume
+from ocp_resources.storage_profile import StorageProfile
+from timeout_sampler import TimeoutExpiredError, TimeoutSampler
+
+from utilities.constants.timeouts import TIMEOUT_1MIN, TIMEOUT_5SEC
+from utilities.data_collector import get_data_collector_base_directory, write_to_file
+
+LOGGER = logging.getLogger(__name__)
+
+CLONE_BENCHMARK_DIR_NAME = "clone-benchmark"
+CLONE_SCHEDULED_REASON = "CloneScheduled"
+CLONE_IN_PROGRESS_REASON = "CloneInProgress"
+CLONE_SUCCEEDED_REASONS = ("CloneSucceeded", "Succeeded")
+
+
+def _parse_k8s_timestamp(timestamp: str) -> datetime.datetime:
+    return datetime.datetime.fromisoformat(timestamp)
+
+
+def wait_for_storage_profile_clone_strategy(storage_profile: StorageProfile, clone_strategy: str) -> None:
+    """
+    Wait until the CDI controller reports the clone strategy set in the StorageProfile spec in its status.
+
+    Args:
+        storage_profile: StorageProfile with a patched spec.cloneStrategy.
+        clone_strategy: Expected clone strategy.
+
+    Raises:
+        TimeoutExpiredError: If the status clone strategy is not updated within timeout.
+    """
+    sampler = TimeoutSampler(
+        wait_timeout=TIMEOUT_1MIN,
+        sleep=TIMEOUT_5SEC,
+        func=lambda: storage_profile.instance.status.cloneStrategy,
+    )
+    try:
+        for status_clone_strategy in sampler:
+            if status_clone_strategy == clone_strategy:
+                return
+    except TimeoutExpiredError:
+        LOGGER.error(f"StorageProfile {storage_profile.name} status.cloneStrategy is not {clone_strategy}")
+        raise
+
+
+def get_dv_clone_phase_durations(dv: DataVolume) -> dict[str, float]:
+    """
+    Get clone phase durations of a succeeded DataVolume from its events and conditions.
+
+    Phases are measured from the DataVolume creation: time until the clone was scheduled, time spent
+    cloning (CloneInProgress until success) and the total time until the Ready condition became True.
+    Phases without a matching event are omitted.
+
+    Args:
+        dv: Succeeded clone DataVolume.
+
+    Returns:
+        dict: phase name to duration in seconds.
+    """
+    dv_instance = dv.instance
+    created = _parse_k8s_timestamp(timestamp=dv_instance.metadata.creationTimestamp)
+    event_times = {}
+    for event in dv.events(timeout=TIMEOUT_5SEC):
+        raw_event = event["raw_object"]
+        if event_timestamp := raw_event.get("lastTimestamp") or raw_event.get("eventTime"):
+            event_times.setdefault(raw_event["reason"], _parse_k8s_timestamp(timestamp=event_timestamp))
+
+    durations = {}
+    if scheduled := event_times.get(CLONE_SCHEDULED_REASON):
+        durations["scheduled"] = (scheduled - created).total_seconds()
+
+    succeeded = next((event_times[reason] for reason in CLONE_SUCCEEDED_REASONS if reason in event_times), None)
+    if (in_progress := event_times.get(CLONE_IN_PROGRESS_REASON)) and succeeded:
+        durations["in_progress"] = (succeeded - in_progress).total_seconds()
+
+    for condition in dv_instance.status.conditions:
+        if condition.type == DataVolume.Condition.Type.READY and condition.status == DataVolume.Condition.Status.TRUE:
+            ready = _parse_k8s_timestamp(timestamp=condition.lastTransitionTime)
+            durations["total"] = (ready - created).total_seconds()
+    LOGGER.info(f"Clone phase durations for {dv.name}: {durations}")
+    return durations
+
+
+def summarize_clone_durations(clone_durations: list[dict[str, float]], source_size: str) -> dict[str, Any]:
+    """
+    Summarize clone phase durations of several clones of the same source.
+
+    Args:
+        clone_durations: Phase durations per clone, as returned by get_dv_clone_phase_durations.
+        source_size: Source PVC size, e.g. "10Gi".
+
+    Returns:
+        dict: p50/p95 per phase in seconds and the effective throughput in MiB/s based on the p50 total time.
+    """
+    summary: dict[str, Any] = {"clones": len(clone_durations)}
+    for phase in ("scheduled", "in_progress", "total"):
+        phase_durations = [durations[phase] for durations in clone_durations if phase in durations]
+        if len(phase_durations) < 2:
+            summary[phase] = {"p50": phase_durations[0] if phase_durations else None, "p95": None}
+            continue
+
+        percentiles = statistics.quantiles(data=phase_durations, n=100, method="inclusive")
+        summary[phase] = {"p50": round(percentiles[49], 2), "p95": round(percentiles[94], 2)}
+
+    if total_p50 := summary["total"]["p50"]:
+        summary["throughput_mib_per_sec"] = round(
+            bitmath.parse_string_unsafe(source_size).to_MiB().value / total_p50, 2
+        )
+    return summary
+
+
+def save_clone_benchmark_results(storage_class: str, clone_strategy: str, summary: dict[str, Any]) -> None:
+    write_to_file(
+        file_name=f"{storage_class}-{clone_strategy}.json",
+        content=json.dumps(summary, indent=2),
+        base_directory=os.path.join(get_data_collector_base_directory(), CLONE_BENCHMARK_DIR_NAME),
+    )
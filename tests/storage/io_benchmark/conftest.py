@@ -0,0 +1,61 @@
+import pytest
+
+from tests.storage.constants import QUAY_FEDORA_CONTAINER_IMAGE
+from tests.storage.io_benchmark.utils import get_benchmark_result_key
+from tests.storage.stop_status_utils import dv_stop_status_restart_threshold
+from utilities.constants import Images
+from utilities.constants.images import OS_FLAVOR_FEDORA
+from utilities.constants.storage import REGISTRY_STR
+from utilities.storage import create_dv, create_vm_from_dv
+
+
+@pytest.fixture()
+def io_benchmark_preallocation(request):
+    return request.param
+
+
+@pytest.fixture()
+def io_benchmark_result_key(
+    storage_class_matrix__module__, storage_class_name_scope_module, io_benchmark_preallocation
+):
+    return get_benchmark_result_key(
+        storage_class=storage_class_name_scope_module,
+        volume_mode=storage_class_matrix__module__[storage_class_name_scope_module]["volume_mode"],
+        preallocation=io_benchmark_preallocation,
+    )
+
+
+@pytest.fixture()
+def io_benchmark_dv(
+    unprivileged_client,
+    namespace,
+    storage_class_matrix__module__,
+    storage_class_name_scope_module,
+    io_benchmark_preallocation,
+):
+    with create_dv(
+        dv_name=f"dv-io-benchmark-{storage_class_name_scope_module}",
+        namespace=namespace.name,
+        source=REGISTRY_STR,
+        url=QUAY_FEDORA_CONTAINER_IMAGE,
+        size=Images.Fedora.DEFAULT_DV_SIZE,
+        storage_class=storage_class_name_scope_module,
+        volume_mode=storage_class_matrix__module__[storage_class_name_scope_module]["volume_mode"],
+        preallocation=io_benchmark_preallocation,
+        client=unprivileged_client,
+    ) as dv:
+        dv.wait_for_dv_success(stop_status_func=dv_stop_status_restart_threshold, dv=dv)
+        yield dv
+
+
+@pytest.fixture()
+def io_benchmark_vm(unprivileged_client, io_benchmark_dv):
+    with create_vm_from_dv(
+        client=unprivileged_client,
+        dv=io_benchmark_dv,
+        vm_name="vm-io-benchmark",
+        os_flavor=OS_FLAVOR_FEDORA,
+        memory_guest=Images.Fedora.DEFAULT_MEMORY_SIZE,
+        wait_for_interfaces=True,
+    ) as vm:
+        yield vm
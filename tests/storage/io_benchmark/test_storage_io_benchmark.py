@@ -0,0 +1,60 @@
+"""
+Storage class I/O benchmark inside Fedora guests
+
+Runs a fixed fio profile (sequential read/write, 4k random read/write, fsync latency) on a VM booted from a
+DataVolume of each storage_class_matrix entry, with and without preallocation.
+Results are stored under the data collector directory; pass a previous run's results directory with
+--storage-io-benchmark-baseline to compare against it.
+"""
+
+import json
+import logging
+
+import pytest
+
+from tests.storage.io_benchmark.utils import (
+    BENCHMARK_REGRESSION_TOLERANCE,
+    get_benchmark_regressions,
+    load_benchmark_baseline,
+    run_fio_profile,
+    save_benchmark_results,
+)
+from utilities.fio import parse_fio_results
+
+LOGGER = logging.getLogger(__name__)
+
+pytestmark = pytest.mark.benchmark
+
+
+@pytest.mark.parametrize(
+    "io_benchmark_preallocation",
+    [
+        pytest.param(True, id="preallocation"),
+        pytest.param(False, id="no_preallocation"),
+    ],
+    indirect=True,
+)
+def test_storage_io_benchmark(pytestconfig, io_benchmark_result_key, io_benchmark_vm):
+    """
+    Test that guest disk performance of a storage class does not regress against the stored baseline.
+
+    Steps:
+        1. Run the fio profile in the guest
+        2. Store IOPS, bandwidth and latency percentiles per fio job
+        3. Compare the results with the baseline, if provided
+
+    Expected:
+        - No fio job is slower than the baseline beyond the regression tolerance
+    """
+    results = parse_fio_results(fio_json=run_fio_profile(vm=io_benchmark_vm))
+    LOGGER.info(f"Storage I/O benchmark results for {io_benchmark_result_key}:\n{json.dumps(results, indent=2)}")
+    save_benchmark_results(result_key=io_benchmark_result_key, results=results)
+    regressions = get_benchmark_regressions(
+        results=results,
+        baseline=load_benchmark_baseline(
+            baseline_dir=pytestconfig.getoption("storage_io_benchmark_baseline"),
+            result_key=io_benchmark_result_key,
+        ),
+        tolerance=BENCHMARK_REGRESSION_TOLERANCE,
+    )
+    assert not regressions, f"Storage I/O regressions for {io_benchmark_result_key}: {regressions}"
@@ -0,0 +1,136 @@
+import json
+import logging
+import os
+import shlex
+from typing import Any
+
+from pyhelper_utils.shell import run_ssh_commands
+
+from utilities.constants.timeouts import TIMEOUT_15MIN
+from utilities.data_collector import get_data_collector_base_directory, write_to_file
+from utilities.fio import FIO_PERCENTILES
+from utilities.virt import VirtualMachineForTests
+
+LOGGER = logging.getLogger(__name__)
+
+STORAGE_IO_BENCHMARK_DIR_NAME = "storage-io-benchmark"
+FIO_RUNTIME_SEC = 30
+FIO_TEST_FILE = "/var/tmp/fio-benchmark.bin"
+FIO_COMMON_OPTIONS = (
+    f"--direct=1 --time_based --runtime={FIO_RUNTIME_SEC} --ramp_time=5 --size=1G "
+    f"--percentile_list={':'.join(FIO_PERCENTILES)} --output-format=json"
+)
+# Jobs run one after another (--stonewall) so each one gets the disk for itself
+FIO_PROFILE = {
+    "seq_read": "--rw=read --bs=1M --ioengine=libaio --iodepth=16",
+    "seq_write": "--rw=write --bs=1M --ioengine=libaio --iodepth=16",
+    "rand_read_4k": "--rw=randread --bs=4k --ioengine=libaio --iodepth=32",
+    "rand_write_4k": "--rw=randwrite --bs=4k --ioengine=libaio --iodepth=32",
+    "fsync_latency": "--rw=write --bs=4k --ioengine=sync --iodepth=1 --fsync=1",
+}
+# Relative change allowed against the baseline before a result is reported as a regression
+BENCHMARK_REGRESSION_TOLERANCE = 0.2
+
+
+def get_benchmark_result_key(storage_class: str, volume_mode: str, preallocation: bool) -> str:
+    return f"{storage_class}-{volume_mode.lower()}-preallocation-{str(preallocation).lower()}"
+
+
+def run_fio_profile(vm: VirtualMachineForTests) -> dict[str, Any]:
+    """
+    Run the fixed fio profile on the VM boot disk.
+
+    fio is installed on the guest if missing; all jobs are executed by a single fio invocation
+    against a test file on the guest root filesystem.
+
+    Args:
+        vm: Running VM with SSH connectivity.
+
+    Returns:
+        dict: fio JSON output.
+    """
+    jobs_str = " ".join([
+        f"--name={job_name} {job_options} --stonewall" for job_name, job_options in FIO_PROFILE.items()
+    ])
+    LOGGER.info(f"Running fio profile {list(FIO_PROFILE)} on {vm.name}")
+    fio_output = run_ssh_commands(
+        host=vm.ssh_exec,
+        commands=[
+            shlex.split("command -v fio || sudo dnf install -y fio"),
+            shlex.split(f"sudo fio --filename={FIO_TEST_FILE} {FIO_COMMON_OPTIONS} {jobs_str}"),
+        ],
+        timeout=TIMEOUT_15MIN,
+    )[1]
+    # fio may print warnings before the JSON document
+    return json.loads(fio_output[fio_output.index("{") :])
+
+
+def get_benchmark_regressions(
+    results: dict[str, dict[str, Any]], baseline: dict[str, dict[str, Any]], tolerance: float
+) -> list[str]:
+    """
+    Compare benchmark results with a baseline.
+
+    Lower IOPS/bandwidth or higher p99 latency beyond the tolerance is reported as a regression.
+    Jobs missing from the baseline are ignored.
+
+    Args:
+        results: Current results, as returned by parse_fio_results.
+        baseline: Baseline results in the same format.
+        tolerance: Allowed relative change, e.g. 0.2 for 20%.
+
+    Returns:
+        list: Human readable regression descriptions, empty if none.
+    """
+    regressions = []
+    for job_name, job_results in results.items():
+        if not (baseline_job := baseline.get(job_name)):
+            continue
+
+        for metric in ("iops", "bandwidth_kib"):
+            if job_results[metric] < baseline_job[metric] * (1 - tolerance):
+                regressions.append(f"{job_name}: {metric} {job_results[metric]} < baseline {baseline_job[metric]}")
+
+        current_p99 = job_results["latency_usec"]["p99"]
+        baseline_p99 = baseline_job["latency_usec"]["p99"]
+        if baseline_p99 and current_p99 > baseline_p99 * (1 + tolerance):
+            regressions.append(f"{job_name}: p99 latency {current_p99}us > baseline {baseline_p99}us")
+    return regressions
+
+
+def save_benchmark_results(result_key: str, results: dict[str, dict[str, Any]]) -> None:
+    """
+    Store benchmark results so that a later run can use them as its baseline.
+
+    Args:
+        result_key: Result identifier, see get_benchmark_result_key.
+        results: Results as returned by parse_fio_results.
+    """
+    write_to_file(
+        file_name=f"{result_key}.json",
+        content=json.dumps(results, indent=2),
+        base_directory=os.path.join(get_data_collector_base_directory(), STORAGE_IO_BENCHMARK_DIR_NAME),
+    )
+
+
+def load_benchmark_baseline(baseline_dir: str | None, result_key: str) -> dict[str, dict[str, Any]]:
+    """
+    Load the baseline results stored by a previous run.
+
+    Args:
+        baseline_dir: Directory with results of a previous run, or None.
+        result_key: Result identifier, see get_benchmark_result_key.
+
+    Returns:
+        dict: Baseline results, empty if no baseline is available.
+    """
+    if not baseline_dir:
+        return {}
+
+    baseline_file = os.path.join(baseline_dir, f"{result_key}.json")
+    if not os.path.isfile(baseline_file):
+        LOGGER.warning(f"No storage I/O benchmark baseline found at {baseline_file}")
+        return {}
+
+    with open(baseline_file) as fd:
+        return json.load(fd)
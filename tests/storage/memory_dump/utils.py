@@ -1,9 +1,14 @@
+import logging
+from collections.abc import Callable
+from typing import Any
+
 from ocp_resources.virtual_machine import VirtualMachine
-from timeout_sampler import retry
 
-from utilities.constants.timeouts import TIMEOUT_2MIN, TIMEOUT_5SEC
+from utilities.constants.timeouts import TIMEOUT_2MIN
 from utilities.virt import VirtualMachineForTests
 
+LOGGER = logging.getLogger(__name__)
+
 
 class MemoryDumpPhaseCompletedError(Exception):
     pass
@@ -13,25 +18,58 @@ class MemoryDumpPhaseRemovedError(Exception):
     pass
 
 
-@retry(
-    wait_timeout=TIMEOUT_2MIN,
-    sleep=TIMEOUT_5SEC,
-    exceptions_dict={MemoryDumpPhaseCompletedError: []},
-)
-def wait_for_memory_dump_status_completed(vm: VirtualMachineForTests) -> bool:
-    vm_memory_dump_phase = vm.instance.status.get("memoryDumpRequest", {}).get("phase")
-    if vm_memory_dump_phase == VirtualMachine.Status.COMPLETED:
-        return True
-    raise MemoryDumpPhaseCompletedError(f"VM {vm.name} memoryDumpRequest.phase is {vm_memory_dump_phase}")
-
-
-@retry(
-    wait_timeout=TIMEOUT_2MIN,
-    sleep=TIMEOUT_5SEC,
-    exceptions_dict={MemoryDumpPhaseRemovedError: []},
-)
-def wait_for_memory_dump_status_removed(vm: VirtualMachineForTests) -> bool:
-    vm_memory_dump_request = vm.instance.status.memoryDumpRequest
-    if vm_memory_dump_request is None:
-        return True
-    raise MemoryDumpPhaseRemovedError(f"VM {vm.name} status.memoryDumpRequest is {vm_memory_dump_request}")
+def _watch_memory_dump_request(
+    vm: VirtualMachineForTests, expected_state: Callable[[dict[str, Any] | None], bool], timeout: int
+) -> dict[str, Any] | None:
+    """
+    Watch the VM status.memoryDumpRequest until it reaches the expected state.
+
+    The current state is checked first; the watch then starts from the VM resource version of that check,
+    so no update is missed.
+
+    Args:
+        vm: VM with a memory dump request.
+        expected_state: Returns True when the memoryDumpRequest (None when removed) is in the expected state.
+        timeout: Watch timeout in seconds.
+
+    Returns:
+        dict | None: The last seen memoryDumpRequest.
+
+    Raises:
+        TimeoutError: If the expected state is not reached within the timeout.
+    """
+    vm_instance = vm.instance.to_dict()
+    memory_dump_request = vm_instance.get("status", {}).get("memoryDumpRequest")
+    if expected_state(memory_dump_request):
+        return memory_dump_request
+
+    for event in vm.watcher(timeout=timeout, resource_version=vm_instance["metadata"]["resourceVersion"]):
+        if event["type"] not in ("ADDED", "MODIFIED"):
+            continue
+        memory_dump_request = event["raw_object"].get("status", {}).get("memoryDumpRequest")
+        LOGGER.info(f"VM {vm.name} status.memoryDumpRequest: {memory_dump_request}")
+        if expected_state(memory_dump_request):
+            return memory_dump_request
+    raise TimeoutError(f"VM {vm.name} status.memoryDumpRequest is {memory_dump_request}")
+
+
+def wait_for_memory_dump_status_completed(vm: VirtualMachineForTests, timeout: int = TIMEOUT_2MIN) -> None:
+    try:
+        _watch_memory_dump_request(
+            vm=vm,
+            expected_state=lambda memory_dump_request: (
+                (memory_dump_request or {}).get("phase") == VirtualMachine.Status.COMPLETED
+            ),
+            timeout=timeout,
+        )
+    except TimeoutError as error:
+        raise MemoryDumpPhaseCompletedError(str(error)) from error
+
+
+def wait_for_memory_dump_status_removed(vm: VirtualMachineForTests, timeout: int = TIMEOUT_2MIN) -> None:
+    try:
+        _watch_memory_dump_request(
+            vm=vm, expected_state=lambda memory_dump_request: memory_dump_request is None, timeout=timeout
+        )
+    except TimeoutError as error:
+        raise MemoryDumpPhaseRemovedError(str(error)) from error
@@ -23,6 +23,7 @@ from tests.storage.storage_migration.constants import (
 )
 from tests.storage.storage_migration.utils import (
     build_namespaces_spec_for_storage_migration,
+    get_hotplugged_disks_hash_manifests,
     wait_for_storage_migration_completed,
 )
 from tests.storage.utils import create_windows_directory, get_storage_class_for_storage_migration
@@ -347,7 +348,8 @@ def vm_with_mounted_hotplugged_disks(vm_for_storage_class_migration_with_hotplug
             commands=[
                 shlex.split(cmd)
                 for cmd in [
-                    f"sudo mkfs.ext4 {device}",
+                    # No lazy initialization, it keeps writing to the disk in the background after mkfs
+                    f"sudo mkfs.ext4 -E lazy_itable_init=0,lazy_journal_init=0 {device}",
                     f"sudo mkdir -p {mount_path}",
                     f"sudo mount {device} {mount_path}",
                 ]
@@ -370,6 +372,24 @@ def written_files_to_mounted_hotplugged_disks(vm_with_mounted_hotplugged_disks):
     yield vm_with_mounted_hotplugged_disks
 
 
+@pytest.fixture(scope="class")
+def vm_with_read_only_hotplugged_disks(written_files_to_mounted_hotplugged_disks):
+    # The disks are hashed before and after the migration, the filesystems must not write to them in between
+    for mount_path in MOUNT_HOTPLUGGED_DEVICE_PATHS:
+        run_ssh_commands(
+            host=written_files_to_mounted_hotplugged_disks.ssh_exec,
+            commands=shlex.split(f"sudo mount -o remount,ro {mount_path}"),
+            wait_timeout=TIMEOUT_2MIN,
+            sleep=TIMEOUT_5SEC,
+        )
+    yield written_files_to_mounted_hotplugged_disks
+
+
+@pytest.fixture(scope="class")
+def hotplugged_disks_hash_manifests_before_migration(vm_with_read_only_hotplugged_disks):
+    return get_hotplugged_disks_hash_manifests(vm=vm_with_read_only_hotplugged_disks)
+
+
 @pytest.fixture(scope="class")
 def windows_vm_with_vtpm_for_storage_migration(
     unprivileged_client,
@@ -14,6 +14,7 @@ from tests.storage.storage_migration.constants import (
 )
 from tests.storage.storage_migration.utils import (
     verify_files_in_hotplugged_disks,
+    verify_hotplugged_disks_integrity,
     verify_storage_migration_succeeded,
     verify_vm_storage_class_updated,
     verify_vms_boot_time_after_storage_migration,
@@ -179,7 +180,7 @@ class TestStorageClassMigrationWithVolumeHotplug:
         ],
         indirect=True,
     )
-    @pytest.mark.usefixtures("written_files_to_mounted_hotplugged_disks")
+    @pytest.mark.usefixtures("hotplugged_disks_hash_manifests_before_migration")
     def test_vm_storage_class_migration_with_hotplugged_volume(
         self,
         source_storage_class,
@@ -198,6 +199,18 @@ class TestStorageClassMigrationWithVolumeHotplug:
             target_storage_class=target_storage_class,
         )
 
+    @pytest.mark.dependency(
+        depends=[f"{TESTS_CLASS_NAME_VOLUME_HOTPLUG}::test_vm_storage_class_migration_with_hotplugged_volume"]
+    )
+    @pytest.mark.usefixtures("vms_for_storage_class_migration")
+    def test_hotplugged_disks_integrity_after_storage_migration(
+        self, vm_with_read_only_hotplugged_disks, hotplugged_disks_hash_manifests_before_migration
+    ):
+        verify_hotplugged_disks_integrity(
+            vm=vm_with_read_only_hotplugged_disks,
+            manifests_before_migration=hotplugged_disks_hash_manifests_before_migration,
+        )
+
     @pytest.mark.dependency(
         depends=[f"{TESTS_CLASS_NAME_VOLUME_HOTPLUG}::test_vm_storage_class_migration_with_hotplugged_volume"]
     )
@@ -8,10 +8,12 @@ from timeout_sampler import TimeoutExpiredError, TimeoutSampler
 from tests.storage.storage_migration.constants import (
     CONTENT,
     FILE_BEFORE_STORAGE_MIGRATION,
+    HOTPLUGGED_DEVICES,
     MOUNT_HOTPLUGGED_DEVICE_PATHS,
 )
 from tests.storage.utils import check_file_in_vm
 from utilities.constants.timeouts import TIMEOUT_2MIN, TIMEOUT_5SEC, TIMEOUT_10MIN, TIMEOUT_10SEC
+from utilities.disk_integrity import DiskHashManifest, assert_disk_hash_manifests_equal, get_disk_hash_manifest
 from utilities.exceptions import StorageMigrationError
 from utilities.virt import VirtualMachineForTests, get_vm_boot_time
 
@@ -96,6 +98,38 @@ def verify_files_in_hotplugged_disks(vm: VirtualMachineForTests, file_name: str,
     assert not mismatches, f"Data mismatch on hotplugged disk(s): {mismatches}"
 
 
+def get_hotplugged_disks_hash_manifests(vm: VirtualMachineForTests) -> dict[str, DiskHashManifest]:
+    """Compute whole-disk hash manifests of the hotplugged disks.
+
+    The hotplugged filesystems must be mounted read-only: a read-write ext4 filesystem, even frozen, still
+    writes its superblock and journal to the disk.
+
+    Args:
+        vm: The VM with the read-only mounted hotplugged disks.
+
+    Returns:
+        dict: Guest device path to its hash manifest.
+    """
+    return {device: get_disk_hash_manifest(vm=vm, device_path=device) for device in HOTPLUGGED_DEVICES}
+
+
+def verify_hotplugged_disks_integrity(
+    vm: VirtualMachineForTests, manifests_before_migration: dict[str, DiskHashManifest]
+) -> None:
+    """Verify that the whole content of the hotplugged disks did not change.
+
+    Args:
+        vm: The VM with the read-only mounted hotplugged disks.
+        manifests_before_migration: Hash manifests taken before the storage migration.
+
+    Raises:
+        AssertionError: If any disk content differs, with the differing byte ranges.
+    """
+    manifests_after_migration = get_hotplugged_disks_hash_manifests(vm=vm)
+    for device, manifest_before_migration in manifests_before_migration.items():
+        assert_disk_hash_manifests_equal(source=manifest_before_migration, target=manifests_after_migration[device])
+
+
 def wait_for_storage_migration_completed(
     mig_migration: MultiNamespaceVirtualMachineStorageMigration, timeout: int = TIMEOUT_10MIN
 ) -> None:
@@ -20,13 +20,14 @@ from ocp_resources.virtual_machine_snapshot import VirtualMachineSnapshot
 from pytest_testconfig import config as py_config
 
 from tests.storage.constants import TEST_FILE_CONTENT, TEST_FILE_NAME
-from tests.storage.vm_export.utils import create_blank_dv_by_specific_user, get_manifest_from_vmexport, get_manifest_url
+from tests.storage.vm_export.utils import create_blank_dv_by_specific_user, get_manifest_from_vmexport
 from utilities.constants.images import OS_FLAVOR_RHEL
 from utilities.constants.instance_types import PREFERENCE_STR, U1_SMALL
 from utilities.constants.pytest import UNPRIVILEGED_PASSWORD, UNPRIVILEGED_USER
 from utilities.infra import create_ns, login_with_user_password
 from utilities.storage import data_volume_template_with_source_ref_dict, write_file_via_ssh
 from utilities.virt import VirtualMachineForTests, running_vm
+from utilities.vm_export import VMExportClient
 
 
 @pytest.fixture()
@@ -76,21 +77,22 @@ def vmexport_external_cert_file(tmpdir, vmexport_from_vmsnapshot, vmexport_from_
 
 
 @pytest.fixture()
-def secret_headers_for_vmexport_from_vmsnapshot(
-    vmexport_from_vmsnapshot,
-    vmexport_from_vmsnapshot_external_links,
-    vmexport_external_cert_file,
-    token_for_vmexport_from_vmsnapshot,
-    namespace_vmexport_target,
+def vmexport_from_vmsnapshot_client(
+    vmexport_from_vmsnapshot_external_links, vmexport_external_cert_file, token_for_vmexport_from_vmsnapshot
 ):
-    secret_manifest_url = get_manifest_url(
-        vmexport_external_links=vmexport_from_vmsnapshot_external_links,
-        manifest_type="auth-header-secret",
-    )
-    secret_yaml_file = get_manifest_from_vmexport(
-        vmexport_cert_file=vmexport_external_cert_file,
-        url=secret_manifest_url,
+    with VMExportClient(
+        external_links=vmexport_from_vmsnapshot_external_links,
         token=token_for_vmexport_from_vmsnapshot,
+        ca_cert_file=vmexport_external_cert_file,
+    ) as vmexport_client:
+        yield vmexport_client
+
+
+@pytest.fixture()
+def secret_headers_for_vmexport_from_vmsnapshot(vmexport_from_vmsnapshot_client, namespace_vmexport_target):
+    secret_yaml_file = get_manifest_from_vmexport(
+        vmexport_client=vmexport_from_vmsnapshot_client,
+        url=vmexport_from_vmsnapshot_client.get_manifest_url(manifest_type="auth-header-secret"),
         kind=Secret.kind,
     )
     with Secret(
@@ -105,24 +107,19 @@ def namespace_vmexport_target(admin_client):
 
 
 @pytest.fixture()
-def vmexport_from_vmsnapshot_manifest_url(vmexport_from_vmsnapshot_external_links):
-    yield get_manifest_url(
-        vmexport_external_links=vmexport_from_vmsnapshot_external_links,
-        manifest_type="all",
-    )
+def vmexport_from_vmsnapshot_manifest_url(vmexport_from_vmsnapshot_client):
+    yield vmexport_from_vmsnapshot_client.get_manifest_url(manifest_type="all")
 
 
 @pytest.fixture()
 def configmap_with_vmexport_external_cert_vmsnapshot(
-    vmexport_external_cert_file,
+    vmexport_from_vmsnapshot_client,
     vmexport_from_vmsnapshot_manifest_url,
-    token_for_vmexport_from_vmsnapshot,
     namespace_vmexport_target,
 ):
     configmap_yaml_file = get_manifest_from_vmexport(
-        vmexport_cert_file=vmexport_external_cert_file,
+        vmexport_client=vmexport_from_vmsnapshot_client,
         url=vmexport_from_vmsnapshot_manifest_url,
-        token=token_for_vmexport_from_vmsnapshot,
         kind=ConfigMap.kind,
     )
     with ConfigMap(
@@ -133,17 +130,15 @@ def configmap_with_vmexport_external_cert_vmsnapshot(
 
 @pytest.fixture()
 def vm_from_vmexport(
-    vmexport_external_cert_file,
+    vmexport_from_vmsnapshot_client,
     vmexport_from_vmsnapshot_manifest_url,
-    token_for_vmexport_from_vmsnapshot,
     namespace_vmexport_target,
     configmap_with_vmexport_external_cert_vmsnapshot,
     secret_headers_for_vmexport_from_vmsnapshot,
 ):
     vm_yaml_file = get_manifest_from_vmexport(
-        vmexport_cert_file=vmexport_external_cert_file,
+        vmexport_client=vmexport_from_vmsnapshot_client,
         url=vmexport_from_vmsnapshot_manifest_url,
-        token=token_for_vmexport_from_vmsnapshot,
         kind=VirtualMachine.kind,
         namespace_vmexport_target=namespace_vmexport_target.name,
     )
@@ -199,6 +194,15 @@ def vmexport_download_path(tmp_path):
     yield str(temp_path / "disk.img")
 
 
+@pytest.fixture()
+def vmexport_from_vmsnapshot_downloaded_volume(tmp_path, vmexport_from_vmsnapshot_client):
+    volume_path = str(tmp_path / "disk.img.gz")
+    vmexport_from_vmsnapshot_client.download_volume(
+        url=vmexport_from_vmsnapshot_client.get_volume_url(volume_format="gzip"), destination=volume_path
+    )
+    yield volume_path
+
+
 @pytest.fixture()
 def rhel_vm_for_snapshot_with_content(
     unprivileged_client,
@@ -11,6 +11,7 @@ from ocp_resources.resource import Resource
 from ocp_resources.virtual_machine_export import VirtualMachineExport
 
 from tests.storage.constants import TEST_FILE_CONTENT, TEST_FILE_NAME
+from tests.storage.vm_export.utils import assert_gzip_file_integrity
 from utilities.infra import run_virtctl_command
 from utilities.storage import run_command_on_vm_and_check_output
 from utilities.virt import running_vm
@@ -67,6 +68,24 @@ def test_vmexport_snapshot_manifests(
     )
 
 
+@pytest.mark.s390x
+def test_vmexport_snapshot_volume_download(vmexport_from_vmsnapshot_downloaded_volume):
+    """
+    Test that the exported snapshot volume is downloaded completely through the export link.
+
+    Preconditions:
+        - VMExport of a RHEL VM snapshot
+        - gzip volume downloaded with VMExportClient (ranged parallel requests when supported by the server)
+
+    Steps:
+        1. Decompress the downloaded volume
+
+    Expected:
+        - The gzip CRC32 and size trailer match the decompressed content
+    """
+    assert_gzip_file_integrity(file_path=vmexport_from_vmsnapshot_downloaded_volume)
+
+
 @pytest.mark.s390x
 @pytest.mark.polarion("CNV-11597")
 def test_virtctl_vmexport_unprivileged(
@@ -2,9 +2,9 @@
 Pytest utils file for CNV VMExport tests
 """
 
+import gzip
 import io
 import logging
-import shlex
 from collections.abc import Generator
 from contextlib import contextmanager
 
@@ -12,24 +12,29 @@ import yaml
 from kubernetes.dynamic import DynamicClient
 from ocp_resources.datavolume import DataVolume
 from ocp_resources.virtual_machine import VirtualMachine
-from pyhelper_utils.shell import run_command
 from pytest_testconfig import config as py_config
 
 from utilities.constants.storage import BIND_IMMEDIATE_ANNOTATION
 from utilities.constants.timeouts import TIMEOUT_1MIN
 from utilities.storage import create_dv
+from utilities.vm_export import VMExportClient
 
 LOGGER = logging.getLogger(__name__)
 
+GZIP_READ_SIZE = 16 * 1024 * 1024
 
-def get_manifest_from_vmexport(vmexport_cert_file, url, token, kind, namespace_vmexport_target=None):
-    cmd = f"curl --cacert {vmexport_cert_file} {url} -H 'x-kubevirt-export-token:{token}' -H 'Accept:application/yaml'"
-    out_value = run_command(command=shlex.split(cmd), verify_stderr=False, check=False)[1]
-    yaml_file_dict = {}
-    for object_dict in yaml.safe_load_all(out_value):
-        if object_dict.get("kind") == kind:
-            yaml_file_dict = object_dict
-            break
+
+def get_manifest_from_vmexport(
+    vmexport_client: VMExportClient, url: str, kind: str, namespace_vmexport_target: str | None = None
+) -> io.StringIO:
+    yaml_file_dict = next(
+        (
+            resource_dict
+            for resource_dict in vmexport_client.get_manifests(url=url)
+            if resource_dict.get("kind") == kind
+        ),
+        {},
+    )
     assert yaml_file_dict, f"Manifest for '{kind}' not found"
     if kind == VirtualMachine.kind:
         del yaml_file_dict["metadata"]["namespace"]
@@ -37,12 +42,22 @@ def get_manifest_from_vmexport(vmexport_cert_file, url, token, kind, namespace_v
     return io.StringIO(yaml.dump(yaml_file_dict))
 
 
-def get_manifest_url(vmexport_external_links, manifest_type):
-    url = (
-        next(manifest for manifest in vmexport_external_links.get("manifests") if manifest["type"] == manifest_type)
-    ).get("url")
-    assert url, f"Manifest url '{manifest_type}' in vmexport external links {vmexport_external_links} not found"
-    return url
+def assert_gzip_file_integrity(file_path: str) -> None:
+    """
+    Verify that a gzip file is complete by decompressing it, which validates its CRC32 and size trailer.
+
+    Args:
+        file_path: Local gzip file path.
+
+    Raises:
+        AssertionError: If the file is truncated or corrupted.
+    """
+    try:
+        with gzip.open(file_path, "rb") as gzip_file:
+            while gzip_file.read(GZIP_READ_SIZE):
+                pass
+    except (OSError, EOFError) as error:
+        raise AssertionError(f"Downloaded volume {file_path} is corrupted: {error}") from error
 
 
 @contextmanager
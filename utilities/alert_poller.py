@@ -0,0 +1,222 @@
+"""
+Shared Prometheus alert poller.
+
+All alert waits of a session read the same alert list, fetched from Prometheus at most once per poll interval
+whatever the number of active waits, and indexed by alert name. Every fetch is compared with the previous one, to
+keep a timeline of the alert state transitions for reports.
+"""
+
+import datetime
+import json
+import logging
+import threading
+import time
+import weakref
+from typing import TYPE_CHECKING, Any
+
+from timeout_sampler import TimeoutSampler
+
+from utilities.constants.monitoring import FIRING_STATE
+from utilities.constants.timeouts import TIMEOUT_5SEC
+from utilities.data_collector import write_to_file
+
+if TYPE_CHECKING:
+    from ocp_utilities.monitoring import Prometheus
+
+LOGGER = logging.getLogger(__name__)
+
+ALERT_TIMELINE_FILE = "alert_timeline.json"
+INACTIVE_STATE = "inactive"
+
+
+def _alert_key(alert: dict[str, Any]) -> str:
+    return json.dumps(alert["labels"], sort_keys=True)
+
+
+class AlertPoller:
+    def __init__(self, prometheus: Prometheus, interval: int = TIMEOUT_5SEC) -> None:
+        """
+        Alert list shared by all alert waits, fetched at most once per `interval` seconds.
+
+        Args:
+            prometheus: Prometheus instance.
+            interval: Minimum time in seconds between two alert list fetches.
+        """
+        self.prometheus = prometheus
+        self.interval = interval
+        self.requests = 0
+        self.timeline: list[dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._fetched_at: float | None = None
+        self._alerts_by_name: dict[str, list[dict[str, Any]]] = {}
+        self._states: dict[str, str] = {}
+
+    def _record_transitions(self, alerts: list[dict[str, Any]]) -> None:
+        timestamp = datetime.datetime.now(tz=datetime.UTC).isoformat()
+        states = {_alert_key(alert=alert): alert["state"] for alert in alerts}
+        labels = {_alert_key(alert=alert): alert["labels"] for alert in alerts}
+        for key in states.keys() | self._states.keys():
+            from_state = self._states.get(key, INACTIVE_STATE if self._fetched_at is not None else None)
+            to_state = states.get(key, INACTIVE_STATE)
+            if from_state != to_state:
+                alert_labels = labels.get(key) or json.loads(key)
+                self.timeline.append({
+                    "time": timestamp,
+                    "alertname": alert_labels.get("alertname"),
+                    "labels": alert_labels,
+                    "from": from_state,
+                    "to": to_state,
+                })
+        self._states = states
+
+    def refresh(self) -> None:
+        """
+        Fetch the alert list, unless it was fetched less than `interval` seconds ago.
+        """
+        with self._lock:
+            if self._fetched_at is not None and time.monotonic() - self._fetched_at < self.interval:
+                return
+
+            alerts = self.prometheus.alerts()["data"]["alerts"]
+            self.requests += 1
+            alerts_by_name: dict[str, list[dict[str, Any]]] = {}
+            for alert in alerts:
+                alerts_by_name.setdefault(alert["labels"]["alertname"], []).append(alert)
+            self._record_transitions(alerts=alerts)
+            self._alerts_by_name = alerts_by_name
+            self._fetched_at = time.monotonic()
+
+    def get_all_alerts(self) -> list[dict[str, Any]]:
+        """
+        Get all the active alerts.
+
+        Returns:
+            list[dict[str, Any]]: Active alerts.
+        """
+        self.refresh()
+        return [alert for alerts in self._alerts_by_name.values() for alert in alerts]
+
+    def get_alerts(
+        self, alert_name: str, state: str | None = None, labels: dict[str, str] | None = None
+    ) -> list[dict[str, Any]]:
+        """
+        Get the active alerts by name.
+
+        Args:
+            alert_name: Alert name.
+            state: Alert state, e.g. `firing` or `pending`; any state when not set.
+            labels: Labels the alerts must have; any labels when not set.
+
+        Returns:
+            list[dict[str, Any]]: Matching alerts.
+        """
+        self.refresh()
+        return [
+            alert
+            for alert in self._alerts_by_name.get(alert_name, [])
+            if (state is None or alert["state"] == state)
+            and all(alert["labels"].get(label) == value for label, value in (labels or {}).items())
+        ]
+
+    def wait_for_alerts(
+        self,
+        alert_name: str,
+        timeout: int,
+        state: str | None = None,
+        labels: dict[str, str] | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Wait until matching alerts are active.
+
+        Args:
+            alert_name: Alert name.
+            timeout: Wait timeout in seconds.
+            state: Alert state, e.g. `firing` or `pending`; any state when not set.
+            labels: Labels the alerts must have; any labels when not set.
+
+        Returns:
+            list[dict[str, Any]]: Matching alerts.
+
+        Raises:
+            TimeoutExpiredError: If no matching alert is active within the timeout.
+        """
+        for sample in TimeoutSampler(
+            wait_timeout=timeout,
+            sleep=self.interval,
+            func=self.get_alerts,
+            alert_name=alert_name,
+            state=state,
+            labels=labels,
+        ):
+            if sample:
+                LOGGER.info(f"Found alert: {alert_name} in {state or 'any'} state.")
+                return sample
+        return []
+
+    def wait_for_alert_resolved(self, alert_name: str, timeout: int, state: str = FIRING_STATE) -> None:
+        """
+        Wait until no alert with the name is in the state.
+
+        Args:
+            alert_name: Alert name.
+            timeout: Wait timeout in seconds.
+            state: Alert state.
+
+        Raises:
+            TimeoutExpiredError: If an alert is still in the state after the timeout.
+        """
+        for sample in TimeoutSampler(
+            wait_timeout=timeout,
+            sleep=self.interval,
+            func=self.get_alerts,
+            alert_name=alert_name,
+            state=state,
+        ):
+            if not sample:
+                return
+
+    def write_timeline(self, base_directory: str) -> None:
+        """
+        Write the alert state transitions to `alert_timeline.json`.
+
+        Args:
+            base_directory: Directory of the timeline file.
+        """
+        LOGGER.info(f"Alert poller fetched the alert list {self.requests} times, {len(self.timeline)} transitions")
+        write_to_file(
+            file_name=ALERT_TIMELINE_FILE, content=json.dumps(self.timeline, indent=2), base_directory=base_directory
+        )
+
+
+_alert_pollers: weakref.WeakKeyDictionary[Any, AlertPoller] = weakref.WeakKeyDictionary()
+_alert_pollers_lock = threading.Lock()
+
+
+def get_alert_poller(prometheus: Prometheus) -> AlertPoller:
+    """
+    Get the alert poller shared by all alert waits on a Prometheus instance.
+
+    Args:
+        prometheus: Prometheus instance.
+
+    Returns:
+        AlertPoller: Alert poller of the Prometheus instance.
+    """
+    with _alert_pollers_lock:
+        if prometheus not in _alert_pollers:
+            _alert_pollers[prometheus] = AlertPoller(prometheus=prometheus)
+        return _alert_pollers[prometheus]
+
+
+def write_alert_timeline(prometheus: Prometheus, base_directory: str) -> None:
+    """
+    Write the alert state transitions of a Prometheus instance, when its alerts were polled.
+
+    Args:
+        prometheus: Prometheus instance.
+        base_directory: Directory of the timeline file.
+    """
+    with _alert_pollers_lock:
+        alert_poller = _alert_pollers.get(prometheus)
+    if alert_poller and alert_poller.requests:
+        alert_poller.write_timeline(base_directory=base_directory)
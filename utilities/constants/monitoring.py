@@ -14,6 +14,7 @@ WARNING_STR = "warning"
 NONE_STRING = "none"
 
 KUBEVIRT_HYPERCONVERGED_OPERATOR_HEALTH_STATUS = "kubevirt_hyperconverged_operator_health_status"
+KUBEVIRT_HCO_SYSTEM_HEALTH_STATUS = "kubevirt_hco_system_health_status"
 KUBEVIRT_HCO_HYPERCONVERGED_CR_EXISTS = "kubevirt_hco_hyperconverged_cr_exists"
 
 OPERATOR_HEALTH_IMPACT_VALUES = {
@@ -0,0 +1,197 @@
+"""
+Control plane resource usage per test.
+
+The time window of every test is recorded during the session. At the end of the session, Prometheus is queried for
+the CPU time and the working set memory change of every container of the control plane namespace (virt-controller,
+virt-handler, virt-api, CDI, HCO, ...) over each window. The usage per test and per container, the totals per container
+and the tests ranked by CPU time and memory growth are written to a report.
+
+Windows shorter than two scrape intervals are widened to two scrape intervals ending at the end of the test, as
+`increase` needs two samples.
+"""
+
+import json
+import logging
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from utilities.data_collector import write_to_file
+from utilities.metric_transitions import query_range
+
+if TYPE_CHECKING:
+    from utilities.prometheus_client import PrometheusClient
+
+LOGGER = logging.getLogger(__name__)
+
+CONTROL_PLANE_PROFILE_FILE = "control_plane_profile.json"
+# Number of most expensive tests logged at the end of the session
+CONTROL_PLANE_PROFILE_LOGGED_TESTS = 10
+CONTROL_PLANE_PROFILE_WORKERS = 4
+CONTAINER_SELECTOR = '{{namespace="{namespace}",container!="",container!="POD"}}'
+CONTAINER_CPU_SECONDS_QUERY = (
+    f"sum by (container) (increase(container_cpu_usage_seconds_total{CONTAINER_SELECTOR}[{{window}}s]))"
+)
+CONTAINER_MEMORY_QUERY = f"sum by (container) (container_memory_working_set_bytes{CONTAINER_SELECTOR})"
+
+
+@dataclass
+class ControlPlaneUsage:
+    """Control plane resource usage during a test, per container."""
+
+    node_id: str
+    start: int
+    end: int
+    cpu_seconds: dict[str, float] = field(default_factory=dict)
+    memory_delta_bytes: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def total_cpu_seconds(self) -> float:
+        return sum(self.cpu_seconds.values())
+
+    @property
+    def total_memory_delta_bytes(self) -> float:
+        return sum(self.memory_delta_bytes.values())
+
+    def to_report(self) -> dict[str, Any]:
+        return {
+            "test": self.node_id,
+            "start": self.start,
+            "end": self.end,
+            "total_cpu_seconds": round(self.total_cpu_seconds, 3),
+            "total_memory_delta_bytes": int(self.total_memory_delta_bytes),
+            "cpu_seconds": {container: round(value, 3) for container, value in sorted(self.cpu_seconds.items())},
+            "memory_delta_bytes": {
+                container: int(value) for container, value in sorted(self.memory_delta_bytes.items())
+            },
+        }
+
+
+class ControlPlaneProfiler:
+    def __init__(self, namespace: str) -> None:
+        """
+        Record the time window of every test, and profile the control plane resource usage over the windows.
+
+        Args:
+            namespace: Control plane namespace, e.g. openshift-cnv.
+        """
+        self.namespace = namespace
+        self.windows: dict[str, tuple[int, int]] = {}
+        self._test_started_at: int | None = None
+
+    def start_test(self) -> None:
+        self._test_started_at = int(time.time())
+
+    def finish_test(self, node_id: str, start_time: int | None = None) -> None:
+        """
+        Record the time window of a test.
+
+        Args:
+            node_id: Test node id.
+            start_time: Test start time recorded by the data collector database; the start of the test protocol when
+                not set.
+        """
+        if start := start_time or self._test_started_at:
+            self.windows[node_id] = (start, math.ceil(time.time()))
+        self._test_started_at = None
+
+    def _profile_window(self, prometheus: PrometheusClient, node_id: str, start: int, end: int) -> ControlPlaneUsage:
+        window = max(end - start, 2 * prometheus.scrape_interval)
+        usage = ControlPlaneUsage(node_id=node_id, start=start, end=end)
+        for series in query_range(
+            prometheus=prometheus,
+            query=CONTAINER_CPU_SECONDS_QUERY.format(namespace=self.namespace, window=window),
+            start=end,
+            end=end,
+            step=window,
+        ):
+            usage.cpu_seconds[series["metric"].get("container", "")] = float(series["values"][-1][1])
+
+        # Two steps: the working set at the start and at the end of the window
+        for series in query_range(
+            prometheus=prometheus,
+            query=CONTAINER_MEMORY_QUERY.format(namespace=self.namespace),
+            start=end - window,
+            end=end,
+            step=window,
+        ):
+            values = {round(float(timestamp)): float(value) for timestamp, value in series["values"]}
+            usage.memory_delta_bytes[series["metric"].get("container", "")] = values.get(end, 0.0) - values.get(
+                end - window, 0.0
+            )
+        return usage
+
+    def _try_profile_window(
+        self, prometheus: PrometheusClient, node_id: str, window: tuple[int, int]
+    ) -> ControlPlaneUsage | None:
+        try:
+            return self._profile_window(prometheus=prometheus, node_id=node_id, start=window[0], end=window[1])
+        except Exception as exp:
+            LOGGER.warning(f"Failed to profile the control plane usage of {node_id}: {exp}")
+            return None
+
+    def profile(self, prometheus: PrometheusClient) -> list[ControlPlaneUsage]:
+        """
+        Query the control plane resource usage over the recorded test windows.
+
+        Args:
+            prometheus: Prometheus client.
+
+        Returns:
+            list[ControlPlaneUsage]: Usage per test, in test order; tests whose queries failed are skipped.
+        """
+        with ThreadPoolExecutor(max_workers=CONTROL_PLANE_PROFILE_WORKERS) as executor:
+            usages = executor.map(
+                lambda node_id: self._try_profile_window(
+                    prometheus=prometheus, node_id=node_id, window=self.windows[node_id]
+                ),
+                self.windows,
+            )
+            return [usage for usage in usages if usage]
+
+    def write(self, prometheus: PrometheusClient, base_directory: str) -> None:
+        """
+        Write the control plane profile of the session, and log the most expensive tests.
+
+        Args:
+            prometheus: Prometheus client.
+            base_directory: Directory of the report.
+        """
+        usages = self.profile(prometheus=prometheus)
+        components: dict[str, dict[str, float]] = {}
+        for usage in usages:
+            for container, cpu_seconds in usage.cpu_seconds.items():
+                component = components.setdefault(container, {"cpu_seconds": 0.0, "memory_delta_bytes": 0.0})
+                component["cpu_seconds"] += cpu_seconds
+            for container, memory_delta_bytes in usage.memory_delta_bytes.items():
+                component = components.setdefault(container, {"cpu_seconds": 0.0, "memory_delta_bytes": 0.0})
+                component["memory_delta_bytes"] += memory_delta_bytes
+
+        by_cpu = sorted(usages, key=lambda usage: usage.total_cpu_seconds, reverse=True)
+        by_memory = sorted(usages, key=lambda usage: usage.total_memory_delta_bytes, reverse=True)
+        for usage in by_cpu[:CONTROL_PLANE_PROFILE_LOGGED_TESTS]:
+            LOGGER.info(
+                f"Control plane usage of {usage.node_id}: {usage.total_cpu_seconds:.1f} CPU seconds, "
+                f"{usage.total_memory_delta_bytes / 2**20:+.1f} MiB working set"
+            )
+        write_to_file(
+            file_name=CONTROL_PLANE_PROFILE_FILE,
+            content=json.dumps(
+                {
+                    "namespace": self.namespace,
+                    "components": {
+                        container: {
+                            "cpu_seconds": round(totals["cpu_seconds"], 3),
+                            "memory_delta_bytes": int(totals["memory_delta_bytes"]),
+                        }
+                        for container, totals in sorted(components.items())
+                    },
+                    "tests_by_cpu": [usage.to_report() for usage in by_cpu],
+                    "tests_by_memory": [usage.node_id for usage in by_memory],
+                },
+                indent=2,
+            ),
+            base_directory=base_directory,
+        )
@@ -7,12 +7,12 @@ from functools import cache
 from _pytest.nodes import Collector
 from ocp_resources.namespace import Namespace
 from ocp_resources.virtual_machine import VirtualMachine
-from ocp_utilities.monitoring import Prometheus
 from pytest import Item
 from pytest_testconfig import config as py_config
 
 import utilities.hco
 import utilities.infra
+import utilities.prometheus_client
 from utilities.constants.timeouts import TIMEOUT_20MIN
 from utilities.must_gather import run_must_gather
 
@@ -103,10 +103,7 @@ def write_to_file(file_name, content, base_directory, mode="w"):
 def collect_alerts_data():
     base_dir = get_data_collector_dir()
     LOGGER.warning(f"Collecting alert data under: {base_dir}")
-    alerts = Prometheus(
-        verify_ssl=False,
-        bearer_token=utilities.infra.get_prometheus_k8s_token(duration="900s"),
-    ).alerts()
+    alerts = utilities.prometheus_client.get_prometheus_client().alerts()
     write_to_file(
         base_directory=base_dir,
         file_name="firing_alerts.json",
@@ -1,16 +1,22 @@
 import datetime
 import logging
+import threading
+from sqlite3 import Connection
 
 from _pytest.nodes import Collector
 from pytest import Item
-from sqlalchemy import Integer, String, create_engine
+from sqlalchemy import Integer, String, create_engine, delete, event, func, inspect, select
+from sqlalchemy.dialects.sqlite import insert
 from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
+from sqlalchemy.schema import CreateIndex
 
 from utilities.data_collector import get_data_collector_base, get_scope_identifier
 
 LOGGER = logging.getLogger(__name__)
 
 CNV_TEST_DB = "cnvtests.db"
+# Seconds a writer waits for the database lock held by another process (e.g. pytest-xdist workers)
+DATABASE_BUSY_TIMEOUT = 30
 
 
 class Base(DeclarativeBase):
@@ -21,35 +27,120 @@ class CnvTestTable(Base):
     __tablename__ = "CnvTestTable"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True, nullable=False)
-    test_name: Mapped[str] = mapped_column(String(500))
+    test_name: Mapped[str] = mapped_column(String(500), unique=True, index=True)
     start_time: Mapped[int] = mapped_column(Integer, nullable=False)
 
 
 class Database:
     def __init__(
-        self, database_file_name: str = CNV_TEST_DB, verbose: bool = True, base_dir: str | None = None
+        self, database_file_name: str = CNV_TEST_DB, verbose: bool = False, base_dir: str | None = None
     ) -> None:
+        """
+        Session-wide store of test/class/module start times.
+
+        One engine is used for the whole session. Start times are buffered and written in one upsert statement
+        by `flush`, which is called at test boundaries; reads are served from an in-memory cache and fall back
+        to the database for entries written by other processes. The database runs in WAL mode with a busy
+        timeout, so concurrent writers from several processes do not fail on a locked database.
+
+        Args:
+            database_file_name (str): Database file name, under the data collector base directory.
+            verbose (bool): Log the SQL statements.
+            base_dir (str | None): Data collector base directory.
+        """
         self.database_file_path = f"{get_data_collector_base(base_dir=base_dir)}{database_file_name}"
         self.connection_string = f"sqlite:///{self.database_file_path}"
         self.verbose = verbose
-        self.engine = create_engine(url=self.connection_string, echo=self.verbose)
+        self.engine = create_engine(
+            url=self.connection_string, echo=self.verbose, connect_args={"timeout": DATABASE_BUSY_TIMEOUT}
+        )
+        event.listen(self.engine, "connect", self._set_sqlite_pragmas)
         Base.metadata.create_all(bind=self.engine)
+        self._create_test_name_index()
+        self._start_times: dict[str, int] = {}
+        self._pending_start_times: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _set_sqlite_pragmas(dbapi_connection: Connection, connection_record: object) -> None:
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+
+    def _create_test_name_index(self) -> None:
+        """
+        Create the test name unique index on a database created before test names were unique.
+
+        `create_all` does not alter existing tables, and `flush` needs the index for its upsert. Duplicate test names
+        are removed first, keeping the earliest inserted entry.
+        """
+        (test_name_index,) = CnvTestTable.__table__.indexes
+        with self.engine.begin() as connection:
+            if inspect(connection).has_index(table_name=CnvTestTable.__tablename__, index_name=test_name_index.name):
+                return
+
+            LOGGER.info(f"Creating index {test_name_index.name} in {self.database_file_path}")
+            connection.execute(
+                delete(CnvTestTable).where(
+                    CnvTestTable.id.not_in(select(func.min(CnvTestTable.id)).group_by(CnvTestTable.test_name))
+                )
+            )
+            # Another process may create it concurrently
+            connection.execute(CreateIndex(element=test_name_index, if_not_exists=True))
 
     def insert_start_time(self, name: str, start_time: int) -> None:
         """
-        Insert start time only if it doesn't exist.
+        Buffer the start time only if it doesn't exist; written to the database by `flush`.
 
         Args:
             name (str): Test/class/module identifier.
             start_time (int): Start time in seconds since epoch.
         """
-        with Session(bind=self.engine) as db_session:
-            existing_entry = db_session.query(CnvTestTable).filter_by(test_name=name).first()
+        with self._lock:
+            if name not in self._start_times:
+                self._start_times[name] = start_time
+                self._pending_start_times[name] = start_time
+
+    def flush(self) -> None:
+        """
+        Write the buffered start times in one transaction.
 
-            if not existing_entry:
-                new_entry = CnvTestTable(test_name=name, start_time=start_time)
-                db_session.add(new_entry)
+        Entries already written by another process are kept, and the cache is updated with the stored values.
+        """
+        with self._lock:
+            if not self._pending_start_times:
+                return
+
+            pending_start_times = self._pending_start_times
+            self._pending_start_times = {}
+            with Session(bind=self.engine) as db_session:
+                db_session.execute(
+                    insert(CnvTestTable)
+                    .values([
+                        {"test_name": name, "start_time": start_time}
+                        for name, start_time in pending_start_times.items()
+                    ])
+                    .on_conflict_do_nothing(index_elements=[CnvTestTable.test_name])
+                )
                 db_session.commit()
+                self._start_times.update(
+                    db_session
+                    .execute(
+                        select(CnvTestTable.test_name, CnvTestTable.start_time).where(
+                            CnvTestTable.test_name.in_(list(pending_start_times))
+                        )
+                    )
+                    .tuples()
+                    .all()
+                )
+
+    def close(self) -> None:
+        """
+        Flush the buffered start times and release the engine connections.
+        """
+        self.flush()
+        self.engine.dispose()
 
     def get_start_time(self, name: str) -> int | None:
         """
@@ -61,11 +152,15 @@ class Database:
         Returns:
             int | None: Start time in seconds since epoch, or None if not found.
         """
-        with Session(bind=self.engine) as db_session:
-            result = (
-                db_session.query(CnvTestTable).with_entities(CnvTestTable.start_time).filter_by(test_name=name).first()
-            )
-            return result[0] if result else None
+        with self._lock:
+            if name in self._start_times:
+                return self._start_times[name]
+
+            with Session(bind=self.engine) as db_session:
+                start_time = db_session.scalar(select(CnvTestTable.start_time).where(CnvTestTable.test_name == name))
+            if start_time is not None:
+                self._start_times[name] = start_time
+            return start_time
 
     def get_start_time_for_collection(self, node: Item | Collector) -> int:
         """
@@ -0,0 +1,134 @@
+"""
+Whole-disk integrity verification based on per-chunk digests.
+
+A guest computes one digest per fixed-size chunk of a disk in a single read pass (a manifest);
+two manifests are compared locally to find the exact byte ranges that differ.
+"""
+
+import logging
+from dataclasses import dataclass
+
+from pyhelper_utils.shell import run_ssh_commands
+
+from utilities.constants.timeouts import TIMEOUT_10MIN
+from utilities.virt import VirtualMachineForTests
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024
+# Executed by python3 in the guest: prints "<chunk size> <disk size>" followed by one blake2b digest per chunk.
+# Cached pages of the device are dropped first so that the digests reflect what is actually stored on the disk.
+GUEST_CHUNK_HASH_SCRIPT = """
+import hashlib, os, sys
+chunk_size = int(sys.argv[2])
+digests = []
+disk_size = 0
+with open(sys.argv[1], "rb", buffering=0) as disk:
+    os.posix_fadvise(disk.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+    while chunk := disk.read(chunk_size):
+        disk_size += len(chunk)
+        digests.append(hashlib.blake2b(chunk, digest_size=8).hexdigest())
+print(chunk_size, disk_size)
+print("\\n".join(digests))
+"""
+
+
+@dataclass(frozen=True)
+class DiskHashManifest:
+    chunk_size: int
+    disk_size: int
+    digests: tuple[str, ...]
+
+
+def parse_disk_hash_manifest(output: str) -> DiskHashManifest:
+    """
+    Parse the output of GUEST_CHUNK_HASH_SCRIPT.
+
+    Args:
+        output: Script output.
+
+    Returns:
+        DiskHashManifest: Parsed manifest.
+    """
+    chunk_size, disk_size, *digests = output.split()
+    return DiskHashManifest(chunk_size=int(chunk_size), disk_size=int(disk_size), digests=tuple(digests))
+
+
+def get_disk_hash_manifest(
+    vm: VirtualMachineForTests, device_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> DiskHashManifest:
+    """
+    Compute per-chunk digests of a guest disk or partition in one read pass.
+
+    The guest must have python3. The disk content should not change while it is hashed,
+    e.g. the filesystem on it is unmounted or frozen.
+
+    Args:
+        vm: Running Linux VM with SSH connectivity.
+        device_path: Guest block device or partition, e.g. /dev/vdb.
+        chunk_size: Chunk size in bytes.
+
+    Returns:
+        DiskHashManifest: Manifest of the disk.
+    """
+    LOGGER.info(f"Computing {chunk_size} bytes chunks digests of {device_path} on {vm.name}")
+    output = run_ssh_commands(
+        host=vm.ssh_exec,
+        commands=["sudo", "python3", "-c", GUEST_CHUNK_HASH_SCRIPT, device_path, str(chunk_size)],
+        timeout=TIMEOUT_10MIN,
+    )[0]
+    return parse_disk_hash_manifest(output=output)
+
+
+def get_disk_hash_manifest_diff(source: DiskHashManifest, target: DiskHashManifest) -> list[tuple[int, int]]:
+    """
+    Find the byte ranges that differ between two disk manifests.
+
+    Adjacent differing chunks are merged into one range; chunks present in only one manifest
+    (disks of different size) are reported as differing.
+
+    Args:
+        source: Manifest of the source disk.
+        target: Manifest of the target disk.
+
+    Returns:
+        list: (offset, length) in bytes of each differing range, empty if the disks are identical.
+
+    Raises:
+        ValueError: If the manifests were computed with different chunk sizes.
+    """
+    if source.chunk_size != target.chunk_size:
+        raise ValueError(f"Chunk size mismatch: source {source.chunk_size}, target {target.chunk_size}")
+
+    chunk_size = source.chunk_size
+    differing_ranges: list[tuple[int, int]] = []
+    for chunk_index in range(max(len(source.digests), len(target.digests))):
+        source_digest = source.digests[chunk_index] if chunk_index < len(source.digests) else None
+        target_digest = target.digests[chunk_index] if chunk_index < len(target.digests) else None
+        if source_digest == target_digest:
+            continue
+
+        offset = chunk_index * chunk_size
+        if differing_ranges and sum(differing_ranges[-1]) == offset:
+            differing_ranges[-1] = (differing_ranges[-1][0], differing_ranges[-1][1] + chunk_size)
+        else:
+            differing_ranges.append((offset, chunk_size))
+    return differing_ranges
+
+
+def assert_disk_hash_manifests_equal(source: DiskHashManifest, target: DiskHashManifest) -> None:
+    """
+    Assert that two disks have identical content.
+
+    Args:
+        source: Manifest of the source disk.
+        target: Manifest of the target disk.
+
+    Raises:
+        AssertionError: If sizes or content differ; the message lists the differing byte ranges.
+    """
+    differing_ranges = get_disk_hash_manifest_diff(source=source, target=target)
+    assert source.disk_size == target.disk_size and not differing_ranges, (
+        f"Disk content mismatch: source size {source.disk_size}, target size {target.disk_size}, "
+        f"differing (offset, length) ranges: {differing_ranges}"
+    )
@@ -138,6 +138,18 @@ class MigrationStuckSchedulingError(Exception):
         return f"Migration {self.migration_name} is stuck in Scheduling state."
 
 
+class GuestFileTransferError(Exception):
+    """Exception raised when a file transferred into a guest does not match its source."""
+
+    def __init__(self, destination: str, expected_sha256: str, actual_sha256: str) -> None:
+        self.destination = destination
+        self.expected_sha256 = expected_sha256
+        self.actual_sha256 = actual_sha256
+
+    def __str__(self) -> str:
+        return f"Checksum mismatch for {self.destination}: expected {self.expected_sha256}, got {self.actual_sha256}"
+
+
 def raise_multiple_exceptions(exceptions):
     """Raising multiple exceptions
 
@@ -0,0 +1,252 @@
+"""
+Background collection of failure data.
+
+When a test fails, its must-gather and namespace inspection job is queued with the collection window known at
+failure time, and runs in a bounded worker pool outside the test timeline. The session waits for all jobs before it ends
+and writes a report with the queue wait and gather duration of each job.
+
+Failures in a burst are coalesced: a failure whose collection window overlaps a job that has not started yet
+(and whose namespaces overlap the job namespaces) is merged into that job, which then covers the union of windows
+and namespaces. An index file links each failed test to the collection that covers it. The number of gathers and
+the total collected size per session are capped.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+import bitmath
+from kubernetes.dynamic import DynamicClient
+
+from utilities.data_collector import (
+    collect_default_cnv_must_gather_with_vm_gather,
+    get_data_collector_base_directory,
+    write_to_file,
+)
+from utilities.namespace_inspection import NamespaceInspectionResult, inspect_namespaces
+
+LOGGER = logging.getLogger(__name__)
+
+FAILURE_COLLECTION_WORKERS = 2
+FAILURE_COLLECTION_MAX_GATHERS = 10
+FAILURE_COLLECTION_MAX_SIZE = "20GiB"
+FAILURE_COLLECTION_DIR_NAME = "failure_collection"
+FAILURE_COLLECTION_REPORT_FILE = "failure_collection_report.json"
+FAILURE_COLLECTION_INDEX_FILE = "failure_collection_index.json"
+
+
+@dataclass
+class FailureCollectionJob:
+    target_dir: str
+    # Epoch seconds from which data is collected; converted to a relative --since when the job starts
+    since_timestamp: int
+    test_names: list[str] = field(default_factory=list)
+    inspect_namespaces: list[str] = field(default_factory=list)
+    queued_at: float = field(default_factory=time.time)
+    # Time of the last merged failure, end of the window known before the job starts
+    last_failure_at: float = field(default_factory=time.time)
+    started_at: float | None = None
+    finished_at: float | None = None
+    namespace_inspections: list[NamespaceInspectionResult] = field(default_factory=list)
+    size_bytes: int = 0
+    skipped: bool = False
+    error: str | None = None
+
+    @property
+    def queue_wait(self) -> float | None:
+        return round(self.started_at - self.queued_at, 2) if self.started_at else None
+
+    @property
+    def gather_duration(self) -> float | None:
+        return round(self.finished_at - self.started_at, 2) if self.started_at and self.finished_at else None
+
+    def can_merge(self, since_timestamp: int, inspect_namespaces: list[str]) -> bool:
+        """
+        Check whether a failure can be covered by this job.
+
+        Args:
+            since_timestamp: Start of the failure collection window, epoch seconds.
+            inspect_namespaces: Namespaces to inspect for the failure.
+
+        Returns:
+            bool: True if the job has not started, the windows overlap and the namespaces overlap
+                (a failure or job without namespaces to inspect only needs the must-gather).
+        """
+        namespaces_overlap = (
+            not inspect_namespaces
+            or not self.inspect_namespaces
+            or bool(set(inspect_namespaces) & set(self.inspect_namespaces))
+        )
+        return self.started_at is None and since_timestamp <= self.last_failure_at and namespaces_overlap
+
+    def to_report(self) -> dict[str, Any]:
+        return {**asdict(self), "queue_wait": self.queue_wait, "gather_duration": self.gather_duration}
+
+
+def get_directory_size(path: str) -> int:
+    """
+    Get the total size of the files under a directory.
+
+    Args:
+        path: Directory path; a missing directory has size 0.
+
+    Returns:
+        int: Size in bytes.
+    """
+    return sum(
+        os.path.getsize(os.path.join(root, file_name))
+        for root, _, file_names in os.walk(path)
+        for file_name in file_names
+        if not os.path.islink(os.path.join(root, file_name))
+    )
+
+
+class FailureCollectionQueue:
+    def __init__(
+        self,
+        max_workers: int = FAILURE_COLLECTION_WORKERS,
+        max_gathers: int = FAILURE_COLLECTION_MAX_GATHERS,
+        max_size: str = FAILURE_COLLECTION_MAX_SIZE,
+    ) -> None:
+        """
+        Bounded worker pool running coalesced failure collection jobs.
+
+        Args:
+            max_workers: Maximum number of concurrent collection jobs.
+            max_gathers: Maximum number of collection jobs per session; later failures that cannot be merged
+                into a pending job are not collected.
+            max_size: Maximum total size of collected data per session, e.g. "20GiB"; jobs starting after
+                it is reached are skipped.
+        """
+        self.max_gathers = max_gathers
+        self.max_size_bytes = int(bitmath.parse_string_unsafe(max_size).to_Byte().value)
+        self.jobs: list[FailureCollectionJob] = []
+        self.index: dict[str, str | None] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="failure-collection")
+
+    @property
+    def collected_bytes(self) -> int:
+        return sum(job.size_bytes for job in self.jobs)
+
+    def submit(
+        self, test_name: str, since_timestamp: int, inspect_namespaces: list[str], admin_client: DynamicClient
+    ) -> None:
+        """
+        Queue the data collection of a failed test; returns immediately.
+
+        The failure is merged into a pending job when possible, otherwise a new job is queued.
+
+        Args:
+            test_name: Failed test node id.
+            since_timestamp: Start of the collection window, epoch seconds.
+            inspect_namespaces: Namespaces to inspect, e.g. ["openshift-storage"].
+            admin_client: Client used to find the CNV must-gather image.
+        """
+        with self._lock:
+            if merge_job := next(
+                (
+                    job
+                    for job in self.jobs
+                    if job.can_merge(since_timestamp=since_timestamp, inspect_namespaces=inspect_namespaces)
+                ),
+                None,
+            ):
+                LOGGER.info(f"[DATA_COLLECTOR] Merged {test_name} into pending collection {merge_job.target_dir}")
+                merge_job.since_timestamp = min(merge_job.since_timestamp, since_timestamp)
+                merge_job.inspect_namespaces = sorted(set(merge_job.inspect_namespaces) | set(inspect_namespaces))
+                merge_job.test_names.append(test_name)
+                merge_job.last_failure_at = time.time()
+                self.index[test_name] = merge_job.target_dir
+                return
+
+            if len(self.jobs) >= self.max_gathers:
+                LOGGER.warning(
+                    f"[DATA_COLLECTOR] Reached {self.max_gathers} collections, not collecting data for {test_name}"
+                )
+                self.index[test_name] = None
+                return
+
+            job = FailureCollectionJob(
+                target_dir=os.path.join(
+                    get_data_collector_base_directory(), FAILURE_COLLECTION_DIR_NAME, f"collection-{len(self.jobs)}"
+                ),
+                since_timestamp=since_timestamp,
+                test_names=[test_name],
+                inspect_namespaces=sorted(set(inspect_namespaces)),
+            )
+            self.jobs.append(job)
+            self.index[test_name] = job.target_dir
+
+        LOGGER.info(f"[DATA_COLLECTOR] Queued failure data collection for {test_name} to {job.target_dir}")
+        self._executor.submit(self._run_job, job=job, admin_client=admin_client)
+
+    def _run_job(self, job: FailureCollectionJob, admin_client: DynamicClient) -> None:
+        with self._lock:
+            job.started_at = time.time()
+            if self.collected_bytes >= self.max_size_bytes:
+                job.skipped = True
+            since_time = int(job.started_at) - job.since_timestamp
+            namespaces = list(job.inspect_namespaces)
+
+        try:
+            if job.skipped:
+                LOGGER.warning(
+                    f"[DATA_COLLECTOR] Collected data reached {self.max_size_bytes} bytes, "
+                    f"not collecting data for {job.test_names}"
+                )
+                return
+
+            LOGGER.info(f"[DATA_COLLECTOR] Collecting data for {job.test_names}, last {since_time}s")
+            collect_default_cnv_must_gather_with_vm_gather(
+                since_time=since_time, target_dir=job.target_dir, admin_client=admin_client
+            )
+            if namespaces:
+                job.namespace_inspections = inspect_namespaces(
+                    admin_client=admin_client,
+                    namespaces=namespaces,
+                    since_seconds=since_time,
+                    target_dir=job.target_dir,
+                )
+        except Exception as exp:
+            job.error = str(exp)
+            LOGGER.warning(f"Failed to collect logs: {job.test_names}: {exp} {traceback.format_exc()}")
+        finally:
+            job.size_bytes = get_directory_size(path=job.target_dir)
+            job.finished_at = time.time()
+
+    def wait_for_completion(self) -> None:
+        """
+        Wait for all queued jobs and write the collection report and the failed tests index
+        to the data collector base directory.
+        """
+        if self.jobs:
+            LOGGER.info(f"[DATA_COLLECTOR] Waiting for {len(self.jobs)} failure data collection job(s)")
+        self._executor.shutdown(wait=True)
+        if not self.index:
+            return
+
+        base_directory = get_data_collector_base_directory()
+        write_to_file(
+            file_name=FAILURE_COLLECTION_REPORT_FILE,
+            content=json.dumps([job.to_report() for job in self.jobs], indent=2),
+            base_directory=base_directory,
+        )
+        skipped_dirs = {job.target_dir for job in self.jobs if job.skipped}
+        write_to_file(
+            file_name=FAILURE_COLLECTION_INDEX_FILE,
+            content=json.dumps(
+                {
+                    test_name: target_dir if target_dir not in skipped_dirs else None
+                    for test_name, target_dir in self.index.items()
+                },
+                indent=2,
+            ),
+            base_directory=base_directory,
+        )
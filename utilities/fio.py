@@ -0,0 +1,38 @@
+"""
+fio JSON output parsing.
+"""
+
+from typing import Any
+
+FIO_PERCENTILES = ("50", "95", "99")
+
+
+def parse_fio_results(fio_json: dict[str, Any]) -> dict[str, dict[str, Any]]:
+    """
+    Extract IOPS, bandwidth and latency percentiles per fio job.
+
+    For jobs issuing fsync, latency is taken from the sync statistics; otherwise completion latency is used.
+    fio reports the sync statistics of every job, with no I/O when the job did not sync.
+
+    Args:
+        fio_json: fio JSON output.
+
+    Returns:
+        dict: job name to {"iops", "bandwidth_kib", "latency_usec": {"p50", "p95", "p99"}}.
+    """
+    results = {}
+    for job in fio_json["jobs"]:
+        direction = "read" if job["read"]["io_bytes"] else "write"
+        direction_stats = job[direction]
+        sync_stats = job.get("sync", {})
+        latency_stats = sync_stats["lat_ns"] if sync_stats.get("total_ios") else direction_stats["clat_ns"]
+        percentiles = latency_stats.get("percentile", {})
+        results[job["jobname"]] = {
+            "iops": round(direction_stats["iops"], 2),
+            "bandwidth_kib": direction_stats["bw"],
+            "latency_usec": {
+                f"p{percentile}": round(percentiles.get(f"{percentile}.000000", 0) / 1000, 2)
+                for percentile in FIO_PERCENTILES
+            },
+        }
+    return results
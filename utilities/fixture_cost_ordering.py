@@ -0,0 +1,268 @@
+"""
+Cost-aware test ordering.
+
+Class, module, package and session scoped fixtures are reused by consecutive tests with the same parameters, and are
+torn down and set up again when the parameters change, or once the tests leave their class, module or package. Tests are reordered so that tests sharing expensive fixture
+instances run together, using the mean setup time of each fixture from a previous `fixture_timing_report.json`
+(see `--fixture-timing`).
+
+Ordering constraints are preserved:
+    - Tests are only reordered within a run of consecutive tests of the same module.
+    - Modules with tests marked with `order` or `dependency` are not reordered.
+    - Tests of the same class with the same class-or-wider scoped parameters keep their relative order.
+"""
+
+import json
+import logging
+from collections import defaultdict
+from typing import Any
+
+import pytest
+
+LOGGER = logging.getLogger(__name__)
+
+PINNED_ORDER_MARKERS = ("order", "dependency")
+REUSABLE_FIXTURE_SCOPES = ("class", "module", "package", "session")
+
+
+def load_fixture_setup_costs(fixture_timing_report: str) -> dict[str, float]:
+    """
+    Load the mean setup time per fixture name from a fixture timing report.
+
+    Args:
+        fixture_timing_report: Path to a `fixture_timing_report.json` of a previous session.
+
+    Returns:
+        dict[str, float]: Mean setup time in seconds per fixture name; the highest when a name has several scopes.
+    """
+    with open(fixture_timing_report) as fd:
+        report = json.load(fd)
+
+    setup_costs: dict[str, float] = {}
+    for entry in report:
+        setup_costs[entry["fixture"]] = max(setup_costs.get(entry["fixture"], 0.0), entry["mean"])
+    return setup_costs
+
+
+def _scope_node_id(item: pytest.Item, scope: str) -> str:
+    module_node_id = item.nodeid.split("::")[0]
+    if scope == "class" and item.cls:
+        return "::".join(item.nodeid.split("::")[:2])
+    if scope == "package":
+        return module_node_id.rpartition("/")[0]
+    if scope == "session":
+        return ""
+    return module_node_id
+
+
+def _get_fixture_scope(item: pytest.Item, argname: str) -> str | None:
+    fixturedefs = item._fixtureinfo.name2fixturedefs.get(argname)
+    return fixturedefs[-1].scope if fixturedefs else None
+
+
+def _get_fixture_instance_keys(item: pytest.Item, setup_costs: dict[str, float]) -> dict[str, tuple]:
+    """
+    Get the instance key of every reusable fixture of the item with a known setup cost.
+
+    Two items with the same instance key of a fixture share the fixture instance when they run one after the other.
+
+    Returns:
+        dict[str, tuple]: Instance key per fixture name: the scope node and the parameter indices the fixture
+            depends on.
+    """
+    name2fixturedefs = item._fixtureinfo.name2fixturedefs
+    param_indices = item.callspec.indices if hasattr(item, "callspec") else {}
+    param_dependencies: dict[str, set[str]] = {}
+
+    def _get_param_dependencies(argname: str) -> set[str]:
+        if argname not in param_dependencies:
+            param_dependencies[argname] = {argname} if argname in param_indices else set()
+            for dependency in name2fixturedefs[argname][-1].argnames if argname in name2fixturedefs else ():
+                param_dependencies[argname] |= _get_param_dependencies(argname=dependency)
+        return param_dependencies[argname]
+
+    instance_keys = {}
+    for argname in name2fixturedefs:
+        scope = _get_fixture_scope(item=item, argname=argname)
+        if scope in REUSABLE_FIXTURE_SCOPES and setup_costs.get(argname):
+            instance_keys[argname] = (
+                _scope_node_id(item=item, scope=scope),
+                tuple(sorted((param, param_indices[param]) for param in _get_param_dependencies(argname=argname))),
+            )
+    return instance_keys
+
+
+def _is_in_scope_node(item: pytest.Item, scope_node_id: str) -> bool:
+    if "::" in scope_node_id:
+        return item.nodeid.startswith(f"{scope_node_id}::")
+    module_node_id = item.nodeid.split("::")[0]
+    return not scope_node_id or module_node_id == scope_node_id or module_node_id.startswith(f"{scope_node_id}/")
+
+
+def _update_active_instances(
+    active_instances: dict[str, tuple], item: pytest.Item, instance_keys: dict[str, tuple]
+) -> None:
+    # pytest tears down the fixture instances of the classes, modules and packages the item is not part of
+    for argname, (scope_node_id, _) in list(active_instances.items()):
+        if not _is_in_scope_node(item=item, scope_node_id=scope_node_id):
+            del active_instances[argname]
+    active_instances.update(instance_keys)
+
+
+def _get_transition_cost(
+    active_instances: dict[str, tuple], instance_keys: dict[str, tuple], setup_costs: dict[str, float]
+) -> float:
+    return sum(
+        setup_costs[argname]
+        for argname, instance_key in instance_keys.items()
+        if active_instances.get(argname) != instance_key
+    )
+
+
+def get_order_setup_cost(
+    items: list[pytest.Item],
+    item_instance_keys: dict[str, dict[str, tuple]],
+    setup_costs: dict[str, float],
+    active_instances: dict[str, tuple] | None = None,
+) -> float:
+    """
+    Estimate the total setup time of the reusable fixtures when the items run in the given order.
+
+    Args:
+        items: Test items, in execution order.
+        item_instance_keys: Fixture instance keys per item node id.
+        setup_costs: Mean setup time per fixture name.
+        active_instances: Fixture instances active before the first item, updated in place.
+
+    Returns:
+        float: Estimated setup time in seconds.
+    """
+    active_instances = {} if active_instances is None else active_instances
+    total_cost = 0.0
+    for item in items:
+        instance_keys = item_instance_keys[item.nodeid]
+        total_cost += _get_transition_cost(
+            active_instances=active_instances, instance_keys=instance_keys, setup_costs=setup_costs
+        )
+        _update_active_instances(active_instances=active_instances, item=item, instance_keys=instance_keys)
+    return total_cost
+
+
+def _is_pinned(items: list[pytest.Item]) -> bool:
+    return any(item.get_closest_marker(name=marker) for item in items for marker in PINNED_ORDER_MARKERS)
+
+
+def _order_module_items(
+    items: list[pytest.Item],
+    item_instance_keys: dict[str, dict[str, tuple]],
+    setup_costs: dict[str, float],
+    active_instances: dict[str, tuple],
+) -> list[pytest.Item]:
+    # Items of a chain keep their relative order. The earliest chain head that reuses all the active fixture
+    # instances it needs runs next; when every head needs a new instance, the earliest head runs next.
+    chains: dict[tuple, list[tuple[int, pytest.Item]]] = defaultdict(list)
+    for index, item in enumerate(items):
+        reusable_params = tuple(
+            (param, param_index)
+            for param, param_index in (item.callspec.indices if hasattr(item, "callspec") else {}).items()
+            if _get_fixture_scope(item=item, argname=param) in REUSABLE_FIXTURE_SCOPES
+        )
+        chains[_scope_node_id(item=item, scope="class"), reusable_params].append((index, item))
+
+    chain_heads = [0] * len(chains)
+    chain_list = list(chains.values())
+    ordered_items = []
+    while len(ordered_items) < len(items):
+        heads = [
+            (chain[chain_heads[chain_index]][0], chain_index)
+            for chain_index, chain in enumerate(chain_list)
+            if chain_heads[chain_index] < len(chain)
+        ]
+        _, chain_index = min(
+            (
+                (index, chain_index)
+                for index, chain_index in heads
+                if not _get_transition_cost(
+                    active_instances=active_instances,
+                    instance_keys=item_instance_keys[chain_list[chain_index][chain_heads[chain_index]][1].nodeid],
+                    setup_costs=setup_costs,
+                )
+            ),
+            default=min(heads),
+        )
+        item = chain_list[chain_index][chain_heads[chain_index]][1]
+        chain_heads[chain_index] += 1
+        _update_active_instances(
+            active_instances=active_instances, item=item, instance_keys=item_instance_keys[item.nodeid]
+        )
+        ordered_items.append(item)
+    return ordered_items
+
+
+def order_items_by_fixture_cost(items: list[pytest.Item], setup_costs: dict[str, float]) -> dict[str, Any]:
+    """
+    Reorder the items in place to minimize the estimated setup time of the reusable fixtures.
+
+    Args:
+        items: Collected test items.
+        setup_costs: Mean setup time per fixture name, see `load_fixture_setup_costs`.
+
+    Returns:
+        dict[str, Any]: Estimated setup time of the default and the new order, and the number of reordered modules.
+    """
+    item_instance_keys = {item.nodeid: _get_fixture_instance_keys(item=item, setup_costs=setup_costs) for item in items}
+    default_cost = get_order_setup_cost(items=items, item_instance_keys=item_instance_keys, setup_costs=setup_costs)
+
+    module_runs: list[list[pytest.Item]] = []
+    for item in items:
+        if module_runs and module_runs[-1][0].nodeid.split("::")[0] == item.nodeid.split("::")[0]:
+            module_runs[-1].append(item)
+        else:
+            module_runs.append([item])
+
+    ordered_items = []
+    reordered_modules = 0
+    active_instances: dict[str, tuple] = {}
+    for module_items in module_runs:
+        module_ordered_items = module_items
+        if not _is_pinned(items=module_items):
+            candidate_items = _order_module_items(
+                items=module_items,
+                item_instance_keys=item_instance_keys,
+                setup_costs=setup_costs,
+                active_instances=dict(active_instances),
+            )
+            # Keep the default order unless the new order is estimated to be cheaper
+            if get_order_setup_cost(
+                items=candidate_items,
+                item_instance_keys=item_instance_keys,
+                setup_costs=setup_costs,
+                active_instances=dict(active_instances),
+            ) < get_order_setup_cost(
+                items=module_items,
+                item_instance_keys=item_instance_keys,
+                setup_costs=setup_costs,
+                active_instances=dict(active_instances),
+            ):
+                module_ordered_items = candidate_items
+                reordered_modules += 1
+
+        for item in module_ordered_items:
+            _update_active_instances(
+                active_instances=active_instances, item=item, instance_keys=item_instance_keys[item.nodeid]
+            )
+        ordered_items.extend(module_ordered_items)
+
+    items[:] = ordered_items
+    ordered_cost = get_order_setup_cost(items=items, item_instance_keys=item_instance_keys, setup_costs=setup_costs)
+    LOGGER.info(
+        f"Fixture cost ordering: estimated fixture setup time {round(ordered_cost, 1)}s instead of "
+        f"{round(default_cost, 1)}s, saving {round(default_cost - ordered_cost, 1)}s; "
+        f"{reordered_modules} modules reordered"
+    )
+    return {
+        "default_cost": round(default_cost, 3),
+        "ordered_cost": round(ordered_cost, 3),
+        "saved": round(default_cost - ordered_cost, 3),
+        "reordered_modules": reordered_modules,
+    }
@@ -0,0 +1,194 @@
+"""
+Fixture setup and teardown timing for a pytest session.
+
+Records the wall time of every fixture setup and teardown, and whether a test reused a cached fixture instance.
+At the end of the session, a report of the slowest fixtures (total, count, mean and p95 setup time per fixture) and a
+Chrome trace format timeline of the fixtures and tests are written. The timeline can be opened with
+chrome://tracing or https://ui.perfetto.dev.
+"""
+
+import json
+import logging
+import math
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from utilities.data_collector import write_to_file
+
+LOGGER = logging.getLogger(__name__)
+
+FIXTURE_TIMING_REPORT_FILE = "fixture_timing_report.json"
+SESSION_TRACE_FILE = "session_trace.json"
+# Number of slowest fixtures logged at the end of the session
+FIXTURE_TIMING_LOGGED_FIXTURES = 10
+
+
+@dataclass
+class FixtureTiming:
+    argname: str
+    scope: str
+    setup_durations: list[float] = field(default_factory=list)
+    teardown_duration: float = 0.0
+    cache_hits: int = 0
+
+    @property
+    def total(self) -> float:
+        return sum(self.setup_durations)
+
+    @property
+    def p95(self) -> float:
+        # Nearest-rank percentile
+        durations = sorted(self.setup_durations)
+        return durations[math.ceil(0.95 * len(durations)) - 1]
+
+    def to_report(self) -> dict[str, Any]:
+        return {
+            "fixture": self.argname,
+            "scope": self.scope,
+            "total": round(self.total, 3),
+            "count": len(self.setup_durations),
+            "mean": round(self.total / len(self.setup_durations), 3),
+            "p95": round(self.p95, 3),
+            "teardown_total": round(self.teardown_duration, 3),
+            "cache_hits": self.cache_hits,
+        }
+
+
+class FixtureTimingRecorder:
+    def __init__(self) -> None:
+        """
+        Record fixture setup and teardown timing, and the test timeline of a pytest session.
+
+        Setups are reported per fixture name and scope; a test that uses an already set up fixture instance counts as
+        a cache hit of that fixture.
+        """
+        self.started_at = time.perf_counter()
+        self.fixtures: dict[tuple[str, str], FixtureTiming] = {}
+        self.trace_events: list[dict[str, Any]] = []
+        self._pid = os.getpid()
+        self._teardown_started_at: dict[int, float] = {}
+        self._test_started_at: float | None = None
+        self._test_setups: set[str] = set()
+
+    def _timestamp(self, perf_counter: float) -> int:
+        # Chrome trace timestamps are in microseconds
+        return int((perf_counter - self.started_at) * 1_000_000)
+
+    def _add_trace_event(
+        self, name: str, category: str, start: float, end: float, args: dict[str, Any] | None = None
+    ) -> None:
+        self.trace_events.append({
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": self._timestamp(perf_counter=start),
+            "dur": self._timestamp(perf_counter=end) - self._timestamp(perf_counter=start),
+            "pid": self._pid,
+            "tid": 0,
+            "args": args or {},
+        })
+
+    def _fixture_timing(self, argname: str, scope: str) -> FixtureTiming:
+        return self.fixtures.setdefault((argname, scope), FixtureTiming(argname=argname, scope=scope))
+
+    def record_setup(self, argname: str, scope: str, node_id: str, start: float, end: float) -> None:
+        """
+        Record a fixture setup.
+
+        Args:
+            argname: Fixture name.
+            scope: Fixture scope.
+            node_id: Node id of the requesting node.
+            start: `time.perf_counter()` at the setup start.
+            end: `time.perf_counter()` at the setup end.
+        """
+        self._fixture_timing(argname=argname, scope=scope).setup_durations.append(end - start)
+        self._test_setups.add(argname)
+        self._add_trace_event(
+            name=argname, category="fixture_setup", start=start, end=end, args={"scope": scope, "node": node_id}
+        )
+
+    def start_teardown(self, fixture_id: int) -> None:
+        """
+        Mark the start of a fixture instance teardown.
+
+        Args:
+            fixture_id: Identity of the fixture definition.
+        """
+        self._teardown_started_at[fixture_id] = time.perf_counter()
+
+    def record_teardown(self, fixture_id: int, argname: str, scope: str) -> None:
+        """
+        Record the end of a fixture instance teardown started with `start_teardown`.
+
+        Args:
+            fixture_id: Identity of the fixture definition.
+            argname: Fixture name.
+            scope: Fixture scope.
+        """
+        start = self._teardown_started_at.pop(fixture_id, None)
+        if start is None:
+            return
+
+        end = time.perf_counter()
+        self._fixture_timing(argname=argname, scope=scope).teardown_duration += end - start
+        self._add_trace_event(name=argname, category="fixture_teardown", start=start, end=end, args={"scope": scope})
+
+    def start_test(self) -> None:
+        self._test_started_at = time.perf_counter()
+        self._test_setups = set()
+
+    def finish_test(self, node_id: str, fixture_names: list[str]) -> None:
+        """
+        Record a test span and the fixtures it reused without setting them up.
+
+        Args:
+            node_id: Test node id.
+            fixture_names: Names of the fixtures used by the test.
+        """
+        if self._test_started_at is None:
+            return
+
+        used_fixtures = set(fixture_names)
+        for fixture_timing in self.fixtures.values():
+            if fixture_timing.argname in used_fixtures and fixture_timing.argname not in self._test_setups:
+                fixture_timing.cache_hits += 1
+
+        self._add_trace_event(name=node_id, category="test", start=self._test_started_at, end=time.perf_counter())
+        self._test_started_at = None
+
+    def report(self) -> list[dict[str, Any]]:
+        """
+        Timing per fixture name and scope.
+
+        Returns:
+            list[dict[str, Any]]: Timing per fixture, sorted by total setup time, slowest first.
+        """
+        return [
+            fixture_timing.to_report()
+            for fixture_timing in sorted(self.fixtures.values(), key=lambda timing: timing.total, reverse=True)
+        ]
+
+    def write(self, base_directory: str) -> None:
+        """
+        Write the fixture timing report and the session trace, and log the slowest fixtures.
+
+        Args:
+            base_directory: Directory of the report and the trace.
+        """
+        report = self.report()
+        for entry in report[:FIXTURE_TIMING_LOGGED_FIXTURES]:
+            LOGGER.info(
+                f"Fixture {entry['fixture']} ({entry['scope']}): total {entry['total']}s, count {entry['count']}, "
+                f"mean {entry['mean']}s, p95 {entry['p95']}s, cache hits {entry['cache_hits']}"
+            )
+        write_to_file(
+            file_name=FIXTURE_TIMING_REPORT_FILE, content=json.dumps(report, indent=2), base_directory=base_directory
+        )
+        write_to_file(
+            file_name=SESSION_TRACE_FILE,
+            content=json.dumps({"traceEvents": self.trace_events, "displayTimeUnit": "ms"}),
+            base_directory=base_directory,
+        )
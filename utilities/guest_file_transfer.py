@@ -0,0 +1,164 @@
+"""
+Streaming file transfer into guests.
+
+Content is sent in chunks, so the payload size is not limited by the command line length:
+over the SSH channel (SFTP) for VMs with SSH connectivity, or over the serial console as base64 framed lines
+for VMs without network. The transferred file checksum is validated in the guest.
+"""
+
+import base64
+import hashlib
+import logging
+import os
+import shlex
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+
+import bitmath
+from pyhelper_utils.shell import run_ssh_commands
+
+from utilities.console import Console
+from utilities.constants.timeouts import TIMEOUT_1MIN
+from utilities.exceptions import GuestFileTransferError
+from utilities.virt import VirtualMachineForTests
+
+LOGGER = logging.getLogger(__name__)
+
+SSH_TRANSFER_CHUNK_SIZE = 1024 * 1024
+# 768 bytes are encoded to a 1024 characters base64 line, well below the guest tty line length limit (4096)
+CONSOLE_TRANSFER_CHUNK_SIZE = 768
+CONSOLE_PROMPT = [r"# ", r"\$ "]
+SHA256_PATTERN = r"[0-9a-f]{64}"
+
+
+@dataclass(frozen=True)
+class FileTransferResult:
+    destination: str
+    size: int
+    sha256: str
+    duration: float
+
+    @property
+    def throughput_mib_per_sec(self) -> float:
+        return round(bitmath.Byte(self.size).to_MiB().value / self.duration, 2) if self.duration else 0.0
+
+
+def _iter_source_chunks(source: str | Iterable[bytes], chunk_size: int) -> Iterator[bytes]:
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as source_file:
+            while chunk := source_file.read(chunk_size):
+                yield chunk
+    else:
+        for chunk in source:
+            # Re-split generator chunks, the console framing relies on a bounded line length
+            for offset in range(0, len(chunk), chunk_size):
+                yield chunk[offset : offset + chunk_size]
+
+
+def _build_transfer_result(destination: str, size: int, sha256: str, start_time: float) -> FileTransferResult:
+    result = FileTransferResult(
+        destination=destination, size=size, sha256=sha256, duration=time.monotonic() - start_time
+    )
+    LOGGER.info(
+        f"Transferred {result.size} bytes to {destination} in {result.duration:.2f}s "
+        f"({result.throughput_mib_per_sec} MiB/s)"
+    )
+    return result
+
+
+def stream_file_to_vm(
+    vm: VirtualMachineForTests,
+    source: str | Iterable[bytes],
+    destination: str,
+    chunk_size: int = SSH_TRANSFER_CHUNK_SIZE,
+) -> FileTransferResult:
+    """
+    Stream a local file or bytes chunks into a guest file over SFTP and validate its checksum.
+
+    The file is written as the VM SSH user, so the destination must be writable by that user.
+
+    Args:
+        vm: Running VM with SSH connectivity.
+        source: Local file path or an iterable (e.g. generator) of bytes chunks.
+        destination: Guest file path; an existing file is overwritten.
+        chunk_size: Size of the chunks read from a local file.
+
+    Returns:
+        FileTransferResult: Transfer size, checksum, duration and throughput.
+
+    Raises:
+        GuestFileTransferError: If the guest file checksum does not match the source.
+    """
+    LOGGER.info(f"Streaming file to {vm.name}:{destination} over SSH")
+    hasher = hashlib.sha256()
+    size = 0
+    start_time = time.monotonic()
+    with vm.ssh_exec.executor().session() as session, session.open_file(destination, "wb") as guest_file:
+        # Do not wait for the server acknowledgement of each write
+        guest_file.set_pipelined(True)
+        for chunk in _iter_source_chunks(source=source, chunk_size=chunk_size):
+            guest_file.write(chunk)
+            hasher.update(chunk)
+            size += len(chunk)
+    result = _build_transfer_result(
+        destination=destination, size=size, sha256=hasher.hexdigest(), start_time=start_time
+    )
+
+    guest_sha256 = run_ssh_commands(host=vm.ssh_exec, commands=["sha256sum", destination])[0].split()[0]
+    if guest_sha256 != result.sha256:
+        raise GuestFileTransferError(destination=destination, expected_sha256=result.sha256, actual_sha256=guest_sha256)
+    return result
+
+
+def stream_file_to_vm_via_console(
+    vm: VirtualMachineForTests,
+    source: str | Iterable[bytes],
+    destination: str,
+    chunk_size: int = CONSOLE_TRANSFER_CHUNK_SIZE,
+    kubeconfig: str | None = None,
+) -> FileTransferResult:
+    """
+    Stream a local file or bytes chunks into a guest file over the serial console and validate its checksum.
+
+    Fallback for VMs without SSH connectivity: each chunk is sent as one base64 encoded line which is decoded
+    and appended to the destination in the guest. This is much slower than stream_file_to_vm.
+
+    Args:
+        vm: Running Linux VM.
+        source: Local file path or an iterable (e.g. generator) of bytes chunks.
+        destination: Guest file path; an existing file is overwritten.
+        chunk_size: Size of the decoded data sent per console line.
+        kubeconfig: Optional path to kubeconfig file for remote cluster access.
+
+    Returns:
+        FileTransferResult: Transfer size, checksum, duration and throughput.
+
+    Raises:
+        GuestFileTransferError: If the guest file checksum does not match the source.
+    """
+    LOGGER.info(f"Streaming file to {vm.name}:{destination} over the serial console")
+    quoted_destination = shlex.quote(destination)
+    hasher = hashlib.sha256()
+    size = 0
+    start_time = time.monotonic()
+    with Console(vm=vm, prompt=CONSOLE_PROMPT, kubeconfig=kubeconfig) as vm_console:
+        vm_console.sendline(f": > {quoted_destination}")
+        vm_console.expect(CONSOLE_PROMPT)
+        for chunk in _iter_source_chunks(source=source, chunk_size=chunk_size):
+            vm_console.sendline(f"echo {base64.b64encode(chunk).decode()} | base64 -d >> {quoted_destination}")
+            vm_console.expect(CONSOLE_PROMPT)
+            hasher.update(chunk)
+            size += len(chunk)
+        result = _build_transfer_result(
+            destination=destination, size=size, sha256=hasher.hexdigest(), start_time=start_time
+        )
+
+        vm_console.sendline(f"sha256sum {quoted_destination}")
+        vm_console.expect(SHA256_PATTERN, timeout=TIMEOUT_1MIN)
+        guest_sha256 = vm_console.after
+        vm_console.expect(CONSOLE_PROMPT)
+
+    if guest_sha256 != result.sha256:
+        raise GuestFileTransferError(destination=destination, expected_sha256=result.sha256, actual_sha256=guest_sha256)
+    return result
@@ -576,7 +576,7 @@ def get_related_images_name_and_version(csv):
     return related_images
 
 
-def run_virtctl_command(command, virtctl_binary=VIRTCTL, namespace=None, check=False, verify_stderr=True):
+def run_virtctl_command(command, virtctl_binary=VIRTCTL, namespace=None, check=False, verify_stderr=True, timeout=None):
     """
     Run virtctl command
 
@@ -586,6 +586,7 @@ def run_virtctl_command(command, virtctl_binary=VIRTCTL, namespace=None, check=F
         namespace (str, default:None): Namespace to send to virtctl command
         check (bool, default:False): If check is True and the exit code was non-zero, it raises a
             CalledProcessError
+        timeout (int, default:None): Command timeout in seconds
 
     Returns:
         tuple: True, out if command succeeded, False, err otherwise.
@@ -599,7 +600,7 @@ def run_virtctl_command(command, virtctl_binary=VIRTCTL, namespace=None, check=F
         virtctl_cmd.extend(["--kubeconfig", kubeconfig])
 
     virtctl_cmd.extend(command)
-    return run_command(command=virtctl_cmd, check=check, verify_stderr=verify_stderr)
+    return run_command(command=virtctl_cmd, check=check, verify_stderr=verify_stderr, timeout=timeout)
 
 
 def get_hco_mismatch_statuses(hco_status_conditions, expected_hco_status):
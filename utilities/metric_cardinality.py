@@ -0,0 +1,366 @@
+"""
+Metric cardinality and scrape cost of the KubeVirt metrics endpoints.
+
+At every profile point (e.g. each VM density step of a scale run) the `/metrics` endpoint of every virt-handler and
+virt-controller pod is scraped from inside the pod, as the observability tests do, recording the scrape duration and
+payload size reported by curl. The series are counted per metric family, per component and per node, with the labels
+contributing the most distinct values per family, and the number of `kubevirt_*` series stored by Prometheus is
+counted per family.
+
+The report of a run can be compared against the report of a previous run (the baseline), point by point for the same
+VMI count.
+"""
+
+import json
+import logging
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from ocp_resources.pod import Pod
+
+import utilities.infra
+from utilities.constants.components import VIRT_CONTROLLER, VIRT_HANDLER
+from utilities.data_collector import write_to_file
+from utilities.metrics_exposition import parse_metrics_exposition
+
+if TYPE_CHECKING:
+    from kubernetes.dynamic import DynamicClient
+    from ocp_resources.namespace import Namespace
+
+    from utilities.prometheus_client import PrometheusClient
+
+LOGGER = logging.getLogger(__name__)
+
+METRIC_CARDINALITY_FILE = "metric_cardinality.json"
+METRIC_CARDINALITY_COMPONENTS = (VIRT_HANDLER, VIRT_CONTROLLER)
+METRIC_CARDINALITY_WORKERS = 4
+# Number of labels with the most distinct values reported per metric family
+METRIC_CARDINALITY_TOP_LABELS = 5
+# Relative growth allowed against the baseline before a value is reported as a regression
+CARDINALITY_REGRESSION_TOLERANCE = 0.2
+# Series count growth below this is not reported, whatever the relative growth
+CARDINALITY_REGRESSION_MIN_SERIES = 10
+METRICS_SCRAPE_COMMAND = (
+    "curl -k -s -w '\\n# SCRAPE_STATS %{time_total} %{size_download}\\n' https://localhost:8443/metrics"
+)
+SCRAPE_STATS_REGEX = re.compile(r"^# SCRAPE_STATS (?P<duration>[\d.]+) (?P<payload_bytes>[\d.]+)$", re.MULTILINE)
+PROMETHEUS_SERIES_QUERY = 'count by (__name__) ({__name__=~"kubevirt_.+"})'
+
+
+@dataclass
+class ScrapeProfile:
+    """Scrape of the metrics endpoint of a component pod."""
+
+    component: str
+    pod: str
+    node: str
+    duration: float
+    payload_bytes: int
+    series_by_family: dict[str, int]
+    # Distinct values per label, per metric family
+    label_values_by_family: dict[str, dict[str, set[str]]]
+    # Metric family per sample name, e.g. `kubevirt_vmi_migration_duration_bucket` to its histogram family
+    family_by_name: dict[str, str]
+
+    @property
+    def series(self) -> int:
+        return sum(self.series_by_family.values())
+
+
+def parse_scrape(component: str, pod: str, node: str, output: str) -> ScrapeProfile:
+    """
+    Parse the output of `METRICS_SCRAPE_COMMAND`.
+
+    Args:
+        component: Component name, e.g. virt-handler.
+        pod: Pod name.
+        node: Node of the pod.
+        output: Metrics endpoint output, followed by the curl scrape statistics.
+
+    Returns:
+        ScrapeProfile: Series and scrape cost of the endpoint.
+
+    Raises:
+        ValueError: If the output has no scrape statistics or a sample line is not valid.
+    """
+    if not (scrape_stats := SCRAPE_STATS_REGEX.search(output)):
+        raise ValueError(f"No scrape statistics in the {component} pod {pod} metrics output")
+
+    metrics_index = parse_metrics_exposition(exposition=output[: scrape_stats.start()])
+    series_by_family = {}
+    label_values_by_family = {}
+    family_by_name = {}
+    for family in metrics_index.families.values():
+        if not family.samples:
+            continue
+
+        series_by_family[family.name] = len(family.samples)
+        label_values: dict[str, set[str]] = {}
+        for sample in family.samples:
+            family_by_name[sample.name] = family.name
+            for label, value in sample.labels.items():
+                label_values.setdefault(label, set()).add(value)
+        label_values_by_family[family.name] = label_values
+
+    return ScrapeProfile(
+        component=component,
+        pod=pod,
+        node=node,
+        duration=float(scrape_stats.group("duration")),
+        payload_bytes=int(float(scrape_stats.group("payload_bytes"))),
+        series_by_family=series_by_family,
+        label_values_by_family=label_values_by_family,
+        family_by_name=family_by_name,
+    )
+
+
+def scrape_metrics_endpoint(pod: Pod, component: str) -> ScrapeProfile:
+    """
+    Scrape the metrics endpoint of a component pod from inside the pod.
+
+    Args:
+        pod: Component pod.
+        component: Component name, e.g. virt-handler.
+
+    Returns:
+        ScrapeProfile: Series and scrape cost of the endpoint.
+    """
+    return parse_scrape(
+        component=component,
+        pod=pod.name,
+        node=pod.instance.spec.nodeName,
+        output=pod.execute(command=["bash", "-c", METRICS_SCRAPE_COMMAND]),
+    )
+
+
+@dataclass
+class CardinalityProfile:
+    """Metric cardinality and scrape cost at a VMI count."""
+
+    vmi_count: int
+    timestamp: int
+    scrapes: list[ScrapeProfile]
+    # Series stored by Prometheus per metric family
+    prometheus_series: dict[str, int]
+
+    def to_report(self, top_labels: int = METRIC_CARDINALITY_TOP_LABELS) -> dict[str, Any]:
+        components: dict[str, dict[str, Any]] = {}
+        nodes: dict[str, dict[str, Any]] = {}
+        series_by_family: dict[str, int] = {}
+        label_values_by_family: dict[str, dict[str, set[str]]] = {}
+        for scrape in self.scrapes:
+            component = components.setdefault(
+                scrape.component, {"pods": 0, "series": 0, "payload_bytes": 0, "max_scrape_duration": 0.0}
+            )
+            component["pods"] += 1
+            component["series"] += scrape.series
+            component["payload_bytes"] += scrape.payload_bytes
+            component["max_scrape_duration"] = max(component["max_scrape_duration"], scrape.duration)
+            if scrape.component == VIRT_HANDLER:
+                nodes[scrape.node] = {
+                    "series": scrape.series,
+                    "payload_bytes": scrape.payload_bytes,
+                    "scrape_duration": scrape.duration,
+                }
+            for family, series in scrape.series_by_family.items():
+                series_by_family[family] = series_by_family.get(family, 0) + series
+                family_label_values = label_values_by_family.setdefault(family, {})
+                for label, values in scrape.label_values_by_family[family].items():
+                    family_label_values.setdefault(label, set()).update(values)
+
+        families = {}
+        for family, series in sorted(series_by_family.items(), key=lambda family_series: -family_series[1]):
+            label_values = sorted(
+                label_values_by_family[family].items(), key=lambda label_values: -len(label_values[1])
+            )
+            families[family] = {
+                "series": series,
+                "series_per_vmi": round(series / self.vmi_count, 3) if self.vmi_count else None,
+                "prometheus_series": self.prometheus_series.get(family),
+                "top_labels": {label: len(values) for label, values in label_values[:top_labels]},
+            }
+
+        return {
+            "vmi_count": self.vmi_count,
+            "timestamp": self.timestamp,
+            "prometheus_series": sum(self.prometheus_series.values()),
+            "components": dict(sorted(components.items())),
+            "nodes": dict(sorted(nodes.items())),
+            "families": families,
+        }
+
+
+class MetricCardinalityProfiler:
+    def __init__(self, prometheus: PrometheusClient, client: DynamicClient, namespace: Namespace) -> None:
+        """
+        Profile the metric cardinality and scrape cost of the KubeVirt components at several VMI counts.
+
+        Args:
+            prometheus: Prometheus client.
+            client: Admin client, to list the component pods and execute in them.
+            namespace: Namespace of the component pods.
+        """
+        self.prometheus = prometheus
+        self.client = client
+        self.namespace = namespace
+        self.profiles: list[CardinalityProfile] = []
+
+    def _try_scrape(self, pod: Pod, component: str) -> ScrapeProfile | None:
+        try:
+            return scrape_metrics_endpoint(pod=pod, component=component)
+        except Exception as exp:
+            LOGGER.warning(f"Failed to scrape the metrics of {component} pod {pod.name}: {exp}")
+            return None
+
+    def _prometheus_series(self, family_by_name: dict[str, str]) -> dict[str, int]:
+        response = self.prometheus.query(query=PROMETHEUS_SERIES_QUERY)
+        if response.get("status") != "success":
+            LOGGER.warning(f"Query {PROMETHEUS_SERIES_QUERY} failed: {response}")
+            return {}
+
+        prometheus_series: dict[str, int] = {}
+        for result in response["data"]["result"]:
+            name = result["metric"].get("__name__", "")
+            family = family_by_name.get(name, name)
+            prometheus_series[family] = prometheus_series.get(family, 0) + int(result["value"][1])
+        return prometheus_series
+
+    def profile(self, vmi_count: int) -> CardinalityProfile:
+        """
+        Scrape the component pods and count the Prometheus series.
+
+        Args:
+            vmi_count: Number of VMIs running on the cluster.
+
+        Returns:
+            CardinalityProfile: Profile at `vmi_count`; pods that could not be scraped are skipped.
+        """
+        pods = [
+            (pod, component)
+            for component in METRIC_CARDINALITY_COMPONENTS
+            for pod in utilities.infra.get_pods(
+                client=self.client, namespace=self.namespace, label=f"{Pod.ApiGroup.KUBEVIRT_IO}={component}"
+            )
+        ]
+        with ThreadPoolExecutor(max_workers=METRIC_CARDINALITY_WORKERS) as executor:
+            scrapes = [
+                scrape
+                for scrape in executor.map(lambda pod_component: self._try_scrape(*pod_component), pods)
+                if scrape
+            ]
+
+        family_by_name = {name: family for scrape in scrapes for name, family in scrape.family_by_name.items()}
+        profile = CardinalityProfile(
+            vmi_count=vmi_count,
+            timestamp=int(time.time()),
+            scrapes=scrapes,
+            prometheus_series=self._prometheus_series(family_by_name=family_by_name),
+        )
+        components = profile.to_report()["components"]
+        LOGGER.info(
+            f"Metric cardinality at {vmi_count} VMIs: "
+            + ", ".join(
+                f"{component} {totals['series']} series, {totals['payload_bytes']} bytes, "
+                f"max scrape {totals['max_scrape_duration']:.3f}s"
+                for component, totals in components.items()
+            )
+        )
+        self.profiles.append(profile)
+        return profile
+
+    def write(self, base_directory: str) -> dict[str, Any]:
+        """
+        Write the cardinality report of the profile points.
+
+        Args:
+            base_directory: Directory of the report.
+
+        Returns:
+            dict[str, Any]: Cardinality report.
+        """
+        report = {"points": [profile.to_report() for profile in self.profiles]}
+        write_to_file(
+            file_name=METRIC_CARDINALITY_FILE,
+            content=json.dumps(report, indent=2),
+            base_directory=base_directory,
+        )
+        return report
+
+
+def load_cardinality_baseline(baseline_dir: str | None) -> dict[str, Any]:
+    """
+    Load the cardinality report stored by a previous run.
+
+    Args:
+        baseline_dir: Directory with the report of a previous run, or None.
+
+    Returns:
+        dict[str, Any]: Baseline report, empty if no baseline is available.
+    """
+    if not baseline_dir:
+        return {}
+
+    baseline_file = os.path.join(baseline_dir, METRIC_CARDINALITY_FILE)
+    if not os.path.isfile(baseline_file):
+        LOGGER.warning(f"No metric cardinality baseline found at {baseline_file}")
+        return {}
+
+    with open(baseline_file) as fd:
+        return json.load(fd)
+
+
+def _exceeds(current: float, baseline: float, tolerance: float, min_growth: float = 0) -> bool:
+    return current > baseline * (1 + tolerance) and current - baseline >= min_growth
+
+
+def get_cardinality_regressions(
+    report: dict[str, Any], baseline: dict[str, Any], tolerance: float = CARDINALITY_REGRESSION_TOLERANCE
+) -> list[str]:
+    """
+    Compare a cardinality report with a baseline, for the VMI counts profiled in both.
+
+    More series per metric family, or a slower or larger scrape per component, beyond the tolerance is reported as a
+    regression. Metric families and components missing from the baseline are ignored.
+
+    Args:
+        report: Current report, as returned by `MetricCardinalityProfiler.write`.
+        baseline: Baseline report in the same format.
+        tolerance: Allowed relative growth, e.g. 0.2 for 20%.
+
+    Returns:
+        list[str]: Human readable regression descriptions, empty if none.
+    """
+    baseline_points = {point["vmi_count"]: point for point in baseline.get("points", [])}
+    regressions = []
+    for point in report["points"]:
+        if not (baseline_point := baseline_points.get(point["vmi_count"])):
+            continue
+
+        vmi_count = point["vmi_count"]
+        for family, family_report in point["families"].items():
+            if (baseline_family := baseline_point["families"].get(family)) and _exceeds(
+                current=family_report["series"],
+                baseline=baseline_family["series"],
+                tolerance=tolerance,
+                min_growth=CARDINALITY_REGRESSION_MIN_SERIES,
+            ):
+                regressions.append(
+                    f"{family} at {vmi_count} VMIs: {family_report['series']} series > baseline "
+                    f"{baseline_family['series']}, top labels {family_report['top_labels']}"
+                )
+
+        for component, component_report in point["components"].items():
+            if not (baseline_component := baseline_point["components"].get(component)):
+                continue
+
+            for key in ("max_scrape_duration", "payload_bytes"):
+                if _exceeds(current=component_report[key], baseline=baseline_component[key], tolerance=tolerance):
+                    regressions.append(
+                        f"{component} at {vmi_count} VMIs: {key} {component_report[key]} > baseline "
+                        f"{baseline_component[key]}"
+                    )
+    return regressions
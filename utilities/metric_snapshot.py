@@ -0,0 +1,227 @@
+"""
+Before/after metric snapshots.
+
+A snapshot holds the value of every series matching a set of selectors (e.g. `{__name__=~"kubevirt_vmi_.*",
+namespace="ns"}`), captured with one query per selector, metric selectors with the same label matchers being merged
+into one query (see `utilities.promql.batch_queries`). The selectors are not joined with `or`, which drops the series
+of a selector whose label set, ignoring the metric name, matches a series of a previous selector. The diff of two
+snapshots lists the added and removed series, the counter deltas and the gauge changes, so that the metric effects of
+an action are checked with a snapshot before and after the action instead of one query per metric.
+
+Counters are told apart from gauges by their name suffix (`_total`, `_count`, `_sum`, `_bucket`), as the metric type
+is not part of query results.
+"""
+
+import logging
+import math
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from functools import partial
+from typing import TYPE_CHECKING, Any
+
+from timeout_sampler import TimeoutExpiredError, TimeoutSampler
+
+from utilities.constants.timeouts import TIMEOUT_5MIN
+from utilities.promql import batch_queries
+
+if TYPE_CHECKING:
+    from utilities.prometheus_client import PrometheusClient
+
+LOGGER = logging.getLogger(__name__)
+
+COUNTER_SUFFIXES = ("_total", "_count", "_sum", "_bucket")
+
+# Metric name and sorted labels, without __name__
+SeriesKey = tuple[str, tuple[tuple[str, str], ...]]
+
+
+def is_counter(name: str) -> bool:
+    return name.endswith(COUNTER_SUFFIXES)
+
+
+def _labels_match(series_labels: dict[str, str], labels: dict[str, str] | None) -> bool:
+    return not labels or all(series_labels.get(label) == value for label, value in labels.items())
+
+
+@dataclass
+class MetricSeriesChange:
+    """Change of a series between two snapshots; `before` is None for added series, `after` for removed ones."""
+
+    name: str
+    labels: dict[str, str]
+    before: float | None
+    after: float | None
+    delta: float
+
+
+@dataclass
+class MetricSnapshotDiff:
+    """Changes between two metric snapshots."""
+
+    added: list[MetricSeriesChange] = field(default_factory=list)
+    removed: list[MetricSeriesChange] = field(default_factory=list)
+    counter_deltas: list[MetricSeriesChange] = field(default_factory=list)
+    gauge_changes: list[MetricSeriesChange] = field(default_factory=list)
+
+    def find(self, name: str, labels: dict[str, str] | None = None) -> list[MetricSeriesChange]:
+        """
+        Find the changes of the series of a metric.
+
+        Args:
+            name: Metric name.
+            labels: Labels the series must have; any labels when not set.
+
+        Returns:
+            list[MetricSeriesChange]: Added, removed and changed series of the metric.
+        """
+        return [
+            change
+            for change in [*self.added, *self.removed, *self.counter_deltas, *self.gauge_changes]
+            if change.name == name and _labels_match(series_labels=change.labels, labels=labels)
+        ]
+
+    def counter_delta(self, name: str, labels: dict[str, str] | None = None) -> float:
+        """
+        Get the increase of a counter, summed over its series.
+
+        Args:
+            name: Counter name.
+            labels: Labels the series must have; any labels when not set.
+
+        Returns:
+            float: Sum of the deltas of the changed series and of the values of the added series.
+
+        Raises:
+            ValueError: If the metric is not a counter.
+        """
+        if not is_counter(name=name):
+            raise ValueError(f"{name} is not a counter, its name does not end with one of {COUNTER_SUFFIXES}")
+        return sum(change.delta for change in self.find(name=name, labels=labels) if change.after is not None)
+
+
+@dataclass
+class MetricSnapshot:
+    """Values of the series matching a set of selectors at a point in time."""
+
+    selectors: list[str]
+    timestamp: float
+    series: dict[SeriesKey, float]
+
+    def __len__(self) -> int:
+        return len(self.series)
+
+    def diff(self, after: MetricSnapshot) -> MetricSnapshotDiff:
+        """
+        Compare with a later snapshot.
+
+        A counter with a lower value in the later snapshot was reset, its delta is counted from 0.
+
+        Args:
+            after: Snapshot taken after this one.
+
+        Returns:
+            MetricSnapshotDiff: Changes from this snapshot to `after`.
+        """
+        snapshot_diff = MetricSnapshotDiff()
+        for (name, labels), after_value in after.series.items():
+            before_value = self.series.get((name, labels))
+            if before_value is None:
+                snapshot_diff.added.append(
+                    MetricSeriesChange(
+                        name=name, labels=dict(labels), before=None, after=after_value, delta=after_value
+                    )
+                )
+            elif before_value != after_value and not (math.isnan(before_value) and math.isnan(after_value)):
+                counter = is_counter(name=name)
+                delta = after_value - before_value if not counter or after_value >= before_value else after_value
+                (snapshot_diff.counter_deltas if counter else snapshot_diff.gauge_changes).append(
+                    MetricSeriesChange(
+                        name=name, labels=dict(labels), before=before_value, after=after_value, delta=delta
+                    )
+                )
+
+        for (name, labels), before_value in self.series.items():
+            if (name, labels) not in after.series:
+                snapshot_diff.removed.append(
+                    MetricSeriesChange(
+                        name=name, labels=dict(labels), before=before_value, after=None, delta=-before_value
+                    )
+                )
+        return snapshot_diff
+
+
+def _query_selector(prometheus: PrometheusClient, query: str) -> list[dict[str, Any]]:
+    response = prometheus.query(query=query)
+    if response.get("status") != "success":
+        raise ValueError(f"Metric snapshot query {query} failed: {response}")
+    return response.get("data", {}).get("result", [])
+
+
+def take_metric_snapshot(prometheus: PrometheusClient, selectors: list[str]) -> MetricSnapshot:
+    """
+    Capture the series matching a set of selectors, merging the metric selectors with the same label matchers.
+
+    Args:
+        prometheus: Prometheus client.
+        selectors: Instant vector selectors, e.g. `{__name__=~"kubevirt_vmi_.*",namespace="ns"}`.
+
+    Returns:
+        MetricSnapshot: Series values.
+
+    Raises:
+        ValueError: If a query fails.
+    """
+    timestamp = time.time()
+    results_by_selector = batch_queries(queries=selectors, run_query=partial(_query_selector, prometheus=prometheus))
+
+    series: dict[SeriesKey, float] = {}
+    for results in results_by_selector.values():
+        for result in results:
+            labels = dict(result["metric"])
+            name = labels.pop("__name__", "")
+            series[name, tuple(sorted(labels.items()))] = float(result["value"][1])
+    LOGGER.info(f"Metric snapshot of {selectors}: {len(series)} series")
+    return MetricSnapshot(selectors=selectors, timestamp=timestamp, series=series)
+
+
+def _diff_from_snapshot(prometheus: PrometheusClient, before: MetricSnapshot) -> MetricSnapshotDiff:
+    return before.diff(after=take_metric_snapshot(prometheus=prometheus, selectors=before.selectors))
+
+
+def wait_for_metric_snapshot_diff(
+    prometheus: PrometheusClient,
+    before: MetricSnapshot,
+    condition: Callable[[MetricSnapshotDiff], bool],
+    timeout: int = TIMEOUT_5MIN,
+) -> MetricSnapshotDiff:
+    """
+    Wait until the diff from a snapshot satisfies a condition, taking a new snapshot once per scrape interval.
+
+    Args:
+        prometheus: Prometheus client.
+        before: Snapshot taken before the action.
+        condition: Condition on the diff from `before` to the current snapshot.
+        timeout: Maximum wait time in seconds.
+
+    Returns:
+        MetricSnapshotDiff: First diff satisfying the condition.
+
+    Raises:
+        TimeoutExpiredError: If the diff does not satisfy the condition within timeout.
+    """
+    sample = None
+    try:
+        for sample in TimeoutSampler(
+            wait_timeout=timeout,
+            sleep=prometheus.scrape_interval,
+            func=_diff_from_snapshot,
+            prometheus=prometheus,
+            before=before,
+        ):
+            if condition(sample):
+                return sample
+    except TimeoutExpiredError:
+        LOGGER.error(f"Metric snapshot diff of {before.selectors} did not satisfy the condition, last diff: {sample}")
+        raise
+    return sample
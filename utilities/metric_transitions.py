@@ -0,0 +1,236 @@
+"""
+Metric transition detection with range queries.
+
+Instead of sampling an instant query every few seconds, which misses values that last less than the sampling
+interval, every poll runs a range query over the time elapsed since the previous poll with the Prometheus scrape
+interval as step, and looks for the first step where the condition is satisfied. A poll per scrape interval sees every
+scraped value, and the wait returns the timestamp of the step where the condition was first satisfied.
+
+Only the window start and the last evaluated value are kept between polls, whatever the wait duration. The range
+queries of a poll are batched: metric selectors with the same label matchers are merged into one request (see
+`utilities.promql.batch_queries`).
+"""
+
+import logging
+import time
+from collections import defaultdict
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import partial
+from typing import TYPE_CHECKING, Any
+
+from timeout_sampler import TimeoutExpiredError, TimeoutSampler
+
+from utilities.promql import batch_queries
+
+if TYPE_CHECKING:
+    from utilities.prometheus_client import PrometheusClient
+
+LOGGER = logging.getLogger(__name__)
+
+# Steps of the previous window evaluated again by the next poll, for samples ingested after the previous poll
+TRANSITION_OVERLAP_STEPS = 1
+
+
+@dataclass
+class MetricTransition:
+    """First step where the value of a query satisfied a condition."""
+
+    query: str
+    timestamp: float
+    value: str | int
+
+
+def query_range(prometheus: PrometheusClient, query: str, start: float, end: float, step: int) -> list[dict[str, Any]]:
+    """
+    Run a range query.
+
+    Args:
+        prometheus: PrometheusClient instance.
+        query: PromQL query.
+        start: Start timestamp in seconds.
+        end: End timestamp in seconds.
+        step: Step in seconds.
+
+    Returns:
+        list[dict[str, Any]]: Series, each with its labels under `metric` and its `[timestamp, value]` points under
+            `values`; an empty list when the query failed.
+    """
+    result = prometheus.get(
+        path=f"{prometheus.api_v1}/query_range",
+        params={"query": query, "start": f"{start:.3f}", "end": f"{end:.3f}", "step": step},
+    )
+    if result.get("status") != "success":
+        LOGGER.warning(f"Range query {query} failed: {result}")
+        return []
+    return result.get("data", {}).get("result", [])
+
+
+class MetricTransitionDetector:
+    def __init__(
+        self,
+        prometheus: PrometheusClient,
+        query: str,
+        condition: Callable[[str | int], bool],
+        start: float | None = None,
+    ) -> None:
+        """
+        Find the first step since `start` where the query value satisfies a condition.
+
+        The value at a step is the value of the first series with a point at that step, int 0 when no series has one
+        (as `get_metrics_value` returns for an absent metric).
+
+        Args:
+            prometheus: PrometheusClient instance.
+            query: PromQL query.
+            condition: Condition on the query value.
+            start: Start timestamp in seconds; now when not set.
+        """
+        self.prometheus = prometheus
+        self.query = query
+        self.condition = condition
+        self.step_ms = prometheus.scrape_interval * 1000
+        self.start_ms = int((start if start is not None else time.time()) * 1000)
+        self.next_start_ms = self.start_ms
+        self.last_value: str | int | None = None
+        self.last_timestamp: float | None = None
+        self.polls = 0
+
+    def get_window(self, now: float) -> tuple[int, int]:
+        """
+        Get the steps to evaluate: from the previous check to the last step before `now`.
+
+        Args:
+            now: Current timestamp in seconds.
+
+        Returns:
+            tuple[int, int]: First and last step timestamps in milliseconds.
+        """
+        end_ms = self.start_ms + (int(now * 1000) - self.start_ms) // self.step_ms * self.step_ms
+        return min(self.next_start_ms, end_ms), end_ms
+
+    def check(self) -> MetricTransition | None:
+        """
+        Evaluate the steps since the previous check.
+
+        Returns:
+            MetricTransition | None: First step where the condition is satisfied, None when it is not satisfied yet.
+        """
+        window_start_ms, end_ms = window = self.get_window(now=time.time())
+        return self.evaluate(
+            series=query_range(
+                prometheus=self.prometheus,
+                query=self.query,
+                start=window_start_ms / 1000,
+                end=end_ms / 1000,
+                step=self.step_ms // 1000,
+            ),
+            window=window,
+        )
+
+    def evaluate(self, series: list[dict[str, Any]], window: tuple[int, int]) -> MetricTransition | None:
+        """
+        Evaluate the steps of a window, from the range query result of the query over that window.
+
+        Args:
+            series: Range query result series.
+            window: First and last step timestamps in milliseconds, see `get_window`.
+
+        Returns:
+            MetricTransition | None: First step where the condition is satisfied, None when it is not satisfied yet.
+        """
+        window_start_ms, end_ms = window
+        values_by_timestamp: dict[int, str] = {}
+        for query_series in series:
+            for timestamp, value in query_series.get("values", []):
+                values_by_timestamp.setdefault(round(float(timestamp) * 1000), value)
+        self.polls += 1
+
+        for timestamp_ms in range(window_start_ms, end_ms + 1, self.step_ms):
+            self.last_value = values_by_timestamp.get(timestamp_ms, 0)
+            self.last_timestamp = timestamp_ms / 1000
+            if self.condition(self.last_value):
+                return MetricTransition(query=self.query, timestamp=self.last_timestamp, value=self.last_value)
+
+        self.next_start_ms = max(self.start_ms, end_ms - TRANSITION_OVERLAP_STEPS * self.step_ms)
+        return None
+
+
+def _check_detectors(
+    prometheus: PrometheusClient,
+    detectors: dict[str, MetricTransitionDetector],
+    transitions: dict[str, MetricTransition],
+) -> dict[str, MetricTransition]:
+    now = time.time()
+    queries_by_window: defaultdict[tuple[int, int], list[str]] = defaultdict(list)
+    for query, detector in detectors.items():
+        queries_by_window[detector.get_window(now=now)].append(query)
+
+    for window, queries in queries_by_window.items():
+        window_start_ms, end_ms = window
+        series_by_query = batch_queries(
+            queries=queries,
+            run_query=partial(
+                query_range,
+                prometheus=prometheus,
+                start=window_start_ms / 1000,
+                end=end_ms / 1000,
+                step=prometheus.scrape_interval,
+            ),
+        )
+        for query in queries:
+            if transition := detectors[query].evaluate(series=series_by_query[query], window=window):
+                transitions[query] = transition
+                del detectors[query]
+    return transitions
+
+
+def wait_for_metric_transitions(
+    prometheus: PrometheusClient,
+    conditions: dict[str, Callable[[str | int], bool]],
+    timeout: int,
+    start: float | None = None,
+) -> dict[str, MetricTransition]:
+    """
+    Wait until the value of every query satisfies its condition at some step since `start`, polling once per scrape
+    interval. The range queries of a poll are batched with `batch_queries`.
+
+    Args:
+        prometheus: PrometheusClient instance.
+        conditions: Condition on the query value per query.
+        timeout: Maximum wait time in seconds.
+        start: Start timestamp in seconds; now when not set.
+
+    Returns:
+        dict[str, MetricTransition]: First step where the condition is satisfied per query.
+
+    Raises:
+        TimeoutExpiredError: If a query value does not satisfy its condition within timeout.
+    """
+    start = start if start is not None else time.time()
+    # Detectors are removed from this dict once their condition is satisfied
+    detectors = {
+        query: MetricTransitionDetector(prometheus=prometheus, query=query, condition=condition, start=start)
+        for query, condition in conditions.items()
+    }
+    transitions: dict[str, MetricTransition] = {}
+    try:
+        for sample in TimeoutSampler(
+            wait_timeout=timeout,
+            sleep=prometheus.scrape_interval,
+            func=_check_detectors,
+            prometheus=prometheus,
+            detectors=detectors,
+            transitions=transitions,
+        ):
+            if not detectors:
+                for transition in sample.values():
+                    LOGGER.info(f"Query {transition.query} value was {transition.value} at {transition.timestamp}")
+                return sample
+    except TimeoutExpiredError:
+        LOGGER.error(
+            "Queries did not satisfy their condition, last values: "
+            f"{ {query: (detector.last_timestamp, detector.last_value) for query, detector in detectors.items()} }"
+        )
+        raise
+    return transitions
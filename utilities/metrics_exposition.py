@@ -0,0 +1,243 @@
+"""
+Prometheus text exposition format parser.
+
+Metrics endpoints (e.g. virt-handler `/metrics`) are parsed in a single pass over the lines: label values are
+unescaped, samples are typed by the `# TYPE` of their metric family (histogram and summary samples are attached to
+their family by their `_bucket`, `_sum`, `_count` suffix), and samples of metrics that were not asked for are skipped
+before their labels are parsed.
+
+The parsed samples are indexed by sample name; lookups by a label subset use an index of the label values of that
+name, built on first use.
+"""
+
+import io
+import logging
+import re
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+LOGGER = logging.getLogger(__name__)
+
+UNTYPED = "untyped"
+HISTOGRAM = "histogram"
+SUMMARY = "summary"
+# Sample name suffix per metric family type, for samples named differently from their family
+FAMILY_SUFFIXES = {
+    HISTOGRAM: ("_bucket", "_sum", "_count", "_created"),
+    SUMMARY: ("_sum", "_count", "_created"),
+    "counter": ("_total", "_created"),
+}
+SAMPLE_NAME_REGEX = re.compile(r"[^{\s]*")
+LABEL_REGEX = re.compile(r'\s*([a-zA-Z_][a-zA-Z0-9_]*)\s*=\s*"((?:[^"\\]|\\.)*)"\s*([,}])')
+LABELS_END_REGEX = re.compile(r"\s*}")
+ESCAPED_CHARACTERS = {"\\": "\\", '"': '"', "n": "\n"}
+
+
+@dataclass
+class MetricSample:
+    """A sample of a metric, typed by its metric family."""
+
+    name: str
+    labels: dict[str, str]
+    value: float
+    family: str
+    type: str = UNTYPED
+    timestamp: int | None = None
+
+
+@dataclass
+class MetricFamily:
+    """Metric family, from its `# HELP` and `# TYPE` lines."""
+
+    name: str
+    type: str = UNTYPED
+    help: str = ""
+    samples: list[MetricSample] = field(default_factory=list, repr=False)
+
+
+class MetricsIndex:
+    def __init__(self) -> None:
+        """
+        Parsed metric samples, indexed by sample name and by label value.
+        """
+        self.families: dict[str, MetricFamily] = {}
+        self._samples_by_name: dict[str, list[MetricSample]] = {}
+        self._label_index: dict[str, dict[tuple[str, str], list[MetricSample]]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(samples) for samples in self._samples_by_name.values())
+
+    def add(self, sample: MetricSample) -> None:
+        """
+        Add a sample.
+
+        Args:
+            sample: Metric sample; its family is created untyped when not declared.
+        """
+        self.families.setdefault(sample.family, MetricFamily(name=sample.family)).samples.append(sample)
+        self._samples_by_name.setdefault(sample.name, []).append(sample)
+        self._label_index.pop(sample.name, None)
+
+    def names(self) -> list[str]:
+        """
+        Get the sample names.
+
+        Returns:
+            list[str]: Sample names, in the order of their first sample.
+        """
+        return list(self._samples_by_name)
+
+    def find(self, name: str, labels: dict[str, str] | None = None) -> list[MetricSample]:
+        """
+        Find samples by name and label subset.
+
+        Args:
+            name: Sample name, e.g. `kubevirt_vmi_memory_available_bytes` or `kubevirt_vmi_migration_duration_bucket`.
+            labels: Labels the samples must have; any labels when not set.
+
+        Returns:
+            list[MetricSample]: Matching samples, in exposition order.
+        """
+        if not labels:
+            return list(self._samples_by_name.get(name, []))
+
+        if name not in self._label_index:
+            label_index: dict[tuple[str, str], list[MetricSample]] = {}
+            for sample in self._samples_by_name.get(name, []):
+                for label in sample.labels.items():
+                    label_index.setdefault(label, []).append(sample)
+            self._label_index[name] = label_index
+
+        candidates = min(
+            (self._label_index[name].get(label, []) for label in labels.items()),
+            key=len,
+        )
+        return [
+            sample for sample in candidates if all(sample.labels.get(label) == value for label, value in labels.items())
+        ]
+
+    def histogram_buckets(self, name: str, labels: dict[str, str] | None = None) -> list[tuple[float, float]]:
+        """
+        Get the cumulative buckets of a histogram.
+
+        Args:
+            name: Histogram family name, without the `_bucket` suffix.
+            labels: Labels of the histogram series; any labels when not set.
+
+        Returns:
+            list[tuple[float, float]]: Upper bound and cumulative count per bucket, sorted by upper bound.
+        """
+        return sorted(
+            (float(sample.labels["le"]), sample.value)
+            for sample in self.find(name=f"{name}_bucket", labels=labels)
+            if "le" in sample.labels
+        )
+
+
+def _unescape(text: str) -> str:
+    if "\\" not in text:
+        return text
+    chunks = []
+    index = 0
+    while (backslash := text.find("\\", index)) != -1:
+        chunks.append(text[index:backslash])
+        escaped = text[backslash + 1 : backslash + 2]
+        chunks.append(ESCAPED_CHARACTERS.get(escaped, f"\\{escaped}"))
+        index = backslash + 2
+    chunks.append(text[index:])
+    return "".join(chunks)
+
+
+def _parse_labels(line: str, index: int) -> tuple[dict[str, str], int]:
+    """
+    Parse the labels of a sample line, starting after its `{`.
+
+    Returns:
+        tuple[dict[str, str], int]: Unescaped labels, and the position after the closing `}`.
+    """
+    labels = {}
+    while label_match := LABEL_REGEX.match(line, index):
+        label, value, separator = label_match.groups()
+        labels[label] = _unescape(text=value)
+        index = label_match.end()
+        if separator == "}":
+            return labels, index
+
+    if labels_end_match := LABELS_END_REGEX.match(line, index):
+        return labels, labels_end_match.end()
+    raise ValueError(f"Invalid label at position {index}")
+
+
+def _get_family(name: str, families: dict[str, MetricFamily]) -> MetricFamily | None:
+    if family := families.get(name):
+        return family
+    for family_type, suffixes in FAMILY_SUFFIXES.items():
+        for suffix in suffixes:
+            if name.endswith(suffix) and (family := families.get(name[: -len(suffix)])) and family.type == family_type:
+                return family
+    return None
+
+
+def parse_metrics_exposition(
+    exposition: str | Iterable[str], metric_names: Iterable[str] | None = None
+) -> MetricsIndex:
+    """
+    Parse metrics in the Prometheus text exposition format.
+
+    Args:
+        exposition: Metrics endpoint output, or an iterable of its lines (e.g. a file object).
+        metric_names: Sample or metric family names to keep; samples of other metrics are skipped without parsing
+            their labels. All the metrics are kept when not set.
+
+    Returns:
+        MetricsIndex: Parsed samples.
+
+    Raises:
+        ValueError: If a sample line is not valid.
+    """
+    lines = io.StringIO(exposition) if isinstance(exposition, str) else exposition
+    wanted_names = set(metric_names) if metric_names is not None else None
+    metrics_index = MetricsIndex()
+    families = metrics_index.families
+    for line_number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+
+        if line[0] == "#":
+            parts = line.split(maxsplit=3)
+            if len(parts) >= 3 and parts[1] in ("HELP", "TYPE"):
+                family = families.setdefault(parts[2], MetricFamily(name=parts[2]))
+                if parts[1] == "HELP":
+                    family.help = _unescape(text=parts[3]) if len(parts) == 4 else ""
+                else:
+                    family.type = parts[3].lower() if len(parts) == 4 else UNTYPED
+            continue
+
+        name = SAMPLE_NAME_REGEX.match(line).group(0)
+        name_end = len(name)
+        family = _get_family(name=name, families=families)
+        family_name = family.name if family else name
+        if wanted_names is not None and name not in wanted_names and family_name not in wanted_names:
+            continue
+
+        try:
+            labels, value_start = (
+                _parse_labels(line=line, index=name_end + 1) if line[name_end : name_end + 1] == "{" else ({}, name_end)
+            )
+            value_and_timestamp = line[value_start:].split()
+            metrics_index.add(
+                sample=MetricSample(
+                    name=name,
+                    labels=labels,
+                    value=float(value_and_timestamp[0]),
+                    family=family_name,
+                    type=family.type if family else UNTYPED,
+                    timestamp=int(value_and_timestamp[1]) if len(value_and_timestamp) > 1 else None,
+                )
+            )
+        except (IndexError, ValueError) as exp:
+            raise ValueError(f"Invalid metric sample at line {line_number}: {line}") from exp
+
+    LOGGER.debug(f"Parsed {len(metrics_index)} metric samples of {len(families)} metric families")
+    return metrics_index
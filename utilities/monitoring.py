@@ -1,14 +1,18 @@
-import datetime
 import logging
-from typing import TYPE_CHECKING
+import operator
+from collections.abc import Callable
+from functools import partial
+from typing import TYPE_CHECKING, Any
 
 from timeout_sampler import TimeoutExpiredError, TimeoutSampler
 
 if TYPE_CHECKING:
-    from ocp_utilities.monitoring import Prometheus
+    from utilities.prometheus_client import PrometheusClient
 
+from utilities.alert_poller import get_alert_poller
 from utilities.constants.monitoring import (
     FIRING_STATE,
+    KUBEVIRT_HCO_SYSTEM_HEALTH_STATUS,
     KUBEVIRT_HYPERCONVERGED_OPERATOR_HEALTH_STATUS,
     OPERATOR_HEALTH_IMPACT_VALUES,
 )
@@ -19,24 +23,20 @@ from utilities.constants.timeouts import (
     TIMEOUT_10MIN,
 )
 from utilities.data_collector import collect_alerts_data
+from utilities.metric_transitions import MetricTransition, wait_for_metric_transitions
+from utilities.promql import batch_queries
 
 LOGGER = logging.getLogger(__name__)
 
 
 def wait_for_alert(prometheus, alert):
-    sampler = TimeoutSampler(
-        wait_timeout=TIMEOUT_10MIN,
-        sleep=TIMEOUT_5SEC,
-        func=prometheus.get_all_alerts_by_alert_name,
-        alert_name=alert,
-    )
-    sample = None
+    alert_poller = get_alert_poller(prometheus=prometheus)
     try:
-        for sample in sampler:
-            if sample:
-                return sample
+        return alert_poller.wait_for_alerts(alert_name=alert, timeout=TIMEOUT_10MIN)
     except TimeoutExpiredError:
-        LOGGER.error(f"Failed to get successful alert {alert}. Current data: {sample}")
+        LOGGER.error(
+            f"Failed to get successful alert {alert}. Current data: {alert_poller.get_alerts(alert_name=alert)}"
+        )
         collect_alerts_data()
         raise
 
@@ -59,16 +59,8 @@ def validate_alert_cnv_labels(
 
 
 def wait_for_firing_alert_clean_up(prometheus, alert_name, timeout=TIMEOUT_5MIN):
-    samples = TimeoutSampler(
-        wait_timeout=timeout,
-        sleep=TIMEOUT_5SEC,
-        func=prometheus.get_firing_alerts,
-        alert_name=alert_name,
-    )
     try:
-        for sample in samples:
-            if not sample:
-                return
+        get_alert_poller(prometheus=prometheus).wait_for_alert_resolved(alert_name=alert_name, timeout=timeout)
     except TimeoutExpiredError:
         LOGGER.error(f"Alert: {alert_name} did not get clear in {timeout} seconds.")
         raise
@@ -81,16 +73,17 @@ def validate_alerts(
     state=FIRING_STATE,
 ):
     alert_name = alert_dict.get("alert_name")
+    alert_poller = get_alert_poller(prometheus=prometheus)
     alerts = None
     try:
-        alerts = prometheus.wait_for_alert_by_state_sampler(
+        alerts = alert_poller.wait_for_alerts(
             alert_name=alert_name,
             timeout=alert_dict.get("timeout", timeout),
             state=alert_dict.get("state", state),
         )
     except TimeoutExpiredError:
         LOGGER.warning(f"Alert {alert_name} not found in firing state. Looking for it in different state.")
-        alerts_not_firing = prometheus.get_all_alerts_by_alert_name(alert_name=alert_name)
+        alerts_not_firing = alert_poller.get_alerts(alert_name=alert_name)
         LOGGER.info(f"Alert: {alerts_not_firing}")
         if alerts_not_firing:
             alerts = alerts_not_firing
@@ -123,19 +116,18 @@ def wait_for_operator_health_metrics_value(
     samples = TimeoutSampler(
         wait_timeout=TIMEOUT_2MIN,
         sleep=TIMEOUT_5SEC,
-        func=get_metrics_value,
+        func=get_metrics_values,
         prometheus=prometheus,
-        metrics_name=KUBEVIRT_HYPERCONVERGED_OPERATOR_HEALTH_STATUS,
+        metrics_names=[KUBEVIRT_HYPERCONVERGED_OPERATOR_HEALTH_STATUS, KUBEVIRT_HCO_SYSTEM_HEALTH_STATUS],
     )
     operator_health_metrics_value = OPERATOR_HEALTH_IMPACT_VALUES[health_impact_value]
     LOGGER.info(f"Based on operator label, expected health metrics value: {operator_health_metrics_value}")
     sample = None
     system_metrics_value = None
     try:
-        for sample in samples:
-            system_metrics_value = get_metrics_value(
-                prometheus=prometheus, metrics_name="kubevirt_hco_system_health_status"
-            )
+        for metrics_values in samples:
+            sample = metrics_values[KUBEVIRT_HYPERCONVERGED_OPERATOR_HEALTH_STATUS]
+            system_metrics_value = metrics_values[KUBEVIRT_HCO_SYSTEM_HEALTH_STATUS]
             expected_heath_impact = max(system_metrics_value, operator_health_metrics_value)
             LOGGER.info(
                 f"System metrics value: {system_metrics_value}, expected health impact: {expected_heath_impact}"
@@ -162,7 +154,7 @@ def wait_for_operator_health_metrics_value(
 
 
 def get_all_firing_alerts(prometheus):
-    alerts = prometheus.alerts()["data"]["alerts"]
+    alerts = get_alert_poller(prometheus=prometheus).get_all_alerts()
     firing_alerts = {}
     for alert in alerts:
         if alert["state"] == "firing":
@@ -173,67 +165,205 @@ def get_all_firing_alerts(prometheus):
     return firing_alerts
 
 
-def get_metrics_value(prometheus, metrics_name):
-    metric_results = prometheus.query(query=metrics_name).get("data", {})
-    if metric_results and (metric_res := metric_results["result"]):
-        metric_values_list = [value for metric_val in metric_res for value in metric_val.get("value")]
+def _query_results(prometheus: PrometheusClient, query: str) -> list[dict[str, Any]]:
+    response = prometheus.query(query=query)
+    if response.get("status", "success") != "success":
+        LOGGER.warning(f"Query {query} failed: {response}")
+    return response.get("data", {}).get("result", [])
+
+
+def batch_query(prometheus: PrometheusClient, queries: list[str]) -> dict[str, list[dict[str, Any]]]:
+    """
+    Run several instant queries in as few requests as possible.
+
+    Metric selectors with the same label matchers are merged into one query, e.g. `a{name="vm"}` and `b{name="vm"}`
+    into `{__name__=~"a|b",name="vm"}`, and the results are split back per metric name (see `batch_queries`). Other
+    queries are run on their own.
+
+    Args:
+        prometheus: Prometheus client.
+        queries: PromQL queries.
+
+    Returns:
+        dict[str, list[dict[str, Any]]]: Query results per query.
+    """
+    return batch_queries(queries=queries, run_query=partial(_query_results, prometheus=prometheus))
+
+
+def wait_for_queries(
+    prometheus: PrometheusClient,
+    conditions: dict[str, Callable[[list[dict[str, Any]]], bool]],
+    timeout: int = TIMEOUT_5MIN,
+    sleep: int = TIMEOUT_5SEC,
+) -> dict[str, list[dict[str, Any]]]:
+    """
+    Wait until the results of every query match their condition, in one sampling loop.
+
+    Each sample runs the queries whose condition is not matched yet with `batch_query`.
+
+    Args:
+        prometheus: Prometheus client.
+        conditions: Condition per query, called with the query results.
+        timeout: Maximum wait time in seconds.
+        sleep: Time in seconds between samples.
+
+    Returns:
+        dict[str, list[dict[str, Any]]]: Query results per query, from the sample that matched its condition.
+
+    Raises:
+        TimeoutExpiredError: If a query does not match its condition within timeout.
+    """
+    # The sampler calls batch_query with this list, queries are removed from it once they match their condition
+    pending_queries = list(conditions)
+    results: dict[str, list[dict[str, Any]]] = {}
+    samples = TimeoutSampler(
+        wait_timeout=timeout,
+        sleep=sleep,
+        func=batch_query,
+        prometheus=prometheus,
+        queries=pending_queries,
+    )
+    try:
+        for sample in samples:
+            for query, query_results in sample.items():
+                results[query] = query_results
+                if conditions[query](query_results):
+                    pending_queries.remove(query)
+            if not pending_queries:
+                return results
+    except TimeoutExpiredError:
+        LOGGER.error(
+            f"Queries did not match their condition in {timeout} seconds, last results: "
+            f"{ {query: results.get(query) for query in pending_queries} }"
+        )
+        raise
+    return results
+
+
+def _get_metric_value(metric_results: list[dict[str, Any]], metrics_name: str) -> Any:
+    if metric_results:
+        metric_values_list = [value for metric_val in metric_results for value in metric_val.get("value")]
         return metric_values_list[1]
     LOGGER.warning(f"For Query {metrics_name}, empty results found.")
     return 0
 
 
+def _gauge_value_matches(value: str | int, expected_value: str) -> bool:
+    # Int 0 is an absent metric, never a gauge value
+    return isinstance(value, str) and value == expected_value
+
+
+def get_metrics_values(prometheus: PrometheusClient, metrics_names: list[str]) -> dict[str, Any]:
+    """
+    Get the value of several metrics, queried with `batch_query`.
+
+    Args:
+        prometheus: Prometheus client.
+        metrics_names: Metric names or selectors.
+
+    Returns:
+        dict[str, Any]: Value of the first result per metric, int 0 when the metric has no results.
+    """
+    return {
+        metrics_name: _get_metric_value(metric_results=metric_results, metrics_name=metrics_name)
+        for metrics_name, metric_results in batch_query(prometheus=prometheus, queries=metrics_names).items()
+    }
+
+
+def get_metrics_value(prometheus, metrics_name):
+    return get_metrics_values(prometheus=prometheus, metrics_names=[metrics_name])[metrics_name]
+
+
+def validate_metrics_values(
+    prometheus: PrometheusClient, expected_values: dict[str, str | int], timeout: int = TIMEOUT_5MIN
+) -> dict[str, MetricTransition]:
+    """Wait until every metric matches its expected value, at some scrape since the call.
+
+    Values that match for a single scrape are detected, as the metrics are checked with range queries over the
+    elapsed time (see `wait_for_metric_transitions`).
+
+    Args:
+        prometheus: Prometheus client.
+        expected_values: Expected value per metric name. Use str for emitted values (e.g. "0"),
+            int 0 for absent/not-emitted metrics (get_metrics_value returns int 0 when absent).
+        timeout: Maximum wait time in seconds.
+
+    Returns:
+        dict[str, MetricTransition]: Timestamp and value of the first match per metric name.
+
+    Raises:
+        TimeoutExpiredError: If a metric does not match within timeout.
+    """
+    try:
+        transitions = wait_for_metric_transitions(
+            prometheus=prometheus,
+            conditions={
+                metric_name: partial(operator.eq, expected_value)
+                for metric_name, expected_value in expected_values.items()
+            },
+            timeout=timeout,
+        )
+    except TimeoutExpiredError:
+        LOGGER.error(f"Metrics values did not match the expected values: {expected_values}")
+        raise
+    LOGGER.info(f"Metrics values match the expected values: {expected_values}")
+    return transitions
+
+
 def validate_metrics_value(
-    prometheus: Prometheus, metric_name: str, expected_value: str | int, timeout: int = TIMEOUT_5MIN
-) -> None:
+    prometheus: PrometheusClient, metric_name: str, expected_value: str | int, timeout: int = TIMEOUT_5MIN
+) -> MetricTransition:
     """Wait until the metric matches the expected value.
 
     Args:
-        prometheus: Prometheus instance.
+        prometheus: Prometheus client.
         metric_name: Name of the metric to query.
         expected_value: Expected value to match. Use str for emitted values (e.g. "0"),
             int 0 for absent/not-emitted metrics (get_metrics_value returns int 0 when absent).
         timeout: Maximum wait time in seconds.
 
+    Returns:
+        MetricTransition: Timestamp and value of the first match.
+
     Raises:
         TimeoutExpiredError: If the metric does not match within timeout.
     """
-    samples = TimeoutSampler(
-        wait_timeout=timeout,
-        sleep=TIMEOUT_5SEC,
-        func=get_metrics_value,
-        prometheus=prometheus,
-        metrics_name=metric_name,
-    )
-    sample = None
-    comparison_values_log = {}
-    try:
-        for sample in samples:
-            comparison_values_log[datetime.datetime.now()] = (
-                f"metric: {metric_name} value is: {sample}, the expected value is {expected_value}"
-            )
-            if sample == expected_value:
-                LOGGER.info(f"Metrics value matches the expected value: {expected_value}")
-                return
-    except TimeoutExpiredError:
-        LOGGER.error(f"Metrics value: {sample}, expected: {expected_value}, comparison log: {comparison_values_log}")
-        raise
+    return validate_metrics_values(
+        prometheus=prometheus, expected_values={metric_name: expected_value}, timeout=timeout
+    )[metric_name]
 
 
-def wait_for_gauge_metrics_value(prometheus, query, expected_value, timeout=TIMEOUT_5MIN):
-    samples = TimeoutSampler(
-        wait_timeout=timeout,
-        sleep=TIMEOUT_5SEC,
-        func=prometheus.query,
-        query=query,
-    )
-    sample = None
+def wait_for_gauge_metrics_values(
+    prometheus: PrometheusClient, expected_values: dict[str, str], timeout: int = TIMEOUT_5MIN
+) -> dict[str, MetricTransition]:
+    """Wait until every query returns its expected value, at some scrape since the call.
+
+    Args:
+        prometheus: Prometheus client.
+        expected_values: Expected value per query.
+        timeout: Maximum wait time in seconds.
+
+    Returns:
+        dict[str, MetricTransition]: Timestamp and value of the first match per query.
 
+    Raises:
+        TimeoutExpiredError: If a query does not return its expected value within timeout.
+    """
     try:
-        for sample in samples:
-            if sample:
-                result = sample["data"]["result"]
-                if result and result[0]["value"] and str(result[0]["value"][1]) == expected_value:
-                    return
+        return wait_for_metric_transitions(
+            prometheus=prometheus,
+            conditions={
+                query: partial(_gauge_value_matches, expected_value=expected_value)
+                for query, expected_value in expected_values.items()
+            },
+            timeout=timeout,
+        )
     except TimeoutExpiredError:
-        LOGGER.error(f"Query: {query} did not return expected result {expected_value}, actual result: {sample}")
+        LOGGER.error(f"Queries did not return expected results {expected_values}")
         raise
+
+
+def wait_for_gauge_metrics_value(prometheus, query, expected_value, timeout=TIMEOUT_5MIN):
+    return wait_for_gauge_metrics_values(
+        prometheus=prometheus, expected_values={query: expected_value}, timeout=timeout
+    )[query]
@@ -0,0 +1,257 @@
+"""
+Namespace inspection for failure data collection.
+
+Collects the resources and the pod logs of namespaces through the Python client, one namespace per worker,
+into a single compressed archive. All the namespaced resources that can be listed are collected, as discovered from
+the API server (including the OpenShift Virtualization custom resources, CSVs and subscriptions), except secrets.
+Pod logs are streamed with sinceSeconds, so only the failure window is collected; the previous logs of restarted
+containers are collected too. The collection time and the compressed artifact size are recorded per namespace.
+"""
+
+import logging
+import os
+import shutil
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from tempfile import SpooledTemporaryFile
+from typing import IO
+
+import yaml
+from kubernetes.client import CoreV1Api
+from kubernetes.dynamic import DynamicClient
+from kubernetes.dynamic.resource import Resource, ResourceList
+
+LOGGER = logging.getLogger(__name__)
+
+NAMESPACE_INSPECTION_WORKERS = 4
+NAMESPACE_INSPECTION_ARCHIVE = "inspect_collection.zip"
+# Namespaced resources not collected, as <plural>.<group>: secrets hold credentials, and package manifests
+# are the whole operator catalog, whatever the namespace
+NAMESPACE_INSPECTION_EXCLUDED_RESOURCES = {"secrets", "packagemanifests.packages.operators.coreos.com"}
+POD_LOG_CHUNK_SIZE = 1024 * 1024
+# Pod logs up to this size are buffered in memory before they are added to the archive
+POD_LOG_SPOOL_SIZE = 16 * 1024 * 1024
+
+
+@dataclass
+class NamespaceInspectionResult:
+    namespace: str
+    duration: float = 0.0
+    size_bytes: int = 0
+    error: str | None = None
+
+
+class NamespaceInspectionArchive:
+    def __init__(self, archive: zipfile.ZipFile) -> None:
+        """
+        Thread-safe writer of inspection artifacts into a zip archive.
+
+        Args:
+            archive: Archive opened for writing.
+        """
+        self.archive = archive
+        self._lock = threading.Lock()
+
+    def write(self, name: str, content: str | IO[bytes]) -> int:
+        """
+        Add a member to the archive.
+
+        Args:
+            name: Member path in the archive.
+            content: Member content, or a binary file object positioned at its start.
+
+        Returns:
+            int: Compressed size of the member in bytes.
+        """
+        with self._lock:
+            if isinstance(content, str):
+                self.archive.writestr(zinfo_or_arcname=name, data=content)
+            else:
+                with self.archive.open(name=name, mode="w") as member:
+                    shutil.copyfileobj(content, member)
+            return self.archive.getinfo(name=name).compress_size
+
+
+def _get_resource_name(resource: Resource) -> str:
+    return f"{resource.name}.{resource.group}" if resource.group else resource.name
+
+
+def get_namespace_inspection_resources(admin_client: DynamicClient) -> list[Resource]:
+    """
+    Discover the namespaced resources to collect: the resources that can be listed, at their preferred version.
+
+    Args:
+        admin_client: Cluster admin client.
+
+    Returns:
+        list[Resource]: Resources to collect, without NAMESPACE_INSPECTION_EXCLUDED_RESOURCES.
+    """
+    return [
+        resource
+        for resource in admin_client.resources.search()
+        if not isinstance(resource, ResourceList)
+        and resource.namespaced
+        and resource.preferred
+        and "list" in (resource.verbs or [])
+        and _get_resource_name(resource=resource) not in NAMESPACE_INSPECTION_EXCLUDED_RESOURCES
+    ]
+
+
+def _stream_pod_log(
+    core_v1_api: CoreV1Api,
+    archive: NamespaceInspectionArchive,
+    namespace: str,
+    pod_name: str,
+    container_name: str,
+    since_seconds: int,
+    previous: bool = False,
+) -> int:
+    response = core_v1_api.read_namespaced_pod_log(
+        name=pod_name,
+        namespace=namespace,
+        container=container_name,
+        since_seconds=since_seconds,
+        previous=previous,
+        _preload_content=False,
+    )
+    log_name = f"{container_name}.previous" if previous else container_name
+    try:
+        with SpooledTemporaryFile(max_size=POD_LOG_SPOOL_SIZE) as log_file:
+            for chunk in response.stream(amt=POD_LOG_CHUNK_SIZE):
+                log_file.write(chunk)
+            log_file.seek(0)
+            return archive.write(name=f"namespaces/{namespace}/pods/{pod_name}/{log_name}.log", content=log_file)
+    finally:
+        response.release_conn()
+
+
+def inspect_namespace(
+    admin_client: DynamicClient,
+    archive: NamespaceInspectionArchive,
+    namespace: str,
+    since_seconds: int,
+    resources: list[Resource],
+) -> NamespaceInspectionResult:
+    """
+    Collect the resources and pod logs of a namespace into the archive.
+
+    Resources are written to `namespaces/<namespace>/<group or core>/<plural>.yaml`, as `oc adm inspect` does.
+    A resource or a container log that cannot be collected is logged and skipped.
+
+    Args:
+        admin_client: Cluster admin client.
+        archive: Archive to write to.
+        namespace: Namespace name.
+        since_seconds: Only collect pod logs newer than this many seconds.
+        resources: Resources to collect, see get_namespace_inspection_resources.
+
+    Returns:
+        NamespaceInspectionResult: Collection time and compressed size of the namespace artifacts.
+    """
+    result = NamespaceInspectionResult(namespace=namespace)
+    start_time = time.monotonic()
+    pods: list[dict] = []
+    try:
+        for resource in resources:
+            try:
+                items = resource.get(namespace=namespace).to_dict()["items"]
+            except Exception as exp:
+                LOGGER.warning(
+                    f"[DATA_COLLECTOR] Failed to collect {_get_resource_name(resource=resource)} in {namespace}: {exp}"
+                )
+                continue
+
+            if not items:
+                continue
+            if not resource.group and resource.kind == "Pod":
+                pods = items
+            result.size_bytes += archive.write(
+                name=f"namespaces/{namespace}/{resource.group or 'core'}/{resource.name}.yaml",
+                content=yaml.safe_dump(items),
+            )
+
+        core_v1_api = CoreV1Api(api_client=admin_client.client)
+        for pod in pods:
+            pod_name = pod["metadata"]["name"]
+            pod_status = pod.get("status") or {}
+            restarted_containers = {
+                container_status["name"]
+                for container_status in (pod_status.get("initContainerStatuses") or [])
+                + (pod_status.get("containerStatuses") or [])
+                if container_status.get("restartCount")
+            }
+            for container in pod["spec"].get("initContainers", []) + pod["spec"]["containers"]:
+                for previous in (False, True) if container["name"] in restarted_containers else (False,):
+                    try:
+                        result.size_bytes += _stream_pod_log(
+                            core_v1_api=core_v1_api,
+                            archive=archive,
+                            namespace=namespace,
+                            pod_name=pod_name,
+                            container_name=container["name"],
+                            since_seconds=since_seconds,
+                            previous=previous,
+                        )
+                    except Exception as exp:
+                        LOGGER.warning(
+                            f"[DATA_COLLECTOR] Failed to collect {namespace}/{pod_name}/{container['name']} "
+                            f"{'previous ' if previous else ''}logs: {exp}"
+                        )
+    except Exception as exp:
+        result.error = str(exp)
+        LOGGER.warning(f"[DATA_COLLECTOR] Failed to inspect namespace {namespace}: {exp}")
+    finally:
+        result.duration = round(time.monotonic() - start_time, 2)
+    return result
+
+
+def inspect_namespaces(
+    admin_client: DynamicClient,
+    namespaces: list[str],
+    since_seconds: int,
+    target_dir: str,
+    max_workers: int = NAMESPACE_INSPECTION_WORKERS,
+) -> list[NamespaceInspectionResult]:
+    """
+    Collect the resources and pod logs of namespaces concurrently into `<target_dir>/inspect_collection.zip`.
+
+    Args:
+        admin_client: Cluster admin client.
+        namespaces: Namespace names.
+        since_seconds: Only collect pod logs newer than this many seconds.
+        target_dir: Directory of the archive.
+        max_workers: Maximum number of namespaces collected concurrently.
+
+    Returns:
+        list[NamespaceInspectionResult]: Result per namespace, in the order of `namespaces`.
+    """
+    os.makedirs(target_dir, exist_ok=True)
+    resources = get_namespace_inspection_resources(admin_client=admin_client)
+    with (
+        zipfile.ZipFile(
+            file=os.path.join(target_dir, NAMESPACE_INSPECTION_ARCHIVE), mode="w", compression=zipfile.ZIP_DEFLATED
+        ) as zip_archive,
+        ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="namespace-inspection") as executor,
+    ):
+        archive = NamespaceInspectionArchive(archive=zip_archive)
+        results = list(
+            executor.map(
+                lambda namespace: inspect_namespace(
+                    admin_client=admin_client,
+                    archive=archive,
+                    namespace=namespace,
+                    since_seconds=since_seconds,
+                    resources=resources,
+                ),
+                namespaces,
+            )
+        )
+
+    for result in results:
+        LOGGER.info(
+            f"[DATA_COLLECTOR] Inspected namespace {result.namespace} in {result.duration}s, {result.size_bytes} bytes"
+        )
+    return results
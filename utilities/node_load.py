@@ -0,0 +1,143 @@
+"""
+Node load time series over a test run.
+
+The CPU, memory, network and disk load of every node is read from the node-exporter metrics in Prometheus with one
+range query per metric, over the time since the sampler was created, at a fixed resolution. The VM density (VMs per
+node) is recorded at checkpoints of the run. Both are written to a JSON file, with the peak and average load per node.
+"""
+
+import json
+import logging
+import math
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from utilities.data_collector import write_to_file
+from utilities.metric_transitions import query_range
+
+if TYPE_CHECKING:
+    from utilities.prometheus_client import PrometheusClient
+
+LOGGER = logging.getLogger(__name__)
+
+NODE_LOAD_TIMELINE_FILE = "node_load_timeline.json"
+NODE_LOAD_STEP = 60
+# Range queries return at most 11000 points per series
+NODE_LOAD_MAX_POINTS = 11000
+# Per node metric queries; {rate_window} is twice the step
+NODE_LOAD_QUERIES = {
+    "cpu_usage_ratio": '1 - avg by (instance) (rate(node_cpu_seconds_total{{mode="idle"}}[{rate_window}s]))',
+    "memory_used_bytes": "sum by (instance) (node_memory_MemTotal_bytes - node_memory_MemAvailable_bytes)",
+    "network_bytes_per_second": (
+        'sum by (instance) (rate(node_network_receive_bytes_total{{device!="lo"}}[{rate_window}s]) '
+        '+ rate(node_network_transmit_bytes_total{{device!="lo"}}[{rate_window}s]))'
+    ),
+    "disk_bytes_per_second": (
+        "sum by (instance) (rate(node_disk_read_bytes_total[{rate_window}s]) "
+        "+ rate(node_disk_written_bytes_total[{rate_window}s]))"
+    ),
+}
+
+
+@dataclass
+class NodeLoadSeries:
+    """Load of a node over the run."""
+
+    values: list[tuple[float, float]]
+
+    @property
+    def peak(self) -> float:
+        return max(value for _, value in self.values)
+
+    @property
+    def average(self) -> float:
+        return sum(value for _, value in self.values) / len(self.values)
+
+    def to_report(self) -> dict[str, Any]:
+        return {"peak": self.peak, "average": self.average, "values": self.values}
+
+
+class NodeLoadSampler:
+    def __init__(self, prometheus: PrometheusClient, step: int = NODE_LOAD_STEP) -> None:
+        """
+        Sample the node load from now on, and the VM density at checkpoints.
+
+        Args:
+            prometheus: Prometheus client.
+            step: Resolution of the node load series in seconds.
+        """
+        self.prometheus = prometheus
+        self.step = step
+        self.start = int(time.time())
+        self.vm_density: list[dict[str, Any]] = []
+
+    def record_vm_density(self, checkpoint: str, vms: list[Any] | None = None) -> None:
+        """
+        Record and log the distribution of VMs on the nodes.
+
+        Args:
+            checkpoint: Name of the point of the run, e.g. `vms_started`.
+            vms: VMs to count; no VMs when not set.
+        """
+        nodes_vms = Counter([vm.vmi.node.name for vm in vms or []])
+        LOGGER.info(f"Nodes vm load distribution at {checkpoint}: {nodes_vms or 'no scale VMs running'}")
+        self.vm_density.append({"time": int(time.time()), "checkpoint": checkpoint, "nodes": dict(nodes_vms)})
+
+    def collect(self) -> dict[str, dict[str, NodeLoadSeries]]:
+        """
+        Query the node load series since the sampler was created.
+
+        Returns:
+            dict[str, dict[str, NodeLoadSeries]]: Load series per metric, per node.
+        """
+        end = int(time.time())
+        # Runs longer than NODE_LOAD_MAX_POINTS steps are sampled at a lower resolution
+        self.step = max(self.step, math.ceil((end - self.start) / NODE_LOAD_MAX_POINTS))
+        nodes_load: dict[str, dict[str, NodeLoadSeries]] = {}
+        for metric, query in NODE_LOAD_QUERIES.items():
+            for series in query_range(
+                prometheus=self.prometheus,
+                query=query.format(rate_window=2 * self.step),
+                start=self.start,
+                end=end,
+                step=self.step,
+            ):
+                nodes_load.setdefault(series["metric"].get("instance", ""), {})[metric] = NodeLoadSeries(
+                    values=[(float(timestamp), float(value)) for timestamp, value in series["values"]]
+                )
+        return nodes_load
+
+    def write(self, base_directory: str) -> None:
+        """
+        Write the node load series and the VM density timeline, and log the peak and average load per node.
+
+        Args:
+            base_directory: Directory of the timeline file.
+        """
+        nodes_load = self.collect()
+        for node, node_load in sorted(nodes_load.items()):
+            LOGGER.info(
+                f"Node {node} load: "
+                + ", ".join(
+                    f"{metric} peak {series.peak:.3g} average {series.average:.3g}"
+                    for metric, series in node_load.items()
+                )
+            )
+        write_to_file(
+            file_name=NODE_LOAD_TIMELINE_FILE,
+            content=json.dumps(
+                {
+                    "start": self.start,
+                    "step": self.step,
+                    "vm_density": self.vm_density,
+                    "nodes": {
+                        node: {metric: series.to_report() for metric, series in node_load.items()}
+                        for node, node_load in sorted(nodes_load.items())
+                    },
+                },
+                indent=2,
+            ),
+            base_directory=base_directory,
+        )
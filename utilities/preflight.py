@@ -0,0 +1,197 @@
+"""
+Session startup preflight.
+
+Startup steps are declared with their dependencies; independent steps run concurrently. Results of idempotent steps
+can be cached per cluster in a local state file for a limited time, so that consecutive sessions against the same
+cluster skip them. A timing breakdown of the steps is logged when the preflight ends.
+
+Credentials must not be cached: only steps with a `cache_ttl` are stored in the state file.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any
+
+LOGGER = logging.getLogger(__name__)
+
+PREFLIGHT_WORKERS = 4
+# Cached step results are reused for 6 hours
+PREFLIGHT_CACHE_TTL = 6 * 60 * 60
+PREFLIGHT_STATE_FILE = os.path.join(
+    os.path.expanduser("~"), ".cache", "openshift-virtualization-tests", "preflight_state.json"
+)
+
+
+@dataclass
+class PreflightStep:
+    """
+    A session startup step.
+
+    `func` is called with the results of the steps in `depends_on` as keyword arguments.
+    A step with a `cache_ttl` (in seconds) is idempotent; its result is cached per cluster for that time.
+    """
+
+    name: str
+    func: Callable[..., Any]
+    depends_on: tuple[str, ...] = ()
+    cache_ttl: int | None = None
+    duration: float | None = None
+    started_at: float | None = None
+    cached: bool = False
+    result: Any = field(default=None, repr=False)
+
+
+class PreflightStateFile:
+    def __init__(self, path: str, cluster: str) -> None:
+        """
+        Cached step results of a cluster, stored in a JSON state file shared by all clusters.
+
+        Args:
+            path: State file path.
+            cluster: Cluster identifier, e.g. the API server URL.
+        """
+        self.path = path
+        self.cluster = cluster
+        self._lock = threading.Lock()
+
+    def _read(self) -> dict[str, Any]:
+        try:
+            with open(self.path) as fd:
+                return json.load(fd)
+        except OSError, ValueError:
+            return {}
+
+    def get(self, name: str, ttl: int) -> tuple[bool, Any]:
+        """
+        Get a cached step result.
+
+        Args:
+            name: Step name.
+            ttl: Maximum age of the cached result in seconds.
+
+        Returns:
+            tuple[bool, Any]: Whether a result newer than `ttl` is cached, and the result.
+        """
+        with self._lock:
+            entry = self._read().get(self.cluster, {}).get(name)
+        if entry and time.time() - entry["timestamp"] < ttl:
+            return True, entry["value"]
+        return False, None
+
+    def set(self, name: str, value: Any) -> None:
+        """
+        Cache a step result.
+
+        The cache is optional: a state file that cannot be written is logged and the result is not cached.
+
+        Args:
+            name: Step name.
+            value: JSON serializable step result.
+        """
+        with self._lock:
+            state = self._read()
+            state.setdefault(self.cluster, {})[name] = {"value": value, "timestamp": time.time()}
+            tmp_path = f"{self.path}.{os.getpid()}"
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                with open(tmp_path, "w") as fd:
+                    json.dump(state, fd, indent=2)
+                os.replace(tmp_path, self.path)
+            except OSError as exp:
+                LOGGER.warning(f"Failed to cache preflight step {name} in {self.path}: {exp}")
+
+
+class Preflight:
+    def __init__(
+        self,
+        steps: list[PreflightStep],
+        state_file: PreflightStateFile | None = None,
+        max_workers: int = PREFLIGHT_WORKERS,
+    ) -> None:
+        """
+        Run startup steps concurrently, each one once all the steps it depends on are done.
+
+        Args:
+            steps: Startup steps; a step may only depend on steps declared before it.
+            state_file: Cache of idempotent step results; no caching when not set.
+            max_workers: Maximum number of steps running concurrently.
+        """
+        self.steps: dict[str, PreflightStep] = {}
+        self.state_file = state_file
+        self.max_workers = max_workers
+        for step in steps:
+            if missing_steps := [name for name in step.depends_on if name not in self.steps]:
+                raise ValueError(f"Preflight step {step.name} depends on steps not declared before it: {missing_steps}")
+            self.steps[step.name] = step
+
+    def _run_step(self, step: PreflightStep) -> Any:
+        step.started_at = time.monotonic()
+        try:
+            if step.cache_ttl and self.state_file:
+                step.cached, value = self.state_file.get(name=step.name, ttl=step.cache_ttl)
+                if step.cached:
+                    return value
+
+            value = step.func(**{name: self.steps[name].result for name in step.depends_on})
+            if step.cache_ttl and self.state_file:
+                self.state_file.set(name=step.name, value=value)
+            return value
+        finally:
+            step.duration = time.monotonic() - step.started_at
+
+    def run(self) -> dict[str, Any]:
+        """
+        Run the steps and log their timing breakdown.
+
+        A failing step stops the preflight: no further step is started, running steps are waited for, and the step
+        exception is raised.
+
+        Returns:
+            dict[str, Any]: Result per step name.
+        """
+        started_at = time.monotonic()
+        pending = dict(self.steps)
+        done: set[str] = set()
+        running: dict[Future, PreflightStep] = {}
+        error: BaseException | None = None
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="preflight") as executor:
+            while pending or running:
+                if error is None:
+                    for step in [step for step in pending.values() if set(step.depends_on) <= done]:
+                        running[executor.submit(self._run_step, step=step)] = pending.pop(step.name)
+
+                if not running:
+                    break
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    step = running.pop(future)
+                    if future.exception():
+                        error = error or future.exception()
+                    else:
+                        step.result = future.result()
+                        done.add(step.name)
+
+                if error and not running:
+                    break
+
+        self._log_timing(duration=time.monotonic() - started_at, started_at=started_at)
+        if error:
+            raise error
+        return {name: step.result for name, step in self.steps.items()}
+
+    def _log_timing(self, duration: float, started_at: float) -> None:
+        LOGGER.info(f"Session startup preflight took {duration:.2f}s")
+        for step in sorted(
+            [step for step in self.steps.values() if step.started_at is not None], key=lambda step: step.started_at
+        ):
+            LOGGER.info(
+                f"  {step.name}: started at +{step.started_at - started_at:.2f}s, took {step.duration:.2f}s"
+                f"{' (cached)' if step.cached else ''}"
+            )
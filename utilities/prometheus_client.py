@@ -0,0 +1,201 @@
+"""
+Shared Prometheus client.
+
+`PrometheusClient` is an `ocp_utilities` `Prometheus` whose requests go through one `requests.Session`, so HTTPS
+connections to the Prometheus route are kept alive and reused, with:
+
+- a bearer token created for `token_duration` seconds and refreshed before it expires (or when a request is rejected
+  with 401), instead of a long lived token created once;
+- retries with exponential backoff on 429 and 5xx responses (honoring `Retry-After`);
+- request count, duration, errors and retries per API endpoint, written to `prometheus_request_timing.json` in the data
+  collector directory when the session ends.
+
+`get_prometheus_client` returns the client shared by the session.
+"""
+
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from json import JSONDecodeError
+from typing import Any
+
+import requests
+from ocp_utilities.monitoring import Prometheus
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import utilities.data_collector
+import utilities.infra
+from utilities.constants.timeouts import TIMEOUT_30SEC
+
+LOGGER = logging.getLogger(__name__)
+
+PROMETHEUS_REQUEST_TIMING_FILE = "prometheus_request_timing.json"
+PROMETHEUS_TOKEN_DURATION = 3600
+# Seconds before the token expiry at which it is refreshed
+PROMETHEUS_TOKEN_REFRESH_MARGIN = 300
+PROMETHEUS_RETRIES = 5
+PROMETHEUS_RETRY_BACKOFF_FACTOR = 0.5
+PROMETHEUS_RETRY_STATUSES = (429, 500, 502, 503, 504)
+PROMETHEUS_POOL_SIZE = 10
+
+
+@dataclass
+class RequestTiming:
+    """Requests of a Prometheus API endpoint."""
+
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    errors: int = 0
+    retries: int = 0
+
+    def to_report(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "total": round(self.total, 3),
+            "mean": round(self.total / self.count, 3) if self.count else 0,
+            "max": round(self.max, 3),
+            "errors": self.errors,
+            "retries": self.retries,
+        }
+
+
+class PrometheusClient(Prometheus):
+    def __init__(self, token_duration: int = PROMETHEUS_TOKEN_DURATION, verify_ssl: bool | str = False) -> None:
+        """
+        Prometheus client with connection reuse, token refresh, retries and request timing.
+
+        Args:
+            token_duration: Lifetime of the bearer tokens in seconds.
+            verify_ssl: Whether to verify the route certificate, or the path to a CA bundle.
+        """
+        self.token_duration = token_duration
+        self.request_timing: dict[str, RequestTiming] = {}
+        self._lock = threading.Lock()
+        self._token_expires_at = 0.0
+        self.session = requests.Session()
+        self.session.mount(
+            prefix="https://",
+            adapter=HTTPAdapter(
+                pool_maxsize=PROMETHEUS_POOL_SIZE,
+                max_retries=Retry(
+                    total=PROMETHEUS_RETRIES,
+                    backoff_factor=PROMETHEUS_RETRY_BACKOFF_FACTOR,
+                    status_forcelist=PROMETHEUS_RETRY_STATUSES,
+                    allowed_methods=("GET",),
+                    raise_on_status=False,
+                ),
+            ),
+        )
+        super().__init__(bearer_token=self._create_token(), verify_ssl=verify_ssl)
+
+    def _create_token(self) -> str:
+        token = utilities.infra.get_prometheus_k8s_token(duration=f"{self.token_duration}s")
+        self._token_expires_at = time.time() + self.token_duration
+        return token
+
+    def refresh_token(self, force: bool = False) -> None:
+        """
+        Create a new bearer token if the current one is about to expire.
+
+        Args:
+            force: Create a new token even if the current one is not about to expire.
+        """
+        with self._lock:
+            if force or time.time() > self._token_expires_at - PROMETHEUS_TOKEN_REFRESH_MARGIN:
+                LOGGER.info("Prometheus: refreshing bearer token")
+                self.bearer_token = self._create_token()
+                self.headers = {"Authorization": f"Bearer {self.bearer_token}"}
+
+    def _send(self, path: str, params: dict[str, Any] | None) -> requests.Response:
+        start = time.perf_counter()
+        response = self.session.get(
+            url=f"{self.api_url}{path}",
+            params=params,
+            headers=self.headers,
+            verify=self.verify_ssl,
+            timeout=TIMEOUT_30SEC,
+        )
+        duration = time.perf_counter() - start
+        retries = response.raw.retries if isinstance(getattr(response.raw, "retries", None), Retry) else None
+        with self._lock:
+            request_timing = self.request_timing.setdefault(path.split("?", maxsplit=1)[0], RequestTiming())
+            request_timing.count += 1
+            request_timing.total += duration
+            request_timing.max = max(request_timing.max, duration)
+            request_timing.errors += response.status_code >= 400
+            request_timing.retries += len(retries.history) if retries else 0
+        return response
+
+    def get(self, path: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+        """
+        Send a GET request to the Prometheus API.
+
+        Args:
+            path: Request path, e.g. `/api/v1/query`.
+            params: Query string parameters, URL encoded.
+
+        Returns:
+            dict[str, Any]: JSON response.
+
+        Raises:
+            JSONDecodeError: If the response is not JSON.
+        """
+        self.refresh_token()
+        response = self._send(path=path, params=params)
+        if response.status_code == requests.codes.unauthorized:
+            self.refresh_token(force=True)
+            response = self._send(path=path, params=params)
+
+        try:
+            return response.json()
+        except JSONDecodeError:
+            LOGGER.error(
+                f"Prometheus: {path} response is not JSON: status_code={response.status_code} response={response.text}"
+            )
+            raise
+
+    def _get_response(self, query: str) -> dict[str, Any]:
+        return self.get(path=query)
+
+    def query(self, query: str) -> dict[str, Any]:
+        return self.get(path=f"{self.api_v1}/query", params={"query": query})
+
+    def write_request_timing(self, base_directory: str) -> None:
+        """
+        Write the request count, duration, errors and retries per API endpoint, if any request was sent.
+
+        Args:
+            base_directory: Directory of the report.
+        """
+        if not self.request_timing:
+            return
+
+        report = {path: request_timing.to_report() for path, request_timing in sorted(self.request_timing.items())}
+        LOGGER.info(f"Prometheus requests: {report}")
+        utilities.data_collector.write_to_file(
+            file_name=PROMETHEUS_REQUEST_TIMING_FILE,
+            content=json.dumps(report, indent=2),
+            base_directory=base_directory,
+        )
+
+
+_prometheus_client: PrometheusClient | None = None
+_prometheus_client_lock = threading.Lock()
+
+
+def get_prometheus_client() -> PrometheusClient:
+    """
+    Get the Prometheus client shared by the session, created on first use.
+
+    Returns:
+        PrometheusClient: Shared Prometheus client.
+    """
+    global _prometheus_client
+    with _prometheus_client_lock:
+        if _prometheus_client is None:
+            _prometheus_client = PrometheusClient()
+        return _prometheus_client
@@ -0,0 +1,98 @@
+"""
+PromQL query batching.
+
+Metric selectors with the same equality label matchers are merged into one query, e.g. `a{name="vm"}` and
+`b{name="vm"}` into `{__name__=~"a|b",name="vm"}`, and the results are split back per metric name. The merged query
+returns the same series as the selectors run on their own, as the series of different metrics are told apart by
+their `__name__` label.
+"""
+
+import logging
+import re
+from collections import defaultdict
+from collections.abc import Callable
+from typing import Any
+
+LOGGER = logging.getLogger(__name__)
+
+# Metric selectors merged into a single query by batch_queries
+BATCH_QUERY_MAX_METRICS = 20
+PROMQL_SELECTOR_REGEX = re.compile(
+    r"^\s*(?P<metric_name>[a-zA-Z_:][a-zA-Z0-9_:]*)\s*(?:\{(?P<label_matchers>.*)\})?\s*$"
+)
+PROMQL_LABEL_MATCHER_REGEX = re.compile(
+    r"""\s*(?P<label>[a-zA-Z_][a-zA-Z0-9_]*)\s*=\s*(?P<value>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')\s*(?:,|$)"""
+)
+
+
+def parse_metric_selector(query: str) -> tuple[str, tuple[str, ...]] | None:
+    """
+    Parse a PromQL instant vector selector with equality label matchers only, e.g. `metric{name="vm"}`.
+
+    Returns:
+        tuple[str, tuple[str, ...]] | None: Metric name and sorted label matchers, None when the query is anything
+            else (functions, operators, regex or negative matchers) and cannot be merged with other queries.
+    """
+    if not (selector_match := PROMQL_SELECTOR_REGEX.match(query)):
+        return None
+
+    label_matchers_text = (selector_match["label_matchers"] or "").strip()
+    label_matchers = list(PROMQL_LABEL_MATCHER_REGEX.finditer(label_matchers_text))
+    if "".join(label_matcher.group(0) for label_matcher in label_matchers) != label_matchers_text:
+        return None
+
+    return selector_match["metric_name"], tuple(
+        sorted(f"{label_matcher['label']}={label_matcher['value']}" for label_matcher in label_matchers)
+    )
+
+
+def batch_queries(
+    queries: list[str], run_query: Callable[..., list[dict[str, Any]]]
+) -> dict[str, list[dict[str, Any]]]:
+    """
+    Run several queries in as few requests as possible, merging the metric selectors with the same label matchers.
+
+    Queries that are not metric selectors are run on their own.
+
+    Args:
+        queries: PromQL queries.
+        run_query: Called with `query=` to run a query, returns its result series, e.g. an instant or a range query.
+
+    Returns:
+        dict[str, list[dict[str, Any]]]: Result series per query.
+    """
+    results: dict[str, list[dict[str, Any]]] = {}
+    queries_by_label_matchers: defaultdict[tuple[str, ...], defaultdict[str, list[str]]] = defaultdict(
+        lambda: defaultdict(list)
+    )
+    requests = 0
+    for query in dict.fromkeys(queries):
+        if metric_selector := parse_metric_selector(query=query):
+            metric_name, label_matchers = metric_selector
+            queries_by_label_matchers[label_matchers][metric_name].append(query)
+        else:
+            results[query] = run_query(query=query)
+            requests += 1
+
+    for label_matchers, queries_by_metric_name in queries_by_label_matchers.items():
+        metric_names = list(queries_by_metric_name)
+        for index in range(0, len(metric_names), BATCH_QUERY_MAX_METRICS):
+            batch_metric_names = metric_names[index : index + BATCH_QUERY_MAX_METRICS]
+            requests += 1
+            if len(batch_metric_names) == 1:
+                results_by_metric_name = {
+                    batch_metric_names[0]: run_query(query=queries_by_metric_name[batch_metric_names[0]][0])
+                }
+            else:
+                name_matcher = f'__name__=~"{"|".join(batch_metric_names)}"'
+                merged_query = "{" + ",".join([name_matcher, *label_matchers]) + "}"
+                results_by_metric_name = defaultdict(list)
+                for result in run_query(query=merged_query):
+                    results_by_metric_name[result["metric"].get("__name__")].append(result)
+
+            for metric_name in batch_metric_names:
+                for query in queries_by_metric_name[metric_name]:
+                    results[query] = results_by_metric_name.get(metric_name, [])
+
+    LOGGER.debug(f"Ran {len(results)} queries in {requests} requests")
+    return {query: results[query] for query in queries}
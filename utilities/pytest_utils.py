@@ -9,7 +9,12 @@ import shutil
 import socket
 import sys
 import tempfile
+import time
+import weakref
 from collections import defaultdict
+from collections.abc import Generator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from functools import cache, partial
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
@@ -27,6 +32,7 @@ import pytest
 from kubernetes.dynamic import DynamicClient
 from ocp_resources.config_map import ConfigMap
 from ocp_resources.namespace import Namespace
+from ocp_resources.network_config_openshift_io import Network
 from ocp_resources.resource import ResourceEditor
 from pytest_testconfig import config as py_config
 
@@ -60,9 +66,16 @@ from utilities.os_utils import (
     generate_linux_instance_type_os_matrix,
     generate_os_matrix_dict,
 )
+from utilities.preflight import PREFLIGHT_STATE_FILE, Preflight, PreflightStateFile, PreflightStep
 
 LOGGER = logging.getLogger(__name__)
 
+MATRIX_SCOPE_REGEX = re.compile(r"__(module|class|function)__$")
+BASE_MATRIX_NAME_REGEX = re.compile(r".*?(.*?_matrix)_(?:.*_matrix)+")
+COLLECTION_TIMING_FILE = "collection_timing.json"
+# Number of slowest matrices listed in the collection timing report
+COLLECTION_TIMING_SLOWEST_MATRICES = 10
+
 
 _failure_info: _FailureInfoDict | None = None
 
@@ -139,8 +152,32 @@ def _inject_failure_junit(session: pytest.Session) -> None:
     LOGGER.info(f"Injected synthetic failure testcase into JUnit XML (exit code: {return_code})")
 
 
+class MatrixParamsCache:
+    def __init__(self) -> None:
+        """
+        Matrix params computed during the collection of a pytest session, keyed by matrix name.
+
+        Dynamic matrices call functions from utilities.pytest_matrix_utils which may be expensive; every matrix is
+        computed once per session and reused by all test functions that use it.
+        """
+        self.params: dict[str, list[Any]] = {}
+        self.durations: dict[str, float] = {}
+        self.hits = 0
+
+
+# Matrix params cache per pytest config, released with the config
+_matrix_params_caches: weakref.WeakKeyDictionary[Any, MatrixParamsCache] = weakref.WeakKeyDictionary()
+
+
+def get_matrix_params_cache(pytest_config: Any) -> MatrixParamsCache:
+    if pytest_config not in _matrix_params_caches:
+        _matrix_params_caches[pytest_config] = MatrixParamsCache()
+    return _matrix_params_caches[pytest_config]
+
+
+@cache
 def get_base_matrix_name(matrix_name):
-    match = re.match(r".*?(.*?_matrix)_(?:.*_matrix)+", matrix_name)
+    match = BASE_MATRIX_NAME_REGEX.match(matrix_name)
     if match:
         return match.group(1)
 
@@ -148,6 +185,29 @@ def get_base_matrix_name(matrix_name):
 
 
 def get_matrix_params(pytest_config, matrix_name):
+    """
+    Get matrix params, computed once per pytest session and matrix name.
+
+    Args:
+       pytest_config (_pytest.config.Config): pytest config
+       matrix_name (str): matrix name
+
+    Returns:
+         list: list of matrix params
+    """
+    matrix_params_cache = get_matrix_params_cache(pytest_config=pytest_config)
+    if matrix_name in matrix_params_cache.params:
+        matrix_params_cache.hits += 1
+        return matrix_params_cache.params[matrix_name]
+
+    start_time = time.monotonic()
+    matrix_params = _compute_matrix_params(pytest_config=pytest_config, matrix_name=matrix_name)
+    matrix_params_cache.durations[matrix_name] = time.monotonic() - start_time
+    matrix_params_cache.params[matrix_name] = matrix_params
+    return matrix_params
+
+
+def _compute_matrix_params(pytest_config, matrix_name):
     """
     Customize matrix based on existing matrix
     Name should be <base_matrix><_extra_matrix>_<scope>
@@ -199,6 +259,86 @@ def get_matrix_params(pytest_config, matrix_name):
     return _matrix_params if isinstance(_matrix_params, list) else [_matrix_params]
 
 
+class CollectionTimingReport:
+    def __init__(self) -> None:
+        """
+        Time spent in the phases of the test collection, to make collection time regressions visible.
+        """
+        self.started_at = time.monotonic()
+        self.phases: defaultdict[str, float] = defaultdict(float)
+
+    @contextmanager
+    def measure(self, phase: str) -> Generator[None]:
+        """
+        Add the time spent in the context to a collection phase.
+
+        Args:
+            phase: Collection phase name.
+        """
+        start_time = time.monotonic()
+        try:
+            yield
+        finally:
+            self.phases[phase] += time.monotonic() - start_time
+
+    def to_dict(self, session: pytest.Session) -> dict[str, Any]:
+        matrix_params_cache = get_matrix_params_cache(pytest_config=session.config)
+        slowest_matrices = sorted(matrix_params_cache.durations.items(), key=lambda item: item[1], reverse=True)
+        return {
+            "total_duration": round(time.monotonic() - self.started_at, 3),
+            "phases": {phase: round(duration, 3) for phase, duration in self.phases.items()},
+            "collected_items": len(session.items),
+            "matrix_params": {
+                "computed": len(matrix_params_cache.params),
+                "cache_hits": matrix_params_cache.hits,
+                "slowest": {
+                    matrix_name: round(duration, 3)
+                    for matrix_name, duration in slowest_matrices[:COLLECTION_TIMING_SLOWEST_MATRICES]
+                },
+            },
+        }
+
+    def write(self, session: pytest.Session) -> None:
+        """
+        Log the collection timing and write it to `collection_timing.json` in the data collector base directory.
+
+        Args:
+            session: pytest session.
+        """
+        report = self.to_dict(session=session)
+        LOGGER.info(
+            f"Collected {report['collected_items']} items in {report['total_duration']}s, "
+            f"phases: {report['phases']}, matrix params computed: {report['matrix_params']['computed']}, "
+            f"cache hits: {report['matrix_params']['cache_hits']}"
+        )
+        try:
+            write_to_file(
+                file_name=COLLECTION_TIMING_FILE,
+                content=json.dumps(report, indent=2),
+                base_directory=get_data_collector_base_directory(),
+            )
+        except Exception as exp:
+            LOGGER.warning(f"Failed to write collection timing report: {exp}")
+
+
+def measure_collection_phase(pytest_config: pytest.Config, phase: str) -> AbstractContextManager[None]:
+    """
+    Measure a collection phase, when the collection is timed.
+
+    The collection is not timed when the tests or the fixtures are only listed (e.g. `--collect-only`,
+    `--fixtures`, which collects without the pytest_collection hook).
+
+    Args:
+        pytest_config: pytest config.
+        phase: Collection phase name.
+
+    Returns:
+        AbstractContextManager: Context adding its duration to the collection phase.
+    """
+    collection_timing = getattr(pytest_config.option, "collection_timing", None)
+    return collection_timing.measure(phase=phase) if collection_timing else nullcontext()
+
+
 def _validate_storage_class_options(
     cmd_default_storage_class: str | None = None,
     cmdline_storage_class_matrix: list[str] | None = None,
@@ -415,6 +555,74 @@ def get_artifactory_server_url(cluster_host_url, session):
     return artifactory_server
 
 
+def run_session_preflight(session: pytest.Session, admin_client: DynamicClient) -> None:
+    """
+    Run the session startup steps, with independent steps running concurrently, and update py_config.
+
+    The cluster service network and the artifactory server URL are cached per cluster for `--preflight-cache-ttl`
+    seconds. Credentials are never cached. The run-in-progress namespace and ConfigMap are deployed only after all
+    other steps pass.
+
+    Args:
+        session: pytest session.
+        admin_client: Cluster admin client.
+    """
+    cache_ttl = session.config.getoption("--preflight-cache-ttl")
+    steps = [
+        PreflightStep(
+            name="version_explorer_url", func=partial(get_cnv_version_explorer_url, pytest_config=session.config)
+        ),
+        PreflightStep(
+            name="cluster_service_network",
+            func=lambda: Network(client=admin_client, name="cluster").instance.status.serviceNetwork,
+            cache_ttl=cache_ttl,
+        ),
+        PreflightStep(name="run_in_progress_check", func=partial(stop_if_run_in_progress, client=admin_client)),
+    ]
+    if not session.config.getoption("--skip-artifactory-check"):
+        steps.extend([
+            PreflightStep(
+                name="artifactory_server_url",
+                func=lambda: (
+                    py_config["server_url"]
+                    or get_artifactory_server_url(cluster_host_url=admin_client.configuration.host, session=session)
+                ),
+                # A server set by the user is not cached, so that changing it takes effect
+                cache_ttl=None if py_config["server_url"] or os.environ.get("ARTIFACTORY_SERVER") else cache_ttl,
+            ),
+            PreflightStep(
+                name="os_login", func=partial(get_cnv_tests_secret_by_name, secret_name="os_login", session=session)
+            ),
+        ])
+    steps.extend([
+        PreflightStep(
+            name="run_in_progress_namespace",
+            func=partial(deploy_run_in_progress_namespace, client=admin_client),
+            depends_on=tuple(step.name for step in steps),
+        ),
+        PreflightStep(
+            name="run_in_progress_config_map",
+            func=partial(deploy_run_in_progress_config_map, client=admin_client, session=session),
+            depends_on=("run_in_progress_namespace",),
+        ),
+    ])
+
+    results = Preflight(
+        steps=steps,
+        state_file=PreflightStateFile(path=PREFLIGHT_STATE_FILE, cluster=admin_client.configuration.host)
+        if cache_ttl
+        else None,
+    ).run()
+    py_config["version_explorer_url"] = results["version_explorer_url"]
+    py_config["cluster_service_network"] = results["cluster_service_network"]
+    if "artifactory_server_url" in results:
+        py_config["server_url"] = results["artifactory_server_url"]
+        py_config["servers"] = {
+            name: _server.format(server=py_config["server_url"]) for name, _server in py_config["servers"].items()
+        }
+        py_config["os_login_param"] = results["os_login"]
+
+
 def get_cnv_version_explorer_url(pytest_config):
     if pytest_config.getoption("install") or pytest_config.getoption("upgrade") in ("eus", "cnv"):
         LOGGER.info("Checking for cnv version explorer url:")
@@ -48,6 +48,7 @@ sys.modules["utilities.data_collector"] = mock_data_collector
 sys.modules["jira"] = mock_jira
 
 import utilities
+from utilities.unittests.recorded_prometheus import RecordedPrometheus
 
 # Also set them as attributes of the utilities module for tests that need them
 utilities.hco = mock_hco  # type: ignore[attr-defined]
@@ -203,3 +204,12 @@ def mock_os_images():
         "fedora": mock_fedora_class,
         "centos": mock_centos_class,
     }
+
+
+@pytest.fixture
+def recorded_prometheus():
+    """Recorded Prometheus API stand-in, serving on a local port for the test"""
+    recorded_prometheus = RecordedPrometheus()
+    recorded_prometheus.start()
+    yield recorded_prometheus
+    recorded_prometheus.stop()
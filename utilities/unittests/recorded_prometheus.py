@@ -0,0 +1,294 @@
+"""
+Recorded Prometheus API stand-in for unit tests and benchmarks of the metric helpers.
+
+`RecordedPrometheus` is a local HTTP server answering the Prometheus API endpoints used by the helpers
+(`/api/v1/query`, `/api/v1/query_range`, `/api/v1/alerts` and `/api/v1/targets`) from recorded series and alerts,
+so the helpers run unchanged, through a real `PrometheusClient`, without a cluster.
+
+Recorded timestamps are offsets in seconds from the start of the server and follow the wall clock: a sample recorded
+at offset 5 is served from 5 seconds after the server started, so the evolution of a metric during a wait can be
+scripted. Samples at negative offsets are served right away.
+
+Metric selectors (`name{label="value",...}`, with `=`, `!=`, `=~` and `!~` matchers, including `__name__`) are
+evaluated against the recorded series; other PromQL expressions are answered from the series recorded for that exact
+expression, and unknown queries get an empty result, as Prometheus returns for absent metrics.
+"""
+
+import json
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from unittest.mock import patch
+from urllib.parse import parse_qsl, urlparse
+
+from ocp_utilities.monitoring import Prometheus
+
+from utilities.prometheus_client import PrometheusClient
+
+# Samples older than the lookback delta are stale and not returned by instant queries
+LOOKBACK_DELTA = 300
+METRIC_SELECTOR_REGEX = re.compile(r"^\s*(?P<name>[a-zA-Z_:][a-zA-Z0-9_:]*)?\s*(?:\{(?P<matchers>.*)\})?\s*$")
+LABEL_MATCHER_REGEX = re.compile(
+    r"\s*(?P<label>[a-zA-Z_]\w*)\s*(?P<op>=~|!~|!=|=)\s*"
+    r"(?P<quote>[\"'])(?P<value>(?:(?!(?P=quote))[^\\]|\\.)*)(?P=quote)\s*,?"
+)
+DURATION_UNITS = {"s": 1, "m": 60, "h": 3600}
+
+
+@dataclass
+class RecordedSeries:
+    """Recorded samples of a series, as (offset, value) sorted by offset."""
+
+    labels: dict[str, str]
+    samples: list[tuple[float, str]] = field(default_factory=list)
+
+    def value_at(self, offset: float) -> str | None:
+        """Value of the latest sample at or before `offset`, None if there is none within the lookback delta."""
+        value = None
+        for sample_offset, sample_value in self.samples:
+            if sample_offset > offset:
+                break
+            value = sample_value if offset - sample_offset <= LOOKBACK_DELTA else None
+        return value
+
+
+def _parse_selector(query: str) -> list[tuple[str, str, str]] | None:
+    selector = METRIC_SELECTOR_REGEX.match(query)
+    if not selector or not (selector.group("name") or selector.group("matchers")):
+        return None
+
+    label_matchers = [("__name__", "=", selector.group("name"))] if selector.group("name") else []
+    matchers = selector.group("matchers") or ""
+    position = 0
+    while position < len(matchers):
+        if not (label_matcher := LABEL_MATCHER_REGEX.match(matchers, position)):
+            return None
+        label_matchers.append((
+            label_matcher.group("label"),
+            label_matcher.group("op"),
+            re.sub(r"\\(.)", r"\1", label_matcher.group("value")),
+        ))
+        position = label_matcher.end()
+    return label_matchers
+
+
+def _matches(labels: dict[str, str], label_matchers: list[tuple[str, str, str]]) -> bool:
+    for label, op, value in label_matchers:
+        label_value = labels.get(label, "")
+        if (
+            (op == "=" and label_value != value)
+            or (op == "!=" and label_value == value)
+            or (op == "=~" and not re.fullmatch(value, label_value))
+            or (op == "!~" and re.fullmatch(value, label_value))
+        ):
+            return False
+    return True
+
+
+def _parse_duration(duration: str) -> float:
+    if duration[-1] in DURATION_UNITS:
+        return float(duration[:-1]) * DURATION_UNITS[duration[-1]]
+    return float(duration)
+
+
+class RecordedPrometheus:
+    def __init__(self, scrape_interval: int = 1) -> None:
+        """
+        Prometheus API stand-in serving recorded series and alerts, see `start`.
+
+        Args:
+            scrape_interval: Scrape interval reported by `/api/v1/targets`, and used as the client poll interval.
+        """
+        self.scrape_interval = scrape_interval
+        self.series: list[RecordedSeries] = []
+        self.expressions: dict[str, list[RecordedSeries]] = {}
+        self.errors: dict[str, str] = {}
+        self.alerts: list[tuple[float, list[dict[str, Any]]]] = []
+        # (path, params) of every request received
+        self.requests: list[tuple[str, dict[str, str]]] = []
+        self.start_time = time.time()
+        self._server: ThreadingHTTPServer | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def record_series(
+        self, labels: dict[str, str], samples: dict[float, str | float], query: str | None = None
+    ) -> None:
+        """
+        Record a series.
+
+        Args:
+            labels: Series labels, including `__name__` for a metric.
+            samples: Sample value per offset in seconds from the server start.
+            query: PromQL expression answered with this series; when not set, the series is matched by the metric
+                selectors.
+        """
+        series = RecordedSeries(
+            labels=labels, samples=[(offset, str(value)) for offset, value in sorted(samples.items())]
+        )
+        if query:
+            self.expressions.setdefault(query, []).append(series)
+        else:
+            self.series.append(series)
+
+    def replay(self, result: list[dict[str, Any]], offset: float = 0, query: str | None = None) -> None:
+        """
+        Record the series of a range query result captured from a cluster, shifted so the first sample is at `offset`.
+
+        Args:
+            result: `data.result` of a `/api/v1/query_range` response.
+            offset: Offset in seconds from the server start of the first sample.
+            query: PromQL expression answered with these series, see `record_series`.
+        """
+        first_timestamp = min(float(timestamp) for series in result for timestamp, _ in series["values"])
+        for series in result:
+            self.record_series(
+                labels=series["metric"],
+                samples={float(timestamp) - first_timestamp + offset: value for timestamp, value in series["values"]},
+                query=query,
+            )
+
+    def record_error(self, query: str, error: str) -> None:
+        """Answer `query` with a `bad_data` error."""
+        self.errors[query] = error
+
+    def record_alerts(self, alerts: list[dict[str, Any]], offset: float = 0) -> None:
+        """
+        Record the alerts served from `offset` seconds after the server start, until the next recorded alerts.
+
+        Args:
+            alerts: Alerts, as in `/api/v1/alerts` `data.alerts`.
+            offset: Offset in seconds from the server start.
+        """
+        self.alerts.append((offset, alerts))
+        self.alerts.sort(key=lambda offset_alerts: offset_alerts[0])
+
+    def offset(self, timestamp: float | None = None) -> float:
+        """Offset from the server start of `timestamp`, now when not set."""
+        return round((timestamp if timestamp is not None else time.time()) - self.start_time, 3)
+
+    def evaluate(self, query: str, timestamp: float) -> list[tuple[dict[str, str], str]]:
+        """
+        Evaluate an instant query.
+
+        Args:
+            query: PromQL query.
+            timestamp: Evaluation timestamp.
+
+        Returns:
+            list[tuple[dict[str, str], str]]: Labels and value of every series with a sample at `timestamp`.
+        """
+        if query in self.expressions:
+            series = self.expressions[query]
+        elif label_matchers := _parse_selector(query=query):
+            series = [series for series in self.series if _matches(labels=series.labels, label_matchers=label_matchers)]
+        else:
+            series = []
+
+        offset = self.offset(timestamp=timestamp)
+        return [(series.labels, value) for series in series if (value := series.value_at(offset=offset)) is not None]
+
+    def _query(self, params: dict[str, str]) -> dict[str, Any]:
+        timestamp = float(params.get("time", time.time()))
+        return {
+            "resultType": "vector",
+            "result": [
+                {"metric": labels, "value": [round(timestamp, 3), value]}
+                for labels, value in self.evaluate(query=params["query"], timestamp=timestamp)
+            ],
+        }
+
+    def _query_range(self, params: dict[str, str]) -> dict[str, Any]:
+        start, end, step = float(params["start"]), float(params["end"]), _parse_duration(duration=params["step"])
+        series_values: dict[tuple[tuple[str, str], ...], dict[str, Any]] = {}
+        timestamp = start
+        while timestamp <= end:
+            for labels, value in self.evaluate(query=params["query"], timestamp=timestamp):
+                series_values.setdefault(tuple(sorted(labels.items())), {"metric": labels, "values": []})[
+                    "values"
+                ].append([round(timestamp, 3), value])
+            timestamp += step
+        return {"resultType": "matrix", "result": list(series_values.values())}
+
+    def _alerts(self) -> dict[str, Any]:
+        offset = self.offset()
+        alerts = [alerts for alerts_offset, alerts in self.alerts if alerts_offset <= offset]
+        return {"alerts": alerts[-1] if alerts else []}
+
+    def _targets(self) -> dict[str, Any]:
+        return {
+            "activeTargets": [
+                {"labels": {"job": "prometheus-k8s"}, "scrapeInterval": f"{self.scrape_interval}s", "health": "up"}
+            ]
+        }
+
+    def handle(self, path: str, params: dict[str, str]) -> tuple[int, dict[str, Any]]:
+        """
+        Answer an API request.
+
+        Args:
+            path: Request path.
+            params: Query string parameters.
+
+        Returns:
+            tuple[int, dict[str, Any]]: HTTP status code and JSON response.
+        """
+        self.requests.append((path, params))
+        if (query := params.get("query")) in self.errors:
+            return 400, {"status": "error", "errorType": "bad_data", "error": self.errors[query]}
+
+        endpoints = {
+            "/api/v1/query": lambda: self._query(params=params),
+            "/api/v1/query_range": lambda: self._query_range(params=params),
+            "/api/v1/alerts": self._alerts,
+            "/api/v1/targets": self._targets,
+        }
+        if path not in endpoints:
+            return 404, {"status": "error", "errorType": "not_found", "error": f"{path} not found"}
+        return 200, {"status": "success", "data": endpoints[path]()}
+
+    def start(self) -> None:
+        """Start serving on a free local port; recorded offsets are relative to this call."""
+        recorded_prometheus = self
+
+        class RecordedPrometheusHandler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                url = urlparse(self.path)
+                status_code, response = recorded_prometheus.handle(path=url.path, params=dict(parse_qsl(url.query)))
+                body = json.dumps(response).encode()
+                self.send_response(status_code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), RecordedPrometheusHandler)
+        # Millisecond resolution, as the timestamps of the API
+        self.start_time = round(time.time(), 3)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def client(self) -> PrometheusClient:
+        """
+        Create a `PrometheusClient` sending its requests to this server.
+
+        Returns:
+            PrometheusClient: Prometheus client.
+        """
+        with (
+            patch.object(Prometheus, "_get_route", return_value=self.url),
+            patch("utilities.prometheus_client.utilities.infra.get_prometheus_k8s_token", return_value="recorded"),
+        ):
+            return PrometheusClient()
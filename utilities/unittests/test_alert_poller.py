@@ -0,0 +1,133 @@
+"""Unit tests for alert_poller module"""
+
+import json
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+from timeout_sampler import TimeoutExpiredError
+
+from utilities.alert_poller import AlertPoller, get_alert_poller, write_alert_timeline
+
+
+def _alert(alert_name, state, **labels):
+    return {"labels": {"alertname": alert_name, **labels}, "state": state}
+
+
+def _alerts_response(*alerts):
+    return {"data": {"alerts": list(alerts)}}
+
+
+class TestAlertPoller:
+    """Test cases for AlertPoller class"""
+
+    def test_filter_by_state_and_labels(self):
+        """Test that alerts are filtered by name, state and labels"""
+        prometheus = MagicMock()
+        prometheus.alerts.return_value = _alerts_response(
+            _alert("KubeVirtNoAvailableNodesToRunVMs", "firing", namespace="openshift-cnv"),
+            _alert("KubeVirtNoAvailableNodesToRunVMs", "pending", namespace="default"),
+            _alert("Watchdog", "firing"),
+        )
+        alert_poller = AlertPoller(prometheus=prometheus, interval=60)
+
+        assert len(alert_poller.get_alerts(alert_name="KubeVirtNoAvailableNodesToRunVMs")) == 2
+        assert alert_poller.get_alerts(alert_name="KubeVirtNoAvailableNodesToRunVMs", state="pending") == [
+            _alert("KubeVirtNoAvailableNodesToRunVMs", "pending", namespace="default")
+        ]
+        assert alert_poller.get_alerts(
+            alert_name="KubeVirtNoAvailableNodesToRunVMs", labels={"namespace": "openshift-cnv"}
+        ) == [_alert("KubeVirtNoAvailableNodesToRunVMs", "firing", namespace="openshift-cnv")]
+        assert len(alert_poller.get_all_alerts()) == 3
+
+    def test_one_request_per_interval(self):
+        """Test that concurrent waits share a single alert list fetch per interval"""
+        prometheus = MagicMock()
+        prometheus.alerts.return_value = _alerts_response(_alert("Watchdog", "firing"))
+        alert_poller = AlertPoller(prometheus=prometheus, interval=60)
+
+        waiters = [
+            threading.Thread(target=alert_poller.wait_for_alerts, kwargs={"alert_name": "Watchdog", "timeout": 5})
+            for _ in range(5)
+        ]
+        for waiter in waiters:
+            waiter.start()
+        for waiter in waiters:
+            waiter.join()
+
+        assert prometheus.alerts.call_count == 1
+        assert alert_poller.requests == 1
+
+    def test_timeline_transitions(self):
+        """Test that alert state transitions are recorded between fetches"""
+        prometheus = MagicMock()
+        prometheus.alerts.side_effect = [
+            _alerts_response(_alert("VirtAPIDown", "pending")),
+            _alerts_response(_alert("VirtAPIDown", "firing")),
+            _alerts_response(),
+        ]
+        alert_poller = AlertPoller(prometheus=prometheus, interval=0)
+
+        for _ in range(3):
+            alert_poller.refresh()
+
+        assert [(entry["alertname"], entry["from"], entry["to"]) for entry in alert_poller.timeline] == [
+            ("VirtAPIDown", None, "pending"),
+            ("VirtAPIDown", "pending", "firing"),
+            ("VirtAPIDown", "firing", "inactive"),
+        ]
+
+    def test_wait_for_alert_resolved(self):
+        """Test that the wait ends when no alert is in the state"""
+        prometheus = MagicMock()
+        prometheus.alerts.side_effect = [
+            _alerts_response(_alert("VirtAPIDown", "firing")),
+            _alerts_response(_alert("VirtAPIDown", "pending")),
+        ]
+        alert_poller = AlertPoller(prometheus=prometheus, interval=0)
+
+        alert_poller.wait_for_alert_resolved(alert_name="VirtAPIDown", timeout=5)
+
+        assert prometheus.alerts.call_count == 2
+
+    @patch("utilities.alert_poller.TimeoutSampler")
+    def test_wait_for_alerts_timeout(self, mock_sampler):
+        """Test that the wait raises when no matching alert is active"""
+        mock_sampler.side_effect = TimeoutExpiredError("Timeout")
+
+        with pytest.raises(TimeoutExpiredError):
+            AlertPoller(prometheus=MagicMock()).wait_for_alerts(alert_name="VirtAPIDown", timeout=5)
+
+
+class TestGetAlertPoller:
+    """Test cases for get_alert_poller function"""
+
+    def test_poller_per_prometheus(self):
+        """Test that the same poller is returned for the same Prometheus instance"""
+        prometheus = MagicMock()
+
+        assert get_alert_poller(prometheus=prometheus) is get_alert_poller(prometheus=prometheus)
+        assert get_alert_poller(prometheus=prometheus) is not get_alert_poller(prometheus=MagicMock())
+
+
+class TestWriteAlertTimeline:
+    """Test cases for write_alert_timeline function"""
+
+    @patch("utilities.alert_poller.write_to_file")
+    def test_timeline_written(self, mock_write_to_file):
+        """Test that the timeline is written when the alerts were polled"""
+        prometheus = MagicMock()
+        prometheus.alerts.return_value = _alerts_response(_alert("Watchdog", "firing"))
+        get_alert_poller(prometheus=prometheus).get_all_alerts()
+
+        write_alert_timeline(prometheus=prometheus, base_directory="/tmp/data-collector")
+
+        content = mock_write_to_file.call_args.kwargs["content"]
+        assert json.loads(content)[0]["to"] == "firing"
+
+    @patch("utilities.alert_poller.write_to_file")
+    def test_timeline_not_written_without_polling(self, mock_write_to_file):
+        """Test that no timeline is written when the alerts were never polled"""
+        write_alert_timeline(prometheus=MagicMock(), base_directory="/tmp/data-collector")
+
+        mock_write_to_file.assert_not_called()
@@ -0,0 +1,85 @@
+"""Unit tests for control_plane_profiling module"""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from utilities.control_plane_profiling import CONTROL_PLANE_PROFILE_FILE, ControlPlaneProfiler
+
+START = 1700000000
+SCRAPE_INTERVAL = 30
+
+
+def _query_range(prometheus, query, start, end, step):
+    """query_range stand-in: virt-controller grows by 10 MiB and uses 30 CPU seconds, virt-api 1 CPU second"""
+    if "container_cpu_usage_seconds_total" in query:
+        return [
+            {"metric": {"container": "virt-controller"}, "values": [[end, "30"]]},
+            {"metric": {"container": "virt-api"}, "values": [[end, "1"]]},
+        ]
+    return [
+        {"metric": {"container": "virt-controller"}, "values": [[start, "104857600"], [end, "115343360"]]},
+        {"metric": {"container": "virt-api"}, "values": [[start, "52428800"], [end, "52428800"]]},
+    ]
+
+
+@patch("utilities.control_plane_profiling.query_range", new=_query_range)
+class TestControlPlaneProfiler:
+    """Test cases for ControlPlaneProfiler class"""
+
+    def test_profile_window(self):
+        """Test that CPU seconds and working set change are profiled per container over the test window"""
+        profiler = ControlPlaneProfiler(namespace="openshift-cnv")
+        profiler.windows["test_a"] = (START, START + 120)
+
+        usage = profiler.profile(prometheus=MagicMock(scrape_interval=SCRAPE_INTERVAL))[0]
+
+        assert usage.cpu_seconds == {"virt-controller": 30.0, "virt-api": 1.0}
+        assert usage.memory_delta_bytes == {"virt-controller": 10485760.0, "virt-api": 0.0}
+        assert usage.total_cpu_seconds == pytest.approx(31)
+
+    def test_short_window_widened(self):
+        """Test that windows shorter than two scrape intervals are widened to two scrape intervals"""
+        profiler = ControlPlaneProfiler(namespace="openshift-cnv")
+        with patch("utilities.control_plane_profiling.query_range", wraps=_query_range) as mock_query_range:
+            profiler._profile_window(
+                prometheus=MagicMock(scrape_interval=SCRAPE_INTERVAL), node_id="test_a", start=START, end=START + 5
+            )
+
+        cpu_query, memory_query = mock_query_range.call_args_list
+        assert cpu_query.kwargs["query"] == (
+            'sum by (container) (increase(container_cpu_usage_seconds_total{namespace="openshift-cnv",'
+            'container!="",container!="POD"}[60s]))'
+        )
+        assert (memory_query.kwargs["start"], memory_query.kwargs["end"]) == (START + 5 - 60, START + 5)
+
+    def test_finish_test_uses_database_start_time(self):
+        """Test that the test window starts at the start time of the data collector database when available"""
+        profiler = ControlPlaneProfiler(namespace="openshift-cnv")
+        profiler.start_test()
+        profiler.finish_test(node_id="test_a", start_time=START)
+        profiler.start_test()
+        profiler.finish_test(node_id="test_b")
+
+        assert profiler.windows["test_a"][0] == START
+        assert profiler.windows["test_b"][0] > START
+
+    @patch("utilities.control_plane_profiling.write_to_file")
+    def test_write_ranked_report(self, mock_write_to_file):
+        """Test that the report ranks tests by CPU time and sums the usage per container"""
+        profiler = ControlPlaneProfiler(namespace="openshift-cnv")
+        profiler.windows = {"test_short": (START, START + 60), "test_long": (START + 60, START + 600)}
+
+        with patch(
+            "utilities.control_plane_profiling.query_range",
+            new=lambda prometheus, query, start, end, step: [
+                {"metric": {"container": "virt-handler"}, "values": [[end, str(step)]]}
+            ],
+        ):
+            profiler.write(prometheus=MagicMock(scrape_interval=SCRAPE_INTERVAL), base_directory="/tmp/report")
+
+        assert mock_write_to_file.call_args.kwargs["file_name"] == CONTROL_PLANE_PROFILE_FILE
+        report = json.loads(mock_write_to_file.call_args.kwargs["content"])
+        assert [usage["test"] for usage in report["tests_by_cpu"]] == ["test_long", "test_short"]
+        assert report["components"]["virt-handler"]["cpu_seconds"] == 600
@@ -310,25 +310,22 @@ class TestCollectAlertsData:
     """Test cases for collect_alerts_data function"""
 
     @patch("utilities.data_collector.get_data_collector_dir")
-    @patch("utilities.data_collector.utilities.infra.get_prometheus_k8s_token")
-    @patch("utilities.data_collector.Prometheus")
+    @patch("utilities.data_collector.utilities.prometheus_client.get_prometheus_client")
     @patch("utilities.data_collector.write_to_file")
     @patch("utilities.data_collector.LOGGER")
-    def test_collect_alerts_data(self, mock_logger, mock_write, mock_prometheus_class, mock_get_token, mock_get_dir):
+    def test_collect_alerts_data(self, mock_logger, mock_write, mock_get_prometheus_client, mock_get_dir):
         """Test collect_alerts_data collects and writes alerts"""
         mock_get_dir.return_value = "/test/dir"
-        mock_get_token.return_value = "test-token"
 
         mock_prometheus = MagicMock()
         mock_alerts = [{"alert": "test", "status": "firing"}]
         mock_prometheus.alerts.return_value = mock_alerts
-        mock_prometheus_class.return_value = mock_prometheus
+        mock_get_prometheus_client.return_value = mock_prometheus
 
         collect_alerts_data()
 
         mock_get_dir.assert_called_once()
-        mock_get_token.assert_called_once_with(duration="900s")
-        mock_prometheus_class.assert_called_once_with(verify_ssl=False, bearer_token="test-token")
+        mock_get_prometheus_client.assert_called_once()
         mock_prometheus.alerts.assert_called_once()
         mock_write.assert_called_once_with(
             base_directory="/test/dir", file_name="firing_alerts.json", content=json.dumps(mock_alerts)
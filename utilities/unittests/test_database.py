@@ -2,14 +2,39 @@
 
 """Unit tests for database module"""
 
+import sqlite3
 import sys
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import pytest
+
 # Add utilities to Python path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from database import CNV_TEST_DB, Base, CnvTestTable, Database
+from database import CNV_TEST_DB, DATABASE_BUSY_TIMEOUT, Base, CnvTestTable, Database
+
+
+@pytest.fixture()
+def database(tmp_path):
+    with patch("database.get_data_collector_base", return_value=f"{tmp_path}/"):
+        db = Database()
+        yield db
+        db.close()
+
+
+@pytest.fixture()
+def other_process_database(tmp_path):
+    """Second store on the same file, as used by another pytest process"""
+    with patch("database.get_data_collector_base", return_value=f"{tmp_path}/"):
+        db = Database()
+        yield db
+        db.close()
+
+
+def _stored_start_times(database_file_path):
+    with sqlite3.connect(database_file_path) as connection:
+        return dict(connection.execute("SELECT test_name, start_time FROM CnvTestTable").fetchall())
 
 
 class TestCnvTestTable:
@@ -24,6 +49,7 @@ class TestCnvTestTable:
         assert hasattr(CnvTestTable, "id")
         assert hasattr(CnvTestTable, "test_name")
         assert hasattr(CnvTestTable, "start_time")
+        assert CnvTestTable.__table__.c.test_name.unique
 
         # Check that it inherits from Base
         assert issubclass(CnvTestTable, Base)
@@ -32,10 +58,14 @@ class TestCnvTestTable:
 class TestDatabase:
     """Test cases for Database class"""
 
+    @patch("database.event")
     @patch("database.create_engine")
     @patch("database.get_data_collector_base")
     @patch("database.Base.metadata.create_all")
-    def test_database_init_with_defaults(self, mock_create_all, mock_get_base, mock_create_engine):
+    @patch("database.Database._create_test_name_index")
+    def test_database_init_with_defaults(
+        self, mock_create_test_name_index, mock_create_all, mock_get_base, mock_create_engine, mock_event
+    ):
         """Test Database initialization with default parameters"""
         mock_get_base.return_value = "/tmp/data/"
         mock_engine = MagicMock()
@@ -46,188 +76,141 @@ class TestDatabase:
         # Check attributes
         assert db.database_file_path == f"/tmp/data/{CNV_TEST_DB}"
         assert db.connection_string == f"sqlite:////tmp/data/{CNV_TEST_DB}"
-        assert db.verbose is True
+        assert db.verbose is False
         assert db.engine == mock_engine
 
         # Check engine creation
         mock_create_engine.assert_called_once_with(
             url=f"sqlite:////tmp/data/{CNV_TEST_DB}",
-            echo=True,
+            echo=False,
+            connect_args={"timeout": DATABASE_BUSY_TIMEOUT},
         )
+        mock_event.listen.assert_called_once_with(mock_engine, "connect", Database._set_sqlite_pragmas)
         mock_create_all.assert_called_once_with(bind=mock_engine)
+        mock_create_test_name_index.assert_called_once_with()
 
+    @patch("database.event")
     @patch("database.create_engine")
     @patch("database.get_data_collector_base")
     @patch("database.Base.metadata.create_all")
-    def test_database_init_with_custom_params(self, mock_create_all, mock_get_base, mock_create_engine):
+    @patch("database.Database._create_test_name_index")
+    def test_database_init_with_custom_params(
+        self, mock_create_test_name_index, mock_create_all, mock_get_base, mock_create_engine, mock_event
+    ):
         """Test Database initialization with custom parameters"""
         mock_get_base.return_value = "/custom/path/"
-        mock_engine = MagicMock()
-        mock_create_engine.return_value = mock_engine
 
         db = Database(
             database_file_name="test.db",
-            verbose=False,
+            verbose=True,
             base_dir="/custom/dir",
         )
 
         assert db.database_file_path == "/custom/path/test.db"
         assert db.connection_string == "sqlite:////custom/path/test.db"
-        assert db.verbose is False
+        assert db.verbose is True
 
         mock_get_base.assert_called_once_with(base_dir="/custom/dir")
 
-    @patch("database.Session")
-    @patch("database.create_engine")
-    @patch("database.get_data_collector_base")
-    @patch("database.Base.metadata.create_all")
-    def test_insert_start_time_new_entry(self, mock_create_all, mock_get_base, mock_create_engine, mock_session_class):
-        """Test inserting start time when entry doesn't exist"""
-        mock_get_base.return_value = "/tmp/data/"
-        mock_engine = MagicMock()
-        mock_create_engine.return_value = mock_engine
-
-        # Mock session - no existing entry
-        mock_session = MagicMock()
-        mock_session.query.return_value.filter_by.return_value.first.return_value = None
-        mock_session_class.return_value.__enter__.return_value = mock_session
-
-        db = Database()
-        db.insert_start_time(name="test_example", start_time=1234567890)
-
-        # Check that add and commit were called
-        mock_session.add.assert_called_once()
-        mock_session.commit.assert_called_once()
-
-        # Check the object that was added
-        added_obj = mock_session.add.call_args[0][0]
-        assert isinstance(added_obj, CnvTestTable)
-        assert added_obj.test_name == "test_example"
-        assert added_obj.start_time == 1234567890
-
-    @patch("database.Session")
-    @patch("database.create_engine")
-    @patch("database.get_data_collector_base")
-    @patch("database.Base.metadata.create_all")
-    def test_insert_start_time_already_exists(
-        self, mock_create_all, mock_get_base, mock_create_engine, mock_session_class
-    ):
+    def test_wal_journal_mode(self, database):
+        """Test that the database runs in WAL mode"""
+        with database.engine.connect() as connection:
+            assert connection.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+
+    def test_test_name_index_added_to_existing_database(self, tmp_path):
+        """Test that a database created without the test name unique index gets it, without duplicate test names"""
+        with sqlite3.connect(tmp_path / CNV_TEST_DB) as connection:
+            connection.execute(
+                "CREATE TABLE CnvTestTable "
+                "(id INTEGER NOT NULL PRIMARY KEY, test_name VARCHAR(500), start_time INTEGER NOT NULL)"
+            )
+            connection.executemany(
+                "INSERT INTO CnvTestTable (test_name, start_time) VALUES (?, ?)",
+                [("test_module.py", 100), ("test_module.py", 200)],
+            )
+
+        with patch("database.get_data_collector_base", return_value=f"{tmp_path}/"):
+            db = Database()
+        db.insert_start_time(name="test_module.py", start_time=300)
+        db.insert_start_time(name="test_module.py::test_a", start_time=301)
+        db.close()
+
+        assert _stored_start_times(database_file_path=db.database_file_path) == {
+            "test_module.py": 100,
+            "test_module.py::test_a": 301,
+        }
+
+    def test_insert_start_time_is_buffered(self, database):
+        """Test that start times are written to the database only on flush"""
+        database.insert_start_time(name="test_example", start_time=1234567890)
+
+        assert _stored_start_times(database_file_path=database.database_file_path) == {}
+        assert database.get_start_time(name="test_example") == 1234567890
+
+        database.flush()
+
+        assert _stored_start_times(database_file_path=database.database_file_path) == {"test_example": 1234567890}
+
+    def test_insert_start_time_already_exists(self, database):
         """Test inserting start time when entry already exists (should not insert again)"""
-        mock_get_base.return_value = "/tmp/data/"
-        mock_engine = MagicMock()
-        mock_create_engine.return_value = mock_engine
-
-        # Mock session - existing entry
-        existing_entry = MagicMock()
-        mock_session = MagicMock()
-        mock_session.query.return_value.filter_by.return_value.first.return_value = existing_entry
-        mock_session_class.return_value.__enter__.return_value = mock_session
-
-        db = Database()
-        db.insert_start_time(name="test_example", start_time=1234567890)
-
-        # Check that add and commit were NOT called (entry already exists)
-        mock_session.add.assert_not_called()
-        mock_session.commit.assert_not_called()
-
-    @patch("database.Session")
-    @patch("database.create_engine")
-    @patch("database.get_data_collector_base")
-    @patch("database.Base.metadata.create_all")
-    def test_get_start_time_found(self, mock_create_all, mock_get_base, mock_create_engine, mock_session_class):
-        """Test getting start time when it exists"""
-        mock_get_base.return_value = "/tmp/data/"
-        mock_engine = MagicMock()
-        mock_create_engine.return_value = mock_engine
-
-        # Mock session and query
-        mock_session = MagicMock()
-        mock_query = MagicMock()
-        mock_with_entities = MagicMock()
-        mock_filter_by = MagicMock()
-
-        # Setup chain of mocks
-        mock_session.query.return_value = mock_query
-        mock_query.with_entities.return_value = mock_with_entities
-        mock_with_entities.filter_by.return_value = mock_filter_by
-        mock_filter_by.first.return_value = [1234567890]
-
-        mock_session_class.return_value.__enter__.return_value = mock_session
-
-        db = Database()
-        result = db.get_start_time(name="test_example")
-
-        assert result == 1234567890
-        mock_session.query.assert_called_once_with(CnvTestTable)
-        mock_query.with_entities.assert_called_once_with(CnvTestTable.start_time)
-        mock_with_entities.filter_by.assert_called_once_with(test_name="test_example")
-
-    @patch("database.create_engine")
-    @patch("database.get_data_collector_base")
-    @patch("database.Base.metadata.create_all")
-    def test_database_engine_creation(self, mock_create_all, mock_get_base, mock_create_engine):
-        """Test that database engine is created properly"""
-        mock_get_base.return_value = "/tmp/data/"
-        mock_engine = MagicMock()
-        mock_create_engine.return_value = mock_engine
-
-        db = Database()
-
-        # The engine should be accessible
-        assert db.engine is not None
-        assert db.engine == mock_engine
-
-    @patch("database.Session")
-    @patch("database.create_engine")
-    @patch("database.get_data_collector_base")
-    @patch("database.Base.metadata.create_all")
-    def test_get_start_time_not_found(self, mock_create_all, mock_get_base, mock_create_engine, mock_session_class):
+        database.insert_start_time(name="test_example", start_time=1234567890)
+        database.insert_start_time(name="test_example", start_time=1234567999)
+        database.flush()
+
+        assert _stored_start_times(database_file_path=database.database_file_path) == {"test_example": 1234567890}
+
+    def test_flush_batches_entries(self, database):
+        """Test that all buffered start times are written by one flush"""
+        database.insert_start_time(name="test_module.py", start_time=100)
+        database.insert_start_time(name="test_module.py::test_a", start_time=101)
+        database.flush()
+        database.flush()
+
+        assert _stored_start_times(database_file_path=database.database_file_path) == {
+            "test_module.py": 100,
+            "test_module.py::test_a": 101,
+        }
+
+    def test_flush_keeps_entry_of_other_process(self, database, other_process_database):
+        """Test that an entry written first by another process is kept and cached"""
+        other_process_database.insert_start_time(name="test_module.py", start_time=100)
+        other_process_database.flush()
+
+        database.insert_start_time(name="test_module.py", start_time=200)
+        database.flush()
+
+        assert _stored_start_times(database_file_path=database.database_file_path) == {"test_module.py": 100}
+        assert database.get_start_time(name="test_module.py") == 100
+
+    def test_get_start_time_reads_through(self, database, other_process_database):
+        """Test that start times written by another process are read from the database and cached"""
+        other_process_database.insert_start_time(name="test_example", start_time=1234567890)
+        other_process_database.flush()
+
+        assert database.get_start_time(name="test_example") == 1234567890
+        with patch("database.Session") as mock_session_class:
+            assert database.get_start_time(name="test_example") == 1234567890
+        mock_session_class.assert_not_called()
+
+    def test_get_start_time_not_found(self, database):
         """Test getting start time when it doesn't exist"""
-        mock_get_base.return_value = "/tmp/data/"
-        mock_engine = MagicMock()
-        mock_create_engine.return_value = mock_engine
+        assert database.get_start_time(name="test_example") is None
 
-        # Mock session and query
-        mock_session = MagicMock()
-        mock_query = MagicMock()
-        mock_with_entities = MagicMock()
-        mock_filter_by = MagicMock()
+    def test_close_flushes(self, database):
+        """Test that closing the store writes the buffered start times"""
+        database.insert_start_time(name="test_example", start_time=1234567890)
 
-        # Setup chain of mocks - return None
-        mock_session.query.return_value = mock_query
-        mock_query.with_entities.return_value = mock_with_entities
-        mock_with_entities.filter_by.return_value = mock_filter_by
-        mock_filter_by.first.return_value = None
+        database.close()
 
-        mock_session_class.return_value.__enter__.return_value = mock_session
-
-        db = Database()
-        result = db.get_start_time(name="test_example")
-
-        assert result is None
+        assert _stored_start_times(database_file_path=database.database_file_path) == {"test_example": 1234567890}
 
     @patch("database.datetime")
     @patch("database.get_scope_identifier")
-    @patch("database.Session")
-    @patch("database.create_engine")
-    @patch("database.get_data_collector_base")
-    @patch("database.Base.metadata.create_all")
     @patch("database.LOGGER")
     def test_get_start_time_for_collection_with_module_scope_marker(
-        self,
-        mock_logger,
-        mock_create_all,
-        mock_get_base,
-        mock_create_engine,
-        mock_session_class,
-        mock_get_scope_identifier,
-        mock_datetime,
+        self, mock_logger, mock_get_scope_identifier, mock_datetime, database
     ):
         """Test get_start_time_for_collection with module scope marker"""
-        mock_get_base.return_value = "/tmp/data/"
-        mock_engine = MagicMock()
-        mock_create_engine.return_value = mock_engine
-
         # Mock node with marker
         mock_node = MagicMock()
         mock_marker = MagicMock()
@@ -236,27 +219,14 @@ class TestDatabase:
 
         # Mock get_scope_identifier
         mock_get_scope_identifier.return_value = "/path/to/test_module.py"
-
-        # Mock session and query
-        mock_session = MagicMock()
-        mock_query = MagicMock()
-        mock_with_entities = MagicMock()
-        mock_filter_by = MagicMock()
-
-        mock_session.query.return_value = mock_query
-        mock_query.with_entities.return_value = mock_with_entities
-        mock_with_entities.filter_by.return_value = mock_filter_by
-        mock_filter_by.first.return_value = [1234567890]
-
-        mock_session_class.return_value.__enter__.return_value = mock_session
+        database.insert_start_time(name="/path/to/test_module.py", start_time=1234567890)
 
         # Mock datetime for time delta calculation
         mock_datetime_now = MagicMock()
         mock_datetime_now.strftime.return_value = "1234567990"
         mock_datetime.datetime.now.return_value = mock_datetime_now
 
-        db = Database()
-        result = db.get_start_time_for_collection(node=mock_node)
+        result = database.get_start_time_for_collection(node=mock_node)
 
         assert result == 1234567890
         mock_node.get_closest_marker.assert_called_once_with(name="data_collector_scope")
@@ -267,26 +237,11 @@ class TestDatabase:
 
     @patch("database.datetime")
     @patch("database.get_scope_identifier")
-    @patch("database.Session")
-    @patch("database.create_engine")
-    @patch("database.get_data_collector_base")
-    @patch("database.Base.metadata.create_all")
     @patch("database.LOGGER")
     def test_get_start_time_for_collection_with_class_scope_marker(
-        self,
-        mock_logger,
-        mock_create_all,
-        mock_get_base,
-        mock_create_engine,
-        mock_session_class,
-        mock_get_scope_identifier,
-        mock_datetime,
+        self, mock_logger, mock_get_scope_identifier, mock_datetime, database
     ):
         """Test get_start_time_for_collection with class scope marker"""
-        mock_get_base.return_value = "/tmp/data/"
-        mock_engine = MagicMock()
-        mock_create_engine.return_value = mock_engine
-
         # Mock node with marker
         mock_node = MagicMock()
         mock_marker = MagicMock()
@@ -295,27 +250,15 @@ class TestDatabase:
 
         # Mock get_scope_identifier
         mock_get_scope_identifier.return_value = "/path/to/test_file.py::TestClass"
-
-        # Mock session and query
-        mock_session = MagicMock()
-        mock_query = MagicMock()
-        mock_with_entities = MagicMock()
-        mock_filter_by = MagicMock()
-
-        mock_session.query.return_value = mock_query
-        mock_query.with_entities.return_value = mock_with_entities
-        mock_with_entities.filter_by.return_value = mock_filter_by
-        mock_filter_by.first.return_value = [1700000000]
-
-        mock_session_class.return_value.__enter__.return_value = mock_session
+        database.insert_start_time(name="/path/to/test_file.py::TestClass", start_time=1700000000)
+        database.flush()
 
         # Mock datetime for time delta calculation
         mock_datetime_now = MagicMock()
         mock_datetime_now.strftime.return_value = "1700000120"
         mock_datetime.datetime.now.return_value = mock_datetime_now
 
-        db = Database()
-        result = db.get_start_time_for_collection(node=mock_node)
+        result = database.get_start_time_for_collection(node=mock_node)
 
         assert result == 1700000000
         mock_get_scope_identifier.assert_called_once_with(node=mock_node, scope_value="class")
@@ -324,53 +267,25 @@ class TestDatabase:
 
     @patch("database.datetime")
     @patch("database.get_scope_identifier")
-    @patch("database.Session")
-    @patch("database.create_engine")
-    @patch("database.get_data_collector_base")
-    @patch("database.Base.metadata.create_all")
     @patch("database.LOGGER")
     def test_get_start_time_for_collection_without_marker(
-        self,
-        mock_logger,
-        mock_create_all,
-        mock_get_base,
-        mock_create_engine,
-        mock_session_class,
-        mock_get_scope_identifier,
-        mock_datetime,
+        self, mock_logger, mock_get_scope_identifier, mock_datetime, database
     ):
         """Test get_start_time_for_collection without marker (test scope)"""
-        mock_get_base.return_value = "/tmp/data/"
-        mock_engine = MagicMock()
-        mock_create_engine.return_value = mock_engine
-
         # Mock node without marker
         mock_node = MagicMock()
         mock_node.get_closest_marker.return_value = None
 
         # Mock get_scope_identifier
         mock_get_scope_identifier.return_value = "/path/to/test_file.py::test_function"
-
-        # Mock session and query
-        mock_session = MagicMock()
-        mock_query = MagicMock()
-        mock_with_entities = MagicMock()
-        mock_filter_by = MagicMock()
-
-        mock_session.query.return_value = mock_query
-        mock_query.with_entities.return_value = mock_with_entities
-        mock_with_entities.filter_by.return_value = mock_filter_by
-        mock_filter_by.first.return_value = [1600000000]
-
-        mock_session_class.return_value.__enter__.return_value = mock_session
+        database.insert_start_time(name="/path/to/test_file.py::test_function", start_time=1600000000)
 
         # Mock datetime for time delta calculation
         mock_datetime_now = MagicMock()
         mock_datetime_now.strftime.return_value = "1600000300"
         mock_datetime.datetime.now.return_value = mock_datetime_now
 
-        db = Database()
-        result = db.get_start_time_for_collection(node=mock_node)
+        result = database.get_start_time_for_collection(node=mock_node)
 
         assert result == 1600000000
         mock_get_scope_identifier.assert_called_once_with(node=mock_node, scope_value=None)
@@ -378,25 +293,9 @@ class TestDatabase:
         assert "TEST scope: 300s (5m)" in mock_logger.info.call_args[0][0]
 
     @patch("database.get_scope_identifier")
-    @patch("database.Session")
-    @patch("database.create_engine")
-    @patch("database.get_data_collector_base")
-    @patch("database.Base.metadata.create_all")
     @patch("database.LOGGER")
-    def test_get_start_time_for_collection_not_found(
-        self,
-        mock_logger,
-        mock_create_all,
-        mock_get_base,
-        mock_create_engine,
-        mock_session_class,
-        mock_get_scope_identifier,
-    ):
+    def test_get_start_time_for_collection_not_found(self, mock_logger, mock_get_scope_identifier, database):
         """Test get_start_time_for_collection when start time not found in database"""
-        mock_get_base.return_value = "/tmp/data/"
-        mock_engine = MagicMock()
-        mock_create_engine.return_value = mock_engine
-
         # Mock node
         mock_node = MagicMock()
         mock_node.get_closest_marker.return_value = None
@@ -404,45 +303,20 @@ class TestDatabase:
         # Mock get_scope_identifier
         mock_get_scope_identifier.return_value = "/path/to/test_file.py::test_function"
 
-        # Mock session and query - return None (not found)
-        mock_session = MagicMock()
-        mock_query = MagicMock()
-        mock_with_entities = MagicMock()
-        mock_filter_by = MagicMock()
-
-        mock_session.query.return_value = mock_query
-        mock_query.with_entities.return_value = mock_with_entities
-        mock_with_entities.filter_by.return_value = mock_filter_by
-        mock_filter_by.first.return_value = None
-
-        mock_session_class.return_value.__enter__.return_value = mock_session
-
-        db = Database()
-        result = db.get_start_time_for_collection(node=mock_node)
+        result = database.get_start_time_for_collection(node=mock_node)
 
         assert result == 0
         mock_logger.warning.assert_called_once()
         assert "Start time not found" in mock_logger.warning.call_args[0][0]
 
-    @patch("database.get_scope_identifier")
-    @patch("database.create_engine")
-    @patch("database.get_data_collector_base")
-    @patch("database.Base.metadata.create_all")
     @patch("database.LOGGER")
-    def test_get_start_time_for_collection_exception_handling(
-        self, mock_logger, mock_create_all, mock_get_base, mock_create_engine, mock_get_scope_identifier
-    ):
+    def test_get_start_time_for_collection_exception_handling(self, mock_logger, database):
         """Test get_start_time_for_collection handles exceptions gracefully"""
-        mock_get_base.return_value = "/tmp/data/"
-        mock_engine = MagicMock()
-        mock_create_engine.return_value = mock_engine
-
         # Mock node that raises exception
         mock_node = MagicMock()
         mock_node.get_closest_marker.side_effect = Exception("Database connection error")
 
-        db = Database()
-        result = db.get_start_time_for_collection(node=mock_node)
+        result = database.get_start_time_for_collection(node=mock_node)
 
         assert result == 0
         mock_logger.warning.assert_called_once()
@@ -0,0 +1,105 @@
+"""Unit tests for disk_integrity module"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from utilities.disk_integrity import (
+    DiskHashManifest,
+    assert_disk_hash_manifests_equal,
+    get_disk_hash_manifest,
+    get_disk_hash_manifest_diff,
+    parse_disk_hash_manifest,
+)
+
+CHUNK_SIZE = 1024
+
+
+def manifest(digests, disk_size=None):
+    return DiskHashManifest(
+        chunk_size=CHUNK_SIZE,
+        disk_size=len(digests) * CHUNK_SIZE if disk_size is None else disk_size,
+        digests=tuple(digests),
+    )
+
+
+class TestParseDiskHashManifest:
+    """Test cases for parse_disk_hash_manifest function"""
+
+    def test_parse_manifest(self):
+        """Test parsing header and digests"""
+        result = parse_disk_hash_manifest(output="1024 2000\naaaa\nbbbb\n")
+
+        assert result == DiskHashManifest(chunk_size=1024, disk_size=2000, digests=("aaaa", "bbbb"))
+
+    def test_parse_empty_disk(self):
+        """Test parsing a manifest of an empty disk"""
+        result = parse_disk_hash_manifest(output="1024 0\n\n")
+
+        assert result.digests == ()
+
+
+class TestGetDiskHashManifest:
+    """Test cases for get_disk_hash_manifest function"""
+
+    @patch("utilities.disk_integrity.run_ssh_commands")
+    def test_get_manifest(self, mock_run_ssh_commands):
+        """Test that the guest script is run against the device and its output parsed"""
+        mock_run_ssh_commands.return_value = ["4096 4096\nabcd\n"]
+        vm = MagicMock()
+
+        result = get_disk_hash_manifest(vm=vm, device_path="/dev/vdb", chunk_size=4096)
+
+        assert result == DiskHashManifest(chunk_size=4096, disk_size=4096, digests=("abcd",))
+        commands = mock_run_ssh_commands.call_args.kwargs["commands"]
+        assert commands[:3] == ["sudo", "python3", "-c"]
+        assert commands[-2:] == ["/dev/vdb", "4096"]
+
+
+class TestGetDiskHashManifestDiff:
+    """Test cases for get_disk_hash_manifest_diff function"""
+
+    def test_identical_manifests(self):
+        """Test that identical manifests have no diff"""
+        assert get_disk_hash_manifest_diff(source=manifest(["a", "b"]), target=manifest(["a", "b"])) == []
+
+    def test_adjacent_chunks_are_merged(self):
+        """Test that adjacent differing chunks are reported as one range"""
+        result = get_disk_hash_manifest_diff(
+            source=manifest(["a", "b", "c", "d", "e"]), target=manifest(["a", "x", "y", "d", "z"])
+        )
+
+        assert result == [(CHUNK_SIZE, 2 * CHUNK_SIZE), (4 * CHUNK_SIZE, CHUNK_SIZE)]
+
+    def test_different_disk_sizes(self):
+        """Test that chunks missing from one manifest are reported"""
+        result = get_disk_hash_manifest_diff(source=manifest(["a", "b", "c"]), target=manifest(["a"]))
+
+        assert result == [(CHUNK_SIZE, 2 * CHUNK_SIZE)]
+
+    def test_chunk_size_mismatch(self):
+        """Test that manifests with different chunk sizes cannot be compared"""
+        with pytest.raises(ValueError, match="Chunk size mismatch"):
+            get_disk_hash_manifest_diff(
+                source=manifest(["a"]), target=DiskHashManifest(chunk_size=2 * CHUNK_SIZE, disk_size=0, digests=())
+            )
+
+
+class TestAssertDiskHashManifestsEqual:
+    """Test cases for assert_disk_hash_manifests_equal function"""
+
+    def test_equal_manifests(self):
+        """Test that equal manifests pass"""
+        assert_disk_hash_manifests_equal(source=manifest(["a", "b"]), target=manifest(["a", "b"]))
+
+    def test_content_mismatch(self):
+        """Test that the assertion message contains the differing ranges"""
+        with pytest.raises(AssertionError, match=r"\(1024, 1024\)"):
+            assert_disk_hash_manifests_equal(source=manifest(["a", "b"]), target=manifest(["a", "c"]))
+
+    def test_size_mismatch(self):
+        """Test that a size difference within the last chunk is detected"""
+        with pytest.raises(AssertionError, match="source size 2000, target size 2048"):
+            assert_disk_hash_manifests_equal(
+                source=manifest(["a", "b"], disk_size=2000), target=manifest(["a", "b"], disk_size=2048)
+            )
@@ -0,0 +1,271 @@
+"""Unit tests for failure_collection module"""
+
+import json
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from utilities.failure_collection import FailureCollectionJob, FailureCollectionQueue, get_directory_size
+
+STORAGE_NAMESPACES = ["openshift-storage"]
+NETWORK_NAMESPACES = ["openshift-nmstate"]
+
+
+@pytest.fixture()
+def failure_collection_job():
+    return FailureCollectionJob(
+        target_dir="/data/failure_collection/collection-0",
+        since_timestamp=int(time.time()) - 600,
+        test_names=["tests/storage/test_a.py::test_a"],
+        inspect_namespaces=STORAGE_NAMESPACES,
+    )
+
+
+@pytest.fixture()
+def mock_must_gather():
+    with patch("utilities.failure_collection.collect_default_cnv_must_gather_with_vm_gather") as mock_must_gather:
+        yield mock_must_gather
+
+
+@pytest.fixture()
+def mock_inspect_namespaces():
+    with patch("utilities.failure_collection.inspect_namespaces", return_value=[]) as mock_inspect_namespaces:
+        yield mock_inspect_namespaces
+
+
+@pytest.fixture()
+def mock_write_to_file():
+    with patch("utilities.failure_collection.write_to_file") as mock_write_to_file:
+        yield mock_write_to_file
+
+
+@pytest.fixture()
+def blocked_must_gather(mock_must_gather):
+    """Keep the first collection running until released, so that following failures stay pending"""
+    started_event = threading.Event()
+    release_event = threading.Event()
+
+    def _must_gather(**kwargs):
+        started_event.set()
+        release_event.wait(timeout=10)
+
+    mock_must_gather.side_effect = _must_gather
+    yield started_event, release_event
+    release_event.set()
+
+
+def _written_json(mock_write_to_file, file_name):
+    return json.loads(
+        next(
+            call.kwargs["content"]
+            for call in mock_write_to_file.call_args_list
+            if call.kwargs["file_name"] == file_name
+        )
+    )
+
+
+class TestFailureCollectionJob:
+    """Test cases for FailureCollectionJob class"""
+
+    def test_durations_before_start(self, failure_collection_job):
+        """Test that durations are unknown until the job runs"""
+        assert failure_collection_job.queue_wait is None
+        assert failure_collection_job.gather_duration is None
+
+    def test_durations(self, failure_collection_job):
+        """Test queue wait and gather duration"""
+        failure_collection_job.queued_at = 100.0
+        failure_collection_job.started_at = 130.0
+        failure_collection_job.finished_at = 400.5
+
+        report = failure_collection_job.to_report()
+
+        assert report["queue_wait"] == pytest.approx(30.0)
+        assert report["gather_duration"] == pytest.approx(270.5)
+        assert report["test_names"] == ["tests/storage/test_a.py::test_a"]
+
+    def test_can_merge_overlapping(self, failure_collection_job):
+        """Test that an overlapping failure with shared namespaces can be merged"""
+        assert failure_collection_job.can_merge(
+            since_timestamp=int(time.time()) - 300, inspect_namespaces=STORAGE_NAMESPACES
+        )
+
+    def test_can_merge_without_namespaces(self, failure_collection_job):
+        """Test that a failure without namespaces to inspect only needs an overlapping window"""
+        assert failure_collection_job.can_merge(since_timestamp=int(time.time()) - 300, inspect_namespaces=[])
+
+    def test_cannot_merge_disjoint_namespaces(self, failure_collection_job):
+        """Test that failures of different components are not merged"""
+        assert not failure_collection_job.can_merge(
+            since_timestamp=int(time.time()) - 300, inspect_namespaces=NETWORK_NAMESPACES
+        )
+
+    def test_cannot_merge_later_window(self, failure_collection_job):
+        """Test that a failure window starting after the last merged failure is not merged"""
+        failure_collection_job.last_failure_at = time.time() - 100
+
+        assert not failure_collection_job.can_merge(
+            since_timestamp=int(time.time()) - 50, inspect_namespaces=STORAGE_NAMESPACES
+        )
+
+    def test_cannot_merge_started(self, failure_collection_job):
+        """Test that a failure is not merged into a running job"""
+        failure_collection_job.started_at = time.time()
+
+        assert not failure_collection_job.can_merge(
+            since_timestamp=int(time.time()) - 300, inspect_namespaces=STORAGE_NAMESPACES
+        )
+
+
+class TestGetDirectorySize:
+    """Test cases for get_directory_size function"""
+
+    def test_directory_size(self, tmp_path):
+        """Test that the sizes of nested files are summed"""
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "a").write_bytes(b"a" * 10)
+        (tmp_path / "sub" / "b").write_bytes(b"b" * 5)
+
+        assert get_directory_size(path=str(tmp_path)) == 15
+
+    def test_missing_directory(self, tmp_path):
+        """Test that a missing directory has size 0"""
+        assert get_directory_size(path=str(tmp_path / "missing")) == 0
+
+
+@patch("utilities.failure_collection.get_data_collector_base_directory", return_value="/data")
+class TestFailureCollectionQueue:
+    """Test cases for FailureCollectionQueue class"""
+
+    def test_job_runs_must_gather_and_inspect(
+        self, mock_base_dir, mock_must_gather, mock_inspect_namespaces, mock_write_to_file
+    ):
+        """Test that a queued job runs must-gather and inspect with the recorded window"""
+        admin_client = MagicMock()
+        queue = FailureCollectionQueue(max_workers=1)
+
+        queue.submit(
+            test_name="test_a",
+            since_timestamp=int(time.time()) - 600,
+            inspect_namespaces=STORAGE_NAMESPACES,
+            admin_client=admin_client,
+        )
+        queue.wait_for_completion()
+
+        since_time = mock_must_gather.call_args.kwargs["since_time"]
+        assert 600 <= since_time <= 610
+        assert mock_must_gather.call_args.kwargs["target_dir"] == "/data/failure_collection/collection-0"
+        assert mock_must_gather.call_args.kwargs["admin_client"] == admin_client
+        mock_inspect_namespaces.assert_called_once_with(
+            admin_client=admin_client,
+            namespaces=STORAGE_NAMESPACES,
+            since_seconds=since_time,
+            target_dir="/data/failure_collection/collection-0",
+        )
+
+    def test_job_without_inspect_namespaces(
+        self, mock_base_dir, mock_must_gather, mock_inspect_namespaces, mock_write_to_file
+    ):
+        """Test that inspect is skipped when there are no namespaces to inspect"""
+        queue = FailureCollectionQueue(max_workers=1)
+
+        queue.submit(test_name="test_a", since_timestamp=0, inspect_namespaces=[], admin_client=MagicMock())
+        queue.wait_for_completion()
+
+        mock_must_gather.assert_called_once()
+        mock_inspect_namespaces.assert_not_called()
+
+    def test_job_error_is_recorded(self, mock_base_dir, mock_must_gather, mock_write_to_file):
+        """Test that a failing job does not raise and records the error"""
+        mock_must_gather.side_effect = RuntimeError("must-gather failed")
+        queue = FailureCollectionQueue(max_workers=1)
+
+        queue.submit(test_name="test_a", since_timestamp=0, inspect_namespaces=[], admin_client=MagicMock())
+        queue.wait_for_completion()
+
+        assert queue.jobs[0].error == "must-gather failed"
+        assert queue.jobs[0].finished_at is not None
+
+    def test_burst_is_coalesced(
+        self, mock_base_dir, blocked_must_gather, mock_must_gather, mock_inspect_namespaces, mock_write_to_file
+    ):
+        """Test that failures queued while a collection runs are merged into one pending collection"""
+        started_event, release_event = blocked_must_gather
+        queue = FailureCollectionQueue(max_workers=1)
+        now = int(time.time())
+        queue.submit(test_name="test_a", since_timestamp=now - 600, inspect_namespaces=[], admin_client=MagicMock())
+        started_event.wait(timeout=10)
+        queue.submit(
+            test_name="test_b", since_timestamp=now - 500, inspect_namespaces=STORAGE_NAMESPACES, admin_client=None
+        )
+        queue.submit(
+            test_name="test_c",
+            since_timestamp=now - 900,
+            inspect_namespaces=["openshift-storage", "openshift-cnv"],
+            admin_client=None,
+        )
+        release_event.set()
+        queue.wait_for_completion()
+
+        assert len(queue.jobs) == 2
+        merged_job = queue.jobs[1]
+        assert merged_job.test_names == ["test_b", "test_c"]
+        assert merged_job.since_timestamp == now - 900
+        assert merged_job.inspect_namespaces == ["openshift-cnv", "openshift-storage"]
+        assert mock_must_gather.call_count == 2
+        assert _written_json(mock_write_to_file=mock_write_to_file, file_name="failure_collection_index.json") == {
+            "test_a": "/data/failure_collection/collection-0",
+            "test_b": "/data/failure_collection/collection-1",
+            "test_c": "/data/failure_collection/collection-1",
+        }
+
+    def test_max_gathers(self, mock_base_dir, blocked_must_gather, mock_must_gather, mock_write_to_file):
+        """Test that failures beyond the gathers cap are indexed as not collected"""
+        started_event, release_event = blocked_must_gather
+        queue = FailureCollectionQueue(max_workers=1, max_gathers=1)
+        queue.submit(test_name="test_a", since_timestamp=0, inspect_namespaces=[], admin_client=None)
+        started_event.wait(timeout=10)
+        queue.submit(test_name="test_b", since_timestamp=0, inspect_namespaces=NETWORK_NAMESPACES, admin_client=None)
+        release_event.set()
+        queue.wait_for_completion()
+
+        assert len(queue.jobs) == 1
+        index = _written_json(mock_write_to_file=mock_write_to_file, file_name="failure_collection_index.json")
+        assert index["test_b"] is None
+
+    @patch("utilities.failure_collection.get_directory_size", return_value=2048)
+    def test_max_size(
+        self, mock_directory_size, mock_base_dir, blocked_must_gather, mock_must_gather, mock_write_to_file
+    ):
+        """Test that jobs starting after the size cap is reached are skipped"""
+        started_event, release_event = blocked_must_gather
+        queue = FailureCollectionQueue(max_workers=1, max_size="1KiB")
+        queue.submit(test_name="test_a", since_timestamp=0, inspect_namespaces=[], admin_client=None)
+        started_event.wait(timeout=10)
+        queue.submit(test_name="test_b", since_timestamp=0, inspect_namespaces=NETWORK_NAMESPACES, admin_client=None)
+        release_event.set()
+        queue.wait_for_completion()
+
+        assert mock_must_gather.call_count == 1
+        assert queue.jobs[1].skipped
+        index = _written_json(mock_write_to_file=mock_write_to_file, file_name="failure_collection_index.json")
+        assert index == {"test_a": "/data/failure_collection/collection-0", "test_b": None}
+
+    def test_report_written(self, mock_base_dir, mock_must_gather, mock_inspect_namespaces, mock_write_to_file):
+        """Test that the report lists every job"""
+        queue = FailureCollectionQueue(max_workers=1)
+        queue.submit(test_name="test_a", since_timestamp=0, inspect_namespaces=[], admin_client=MagicMock())
+
+        queue.wait_for_completion()
+
+        report = _written_json(mock_write_to_file=mock_write_to_file, file_name="failure_collection_report.json")
+        assert [job["test_names"] for job in report] == [["test_a"]]
+        assert mock_write_to_file.call_args.kwargs["base_directory"] == "/data"
+
+    def test_no_report_without_failures(self, mock_base_dir, mock_write_to_file):
+        """Test that no report is written when no test failed"""
+        FailureCollectionQueue().wait_for_completion()
+
+        mock_write_to_file.assert_not_called()
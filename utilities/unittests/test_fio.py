@@ -0,0 +1,227 @@
+"""Unit tests for fio module"""
+
+import json
+
+from utilities.fio import parse_fio_results
+
+# fio-3.36 --output-format=json output of a 4k random read job (--percentile_list=50:95:99), trimmed of the
+# job options and of the latency distributions
+FIO_RANDREAD_OUTPUT = """
+{
+  "fio version" : "fio-3.36",
+  "timestamp" : 1760860800,
+  "timestamp_ms" : 1760860800412,
+  "time" : "Sun Oct 19 08:00:00 2025",
+  "jobs" : [
+    {
+      "jobname" : "rand_read_4k",
+      "groupid" : 0,
+      "job_start" : 1760860765398,
+      "error" : 0,
+      "eta" : 0,
+      "elapsed" : 36,
+      "read" : {
+        "io_bytes" : 1490157568,
+        "io_kbytes" : 1455232,
+        "bw_bytes" : 49671918,
+        "bw" : 48507,
+        "iops" : 12126.933333,
+        "runtime" : 30000,
+        "total_ios" : 363808,
+        "short_ios" : 0,
+        "drop_ios" : 0,
+        "slat_ns" : {
+          "min" : 1473,
+          "max" : 1048711,
+          "mean" : 6012.441227,
+          "stddev" : 4381.912645,
+          "N" : 363808
+        },
+        "clat_ns" : {
+          "min" : 181245,
+          "max" : 38215334,
+          "mean" : 2632120.718322,
+          "stddev" : 1204718.337712,
+          "N" : 363808,
+          "percentile" : {
+            "50.000000" : 2441216,
+            "95.000000" : 4751360,
+            "99.000000" : 6717440
+          }
+        },
+        "lat_ns" : {
+          "min" : 186312,
+          "max" : 38221876,
+          "mean" : 2638133.159549,
+          "stddev" : 1204809.271503,
+          "N" : 363808
+        },
+        "bw_min" : 44264,
+        "bw_max" : 52120,
+        "bw_agg" : 100.000000,
+        "bw_mean" : 48517.633333,
+        "bw_dev" : 1712.338411,
+        "bw_samples" : 60,
+        "iops_min" : 11066,
+        "iops_max" : 13030,
+        "iops_mean" : 12129.400000,
+        "iops_stddev" : 428.084703,
+        "iops_samples" : 60
+      },
+      "write" : {
+        "io_bytes" : 0,
+        "io_kbytes" : 0,
+        "bw_bytes" : 0,
+        "bw" : 0,
+        "iops" : 0.000000,
+        "runtime" : 0,
+        "total_ios" : 0,
+        "short_ios" : 0,
+        "drop_ios" : 0,
+        "slat_ns" : {
+          "min" : 0,
+          "max" : 0,
+          "mean" : 0.000000,
+          "stddev" : 0.000000,
+          "N" : 0
+        },
+        "clat_ns" : {
+          "min" : 0,
+          "max" : 0,
+          "mean" : 0.000000,
+          "stddev" : 0.000000,
+          "N" : 0
+        },
+        "lat_ns" : {
+          "min" : 0,
+          "max" : 0,
+          "mean" : 0.000000,
+          "stddev" : 0.000000,
+          "N" : 0
+        },
+        "bw_min" : 0,
+        "bw_max" : 0,
+        "bw_agg" : 0.000000,
+        "bw_mean" : 0.000000,
+        "bw_dev" : 0.000000,
+        "bw_samples" : 0,
+        "iops_min" : 0,
+        "iops_max" : 0,
+        "iops_mean" : 0.000000,
+        "iops_stddev" : 0.000000,
+        "iops_samples" : 0
+      },
+      "trim" : {
+        "io_bytes" : 0,
+        "io_kbytes" : 0,
+        "bw_bytes" : 0,
+        "bw" : 0,
+        "iops" : 0.000000,
+        "runtime" : 0,
+        "total_ios" : 0,
+        "short_ios" : 0,
+        "drop_ios" : 0,
+        "slat_ns" : {
+          "min" : 0,
+          "max" : 0,
+          "mean" : 0.000000,
+          "stddev" : 0.000000,
+          "N" : 0
+        },
+        "clat_ns" : {
+          "min" : 0,
+          "max" : 0,
+          "mean" : 0.000000,
+          "stddev" : 0.000000,
+          "N" : 0
+        },
+        "lat_ns" : {
+          "min" : 0,
+          "max" : 0,
+          "mean" : 0.000000,
+          "stddev" : 0.000000,
+          "N" : 0
+        },
+        "bw_min" : 0,
+        "bw_max" : 0,
+        "bw_agg" : 0.000000,
+        "bw_mean" : 0.000000,
+        "bw_dev" : 0.000000,
+        "bw_samples" : 0,
+        "iops_min" : 0,
+        "iops_max" : 0,
+        "iops_mean" : 0.000000,
+        "iops_stddev" : 0.000000,
+        "iops_samples" : 0
+      },
+      "sync" : {
+        "total_ios" : 0,
+        "lat_ns" : {
+          "min" : 0,
+          "max" : 0,
+          "mean" : 0.000000,
+          "stddev" : 0.000000,
+          "N" : 0
+        }
+      },
+      "job_runtime" : 29999,
+      "usr_cpu" : 3.463449,
+      "sys_cpu" : 11.430381,
+      "ctx" : 301452,
+      "majf" : 0,
+      "minf" : 47,
+      "iodepth_level" : {
+        "1" : 0.100000,
+        "2" : 0.100000,
+        "4" : 0.100000,
+        "8" : 0.100000,
+        "16" : 0.100000,
+        "32" : 100.000000,
+        ">=64" : 0.000000
+      }
+    }
+  ]
+}
+"""
+
+
+def _fsync_job():
+    """fio JSON job of a 4k sync write job issuing an fsync after every write"""
+    fio_json = json.loads(FIO_RANDREAD_OUTPUT)
+    job = fio_json["jobs"][0]
+    job["jobname"] = "fsync_latency"
+    job["read"], job["write"] = job["write"], job["read"]
+    job["sync"] = {
+        "total_ios": 9875,
+        "lat_ns": {
+            "min": 401152,
+            "max": 21120330,
+            "mean": 1512097.51,
+            "stddev": 615227.87,
+            "N": 9875,
+            "percentile": {"50.000000": 1384448, "95.000000": 2506752, "99.000000": 3751936},
+        },
+    }
+    return fio_json
+
+
+class TestParseFioResults:
+    """Test cases for parse_fio_results function"""
+
+    def test_randread_job(self):
+        """Test that a job without fsync reports the completion latency of its I/O direction"""
+        assert parse_fio_results(fio_json=json.loads(FIO_RANDREAD_OUTPUT)) == {
+            "rand_read_4k": {
+                "iops": 12126.93,
+                "bandwidth_kib": 48507,
+                "latency_usec": {"p50": 2441.22, "p95": 4751.36, "p99": 6717.44},
+            }
+        }
+
+    def test_fsync_job(self):
+        """Test that a job issuing fsync reports the sync latency"""
+        assert parse_fio_results(fio_json=_fsync_job())["fsync_latency"]["latency_usec"] == {
+            "p50": 1384.45,
+            "p95": 2506.75,
+            "p99": 3751.94,
+        }
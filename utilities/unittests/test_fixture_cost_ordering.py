@@ -0,0 +1,179 @@
+"""Unit tests for fixture_cost_ordering module"""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from utilities.fixture_cost_ordering import load_fixture_setup_costs, order_items_by_fixture_cost
+
+SETUP_COSTS = {"vm": 10.0, "data_volume": 5.0}
+FIXTURE_DEFS = {
+    "os_matrix__class__": [SimpleNamespace(scope="class", argnames=())],
+    "class_vm": [SimpleNamespace(scope="class", argnames=("os_matrix__class__",))],
+    "class_data_volume": [SimpleNamespace(scope="class", argnames=("os_matrix__class__",))],
+    "storage_class_matrix__module__": [SimpleNamespace(scope="module", argnames=())],
+    "rhel_os_matrix__module__": [SimpleNamespace(scope="module", argnames=())],
+    "vm": [SimpleNamespace(scope="module", argnames=("rhel_os_matrix__module__",))],
+    "data_volume": [SimpleNamespace(scope="module", argnames=("storage_class_matrix__module__",))],
+}
+
+
+def _item(node_id, fixture_names, indices, markers=(), cls=None):
+    return SimpleNamespace(
+        nodeid=node_id,
+        cls=cls,
+        callspec=SimpleNamespace(indices=indices),
+        _fixtureinfo=SimpleNamespace(
+            name2fixturedefs={fixture_name: FIXTURE_DEFS[fixture_name] for fixture_name in fixture_names}
+        ),
+        get_closest_marker=lambda name: name if name in markers else None,
+    )
+
+
+@pytest.fixture()
+def interleaved_items():
+    """Items in the order pytest collects two independently parametrized module fixtures"""
+    vm_fixtures = ["rhel_os_matrix__module__", "vm"]
+    data_volume_fixtures = ["storage_class_matrix__module__", "data_volume"]
+    os_index = "rhel_os_matrix__module__"
+    storage_index = "storage_class_matrix__module__"
+    return [
+        _item(node_id="tests/test_a.py::test_vm[rhel8]", fixture_names=vm_fixtures, indices={os_index: 0}),
+        _item(
+            node_id="tests/test_a.py::test_both[rhel8-nfs]",
+            fixture_names=vm_fixtures + data_volume_fixtures,
+            indices={os_index: 0, storage_index: 0},
+        ),
+        _item(
+            node_id="tests/test_a.py::test_both[rhel9-nfs]",
+            fixture_names=vm_fixtures + data_volume_fixtures,
+            indices={os_index: 1, storage_index: 0},
+        ),
+        _item(node_id="tests/test_a.py::test_vm[rhel9]", fixture_names=vm_fixtures, indices={os_index: 1}),
+        _item(
+            node_id="tests/test_a.py::test_both[rhel9-ceph]",
+            fixture_names=vm_fixtures + data_volume_fixtures,
+            indices={os_index: 1, storage_index: 1},
+        ),
+        _item(
+            node_id="tests/test_a.py::test_both[rhel8-ceph]",
+            fixture_names=vm_fixtures + data_volume_fixtures,
+            indices={os_index: 0, storage_index: 1},
+        ),
+        _item(
+            node_id="tests/test_a.py::test_data_volume[ceph]",
+            fixture_names=data_volume_fixtures,
+            indices={storage_index: 1},
+        ),
+        _item(
+            node_id="tests/test_a.py::test_data_volume[nfs]",
+            fixture_names=data_volume_fixtures,
+            indices={storage_index: 0},
+        ),
+    ]
+
+
+class TestLoadFixtureSetupCosts:
+    """Test cases for load_fixture_setup_costs function"""
+
+    def test_mean_per_fixture(self, tmp_path):
+        """Test that the highest mean setup time of a fixture name is used"""
+        report_file = tmp_path / "fixture_timing_report.json"
+        report_file.write_text(
+            json.dumps([
+                {"fixture": "vm", "scope": "module", "mean": 10.0},
+                {"fixture": "vm", "scope": "class", "mean": 12.0},
+                {"fixture": "data_volume", "scope": "module", "mean": 5.0},
+            ])
+        )
+
+        assert load_fixture_setup_costs(fixture_timing_report=str(report_file)) == {"vm": 12.0, "data_volume": 5.0}
+
+
+class TestOrderItemsByFixtureCost:
+    """Test cases for order_items_by_fixture_cost function"""
+
+    def test_interleaved_params_grouped(self, interleaved_items):
+        """Test that items sharing a fixture instance are moved next to each other"""
+        items = interleaved_items.copy()
+
+        result = order_items_by_fixture_cost(items=items, setup_costs=SETUP_COSTS)
+
+        assert [item.nodeid.split("::")[1] for item in items] == [
+            "test_vm[rhel8]",
+            "test_both[rhel8-nfs]",
+            "test_data_volume[nfs]",
+            "test_both[rhel9-nfs]",
+            "test_vm[rhel9]",
+            "test_both[rhel9-ceph]",
+            "test_data_volume[ceph]",
+            "test_both[rhel8-ceph]",
+        ]
+        assert result == {"default_cost": 45.0, "ordered_cost": 40.0, "saved": 5.0, "reordered_modules": 1}
+
+    def test_class_fixtures_torn_down_between_classes(self):
+        """Test that class fixture instances are not reused once the tests leave their class"""
+        class_vm_fixtures = ["os_matrix__class__", "class_vm"]
+        class_data_volume_fixtures = ["os_matrix__class__", "class_data_volume"]
+        os_index = {"os_matrix__class__": 0}
+        items = [
+            _item(
+                node_id="tests/test_c.py::TestA::test_a[rhel9]",
+                fixture_names=class_vm_fixtures,
+                indices=os_index,
+                cls="TestA",
+            ),
+            _item(
+                node_id="tests/test_c.py::TestB::test_b[rhel9]",
+                fixture_names=class_data_volume_fixtures,
+                indices=os_index,
+                cls="TestB",
+            ),
+            _item(
+                node_id="tests/test_c.py::TestA::test_a2[rhel9]",
+                fixture_names=class_vm_fixtures,
+                indices=os_index,
+                cls="TestA",
+            ),
+        ]
+
+        result = order_items_by_fixture_cost(items=items, setup_costs={"class_vm": 100.0, "class_data_volume": 10.0})
+
+        assert [item.nodeid.split("::", 1)[1] for item in items] == [
+            "TestA::test_a[rhel9]",
+            "TestA::test_a2[rhel9]",
+            "TestB::test_b[rhel9]",
+        ]
+        assert result == {"default_cost": 210.0, "ordered_cost": 110.0, "saved": 100.0, "reordered_modules": 1}
+
+    def test_pinned_module_not_reordered(self, interleaved_items):
+        """Test that a module with order markers keeps its order"""
+        items = interleaved_items.copy()
+        items[0].get_closest_marker = lambda name: name if name == "order" else None
+
+        result = order_items_by_fixture_cost(items=items, setup_costs=SETUP_COSTS)
+
+        assert items == interleaved_items
+        assert result["saved"] == pytest.approx(0.0)
+
+    def test_unknown_costs_keep_order(self, interleaved_items):
+        """Test that the order is kept when no fixture setup time is known"""
+        items = interleaved_items.copy()
+
+        order_items_by_fixture_cost(items=items, setup_costs={})
+
+        assert items == interleaved_items
+
+    def test_items_only_reordered_within_module(self, interleaved_items):
+        """Test that items of another module are not moved across the module boundary"""
+        other_module_item = _item(
+            node_id="tests/test_b.py::test_data_volume[nfs]",
+            fixture_names=["storage_class_matrix__module__", "data_volume"],
+            indices={"storage_class_matrix__module__": 0},
+        )
+        items = [*interleaved_items[:4], other_module_item, *interleaved_items[4:]]
+
+        order_items_by_fixture_cost(items=items, setup_costs=SETUP_COSTS)
+
+        assert items.index(other_module_item) == 4
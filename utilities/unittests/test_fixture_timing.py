@@ -0,0 +1,114 @@
+"""Unit tests for fixture_timing module"""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from utilities.fixture_timing import (
+    FIXTURE_TIMING_REPORT_FILE,
+    SESSION_TRACE_FILE,
+    FixtureTiming,
+    FixtureTimingRecorder,
+)
+
+
+@pytest.fixture()
+def fixture_timing_recorder():
+    return FixtureTimingRecorder()
+
+
+def _run_test(recorder, node_id, fixture_names, setups):
+    recorder.start_test()
+    for argname, scope, duration in setups:
+        start = recorder.started_at + 1
+        recorder.record_setup(argname=argname, scope=scope, node_id=node_id, start=start, end=start + duration)
+    recorder.finish_test(node_id=node_id, fixture_names=fixture_names)
+
+
+class TestFixtureTiming:
+    """Test cases for FixtureTiming class"""
+
+    def test_report(self):
+        """Test total, count, mean and nearest-rank p95 of the setup durations"""
+        fixture_timing = FixtureTiming(
+            argname="golden_image_data_volume", scope="module", setup_durations=[float(i) for i in range(1, 21)]
+        )
+
+        report = fixture_timing.to_report()
+
+        assert report["total"] == pytest.approx(210.0)
+        assert report["count"] == 20
+        assert report["mean"] == pytest.approx(10.5)
+        assert report["p95"] == pytest.approx(19.0)
+
+    def test_single_setup_p95(self):
+        """Test that the p95 of a single setup is its duration"""
+        assert FixtureTiming(argname="virtctl_binary", scope="session", setup_durations=[4.0]).p95 == pytest.approx(4.0)
+
+
+class TestFixtureTimingRecorder:
+    """Test cases for FixtureTimingRecorder class"""
+
+    def test_report_sorted_by_total(self, fixture_timing_recorder):
+        """Test that fixtures are reported slowest first"""
+        _run_test(
+            recorder=fixture_timing_recorder,
+            node_id="test_a",
+            fixture_names=["fast", "slow"],
+            setups=[("fast", "function", 1.0), ("slow", "module", 5.0)],
+        )
+
+        assert [entry["fixture"] for entry in fixture_timing_recorder.report()] == ["slow", "fast"]
+
+    def test_cache_hits(self, fixture_timing_recorder):
+        """Test that a test using an already set up fixture counts as a cache hit"""
+        _run_test(
+            recorder=fixture_timing_recorder,
+            node_id="test_a",
+            fixture_names=["nodes_active_nics", "vm"],
+            setups=[("nodes_active_nics", "session", 3.0), ("vm", "function", 1.0)],
+        )
+        _run_test(
+            recorder=fixture_timing_recorder,
+            node_id="test_b",
+            fixture_names=["nodes_active_nics", "vm"],
+            setups=[("vm", "function", 1.0)],
+        )
+
+        report = {entry["fixture"]: entry for entry in fixture_timing_recorder.report()}
+        assert report["nodes_active_nics"]["count"] == 1
+        assert report["nodes_active_nics"]["cache_hits"] == 1
+        assert report["vm"]["count"] == 2
+        assert report["vm"]["cache_hits"] == 0
+
+    def test_teardown(self, fixture_timing_recorder):
+        """Test that a teardown is recorded only after its start was marked"""
+        fixture_timing_recorder.record_teardown(fixture_id=1, argname="vm", scope="function")
+        fixture_timing_recorder.start_teardown(fixture_id=1)
+        fixture_timing_recorder.record_teardown(fixture_id=1, argname="vm", scope="function")
+
+        assert [event["cat"] for event in fixture_timing_recorder.trace_events] == ["fixture_teardown"]
+        assert fixture_timing_recorder.fixtures["vm", "function"].teardown_duration >= 0
+
+    @patch("utilities.fixture_timing.write_to_file")
+    def test_write(self, mock_write_to_file, fixture_timing_recorder):
+        """Test that the report and a Chrome trace of fixtures and tests are written"""
+        _run_test(
+            recorder=fixture_timing_recorder,
+            node_id="test_a",
+            fixture_names=["vm"],
+            setups=[("vm", "function", 2.0)],
+        )
+
+        fixture_timing_recorder.write(base_directory="/data")
+
+        written = {call.kwargs["file_name"]: call.kwargs["content"] for call in mock_write_to_file.call_args_list}
+        assert json.loads(written[FIXTURE_TIMING_REPORT_FILE])[0]["fixture"] == "vm"
+        trace_events = json.loads(written[SESSION_TRACE_FILE])["traceEvents"]
+        assert [(event["name"], event["cat"], event["ph"]) for event in trace_events] == [
+            ("vm", "fixture_setup", "X"),
+            ("test_a", "test", "X"),
+        ]
+        assert trace_events[0]["ts"] == pytest.approx(1_000_000, abs=1)
+        assert trace_events[0]["dur"] == pytest.approx(2_000_000, abs=1)
@@ -0,0 +1,113 @@
+"""Unit tests for guest_file_transfer module"""
+
+import base64
+import hashlib
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from utilities.exceptions import GuestFileTransferError
+from utilities.guest_file_transfer import (
+    FileTransferResult,
+    stream_file_to_vm,
+    stream_file_to_vm_via_console,
+)
+
+CONTENT = b"0123456789" * 10
+CONTENT_SHA256 = hashlib.sha256(CONTENT).hexdigest()
+
+
+@pytest.fixture()
+def mock_vm():
+    vm = MagicMock()
+    vm.name = "test-vm"
+    return vm
+
+
+@pytest.fixture()
+def guest_file(mock_vm):
+    session = mock_vm.ssh_exec.executor.return_value.session.return_value.__enter__.return_value
+    return session.open_file.return_value.__enter__.return_value
+
+
+@pytest.fixture()
+def mock_console():
+    with patch("utilities.guest_file_transfer.Console") as mock_console_class:
+        yield mock_console_class.return_value.__enter__.return_value
+
+
+class TestFileTransferResult:
+    """Test cases for FileTransferResult class"""
+
+    def test_throughput(self):
+        """Test throughput calculation in MiB/s"""
+        result = FileTransferResult(destination="/tmp/file", size=4 * 1024 * 1024, sha256="", duration=2.0)
+
+        assert result.throughput_mib_per_sec == pytest.approx(2.0)
+
+    def test_throughput_zero_duration(self):
+        """Test that a zero duration does not raise"""
+        assert FileTransferResult(
+            destination="/tmp/file", size=1, sha256="", duration=0
+        ).throughput_mib_per_sec == pytest.approx(0)
+
+
+class TestStreamFileToVm:
+    """Test cases for stream_file_to_vm function"""
+
+    @patch("utilities.guest_file_transfer.run_ssh_commands")
+    def test_stream_local_file(self, mock_run_ssh_commands, mock_vm, guest_file, tmp_path):
+        """Test that a local file is written in chunks and its checksum validated"""
+        source = tmp_path / "source.bin"
+        source.write_bytes(CONTENT)
+        mock_run_ssh_commands.return_value = [f"{CONTENT_SHA256}  /tmp/file\n"]
+
+        result = stream_file_to_vm(vm=mock_vm, source=str(source), destination="/tmp/file", chunk_size=30)
+
+        assert b"".join(call.args[0] for call in guest_file.write.call_args_list) == CONTENT
+        assert guest_file.write.call_count == 4
+        assert result.size == len(CONTENT)
+        assert result.sha256 == CONTENT_SHA256
+        mock_run_ssh_commands.assert_called_once_with(host=mock_vm.ssh_exec, commands=["sha256sum", "/tmp/file"])
+
+    @patch("utilities.guest_file_transfer.run_ssh_commands")
+    def test_stream_generator(self, mock_run_ssh_commands, mock_vm, guest_file):
+        """Test that chunks of a generator are streamed"""
+        mock_run_ssh_commands.return_value = [f"{CONTENT_SHA256}  /tmp/file\n"]
+
+        result = stream_file_to_vm(vm=mock_vm, source=(CONTENT[:50], CONTENT[50:]), destination="/tmp/file")
+
+        assert guest_file.write.call_count == 2
+        assert result.size == len(CONTENT)
+
+    @patch("utilities.guest_file_transfer.run_ssh_commands")
+    def test_checksum_mismatch(self, mock_run_ssh_commands, mock_vm, guest_file):
+        """Test that a checksum mismatch raises GuestFileTransferError"""
+        mock_run_ssh_commands.return_value = [f"{'0' * 64}  /tmp/file\n"]
+
+        with pytest.raises(GuestFileTransferError, match="Checksum mismatch for /tmp/file"):
+            stream_file_to_vm(vm=mock_vm, source=[CONTENT], destination="/tmp/file")
+
+
+class TestStreamFileToVmViaConsole:
+    """Test cases for stream_file_to_vm_via_console function"""
+
+    def test_stream_base64_framed_chunks(self, mock_vm, mock_console):
+        """Test that each chunk is sent as one base64 line and the checksum validated"""
+        mock_console.after = CONTENT_SHA256
+
+        result = stream_file_to_vm_via_console(vm=mock_vm, source=[CONTENT], destination="/tmp/my file", chunk_size=60)
+
+        sent_lines = [call.args[0] for call in mock_console.sendline.call_args_list]
+        assert sent_lines[0] == ": > '/tmp/my file'"
+        assert sent_lines[1] == f"echo {base64.b64encode(CONTENT[:60]).decode()} | base64 -d >> '/tmp/my file'"
+        assert len(sent_lines) == 4
+        assert sent_lines[-1] == "sha256sum '/tmp/my file'"
+        assert result.size == len(CONTENT)
+
+    def test_checksum_mismatch(self, mock_vm, mock_console):
+        """Test that a checksum mismatch raises GuestFileTransferError"""
+        mock_console.after = "0" * 64
+
+        with pytest.raises(GuestFileTransferError):
+            stream_file_to_vm_via_console(vm=mock_vm, source=[CONTENT], destination="/tmp/file")
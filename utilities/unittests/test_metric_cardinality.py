@@ -0,0 +1,178 @@
+"""Unit tests for metric_cardinality module"""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from utilities.metric_cardinality import (
+    METRIC_CARDINALITY_FILE,
+    PROMETHEUS_SERIES_QUERY,
+    MetricCardinalityProfiler,
+    get_cardinality_regressions,
+    load_cardinality_baseline,
+    parse_scrape,
+)
+
+
+def _metrics_output(vms, duration="0.125", payload_bytes="2048"):
+    """virt-handler metrics endpoint output with the curl scrape statistics, for `vms` VMIs"""
+    lines = [
+        "# HELP kubevirt_vmi_memory_available_bytes Amount of usable memory.",
+        "# TYPE kubevirt_vmi_memory_available_bytes gauge",
+        *[f'kubevirt_vmi_memory_available_bytes{{name="{vm}",namespace="ns"}} 1024' for vm in vms],
+        "# TYPE kubevirt_vmi_phase_transition_time_seconds histogram",
+        *[
+            f'kubevirt_vmi_phase_transition_time_seconds_bucket{{phase="Running",le="{le}"}} 1'
+            for le in ("0.5", "5", "+Inf")
+        ],
+        'kubevirt_vmi_phase_transition_time_seconds_sum{phase="Running"} 3',
+        'kubevirt_vmi_phase_transition_time_seconds_count{phase="Running"} 1',
+    ]
+    return "\n".join(lines) + f"\n\n# SCRAPE_STATS {duration} {payload_bytes}\n"
+
+
+def _pod(name, node, output):
+    pod = MagicMock()
+    pod.name = name
+    pod.instance.spec.nodeName = node
+    pod.execute.return_value = output
+    return pod
+
+
+def _report(vmi_count, series, max_scrape_duration=0.1):
+    """Cardinality report with a single point"""
+    return {
+        "points": [
+            {
+                "vmi_count": vmi_count,
+                "families": {"kubevirt_vmi_memory_available_bytes": {"series": series, "top_labels": {"name": series}}},
+                "components": {"virt-handler": {"max_scrape_duration": max_scrape_duration, "payload_bytes": 2048}},
+            }
+        ]
+    }
+
+
+class TestParseScrape:
+    """Test cases for parse_scrape function"""
+
+    def test_series_per_family(self):
+        """Test that samples are counted per metric family, with the distinct values of their labels"""
+        scrape = parse_scrape(
+            component="virt-handler",
+            pod="virt-handler-a",
+            node="worker-0",
+            output=_metrics_output(vms=["vm-a", "vm-b"]),
+        )
+
+        assert scrape.series_by_family == {
+            "kubevirt_vmi_memory_available_bytes": 2,
+            "kubevirt_vmi_phase_transition_time_seconds": 5,
+        }
+        assert scrape.label_values_by_family["kubevirt_vmi_memory_available_bytes"]["name"] == {"vm-a", "vm-b"}
+        assert (
+            scrape.family_by_name["kubevirt_vmi_phase_transition_time_seconds_bucket"]
+            == "kubevirt_vmi_phase_transition_time_seconds"
+        )
+        assert (scrape.duration, scrape.payload_bytes) == (0.125, 2048)
+
+    def test_missing_scrape_statistics(self):
+        """Test that an output without the curl scrape statistics is rejected"""
+        with pytest.raises(ValueError, match="No scrape statistics"):
+            parse_scrape(component="virt-handler", pod="virt-handler-a", node="worker-0", output="up 1\n")
+
+
+class TestMetricCardinalityProfiler:
+    """Test cases for MetricCardinalityProfiler class"""
+
+    @patch("utilities.metric_cardinality.write_to_file")
+    @patch("utilities.metric_cardinality.utilities.infra.get_pods")
+    def test_profile_and_write(self, mock_get_pods, mock_write_to_file, recorded_prometheus):
+        """Test that the series, top labels and scrape cost are reported per family, component and node"""
+        mock_get_pods.side_effect = lambda client, namespace, label: (
+            [
+                _pod(name="virt-handler-a", node="worker-0", output=_metrics_output(vms=["vm-a", "vm-b"])),
+                _pod(name="virt-handler-b", node="worker-1", output=_metrics_output(vms=["vm-c"], duration="0.5")),
+            ]
+            if label.endswith("virt-handler")
+            else []
+        )
+        recorded_prometheus.record_series(
+            labels={"__name__": "kubevirt_vmi_phase_transition_time_seconds_bucket"},
+            samples={-10: 6},
+            query=PROMETHEUS_SERIES_QUERY,
+        )
+        profiler = MetricCardinalityProfiler(
+            prometheus=recorded_prometheus.client(), client=MagicMock(), namespace=MagicMock()
+        )
+
+        profiler.profile(vmi_count=3)
+        report = profiler.write(base_directory="/tmp/report")
+
+        assert mock_write_to_file.call_args.kwargs["file_name"] == METRIC_CARDINALITY_FILE
+        assert json.loads(mock_write_to_file.call_args.kwargs["content"]) == report
+        point = report["points"][0]
+        assert point["components"]["virt-handler"] == {
+            "pods": 2,
+            "series": 13,
+            "payload_bytes": 4096,
+            "max_scrape_duration": 0.5,
+        }
+        assert point["nodes"]["worker-0"]["series"] == 7
+        assert point["families"]["kubevirt_vmi_memory_available_bytes"] == {
+            "series": 3,
+            "series_per_vmi": 1.0,
+            "prometheus_series": None,
+            "top_labels": {"name": 3, "namespace": 1},
+        }
+        assert point["families"]["kubevirt_vmi_phase_transition_time_seconds"]["prometheus_series"] == 6
+
+
+class TestGetCardinalityRegressions:
+    """Test cases for get_cardinality_regressions function"""
+
+    def test_series_growth_reported(self):
+        """Test that a metric family growing beyond the tolerance is reported with its top labels"""
+        regressions = get_cardinality_regressions(
+            report=_report(vmi_count=100, series=200), baseline=_report(vmi_count=100, series=100)
+        )
+
+        assert regressions == [
+            "kubevirt_vmi_memory_available_bytes at 100 VMIs: 200 series > baseline 100, top labels {'name': 200}"
+        ]
+
+    def test_small_growth_ignored(self):
+        """Test that a series growth below the minimum is not reported, whatever the relative growth"""
+        assert not get_cardinality_regressions(
+            report=_report(vmi_count=1, series=4), baseline=_report(vmi_count=1, series=1)
+        )
+
+    def test_scrape_duration_growth_reported(self):
+        """Test that a slower scrape beyond the tolerance is reported per component"""
+        regressions = get_cardinality_regressions(
+            report=_report(vmi_count=100, series=100, max_scrape_duration=0.3),
+            baseline=_report(vmi_count=100, series=100),
+        )
+
+        assert regressions == ["virt-handler at 100 VMIs: max_scrape_duration 0.3 > baseline 0.1"]
+
+    def test_other_vmi_counts_ignored(self):
+        """Test that points are only compared with baseline points of the same VMI count"""
+        assert not get_cardinality_regressions(
+            report=_report(vmi_count=200, series=200), baseline=_report(vmi_count=100, series=100)
+        )
+
+
+class TestLoadCardinalityBaseline:
+    """Test cases for load_cardinality_baseline function"""
+
+    def test_load_baseline(self, tmp_path):
+        """Test that the report stored in the baseline directory is loaded"""
+        (tmp_path / METRIC_CARDINALITY_FILE).write_text(json.dumps(_report(vmi_count=1, series=1)))
+
+        assert load_cardinality_baseline(baseline_dir=str(tmp_path)) == _report(vmi_count=1, series=1)
+
+    def test_no_baseline(self, tmp_path):
+        """Test that no baseline is used when none is given or the directory has no report"""
+        assert load_cardinality_baseline(baseline_dir=None) == {}
+        assert load_cardinality_baseline(baseline_dir=str(tmp_path)) == {}
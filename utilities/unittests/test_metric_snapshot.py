@@ -0,0 +1,177 @@
+"""Unit tests for metric_snapshot module"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from timeout_sampler import TimeoutExpiredError
+
+from utilities.metric_snapshot import (
+    MetricSnapshot,
+    take_metric_snapshot,
+    wait_for_metric_snapshot_diff,
+)
+
+SELECTOR = '{__name__=~"kubevirt_vmi_.*",namespace="ns"}'
+
+
+def _query_response(series):
+    """Instant query response with `series` as {(name, name label value): value}"""
+    return {
+        "status": "success",
+        "data": {
+            "result": [
+                {"metric": {"__name__": name, "name": vm_name, "namespace": "ns"}, "value": [1700000000, value]}
+                for (name, vm_name), value in series.items()
+            ]
+        },
+    }
+
+
+def _snapshot(series):
+    """Snapshot with `series` as {(name, name label value): value}"""
+    return MetricSnapshot(
+        selectors=[SELECTOR],
+        timestamp=0,
+        series={
+            (name, (("name", vm_name), ("namespace", "ns"))): float(value) for (name, vm_name), value in series.items()
+        },
+    )
+
+
+class TestTakeMetricSnapshot:
+    """Test cases for take_metric_snapshot function"""
+
+    def test_query_per_selector(self):
+        """Test that every selector is queried and its series captured"""
+        mock_prometheus = MagicMock()
+        mock_prometheus.query.side_effect = [
+            _query_response(
+                series={
+                    ("kubevirt_vmi_migrations_total", "vm-a"): "2",
+                    ("kubevirt_vmi_memory_used_bytes", "vm-a"): "1e6",
+                }
+            ),
+            {"status": "success", "data": {"result": []}},
+        ]
+
+        snapshot = take_metric_snapshot(prometheus=mock_prometheus, selectors=[SELECTOR, "kubevirt_hco_system_health"])
+
+        assert [call.kwargs["query"] for call in mock_prometheus.query.call_args_list] == [
+            SELECTOR,
+            "kubevirt_hco_system_health",
+        ]
+        assert snapshot.series == {
+            ("kubevirt_vmi_migrations_total", (("name", "vm-a"), ("namespace", "ns"))): 2.0,
+            ("kubevirt_vmi_memory_used_bytes", (("name", "vm-a"), ("namespace", "ns"))): 1e6,
+        }
+
+    def test_metrics_with_same_label_set_against_recorded_prometheus(self, recorded_prometheus):
+        """Test that the series of metrics sharing a label set are all captured, with one merged query"""
+        for metric_name, value in (("metric_a", "1"), ("metric_b", "2")):
+            recorded_prometheus.record_series(
+                labels={"__name__": metric_name, "name": "vm-a", "namespace": "ns"}, samples={-10: value}
+            )
+
+        snapshot = take_metric_snapshot(
+            prometheus=recorded_prometheus.client(),
+            selectors=['metric_a{namespace="ns"}', 'metric_b{namespace="ns"}'],
+        )
+
+        assert [path for path, _ in recorded_prometheus.requests].count("/api/v1/query") == 1
+        assert snapshot.series == {
+            ("metric_a", (("name", "vm-a"), ("namespace", "ns"))): 1.0,
+            ("metric_b", (("name", "vm-a"), ("namespace", "ns"))): 2.0,
+        }
+
+    def test_failed_query(self):
+        """Test that a failed query raises instead of returning an empty snapshot"""
+        mock_prometheus = MagicMock()
+        mock_prometheus.query.return_value = {"status": "error", "error": "parse error"}
+
+        with pytest.raises(ValueError, match="parse error"):
+            take_metric_snapshot(prometheus=mock_prometheus, selectors=[SELECTOR])
+
+
+class TestMetricSnapshotDiff:
+    """Test cases for MetricSnapshot.diff and MetricSnapshotDiff"""
+
+    def test_diff(self):
+        """Test that added and removed series, counter deltas and gauge changes are listed"""
+        before = _snapshot(
+            series={
+                ("kubevirt_vmi_network_receive_bytes_total", "vm-a"): 100,
+                ("kubevirt_vmi_memory_used_bytes", "vm-a"): 50,
+                ("kubevirt_vmi_vcpu_wait_seconds_total", "vm-a"): 7,
+                ("kubevirt_vmi_info", "vm-b"): 1,
+            }
+        )
+        after = _snapshot(
+            series={
+                ("kubevirt_vmi_network_receive_bytes_total", "vm-a"): 150,
+                ("kubevirt_vmi_memory_used_bytes", "vm-a"): 40,
+                ("kubevirt_vmi_vcpu_wait_seconds_total", "vm-a"): 7,
+                ("kubevirt_vmi_info", "vm-c"): 1,
+            }
+        )
+
+        snapshot_diff = before.diff(after=after)
+
+        assert [(change.name, change.delta) for change in snapshot_diff.counter_deltas] == [
+            ("kubevirt_vmi_network_receive_bytes_total", 50)
+        ]
+        assert [(change.name, change.delta) for change in snapshot_diff.gauge_changes] == [
+            ("kubevirt_vmi_memory_used_bytes", -10)
+        ]
+        assert [change.labels["name"] for change in snapshot_diff.added] == ["vm-c"]
+        assert [change.labels["name"] for change in snapshot_diff.removed] == ["vm-b"]
+
+    def test_counter_delta(self):
+        """Test that counter deltas are summed over series, counting added series and resets from 0"""
+        before = _snapshot(
+            series={("kubevirt_vmi_migrations_total", "vm-a"): 5, ("kubevirt_vmi_migrations_total", "vm-b"): 3}
+        )
+        after = _snapshot(
+            series={
+                ("kubevirt_vmi_migrations_total", "vm-a"): 6,
+                ("kubevirt_vmi_migrations_total", "vm-b"): 1,
+                ("kubevirt_vmi_migrations_total", "vm-c"): 2,
+            }
+        )
+
+        snapshot_diff = before.diff(after=after)
+
+        assert snapshot_diff.counter_delta(name="kubevirt_vmi_migrations_total") == 4
+        assert snapshot_diff.counter_delta(name="kubevirt_vmi_migrations_total", labels={"name": "vm-a"}) == 1
+        with pytest.raises(ValueError):
+            snapshot_diff.counter_delta(name="kubevirt_vmi_memory_used_bytes")
+
+
+class TestWaitForMetricSnapshotDiff:
+    """Test cases for wait_for_metric_snapshot_diff function"""
+
+    @patch("utilities.metric_snapshot.TimeoutSampler")
+    def test_wait_for_metric_snapshot_diff_success(self, mock_sampler):
+        """Test that the first diff satisfying the condition is returned"""
+        before = _snapshot(series={("kubevirt_vmi_migrations_total", "vm-a"): 1})
+        mock_sampler.return_value = [
+            before.diff(after=before),
+            before.diff(after=_snapshot(series={("kubevirt_vmi_migrations_total", "vm-a"): 2})),
+        ]
+
+        snapshot_diff = wait_for_metric_snapshot_diff(
+            prometheus=MagicMock(),
+            before=before,
+            condition=lambda snapshot_diff: snapshot_diff.counter_delta(name="kubevirt_vmi_migrations_total") > 0,
+        )
+
+        assert snapshot_diff.counter_delta(name="kubevirt_vmi_migrations_total") == 1
+
+    @patch("utilities.metric_snapshot.TimeoutSampler")
+    def test_wait_for_metric_snapshot_diff_timeout(self, mock_sampler):
+        """Test that TimeoutExpiredError is raised when no diff satisfies the condition"""
+        mock_sampler.side_effect = TimeoutExpiredError("Timeout")
+
+        with pytest.raises(TimeoutExpiredError):
+            wait_for_metric_snapshot_diff(
+                prometheus=MagicMock(), before=_snapshot(series={}), condition=lambda snapshot_diff: False
+            )
@@ -0,0 +1,176 @@
+"""Unit tests for metric_transitions module"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from timeout_sampler import TimeoutExpiredError
+
+from utilities.metric_transitions import MetricTransitionDetector, query_range, wait_for_metric_transitions
+
+START = 1700000000.0
+SCRAPE_INTERVAL = 30
+
+
+@pytest.fixture()
+def prometheus():
+    prometheus = MagicMock()
+    prometheus.api_url = "https://prometheus"
+    prometheus.api_v1 = "/api/v1"
+    prometheus.scrape_interval = SCRAPE_INTERVAL
+    return prometheus
+
+
+def _series(points, metric_name="test_metric"):
+    """Range query result of a single series with `points` as {timestamp: value}"""
+    return [
+        {"metric": {"__name__": metric_name}, "values": [[timestamp, value] for timestamp, value in points.items()]}
+    ]
+
+
+def _sampler(polls):
+    """TimeoutSampler stand-in, calling func `polls` times and then timing out"""
+
+    def _timeout_sampler(wait_timeout, sleep, func, **func_kwargs):
+        for _ in range(polls):
+            yield func(**func_kwargs)
+        raise TimeoutExpiredError("Timeout")
+
+    return _timeout_sampler
+
+
+class TestQueryRange:
+    """Test cases for query_range function"""
+
+    def test_query_range_success(self, prometheus):
+        """Test that the range query is sent to the Prometheus API and its series are returned"""
+        prometheus.get.return_value = {"status": "success", "data": {"result": _series({START: "1"})}}
+
+        result = query_range(prometheus=prometheus, query="test_metric", start=START, end=START + 60, step=30)
+
+        assert result == _series({START: "1"})
+        assert prometheus.get.call_args.kwargs["path"] == "/api/v1/query_range"
+        assert prometheus.get.call_args.kwargs["params"] == {
+            "query": "test_metric",
+            "start": "1700000000.000",
+            "end": "1700000060.000",
+            "step": 30,
+        }
+
+    def test_query_range_error(self, prometheus):
+        """Test that a failed range query returns no series"""
+        prometheus.get.return_value = {"status": "error", "error": "parse error"}
+
+        assert query_range(prometheus=prometheus, query="test_metric{", start=START, end=START, step=30) == []
+
+    def test_query_range_replayed_recording(self, recorded_prometheus):
+        """Test that a recorded range query result is returned again when replayed at the same resolution"""
+        recording = [
+            {"metric": {"__name__": "test_metric", "name": name}, "values": [[START, "0"], [START + 30, value]]}
+            for name, value in (("vm-a", "1"), ("vm-b", "2"))
+        ]
+        recorded_prometheus.replay(result=recording, offset=-60)
+        start = recorded_prometheus.start_time - 60
+
+        result = query_range(
+            prometheus=recorded_prometheus.client(), query="test_metric", start=start, end=start + 30, step=30
+        )
+
+        assert [[value for _, value in series["values"]] for series in result] == [["0", "1"], ["0", "2"]]
+
+
+class TestMetricTransitionDetector:
+    """Test cases for MetricTransitionDetector class"""
+
+    @patch("utilities.metric_transitions.time")
+    @patch("utilities.metric_transitions.query_range")
+    def test_short_lived_value_detected(self, mock_query_range, mock_time, prometheus):
+        """Test that a value lasting a single scrape between two checks is found with its timestamp"""
+        mock_time.time.return_value = START + 95
+        mock_query_range.return_value = _series({START: "0", START + 30: "1", START + 60: "0", START + 90: "0"})
+        detector = MetricTransitionDetector(
+            prometheus=prometheus, query="test_metric", condition=lambda value: value == "1", start=START
+        )
+
+        transition = detector.check()
+
+        assert (transition.timestamp, transition.value) == (START + 30, "1")
+        assert mock_query_range.call_args.kwargs["end"] == START + 90
+
+    @patch("utilities.metric_transitions.time")
+    @patch("utilities.metric_transitions.query_range")
+    def test_absent_steps_are_int_zero(self, mock_query_range, mock_time, prometheus):
+        """Test that steps without a point of any series have the int 0 value"""
+        mock_time.time.return_value = START + 60
+        mock_query_range.return_value = _series({START: "1", START + 60: "1"})
+        detector = MetricTransitionDetector(
+            prometheus=prometheus, query="test_metric", condition=lambda value: value == 0, start=START
+        )
+
+        assert detector.check().timestamp == START + 30
+
+    @patch("utilities.metric_transitions.time")
+    @patch("utilities.metric_transitions.query_range")
+    def test_next_check_queries_from_previous_end(self, mock_query_range, mock_time, prometheus):
+        """Test that a check only queries the steps since the end of the previous check, with an overlap step"""
+        mock_query_range.return_value = _series({START: "1"})
+        detector = MetricTransitionDetector(
+            prometheus=prometheus, query="test_metric", condition=lambda value: value == "2", start=START
+        )
+        mock_time.time.return_value = START + 120
+        assert detector.check() is None
+
+        mock_time.time.return_value = START + 240
+        assert detector.check() is None
+
+        assert (mock_query_range.call_args.kwargs["start"], mock_query_range.call_args.kwargs["end"]) == (
+            START + 90,
+            START + 240,
+        )
+        assert (detector.polls, detector.last_timestamp, detector.last_value) == (2, START + 240, 0)
+
+
+class TestWaitForMetricTransitions:
+    """Test cases for wait_for_metric_transitions function"""
+
+    @patch("utilities.metric_transitions.TimeoutSampler", new=_sampler(polls=3))
+    @patch("utilities.metric_transitions.time")
+    @patch("utilities.metric_transitions.query_range")
+    def test_matched_queries_not_queried_again(self, mock_query_range, mock_time, prometheus):
+        """Test that queries are batched and no longer queried once their condition is satisfied"""
+        mock_time.time.return_value = START
+        mock_query_range.side_effect = lambda prometheus, query, start, end, step: (
+            _series(points={START: "1"}, metric_name="metric_a")
+            if mock_query_range.call_count == 1
+            else _series(points={START: "1"}, metric_name="metric_b")
+            if mock_query_range.call_count > 2
+            else []
+        )
+
+        transitions = wait_for_metric_transitions(
+            prometheus=prometheus,
+            conditions={"metric_a": lambda value: value == "1", "metric_b": lambda value: value == "1"},
+            timeout=60,
+        )
+
+        assert {query: transition.timestamp for query, transition in transitions.items()} == {
+            "metric_a": START,
+            "metric_b": START,
+        }
+        assert [call.kwargs["query"] for call in mock_query_range.call_args_list] == [
+            '{__name__=~"metric_a|metric_b"}',
+            "metric_b",
+            "metric_b",
+        ]
+
+    @patch("utilities.metric_transitions.TimeoutSampler", new=_sampler(polls=2))
+    @patch("utilities.metric_transitions.time")
+    @patch("utilities.metric_transitions.query_range")
+    def test_timeout(self, mock_query_range, mock_time, prometheus):
+        """Test that TimeoutExpiredError is raised when a condition is never satisfied"""
+        mock_time.time.return_value = START
+        mock_query_range.return_value = _series({START: "0"})
+
+        with pytest.raises(TimeoutExpiredError):
+            wait_for_metric_transitions(
+                prometheus=prometheus, conditions={"test_metric": lambda value: value == "1"}, timeout=60
+            )
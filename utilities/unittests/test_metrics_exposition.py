@@ -0,0 +1,168 @@
+"""Unit tests for metrics_exposition module"""
+
+import math
+
+import pytest
+
+from utilities.metrics_exposition import parse_metrics_exposition
+
+VIRT_HANDLER_METRICS = r"""# HELP kubevirt_vmi_memory_available_bytes Amount of usable memory as seen by the domain.
+# TYPE kubevirt_vmi_memory_available_bytes gauge
+kubevirt_vmi_memory_available_bytes{name="vm-a",namespace="ns",node="worker-0"} 1.6777216e+09
+kubevirt_vmi_memory_available_bytes{name="vm-b",namespace="ns",node="worker-1"} 2.097152e+09
+# HELP kubevirt_vmi_info Information about VirtualMachineInstances.
+# TYPE kubevirt_vmi_info gauge
+kubevirt_vmi_info{guest_os_name="Red Hat Enterprise Linux, \"Plow\"",name="vm-a",note="line\nbreak",path="C:\\vm",} 1
+# HELP kubevirt_vmi_network_receive_bytes_total Total network traffic received in bytes.
+# TYPE kubevirt_vmi_network_receive_bytes_total counter
+kubevirt_vmi_network_receive_bytes_total{interface="default",name="vm-a"} 1024 1700000000000
+# HELP kubevirt_vmi_phase_transition_time_seconds Histogram of VM phase transitions duration.
+# TYPE kubevirt_vmi_phase_transition_time_seconds histogram
+kubevirt_vmi_phase_transition_time_seconds_bucket{phase="Running",le="+Inf"} 12
+kubevirt_vmi_phase_transition_time_seconds_bucket{phase="Running",le="0.5"} 3
+kubevirt_vmi_phase_transition_time_seconds_bucket{phase="Running",le="5"} 10
+kubevirt_vmi_phase_transition_time_seconds_sum{phase="Running"} 31.5
+kubevirt_vmi_phase_transition_time_seconds_count{phase="Running"} 12
+process_open_fds 42
+"""
+
+
+def _virt_handler_metrics_dump(vmis):
+    """virt-handler /metrics output of a node with `vmis` VMIs, in the layout of a recorded dump"""
+    families = {
+        "kubevirt_vmi_memory_available_bytes": "gauge",
+        "kubevirt_vmi_memory_resident_bytes": "gauge",
+        "kubevirt_vmi_network_receive_bytes_total": "counter",
+        "kubevirt_vmi_network_transmit_bytes_total": "counter",
+        "kubevirt_vmi_storage_read_traffic_bytes_total": "counter",
+        "kubevirt_vmi_storage_write_traffic_bytes_total": "counter",
+        "kubevirt_vmi_vcpu_seconds_total": "counter",
+    }
+    lines = []
+    for family, family_type in families.items():
+        lines.extend([f"# HELP {family} {family} of the VMI.", f"# TYPE {family} {family_type}"])
+        lines.extend(
+            f'{family}{{interface="default",kubernetes_vmi_label_kubevirt_io_nodeName="worker-0",name="vm-{vmi}",'
+            f'namespace="ns-{vmi % 10}",node="worker-0"}} {vmi * 1024}'
+            for vmi in range(vmis)
+        )
+    lines.extend([
+        "# HELP kubevirt_vmi_info Information about VirtualMachineInstances.",
+        "# TYPE kubevirt_vmi_info gauge",
+    ])
+    lines.extend(
+        f'kubevirt_vmi_info{{guest_os_name="Red Hat Enterprise Linux, \\"Plow\\"",name="vm-{vmi}",'
+        f'namespace="ns-{vmi % 10}",phase="running"}} 1'
+        for vmi in range(vmis)
+    )
+    lines.extend([
+        "# HELP kubevirt_vmi_phase_transition_time_seconds Histogram of VM phase transitions duration.",
+        "# TYPE kubevirt_vmi_phase_transition_time_seconds histogram",
+    ])
+    for vmi in range(vmis):
+        lines.extend(
+            f'kubevirt_vmi_phase_transition_time_seconds_bucket{{name="vm-{vmi}",phase="Running",le="{bound}"}} {vmi}'
+            for bound in ("0.5", "1", "5", "10", "+Inf")
+        )
+    return "\n".join(lines)
+
+
+@pytest.fixture(scope="module")
+def metrics_dump():
+    return _virt_handler_metrics_dump(vmis=1000)
+
+
+class TestParseMetricsExposition:
+    """Test cases for parse_metrics_exposition function"""
+
+    def test_label_values_unescaped(self):
+        """Test that label values with commas, escaped quotes, new lines and backslashes are parsed"""
+        metrics_index = parse_metrics_exposition(exposition=VIRT_HANDLER_METRICS)
+
+        assert metrics_index.find(name="kubevirt_vmi_info")[0].labels == {
+            "guest_os_name": 'Red Hat Enterprise Linux, "Plow"',
+            "name": "vm-a",
+            "note": "line\nbreak",
+            "path": "C:\\vm",
+        }
+
+    def test_typed_samples(self):
+        """Test that samples are typed by their metric family, including histogram suffixes"""
+        metrics_index = parse_metrics_exposition(exposition=VIRT_HANDLER_METRICS)
+
+        counter_sample = metrics_index.find(name="kubevirt_vmi_network_receive_bytes_total")[0]
+        bucket_sample = metrics_index.find(name="kubevirt_vmi_phase_transition_time_seconds_bucket")[0]
+        assert (counter_sample.type, counter_sample.value, counter_sample.timestamp) == ("counter", 1024, 1700000000000)
+        assert (bucket_sample.type, bucket_sample.family) == ("histogram", "kubevirt_vmi_phase_transition_time_seconds")
+        assert len(metrics_index.families["kubevirt_vmi_phase_transition_time_seconds"].samples) == 5
+        assert metrics_index.find(name="process_open_fds")[0].type == "untyped"
+        assert metrics_index.families["kubevirt_vmi_info"].help == "Information about VirtualMachineInstances."
+
+    def test_metric_names_filter(self):
+        """Test that only the samples of the requested metrics and metric families are parsed"""
+        metrics_index = parse_metrics_exposition(
+            exposition=VIRT_HANDLER_METRICS,
+            metric_names=["kubevirt_vmi_memory_available_bytes", "kubevirt_vmi_phase_transition_time_seconds"],
+        )
+
+        assert metrics_index.names() == [
+            "kubevirt_vmi_memory_available_bytes",
+            "kubevirt_vmi_phase_transition_time_seconds_bucket",
+            "kubevirt_vmi_phase_transition_time_seconds_sum",
+            "kubevirt_vmi_phase_transition_time_seconds_count",
+        ]
+
+    def test_invalid_sample(self):
+        """Test that an invalid sample line raises with its line number"""
+        with pytest.raises(ValueError, match="line 2"):
+            parse_metrics_exposition(exposition='process_open_fds 42\nkubevirt_vmi_info{name="vm-a} 1')
+
+
+class TestMetricsIndex:
+    """Test cases for MetricsIndex class"""
+
+    def test_find_by_label_subset(self):
+        """Test that samples are found by name and a subset of their labels"""
+        metrics_index = parse_metrics_exposition(exposition=VIRT_HANDLER_METRICS)
+
+        samples = metrics_index.find(name="kubevirt_vmi_memory_available_bytes", labels={"node": "worker-1"})
+
+        assert [sample.labels["name"] for sample in samples] == ["vm-b"]
+        assert not metrics_index.find(name="kubevirt_vmi_memory_available_bytes", labels={"node": "worker-2"})
+
+    def test_histogram_buckets(self):
+        """Test that histogram buckets are returned sorted by upper bound"""
+        metrics_index = parse_metrics_exposition(exposition=VIRT_HANDLER_METRICS)
+
+        assert metrics_index.histogram_buckets(
+            name="kubevirt_vmi_phase_transition_time_seconds", labels={"phase": "Running"}
+        ) == [(0.5, 3), (5, 10), (math.inf, 12)]
+
+
+@pytest.mark.slow
+class TestParseMetricsExpositionBenchmark:
+    """Benchmarks of parse_metrics_exposition over a virt-handler metrics dump of a node with 1000 VMIs"""
+
+    def test_parse_all(self, benchmark, metrics_dump):
+        """Benchmark parsing all the metrics"""
+        metrics_index = benchmark(parse_metrics_exposition, exposition=metrics_dump)
+
+        assert len(metrics_index) == 13000
+
+    def test_parse_filtered(self, benchmark, metrics_dump):
+        """Benchmark parsing a single metric"""
+        metrics_index = benchmark(
+            parse_metrics_exposition, exposition=metrics_dump, metric_names=["kubevirt_vmi_memory_available_bytes"]
+        )
+
+        assert len(metrics_index) == 1000
+
+    def test_find_by_labels(self, benchmark, metrics_dump):
+        """Benchmark label subset lookups on an index"""
+        metrics_index = parse_metrics_exposition(exposition=metrics_dump)
+
+        samples = benchmark(
+            metrics_index.find, name="kubevirt_vmi_vcpu_seconds_total", labels={"name": "vm-500", "namespace": "ns-0"}
+        )
+
+        assert len(samples) == 1
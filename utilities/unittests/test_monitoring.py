@@ -8,51 +8,51 @@ import pytest
 from timeout_sampler import TimeoutExpiredError
 
 # Monitoring module can be imported safely with centralized mocking in conftest.py
+from utilities.constants.monitoring import (
+    KUBEVIRT_HCO_SYSTEM_HEALTH_STATUS,
+    KUBEVIRT_HYPERCONVERGED_OPERATOR_HEALTH_STATUS,
+)
+from utilities.metric_transitions import MetricTransition
 from utilities.monitoring import (
+    batch_query,
     get_all_firing_alerts,
     get_metrics_value,
+    get_metrics_values,
     validate_alert_cnv_labels,
     validate_alerts,
     validate_metrics_value,
     wait_for_alert,
     wait_for_firing_alert_clean_up,
     wait_for_gauge_metrics_value,
+    wait_for_gauge_metrics_values,
     wait_for_operator_health_metrics_value,
+    wait_for_queries,
 )
 
 
 class TestWaitForAlert:
     """Test cases for wait_for_alert function"""
 
-    @patch("utilities.monitoring.TimeoutSampler")
-    def test_wait_for_alert_success(self, mock_sampler):
+    @patch("utilities.monitoring.get_alert_poller")
+    def test_wait_for_alert_success(self, mock_get_alert_poller):
         """Test successful alert waiting"""
         mock_prometheus = MagicMock()
         mock_alerts = [{"alert": "test-alert", "state": "firing"}]
-
-        mock_sampler.return_value = [mock_alerts]
+        mock_get_alert_poller.return_value.wait_for_alerts.return_value = mock_alerts
 
         result = wait_for_alert(mock_prometheus, "test-alert")
 
         assert result == mock_alerts
-        mock_sampler.assert_called_once()
-        call_args = mock_sampler.call_args[1]
-        assert call_args["func"] == mock_prometheus.get_all_alerts_by_alert_name
+        mock_get_alert_poller.assert_called_once_with(prometheus=mock_prometheus)
+        call_args = mock_get_alert_poller.return_value.wait_for_alerts.call_args[1]
         assert call_args["alert_name"] == "test-alert"
 
     @patch("utilities.monitoring.collect_alerts_data")
-    @patch("utilities.monitoring.TimeoutSampler")
-    def test_wait_for_alert_timeout(self, mock_sampler, mock_collect_alerts):
+    @patch("utilities.monitoring.get_alert_poller")
+    def test_wait_for_alert_timeout(self, mock_get_alert_poller, mock_collect_alerts):
         """Test alert waiting timeout"""
         mock_prometheus = MagicMock()
-
-        # Create a generator that yields some samples then raises timeout
-        def timeout_generator():
-            yield None
-            yield None
-            raise TimeoutExpiredError("Timeout")
-
-        mock_sampler.return_value = timeout_generator()
+        mock_get_alert_poller.return_value.wait_for_alerts.side_effect = TimeoutExpiredError("Timeout")
 
         with pytest.raises(TimeoutExpiredError):
             wait_for_alert(mock_prometheus, "test-alert")
@@ -60,19 +60,6 @@ class TestWaitForAlert:
         # Should call collect_alerts_data on timeout
         mock_collect_alerts.assert_called_once()
 
-    @patch("utilities.monitoring.TimeoutSampler")
-    def test_wait_for_alert_no_sample(self, mock_sampler):
-        """Test alert waiting with no samples found"""
-        mock_prometheus = MagicMock()
-
-        mock_sampler.return_value = [None, None]
-
-        # Should timeout if no valid samples are found
-        mock_sampler.side_effect = TimeoutExpiredError("Timeout")
-
-        with pytest.raises(TimeoutExpiredError):
-            wait_for_alert(mock_prometheus, "test-alert")
-
 
 class TestValidateAlertCnvLabels:
     """Test cases for validate_alert_cnv_labels function"""
@@ -131,27 +118,20 @@ class TestValidateAlertCnvLabels:
 class TestWaitForFiringAlertCleanUp:
     """Test cases for wait_for_firing_alert_clean_up function"""
 
-    @patch("utilities.monitoring.TimeoutSampler")
-    def test_wait_for_firing_alert_clean_up_success(self, mock_sampler):
+    @patch("utilities.monitoring.get_alert_poller")
+    def test_wait_for_firing_alert_clean_up_success(self, mock_get_alert_poller):
         """Test successful alert cleanup waiting"""
         mock_prometheus = MagicMock()
 
-        # Mock progression: alerts exist, then empty
-        mock_sampler.return_value = [
-            [{"alert": "test-alert"}],  # Alerts still firing
-            [],  # No more alerts
-        ]
-
         wait_for_firing_alert_clean_up(mock_prometheus, "test-alert")
 
-        mock_sampler.assert_called_once()
+        mock_get_alert_poller.return_value.wait_for_alert_resolved.assert_called_once()
 
-    @patch("utilities.monitoring.TimeoutSampler")
-    def test_wait_for_firing_alert_clean_up_timeout(self, mock_sampler):
+    @patch("utilities.monitoring.get_alert_poller")
+    def test_wait_for_firing_alert_clean_up_timeout(self, mock_get_alert_poller):
         """Test alert cleanup timeout"""
         mock_prometheus = MagicMock()
-
-        mock_sampler.side_effect = TimeoutExpiredError("Timeout")
+        mock_get_alert_poller.return_value.wait_for_alert_resolved.side_effect = TimeoutExpiredError("Timeout")
 
         with pytest.raises(TimeoutExpiredError):
             wait_for_firing_alert_clean_up(mock_prometheus, "test-alert")
@@ -160,45 +140,53 @@ class TestWaitForFiringAlertCleanUp:
 class TestValidateAlerts:
     """Test cases for validate_alerts function"""
 
+    @patch("utilities.monitoring.get_alert_poller")
     @patch("utilities.monitoring.wait_for_operator_health_metrics_value")
     @patch("utilities.monitoring.validate_alert_cnv_labels")
-    def test_validate_alerts_success(self, mock_validate_labels, mock_wait_health):
+    def test_validate_alerts_success(self, mock_validate_labels, mock_wait_health, mock_get_alert_poller):
         """Test successful alert validation"""
         mock_prometheus = MagicMock()
-        mock_prometheus.wait_for_alert_by_state_sampler.return_value = [{"labels": {"alertname": "test-alert"}}]
+        mock_alert_poller = mock_get_alert_poller.return_value
+        mock_alert_poller.wait_for_alerts.return_value = [{"labels": {"alertname": "test-alert"}}]
 
         alert_dict = {"alert_name": "test-alert", "labels": {"operator_health_impact": "critical"}}
 
         validate_alerts(prometheus=mock_prometheus, alert_dict=alert_dict)
 
-        mock_prometheus.wait_for_alert_by_state_sampler.assert_called_once()
+        mock_alert_poller.wait_for_alerts.assert_called_once()
         mock_validate_labels.assert_called_once()
         mock_wait_health.assert_called_once()
 
+    @patch("utilities.monitoring.get_alert_poller")
     @patch("utilities.monitoring.wait_for_operator_health_metrics_value")
     @patch("utilities.monitoring.collect_alerts_data")
     @patch("utilities.monitoring.validate_alert_cnv_labels")
-    def test_validate_alerts_timeout_with_recovery(self, mock_validate_labels, mock_collect_alerts, mock_wait_health):
+    def test_validate_alerts_timeout_with_recovery(
+        self, mock_validate_labels, mock_collect_alerts, mock_wait_health, mock_get_alert_poller
+    ):
         """Test alert validation with timeout but alert found in different state"""
         mock_prometheus = MagicMock()
-        mock_prometheus.wait_for_alert_by_state_sampler.side_effect = TimeoutExpiredError("Timeout")
-        mock_prometheus.get_all_alerts_by_alert_name.return_value = [{"labels": {"alertname": "test-alert"}}]
+        mock_alert_poller = mock_get_alert_poller.return_value
+        mock_alert_poller.wait_for_alerts.side_effect = TimeoutExpiredError("Timeout")
+        mock_alert_poller.get_alerts.return_value = [{"labels": {"alertname": "test-alert"}}]
 
         alert_dict = {"alert_name": "test-alert", "labels": {"operator_health_impact": "critical"}}
 
         validate_alerts(prometheus=mock_prometheus, alert_dict=alert_dict)
 
-        mock_prometheus.get_all_alerts_by_alert_name.assert_called_once()
+        mock_alert_poller.get_alerts.assert_called_once()
         mock_validate_labels.assert_called_once()
         # Should call wait_for_operator_health_metrics_value because state defaults to FIRING_STATE
         mock_wait_health.assert_called_once()
 
+    @patch("utilities.monitoring.get_alert_poller")
     @patch("utilities.monitoring.collect_alerts_data")
-    def test_validate_alerts_timeout_no_recovery(self, mock_collect_alerts):
+    def test_validate_alerts_timeout_no_recovery(self, mock_collect_alerts, mock_get_alert_poller):
         """Test alert validation with timeout and no alert found"""
         mock_prometheus = MagicMock()
-        mock_prometheus.wait_for_alert_by_state_sampler.side_effect = TimeoutExpiredError("Timeout")
-        mock_prometheus.get_all_alerts_by_alert_name.return_value = []
+        mock_alert_poller = mock_get_alert_poller.return_value
+        mock_alert_poller.wait_for_alerts.side_effect = TimeoutExpiredError("Timeout")
+        mock_alert_poller.get_alerts.return_value = []
 
         alert_dict = {"alert_name": "test-alert", "labels": {"operator_health_impact": "critical"}}
 
@@ -207,12 +195,14 @@ class TestValidateAlerts:
 
         mock_collect_alerts.assert_called_once()
 
+    @patch("utilities.monitoring.get_alert_poller")
     @patch("utilities.monitoring.collect_alerts_data")
     @patch("utilities.monitoring.validate_alert_cnv_labels")
-    def test_validate_alerts_cnv_timeout(self, mock_validate_labels, mock_collect_alerts):
+    def test_validate_alerts_cnv_timeout(self, mock_validate_labels, mock_collect_alerts, mock_get_alert_poller):
         """Test alert validation with timeout in CNV labels validation"""
         mock_prometheus = MagicMock()
-        mock_prometheus.wait_for_alert_by_state_sampler.return_value = [{"labels": {"alertname": "test-alert"}}]
+        mock_alert_poller = mock_get_alert_poller.return_value
+        mock_alert_poller.wait_for_alerts.return_value = [{"labels": {"alertname": "test-alert"}}]
         mock_validate_labels.side_effect = TimeoutExpiredError("Timeout")
 
         alert_dict = {"alert_name": "test-alert", "labels": {"operator_health_impact": "critical"}}
@@ -227,25 +217,24 @@ class TestWaitForOperatorHealthMetricsValue:
     """Test cases for wait_for_operator_health_metrics_value function"""
 
     @patch("utilities.monitoring.get_all_firing_alerts")
-    @patch("utilities.monitoring.get_metrics_value")
     @patch("utilities.monitoring.TimeoutSampler")
-    def test_wait_for_operator_health_metrics_value_success(self, mock_sampler, mock_get_metrics, mock_get_alerts):
+    def test_wait_for_operator_health_metrics_value_success(self, mock_sampler, mock_get_alerts):
         """Test successful operator health metrics waiting"""
         mock_prometheus = MagicMock()
-        mock_get_metrics.side_effect = ["2", "2"]  # operator health and system health (critical = 2)
-
-        # Mock the sampler to return the expected value
-        mock_sampler.return_value = ["2"]
+        # operator health and system health (critical = 2)
+        mock_sampler.return_value = [
+            {KUBEVIRT_HYPERCONVERGED_OPERATOR_HEALTH_STATUS: "2", KUBEVIRT_HCO_SYSTEM_HEALTH_STATUS: "2"}
+        ]
 
         result = wait_for_operator_health_metrics_value(prometheus=mock_prometheus, health_impact_value="critical")
 
         assert result is True
         mock_sampler.assert_called_once()
+        assert mock_sampler.call_args[1]["func"] == get_metrics_values
 
     @patch("utilities.monitoring.get_all_firing_alerts")
-    @patch("utilities.monitoring.get_metrics_value")
     @patch("utilities.monitoring.TimeoutSampler")
-    def test_wait_for_operator_health_metrics_value_timeout(self, mock_sampler, mock_get_metrics, mock_get_alerts):
+    def test_wait_for_operator_health_metrics_value_timeout(self, mock_sampler, mock_get_alerts):
         """Test operator health metrics timeout"""
         mock_prometheus = MagicMock()
         mock_get_alerts.return_value = {}
@@ -256,26 +245,20 @@ class TestWaitForOperatorHealthMetricsValue:
             wait_for_operator_health_metrics_value(prometheus=mock_prometheus, health_impact_value="critical")
 
     @patch("utilities.monitoring.get_all_firing_alerts")
-    @patch("utilities.monitoring.get_metrics_value")
-    def test_wait_for_operator_health_metrics_value_with_higher_alerts(self, mock_get_metrics, mock_get_alerts):
+    def test_wait_for_operator_health_metrics_value_with_higher_alerts(self, mock_get_alerts):
         """Test operator health metrics with higher priority alerts"""
         mock_prometheus = MagicMock()
-        mock_get_metrics.side_effect = ["0", "1"]  # Different system metrics
         mock_get_alerts.return_value = {"2": ["high-priority-alert"]}  # Higher health impact alerts (string keys)
 
         # Mock the actual function to patch the timeout behavior
         with patch("utilities.monitoring.TimeoutSampler") as mock_sampler:
-            # Create a mock iterator that raises TimeoutExpiredError
-            def timeout_side_effect(*args, **kwargs):
-                # Return a generator that yields a few values then raises timeout
-                def generator():
-                    yield "0"
-                    yield "0"
-                    raise TimeoutExpiredError("Timeout")
-
-                return generator()
+            # Return a generator that yields a few values then raises timeout
+            def generator():
+                for _ in range(2):
+                    yield {KUBEVIRT_HYPERCONVERGED_OPERATOR_HEALTH_STATUS: "0", KUBEVIRT_HCO_SYSTEM_HEALTH_STATUS: "1"}
+                raise TimeoutExpiredError("Timeout")
 
-            mock_sampler.return_value = timeout_side_effect()
+            mock_sampler.return_value = generator()
 
             result = wait_for_operator_health_metrics_value(
                 prometheus=mock_prometheus,
@@ -288,19 +271,15 @@ class TestWaitForOperatorHealthMetricsValue:
 class TestGetAllFiringAlerts:
     """Test cases for get_all_firing_alerts function"""
 
-    def test_get_all_firing_alerts_success(self):
+    @patch("utilities.monitoring.get_alert_poller")
+    def test_get_all_firing_alerts_success(self, mock_get_alert_poller):
         """Test getting all firing alerts"""
         mock_prometheus = MagicMock()
-        mock_alerts_response = {
-            "data": {
-                "alerts": [
-                    {"state": "firing", "labels": {"alertname": "alert1", "operator_health_impact": "critical"}},
-                    {"state": "pending", "labels": {"alertname": "alert2", "operator_health_impact": "warning"}},
-                    {"state": "firing", "labels": {"alertname": "alert3", "operator_health_impact": "critical"}},
-                ]
-            }
-        }
-        mock_prometheus.alerts.return_value = mock_alerts_response
+        mock_get_alert_poller.return_value.get_all_alerts.return_value = [
+            {"state": "firing", "labels": {"alertname": "alert1", "operator_health_impact": "critical"}},
+            {"state": "pending", "labels": {"alertname": "alert2", "operator_health_impact": "warning"}},
+            {"state": "firing", "labels": {"alertname": "alert3", "operator_health_impact": "critical"}},
+        ]
 
         result = get_all_firing_alerts(mock_prometheus)
 
@@ -308,20 +287,16 @@ class TestGetAllFiringAlerts:
         # critical = "2", so health_value = "2" for critical alerts (string keys)
         expected = {"2": ["alert1", "alert3"]}  # critical alerts
         assert result == expected
-        mock_prometheus.alerts.assert_called_once()
+        mock_get_alert_poller.return_value.get_all_alerts.assert_called_once()
 
-    def test_get_all_firing_alerts_no_firing(self):
+    @patch("utilities.monitoring.get_alert_poller")
+    def test_get_all_firing_alerts_no_firing(self, mock_get_alert_poller):
         """Test getting firing alerts when none are firing"""
         mock_prometheus = MagicMock()
-        mock_alerts_response = {
-            "data": {
-                "alerts": [
-                    {"state": "pending", "labels": {"alertname": "alert1", "operator_health_impact": "warning"}},
-                    {"state": "resolved", "labels": {"alertname": "alert2", "operator_health_impact": "critical"}},
-                ]
-            }
-        }
-        mock_prometheus.alerts.return_value = mock_alerts_response
+        mock_get_alert_poller.return_value.get_all_alerts.return_value = [
+            {"state": "pending", "labels": {"alertname": "alert1", "operator_health_impact": "warning"}},
+            {"state": "resolved", "labels": {"alertname": "alert2", "operator_health_impact": "critical"}},
+        ]
 
         result = get_all_firing_alerts(mock_prometheus)
 
@@ -352,73 +327,215 @@ class TestGetMetricsValue:
         assert result == 0
 
 
-class TestValidateMetricsValue:
-    """Test cases for validate_metrics_value function"""
+class TestBatchQuery:
+    """Test cases for batch_query function"""
 
-    @patch("utilities.monitoring.TimeoutSampler")
-    def test_matches_emitted_string_value(self, mock_sampler_cls):
-        """Test matching when metric is emitted with a string value."""
-        mock_sampler_cls.return_value = iter(["0"])
-        validate_metrics_value(prometheus=MagicMock(), metric_name="test_metric", expected_value="0")
+    def test_selectors_merged_per_label_matchers(self):
+        """Test that selectors with the same label matchers are merged and the results split per query"""
+        mock_prometheus = MagicMock()
+        mock_prometheus.query.side_effect = lambda query: {
+            "status": "success",
+            "data": {
+                "result": [
+                    {"metric": {"__name__": "metric_a", "name": "vm"}, "value": ["timestamp", "1"]},
+                    {"metric": {"__name__": "metric_b", "name": "vm"}, "value": ["timestamp", "2"]},
+                ]
+                if query.startswith("{")
+                else [{"metric": {}, "value": ["timestamp", "3"]}]
+            },
+        }
 
-    @patch("utilities.monitoring.TimeoutSampler")
-    def test_matches_absent_metric_with_int_zero(self, mock_sampler_cls):
-        """Test matching absent metric (int 0) with expected_value=0."""
-        mock_sampler_cls.return_value = iter([0])
-        validate_metrics_value(prometheus=MagicMock(), metric_name="test_metric", expected_value=0)
+        result = batch_query(
+            prometheus=mock_prometheus,
+            queries=["metric_a{name='vm'}", "metric_b{ name = 'vm' }", "metric_c{name='vm'}", "sum(metric_a)"],
+        )
+
+        assert mock_prometheus.query.call_count == 2
+        mock_prometheus.query.assert_any_call(query="{__name__=~\"metric_a|metric_b|metric_c\",name='vm'}")
+        mock_prometheus.query.assert_any_call(query="sum(metric_a)")
+        assert result["metric_a{name='vm'}"][0]["value"][1] == "1"
+        assert result["metric_b{ name = 'vm' }"][0]["value"][1] == "2"
+        assert result["metric_c{name='vm'}"] == []
+        assert result["sum(metric_a)"][0]["value"][1] == "3"
+
+    def test_regex_matchers_not_merged(self):
+        """Test that selectors with regex or negative matchers are queried on their own"""
+        mock_prometheus = MagicMock()
+        mock_prometheus.query.return_value = {"data": {"result": []}}
+        queries = ["metric_a{name=~'vm.*'}", "metric_b{name!='vm'}"]
+
+        batch_query(prometheus=mock_prometheus, queries=queries)
+
+        assert [call.kwargs["query"] for call in mock_prometheus.query.call_args_list] == queries
+
+    def test_merged_query_against_recorded_prometheus(self, recorded_prometheus):
+        """Test that merged selectors return the same series as the queries run on their own, in one request"""
+        for name in ("vm-a", "vm-b"):
+            for metric_name, value in (("metric_a", 1), ("metric_b", 2)):
+                recorded_prometheus.record_series(labels={"__name__": metric_name, "name": name}, samples={-10: value})
+        queries = ["metric_a{name='vm-a'}", "metric_b{name='vm-a'}", "metric_c{name='vm-a'}"]
+        prometheus = recorded_prometheus.client()
+
+        result = batch_query(prometheus=prometheus, queries=queries)
+
+        assert [path for path, _ in recorded_prometheus.requests].count("/api/v1/query") == 1
+        assert {
+            query: [(series["metric"], series["value"][1]) for series in query_results]
+            for query, query_results in result.items()
+        } == {
+            query: [
+                (series["metric"], series["value"][1]) for series in prometheus.query(query=query)["data"]["result"]
+            ]
+            for query in queries
+        }
+        assert result["metric_b{name='vm-a'}"][0]["value"][1] == "2"
 
-    @patch("utilities.monitoring.TimeoutSampler")
-    def test_absent_metric_does_not_match_string_zero(self, mock_sampler_cls):
-        """Test that absent metric (int 0) does NOT match expected_value='0'."""
 
-        def raise_after_samples(*args, **kwargs):
-            def _iter():
-                yield 0
+class TestWaitForQueries:
+    """Test cases for wait_for_queries function"""
+
+    def test_matched_queries_not_sampled_again(self):
+        """Test that all the queries share one sampling loop and matched queries are dropped from it"""
+        sampled_queries = []
+
+        def _batch_query(prometheus, queries):
+            sampled_queries.append(list(queries))
+            return {query: [{"value": ["timestamp", str(len(sampled_queries))]}] for query in queries}
+
+        with patch("utilities.monitoring.batch_query", new=_batch_query):
+            result = wait_for_queries(
+                prometheus=MagicMock(),
+                conditions={
+                    "metric_a": lambda query_results: query_results[0]["value"][1] == "1",
+                    "metric_b": lambda query_results: query_results[0]["value"][1] == "2",
+                },
+                timeout=10,
+                sleep=0,
+            )
+
+        assert sampled_queries == [["metric_a", "metric_b"], ["metric_b"]]
+        assert result["metric_a"][0]["value"][1] == "1"
+        assert result["metric_b"][0]["value"][1] == "2"
+
+
+def _wait_for_values(values):
+    """wait_for_metric_transitions stand-in, matching every condition against `values` in scrape order"""
+
+    def _wait_for_metric_transitions(prometheus, conditions, timeout):
+        transitions = {}
+        for query, condition in conditions.items():
+            for timestamp, value in enumerate(values):
+                if condition(value):
+                    transitions[query] = MetricTransition(query=query, timestamp=timestamp, value=value)
+                    break
+            else:
                 raise TimeoutExpiredError("Timeout")
+        return transitions
 
-            return _iter()
+    return _wait_for_metric_transitions
 
-        mock_sampler_cls.side_effect = raise_after_samples
-        with pytest.raises(TimeoutExpiredError):
-            validate_metrics_value(prometheus=MagicMock(), metric_name="test_metric", expected_value="0")
 
-    @patch("utilities.monitoring.TimeoutSampler")
-    def test_timeout_when_value_does_not_match(self, mock_sampler_cls):
+class TestValidateMetricsValue:
+    """Test cases for validate_metrics_value function"""
+
+    def test_matches_emitted_string_value(self):
+        """Test matching when metric is emitted with a string value, returning the first matching scrape."""
+        with patch("utilities.monitoring.wait_for_metric_transitions", new=_wait_for_values(values=["5", "0", "5"])):
+            transition = validate_metrics_value(prometheus=MagicMock(), metric_name="test_metric", expected_value="0")
+
+        assert (transition.timestamp, transition.value) == (1, "0")
+
+    def test_matches_absent_metric_with_int_zero(self):
+        """Test matching absent metric (int 0) with expected_value=0."""
+        with patch("utilities.monitoring.wait_for_metric_transitions", new=_wait_for_values(values=["5", 0])):
+            transition = validate_metrics_value(prometheus=MagicMock(), metric_name="test_metric", expected_value=0)
+
+        assert transition.timestamp == 1
+
+    def test_absent_metric_does_not_match_string_zero(self):
+        """Test that absent metric (int 0) does NOT match expected_value='0'."""
+        with patch("utilities.monitoring.wait_for_metric_transitions", new=_wait_for_values(values=[0])):
+            with pytest.raises(TimeoutExpiredError):
+                validate_metrics_value(prometheus=MagicMock(), metric_name="test_metric", expected_value="0")
+
+    def test_timeout_when_value_does_not_match(self):
         """Test timeout when metric value never matches expected."""
+        with patch("utilities.monitoring.wait_for_metric_transitions", new=_wait_for_values(values=["5"])):
+            with pytest.raises(TimeoutExpiredError):
+                validate_metrics_value(prometheus=MagicMock(), metric_name="test_metric", expected_value="0")
 
-        def raise_after_samples(*args, **kwargs):
-            def _iter():
-                yield "5"
-                raise TimeoutExpiredError("Timeout")
+    def test_single_scrape_value_against_recorded_prometheus(self, recorded_prometheus):
+        """Test that a value lasting a single scrape while waiting is matched, at the scrape it was emitted"""
+        recorded_prometheus.record_series(labels={"__name__": "test_metric"}, samples={-10: "5", 1: "0", 2: "5"})
 
-            return _iter()
+        transition = validate_metrics_value(
+            prometheus=recorded_prometheus.client(), metric_name="test_metric", expected_value="0", timeout=10
+        )
 
-        mock_sampler_cls.side_effect = raise_after_samples
-        with pytest.raises(TimeoutExpiredError):
-            validate_metrics_value(prometheus=MagicMock(), metric_name="test_metric", expected_value="0")
+        assert 1 <= recorded_prometheus.offset(timestamp=transition.timestamp) < 2
 
 
 class TestWaitForGaugeMetricsValue:
     """Test cases for wait_for_gauge_metrics_value function"""
 
-    @patch("utilities.monitoring.TimeoutSampler")
-    def test_wait_for_gauge_metrics_value_success(self, mock_sampler):
+    def test_wait_for_gauge_metrics_value_success(self):
         """Test successful gauge metrics value waiting"""
-        mock_prometheus = MagicMock()
-        mock_sample = {"data": {"result": [{"value": ["timestamp", "1.0"]}]}}
+        with patch("utilities.monitoring.wait_for_metric_transitions", new=_wait_for_values(values=["0", "1.0"])):
+            transition = wait_for_gauge_metrics_value(prometheus=MagicMock(), query="test_query", expected_value="1.0")
 
-        mock_sampler.return_value = [mock_sample]
+        assert transition.timestamp == 1
 
-        wait_for_gauge_metrics_value(prometheus=mock_prometheus, query="test_query", expected_value="1.0")
+    def test_wait_for_gauge_metrics_value_timeout(self):
+        """Test gauge metrics value timeout when the query has no results"""
+        with patch("utilities.monitoring.wait_for_metric_transitions", new=_wait_for_values(values=[0])):
+            with pytest.raises(TimeoutExpiredError):
+                wait_for_gauge_metrics_value(prometheus=MagicMock(), query="test_query", expected_value="0")
 
-        mock_sampler.assert_called_once()
 
-    @patch("utilities.monitoring.TimeoutSampler")
-    def test_wait_for_gauge_metrics_value_timeout(self, mock_sampler):
-        """Test gauge metrics value timeout"""
-        mock_prometheus = MagicMock()
+class TestWaitForGaugeMetricsValues:
+    """Test cases for wait_for_gauge_metrics_values function"""
 
-        mock_sampler.side_effect = TimeoutExpiredError("Timeout")
+    def test_range_queries_batched_against_recorded_prometheus(self, recorded_prometheus):
+        """Test that the queries with the same label matchers are waited for with one range query per poll"""
+        for metric_name in ("metric_a", "metric_b"):
+            recorded_prometheus.record_series(
+                labels={"__name__": metric_name, "name": "vm-a"}, samples={-10: "0", 1: "1"}
+            )
 
-        with pytest.raises(TimeoutExpiredError):
-            wait_for_gauge_metrics_value(prometheus=mock_prometheus, query="test_query", expected_value="1.0")
+        transitions = wait_for_gauge_metrics_values(
+            prometheus=recorded_prometheus.client(),
+            expected_values={"metric_a{name='vm-a'}": "1", "metric_b{name='vm-a'}": "1"},
+            timeout=10,
+        )
+
+        assert {query: transition.value for query, transition in transitions.items()} == {
+            "metric_a{name='vm-a'}": "1",
+            "metric_b{name='vm-a'}": "1",
+        }
+        range_queries = [
+            params["query"] for path, params in recorded_prometheus.requests if path == "/api/v1/query_range"
+        ]
+        assert range_queries
+        assert set(range_queries) == {"{__name__=~\"metric_a|metric_b\",name='vm-a'}"}
+
+
+@pytest.mark.slow
+class TestBatchQueryBenchmark:
+    """Benchmarks of batch_query against a recorded Prometheus with 10 metrics of 1000 VMs"""
+
+    def test_batch_query(self, benchmark, recorded_prometheus):
+        """Benchmark querying the 10 metrics of a VM, including the HTTP round trip and the results split"""
+        metric_names = [f"kubevirt_vmi_metric_{index}" for index in range(10)]
+        for vm_index in range(1000):
+            for metric_name in metric_names:
+                recorded_prometheus.record_series(
+                    labels={"__name__": metric_name, "name": f"vm-{vm_index}"}, samples={-10: vm_index}
+                )
+
+        result = benchmark(
+            batch_query,
+            prometheus=recorded_prometheus.client(),
+            queries=[f"{metric_name}{{name='vm-500'}}" for metric_name in metric_names],
+        )
+
+        assert {query_results[0]["value"][1] for query_results in result.values()} == {"500"}
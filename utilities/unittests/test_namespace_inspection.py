@@ -0,0 +1,196 @@
+"""Unit tests for namespace_inspection module"""
+
+import io
+import zipfile
+from unittest.mock import MagicMock, patch
+
+import pytest
+import yaml
+from kubernetes.dynamic.resource import ResourceList
+
+from utilities.namespace_inspection import (
+    NAMESPACE_INSPECTION_ARCHIVE,
+    NamespaceInspectionArchive,
+    get_namespace_inspection_resources,
+    inspect_namespace,
+    inspect_namespaces,
+)
+
+POD = {
+    "metadata": {"name": "pod-a"},
+    "spec": {"initContainers": [{"name": "init"}], "containers": [{"name": "main"}]},
+    "status": {"containerStatuses": [{"name": "main", "restartCount": 0}]},
+}
+VM = {"metadata": {"name": "vm-a"}}
+ITEMS = {"pods": [POD], "virtualmachines": [VM]}
+
+
+def _resource(name, kind, group="", namespaced=True, preferred=True, verbs=("get", "list", "watch")):
+    resource = MagicMock(kind=kind, group=group, namespaced=namespaced, preferred=preferred, verbs=list(verbs))
+    resource.name = name
+    resource.get.return_value.to_dict.return_value = {"items": ITEMS.get(name, [])}
+    return resource
+
+
+RESOURCES = [
+    _resource(name="pods", kind="Pod"),
+    _resource(name="services", kind="Service"),
+    _resource(name="virtualmachines", kind="VirtualMachine", group="kubevirt.io"),
+]
+
+
+def _log_response(content):
+    response = MagicMock()
+    response.stream.side_effect = lambda amt: iter([content[:4], content[4:]])
+    return response
+
+
+@pytest.fixture()
+def admin_client():
+    client = MagicMock()
+    client.resources.search.return_value = RESOURCES
+    return client
+
+
+@pytest.fixture()
+def mock_core_v1_api():
+    with patch("utilities.namespace_inspection.CoreV1Api") as mock_core_v1_api:
+        mock_core_v1_api.return_value.read_namespaced_pod_log.side_effect = lambda **kwargs: _log_response(
+            content=f"{kwargs['container']} log line".encode()
+        )
+        yield mock_core_v1_api.return_value
+
+
+@pytest.fixture()
+def inspection_archive():
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(file=buffer, mode="w", compression=zipfile.ZIP_DEFLATED) as zip_archive:
+        yield NamespaceInspectionArchive(archive=zip_archive)
+
+
+class TestNamespaceInspectionArchive:
+    """Test cases for NamespaceInspectionArchive class"""
+
+    def test_write_returns_compressed_size(self, inspection_archive):
+        """Test that text and file members are written and their compressed size is returned"""
+        text_size = inspection_archive.write(name="a.yaml", content="a" * 1000)
+        file_size = inspection_archive.write(name="b.log", content=io.BytesIO(b"b" * 1000))
+
+        assert 0 < text_size < 1000
+        assert 0 < file_size < 1000
+        assert inspection_archive.archive.read(name="b.log") == b"b" * 1000
+
+
+class TestGetNamespaceInspectionResources:
+    """Test cases for get_namespace_inspection_resources function"""
+
+    def test_namespaced_listable_resources(self, admin_client):
+        """Test that only namespaced resources that can be listed, at their preferred version, are collected"""
+        admin_client.resources.search.return_value = RESOURCES + [
+            _resource(name="secrets", kind="Secret"),
+            _resource(name="packagemanifests", kind="PackageManifest", group="packages.operators.coreos.com"),
+            _resource(name="nodes", kind="Node", namespaced=False),
+            _resource(name="bindings", kind="Binding", verbs=("create",)),
+            _resource(name="virtualmachines", kind="VirtualMachine", group="kubevirt.io", preferred=False),
+            ResourceList(client=MagicMock(), base_kind="Pod"),
+        ]
+
+        assert get_namespace_inspection_resources(admin_client=admin_client) == RESOURCES
+
+
+class TestInspectNamespace:
+    """Test cases for inspect_namespace function"""
+
+    def test_resources_and_logs_collected(self, admin_client, mock_core_v1_api, inspection_archive):
+        """Test that resources and the logs of every container are collected with sinceSeconds"""
+        result = inspect_namespace(
+            admin_client=admin_client,
+            archive=inspection_archive,
+            namespace="ns",
+            since_seconds=600,
+            resources=RESOURCES,
+        )
+
+        names = inspection_archive.archive.namelist()
+        assert yaml.safe_load(inspection_archive.archive.read(name="namespaces/ns/core/pods.yaml")) == [POD]
+        assert yaml.safe_load(
+            inspection_archive.archive.read(name="namespaces/ns/kubevirt.io/virtualmachines.yaml")
+        ) == [VM]
+        assert "namespaces/ns/core/services.yaml" not in names
+        assert inspection_archive.archive.read(name="namespaces/ns/pods/pod-a/main.log") == b"main log line"
+        assert "namespaces/ns/pods/pod-a/init.log" in names
+        assert "namespaces/ns/pods/pod-a/main.previous.log" not in names
+        mock_core_v1_api.read_namespaced_pod_log.assert_any_call(
+            name="pod-a", namespace="ns", container="main", since_seconds=600, previous=False, _preload_content=False
+        )
+        assert result.error is None
+        assert result.size_bytes == sum(info.compress_size for info in inspection_archive.archive.infolist())
+
+    def test_previous_logs_of_restarted_containers(self, admin_client, mock_core_v1_api, inspection_archive):
+        """Test that the previous logs of a restarted container are collected"""
+        restarted_pod = {**POD, "status": {"containerStatuses": [{"name": "main", "restartCount": 2}]}}
+        pods = _resource(name="pods", kind="Pod")
+        pods.get.return_value.to_dict.return_value = {"items": [restarted_pod]}
+
+        inspect_namespace(
+            admin_client=admin_client, archive=inspection_archive, namespace="ns", since_seconds=600, resources=[pods]
+        )
+
+        names = inspection_archive.archive.namelist()
+        assert "namespaces/ns/pods/pod-a/main.previous.log" in names
+        assert "namespaces/ns/pods/pod-a/init.previous.log" not in names
+        mock_core_v1_api.read_namespaced_pod_log.assert_any_call(
+            name="pod-a", namespace="ns", container="main", since_seconds=600, previous=True, _preload_content=False
+        )
+
+    def test_failed_resource_is_skipped(self, admin_client, mock_core_v1_api, inspection_archive):
+        """Test that a resource that cannot be listed does not stop the inspection"""
+        forbidden_resource = _resource(name="virtualmachines", kind="VirtualMachine", group="kubevirt.io")
+        forbidden_resource.get.side_effect = RuntimeError("forbidden")
+
+        result = inspect_namespace(
+            admin_client=admin_client,
+            archive=inspection_archive,
+            namespace="ns",
+            since_seconds=600,
+            resources=[forbidden_resource, *RESOURCES[:1]],
+        )
+
+        assert "namespaces/ns/kubevirt.io/virtualmachines.yaml" not in inspection_archive.archive.namelist()
+        assert "namespaces/ns/pods/pod-a/main.log" in inspection_archive.archive.namelist()
+        assert result.error is None
+
+    def test_failed_log_is_skipped(self, admin_client, mock_core_v1_api, inspection_archive):
+        """Test that a container log that cannot be read does not stop the inspection"""
+        mock_core_v1_api.read_namespaced_pod_log.side_effect = [
+            RuntimeError("container not started"),
+            _log_response(b"log"),
+        ]
+
+        inspect_namespace(
+            admin_client=admin_client,
+            archive=inspection_archive,
+            namespace="ns",
+            since_seconds=600,
+            resources=RESOURCES,
+        )
+
+        assert inspection_archive.archive.read(name="namespaces/ns/pods/pod-a/main.log") == b"log"
+
+
+class TestInspectNamespaces:
+    """Test cases for inspect_namespaces function"""
+
+    def test_archive_per_collection(self, admin_client, mock_core_v1_api, tmp_path):
+        """Test that all namespaces are collected into one archive with a result per namespace"""
+        results = inspect_namespaces(
+            admin_client=admin_client, namespaces=["ns-a", "ns-b"], since_seconds=600, target_dir=str(tmp_path / "c")
+        )
+
+        assert [result.namespace for result in results] == ["ns-a", "ns-b"]
+        assert all(result.size_bytes > 0 for result in results)
+        with zipfile.ZipFile(file=tmp_path / "c" / NAMESPACE_INSPECTION_ARCHIVE) as zip_archive:
+            names = zip_archive.namelist()
+        assert "namespaces/ns-a/pods/pod-a/main.log" in names
+        assert "namespaces/ns-b/pods/pod-a/main.log" in names
+        admin_client.resources.search.assert_called_once_with()
@@ -0,0 +1,73 @@
+"""Unit tests for node_load module"""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from utilities.node_load import NODE_LOAD_MAX_POINTS, NODE_LOAD_TIMELINE_FILE, NodeLoadSampler
+
+START = 1700000000
+
+
+def _query_range(prometheus, query, start, end, step):
+    """query_range stand-in: two nodes, worker-1 twice as loaded as worker-0"""
+    return [
+        {"metric": {"instance": node}, "values": [[start, str(load)], [start + step, str(3 * load)]]}
+        for node, load in (("worker-0", 1), ("worker-1", 2))
+    ]
+
+
+@pytest.fixture()
+def node_load_sampler():
+    with patch("utilities.node_load.time") as mock_time:
+        mock_time.time.return_value = START
+        return NodeLoadSampler(prometheus=MagicMock())
+
+
+@patch("utilities.node_load.time")
+class TestNodeLoadSampler:
+    """Test cases for NodeLoadSampler class"""
+
+    def test_collect(self, mock_time, node_load_sampler):
+        """Test that every node metric is queried over the run and summarized per node"""
+        mock_time.time.return_value = START + 600
+        with patch("utilities.node_load.query_range", wraps=_query_range) as mock_query_range:
+            nodes_load = node_load_sampler.collect()
+
+        assert {call.kwargs["start"] for call in mock_query_range.call_args_list} == {START}
+        assert "[120s]" in mock_query_range.call_args_list[0].kwargs["query"]
+        assert set(nodes_load["worker-1"]) == {
+            "cpu_usage_ratio",
+            "memory_used_bytes",
+            "network_bytes_per_second",
+            "disk_bytes_per_second",
+        }
+        assert (nodes_load["worker-1"]["cpu_usage_ratio"].peak, nodes_load["worker-1"]["cpu_usage_ratio"].average) == (
+            6,
+            4,
+        )
+
+    def test_long_run_lower_resolution(self, mock_time, node_load_sampler):
+        """Test that the step is increased when the run is longer than the range query points limit"""
+        mock_time.time.return_value = START + 60 * NODE_LOAD_MAX_POINTS * 2
+        with patch("utilities.node_load.query_range", return_value=[]) as mock_query_range:
+            node_load_sampler.collect()
+
+        assert mock_query_range.call_args.kwargs["step"] == 120
+
+    @patch("utilities.node_load.write_to_file")
+    def test_write_with_vm_density(self, mock_write_to_file, mock_time, node_load_sampler):
+        """Test that the VM density checkpoints are written with the node load series"""
+        mock_time.time.return_value = START + 60
+        vm = MagicMock()
+        vm.vmi.node.name = "worker-0"
+        node_load_sampler.record_vm_density(checkpoint="vms_started", vms=[vm, vm])
+
+        with patch("utilities.node_load.query_range", new=_query_range):
+            node_load_sampler.write(base_directory="/tmp/report")
+
+        assert mock_write_to_file.call_args.kwargs["file_name"] == NODE_LOAD_TIMELINE_FILE
+        timeline = json.loads(mock_write_to_file.call_args.kwargs["content"])
+        assert timeline["vm_density"] == [{"time": START + 60, "checkpoint": "vms_started", "nodes": {"worker-0": 2}}]
+        assert timeline["nodes"]["worker-0"]["memory_used_bytes"]["peak"] == 3
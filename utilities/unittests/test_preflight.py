@@ -0,0 +1,115 @@
+"""Unit tests for preflight module"""
+
+import threading
+import time
+
+import pytest
+
+from utilities.preflight import Preflight, PreflightStateFile, PreflightStep
+
+CLUSTER = "https://api.cluster.example.com:6443"
+
+
+@pytest.fixture()
+def state_file(tmp_path):
+    return PreflightStateFile(path=str(tmp_path / "state" / "preflight_state.json"), cluster=CLUSTER)
+
+
+class TestPreflightStateFile:
+    """Test cases for PreflightStateFile class"""
+
+    def test_cached_value(self, state_file):
+        """Test that a stored value is returned within its TTL"""
+        state_file.set(name="cluster_service_network", value=["172.30.0.0/16"])
+
+        assert state_file.get(name="cluster_service_network", ttl=60) == (True, ["172.30.0.0/16"])
+
+    def test_expired_value(self, state_file):
+        """Test that a value older than its TTL is not returned"""
+        state_file.set(name="cluster_service_network", value=["172.30.0.0/16"])
+        time.sleep(0.01)
+
+        assert state_file.get(name="cluster_service_network", ttl=0.001) == (False, None)
+
+    def test_values_per_cluster(self, state_file):
+        """Test that values of another cluster are not returned"""
+        state_file.set(name="artifactory_server_url", value="artifactory.example.com")
+        other_cluster_state_file = PreflightStateFile(path=state_file.path, cluster="https://api.other:6443")
+
+        assert other_cluster_state_file.get(name="artifactory_server_url", ttl=60) == (False, None)
+
+    def test_missing_file(self, tmp_path):
+        """Test that a missing state file has no cached values"""
+        state_file = PreflightStateFile(path=str(tmp_path / "missing.json"), cluster=CLUSTER)
+
+        assert state_file.get(name="cluster_service_network", ttl=60) == (False, None)
+
+    def test_unwritable_file(self, tmp_path):
+        """Test that a state file that cannot be written does not fail, and nothing is cached"""
+        (tmp_path / "not-a-directory").write_text("")
+        state_file = PreflightStateFile(path=str(tmp_path / "not-a-directory" / "state.json"), cluster=CLUSTER)
+
+        state_file.set(name="cluster_service_network", value=["172.30.0.0/16"])
+
+        assert state_file.get(name="cluster_service_network", ttl=60) == (False, None)
+
+
+class TestPreflight:
+    """Test cases for Preflight class"""
+
+    def test_independent_steps_run_concurrently(self):
+        """Test that independent steps run at the same time and dependent steps get their results"""
+        barrier = threading.Barrier(parties=2, timeout=5)
+
+        def _step(value):
+            barrier.wait()
+            return value
+
+        results = Preflight(
+            steps=[
+                PreflightStep(name="first", func=lambda: _step(value=1)),
+                PreflightStep(name="second", func=lambda: _step(value=2)),
+                PreflightStep(name="sum", func=lambda first, second: first + second, depends_on=("first", "second")),
+            ]
+        ).run()
+
+        assert results == {"first": 1, "second": 2, "sum": 3}
+
+    def test_cached_step_not_run(self, state_file):
+        """Test that a cached step result is reused and other steps always run"""
+        calls = []
+
+        def _steps():
+            return [
+                PreflightStep(name="cached", func=lambda: calls.append("cached") or "value", cache_ttl=60),
+                PreflightStep(name="credentials", func=lambda: calls.append("credentials") or "secret"),
+            ]
+
+        Preflight(steps=_steps(), state_file=state_file).run()
+        results = Preflight(steps=_steps(), state_file=state_file).run()
+
+        assert results == {"cached": "value", "credentials": "secret"}
+        assert calls == ["cached", "credentials", "credentials"]
+        assert state_file.get(name="credentials", ttl=60) == (False, None)
+
+    def test_failed_step_stops_dependents(self):
+        """Test that a failing step raises and its dependent steps do not run"""
+        calls = []
+
+        def _fail():
+            raise RuntimeError("run in progress")
+
+        with pytest.raises(RuntimeError, match="run in progress"):
+            Preflight(
+                steps=[
+                    PreflightStep(name="check", func=_fail),
+                    PreflightStep(name="deploy", func=lambda: calls.append("deploy"), depends_on=("check",)),
+                ]
+            ).run()
+
+        assert not calls
+
+    def test_undeclared_dependency(self):
+        """Test that a step may only depend on steps declared before it"""
+        with pytest.raises(ValueError, match="not declared before it"):
+            Preflight(steps=[PreflightStep(name="deploy", func=lambda check: None, depends_on=("check",))])
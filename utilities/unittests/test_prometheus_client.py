@@ -0,0 +1,99 @@
+"""Unit tests for prometheus_client module"""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from ocp_utilities.monitoring import Prometheus
+
+from utilities.prometheus_client import (
+    PROMETHEUS_REQUEST_TIMING_FILE,
+    PROMETHEUS_TOKEN_DURATION,
+    PROMETHEUS_TOKEN_REFRESH_MARGIN,
+    PrometheusClient,
+)
+
+START = 1700000000.0
+
+
+def _response(status_code=200, body=None):
+    """requests.Response stand-in"""
+    response = MagicMock(status_code=status_code)
+    response.json.return_value = body or {"status": "success", "data": {"result": []}}
+    return response
+
+
+@pytest.fixture()
+def mock_get_token():
+    with patch("utilities.prometheus_client.utilities.infra.get_prometheus_k8s_token") as mock_get_token:
+        mock_get_token.side_effect = ["token-1", "token-2", "token-3"]
+        yield mock_get_token
+
+
+@pytest.fixture()
+def mock_time():
+    with patch("utilities.prometheus_client.time") as mock_time:
+        mock_time.time.return_value = START
+        mock_time.perf_counter.side_effect = [0.0, 0.5, 1.0, 3.0]
+        yield mock_time
+
+
+@pytest.fixture()
+def prometheus_client(mock_get_token, mock_time):
+    with (
+        patch.object(Prometheus, "_get_route", return_value="https://prometheus"),
+        patch.object(Prometheus, "get_scrape_interval", return_value=30),
+    ):
+        prometheus_client = PrometheusClient()
+    prometheus_client.session = MagicMock()
+    return prometheus_client
+
+
+class TestPrometheusClient:
+    """Test cases for PrometheusClient class"""
+
+    def test_query_params_encoded(self, prometheus_client):
+        """Test that instant queries are sent as query string parameters on the shared session"""
+        prometheus_client.session.get.return_value = _response()
+
+        prometheus_client.query(query='up{job="kubevirt"}')
+
+        assert prometheus_client.session.get.call_args.kwargs["url"] == "https://prometheus/api/v1/query"
+        assert prometheus_client.session.get.call_args.kwargs["params"] == {"query": 'up{job="kubevirt"}'}
+        assert prometheus_client.session.get.call_args.kwargs["headers"] == {"Authorization": "Bearer token-1"}
+
+    def test_token_refreshed_before_expiry(self, prometheus_client, mock_get_token, mock_time):
+        """Test that the token is refreshed once it is within the refresh margin of its expiry"""
+        prometheus_client.session.get.return_value = _response()
+        mock_time.time.return_value = START + PROMETHEUS_TOKEN_DURATION - PROMETHEUS_TOKEN_REFRESH_MARGIN + 1
+
+        prometheus_client.get(path="/api/v1/alerts")
+
+        mock_get_token.assert_called_with(duration=f"{PROMETHEUS_TOKEN_DURATION}s")
+        assert prometheus_client.session.get.call_args.kwargs["headers"] == {"Authorization": "Bearer token-2"}
+
+    def test_unauthorized_refreshes_token_and_retries(self, prometheus_client):
+        """Test that a request rejected with 401 is sent again with a new token, and counted as an error"""
+        prometheus_client.session.get.side_effect = [_response(status_code=401), _response()]
+
+        assert prometheus_client.get(path="/api/v1/query") == {"status": "success", "data": {"result": []}}
+        assert prometheus_client.session.get.call_args.kwargs["headers"] == {"Authorization": "Bearer token-2"}
+        assert prometheus_client.request_timing["/api/v1/query"].to_report() == {
+            "count": 2,
+            "total": 2.5,
+            "mean": 1.25,
+            "max": 2.0,
+            "errors": 1,
+            "retries": 0,
+        }
+
+    @patch("utilities.prometheus_client.utilities.data_collector.write_to_file")
+    def test_write_request_timing(self, mock_write_to_file, prometheus_client):
+        """Test that the request timing is written per API endpoint, without the query string"""
+        prometheus_client.session.get.return_value = _response()
+        prometheus_client._get_response(query="/api/v1/query?query=up")
+
+        prometheus_client.write_request_timing(base_directory="/tmp/report")
+
+        assert mock_write_to_file.call_args.kwargs["file_name"] == PROMETHEUS_REQUEST_TIMING_FILE
+        assert list(json.loads(mock_write_to_file.call_args.kwargs["content"])) == ["/api/v1/query"]
@@ -2,6 +2,8 @@
 
 """Unit tests for pytest_utils module"""
 
+import argparse
+import json
 from unittest.mock import MagicMock, mock_open, patch
 from xml.etree import ElementTree
 
@@ -24,6 +26,8 @@ from utilities.constants.instance_types import (
 )
 from utilities.exceptions import MissingEnvironmentVariableError, UnsupportedCPUArchitectureError
 from utilities.pytest_utils import (
+    COLLECTION_TIMING_FILE,
+    CollectionTimingReport,
     _validate_storage_class_options,
     assert_incremental_classes_fully_collected,
     config_default_storage_class,
@@ -39,11 +43,14 @@ from utilities.pytest_utils import (
     get_cnv_version_explorer_url,
     get_current_running_data,
     get_matrix_params,
+    get_matrix_params_cache,
     get_tests_cluster_markers,
     mark_nmstate_dependent_tests,
+    measure_collection_phase,
     remove_tests_from_list,
     reorder_early_fixtures,
     run_in_progress_config_map,
+    run_session_preflight,
     separator,
     skip_if_pytest_flags_exists,
     stop_if_run_in_progress,
@@ -262,6 +269,91 @@ class TestGetMatrixParams:
         assert result == [{"param": "value"}]
 
 
+class TestGetMatrixParamsCache:
+    """Test cases for get_matrix_params session cache"""
+
+    @patch("utilities.pytest_utils.py_config", {"test_matrix": [{"param": "value"}]})
+    @patch("utilities.pytest_utils.skip_if_pytest_flags_exists", return_value=False)
+    def test_matrix_params_computed_once_per_config(self, mock_skip_flags):
+        """Test that repeated calls with the same config reuse the computed matrix params"""
+        mock_pytest_config = MagicMock()
+
+        first_result = get_matrix_params(pytest_config=mock_pytest_config, matrix_name="test_matrix")
+        second_result = get_matrix_params(pytest_config=mock_pytest_config, matrix_name="test_matrix")
+
+        assert first_result is second_result
+        mock_skip_flags.assert_called_once_with(pytest_config=mock_pytest_config)
+        matrix_params_cache = get_matrix_params_cache(pytest_config=mock_pytest_config)
+        assert matrix_params_cache.hits == 1
+        assert list(matrix_params_cache.durations) == ["test_matrix"]
+
+    @patch("utilities.pytest_utils.py_config", {"test_matrix": [{"param": "value"}]})
+    @patch("utilities.pytest_utils.skip_if_pytest_flags_exists", return_value=False)
+    def test_matrix_params_cache_per_config(self, mock_skip_flags):
+        """Test that each pytest config has its own cache"""
+        get_matrix_params(pytest_config=MagicMock(), matrix_name="test_matrix")
+        get_matrix_params(pytest_config=MagicMock(), matrix_name="test_matrix")
+
+        assert mock_skip_flags.call_count == 2
+
+
+class TestCollectionTimingReport:
+    """Test cases for CollectionTimingReport class"""
+
+    @patch("utilities.pytest_utils.py_config", {"test_matrix": [{"param": "value"}]})
+    @patch("utilities.pytest_utils.skip_if_pytest_flags_exists", return_value=False)
+    @patch("utilities.pytest_utils.get_data_collector_base_directory", return_value="/data")
+    @patch("utilities.pytest_utils.write_to_file")
+    def test_report_written(self, mock_write_to_file, mock_base_dir, mock_skip_flags):
+        """Test that phase durations, collected items and matrix cache stats are written"""
+        mock_session = MagicMock()
+        mock_session.items = [MagicMock(), MagicMock()]
+        collection_timing = CollectionTimingReport()
+        for _ in range(2):
+            with collection_timing.measure(phase="generate_tests"):
+                get_matrix_params(pytest_config=mock_session.config, matrix_name="test_matrix")
+
+        collection_timing.write(session=mock_session)
+
+        mock_write_to_file.assert_called_once()
+        assert mock_write_to_file.call_args.kwargs["file_name"] == COLLECTION_TIMING_FILE
+        assert mock_write_to_file.call_args.kwargs["base_directory"] == "/data"
+        report = json.loads(mock_write_to_file.call_args.kwargs["content"])
+        assert report["collected_items"] == 2
+        assert list(report["phases"]) == ["generate_tests"]
+        assert report["matrix_params"]["computed"] == 1
+        assert report["matrix_params"]["cache_hits"] == 1
+        assert list(report["matrix_params"]["slowest"]) == ["test_matrix"]
+
+    @patch("utilities.pytest_utils.get_data_collector_base_directory", return_value="/data")
+    @patch("utilities.pytest_utils.write_to_file", side_effect=OSError("read-only file system"))
+    def test_write_failure_does_not_raise(self, mock_write_to_file, mock_base_dir):
+        """Test that a failure to write the report does not fail the collection"""
+        CollectionTimingReport().write(session=MagicMock())
+
+
+class TestMeasureCollectionPhase:
+    """Test cases for measure_collection_phase function"""
+
+    def test_phase_measured(self):
+        """Test that the phase is added to the collection timing of the session"""
+        mock_pytest_config = MagicMock()
+        mock_pytest_config.option.collection_timing = CollectionTimingReport()
+
+        with measure_collection_phase(pytest_config=mock_pytest_config, phase="modifyitems"):
+            pass
+
+        assert list(mock_pytest_config.option.collection_timing.phases) == ["modifyitems"]
+
+    def test_collection_not_timed(self):
+        """Test that the phase runs without timing when the collection is not timed, e.g. with --fixtures"""
+        mock_pytest_config = MagicMock()
+        mock_pytest_config.option = argparse.Namespace()
+
+        with measure_collection_phase(pytest_config=mock_pytest_config, phase="modifyitems"):
+            pass
+
+
 class TestConfigDefaultStorageClass:
     """Test cases for config_default_storage_class function"""
 
@@ -1225,6 +1317,72 @@ class TestGetArtifactoryServerUrl:
         assert mock_get_secret.call_count == 2
 
 
+class TestRunSessionPreflight:
+    """Test cases for run_session_preflight function"""
+
+    @patch("utilities.pytest_utils.deploy_run_in_progress_config_map")
+    @patch("utilities.pytest_utils.deploy_run_in_progress_namespace")
+    @patch("utilities.pytest_utils.stop_if_run_in_progress")
+    @patch("utilities.pytest_utils.get_cnv_tests_secret_by_name", return_value={"user": "cloud-user"})
+    @patch("utilities.pytest_utils.get_artifactory_server_url", return_value="artifactory.example.com")
+    @patch("utilities.pytest_utils.get_cnv_version_explorer_url", return_value=None)
+    @patch("utilities.pytest_utils.Network")
+    def test_py_config_updated(
+        self,
+        mock_network,
+        mock_version_explorer_url,
+        mock_artifactory_server_url,
+        mock_secret,
+        mock_stop_if_run_in_progress,
+        mock_deploy_namespace,
+        mock_deploy_config_map,
+    ):
+        """Test that the startup results are set in py_config and the run-in-progress resources are deployed"""
+        mock_network.return_value.instance.status.serviceNetwork = ["172.30.0.0/16"]
+        mock_session = MagicMock()
+        mock_session.config.getoption.side_effect = lambda name: {
+            "--preflight-cache-ttl": 0,
+            "--skip-artifactory-check": False,
+        }[name]
+        test_py_config = {"server_url": None, "servers": {"images": "https://{server}/images"}}
+
+        with patch("utilities.pytest_utils.py_config", test_py_config):
+            run_session_preflight(session=mock_session, admin_client=MagicMock())
+
+        assert test_py_config["cluster_service_network"] == ["172.30.0.0/16"]
+        assert test_py_config["servers"] == {"images": "https://artifactory.example.com/images"}
+        assert test_py_config["os_login_param"] == {"user": "cloud-user"}
+        mock_stop_if_run_in_progress.assert_called_once()
+        mock_deploy_namespace.assert_called_once()
+        mock_deploy_config_map.assert_called_once()
+
+    @patch("utilities.pytest_utils.deploy_run_in_progress_config_map")
+    @patch("utilities.pytest_utils.deploy_run_in_progress_namespace")
+    @patch("utilities.pytest_utils.stop_if_run_in_progress", side_effect=RuntimeError("run in progress"))
+    @patch("utilities.pytest_utils.get_cnv_version_explorer_url", return_value=None)
+    @patch("utilities.pytest_utils.Network")
+    def test_no_deploy_when_check_fails(
+        self,
+        mock_network,
+        mock_version_explorer_url,
+        mock_stop_if_run_in_progress,
+        mock_deploy_namespace,
+        mock_deploy_config_map,
+    ):
+        """Test that the run-in-progress resources are not deployed when a startup step fails"""
+        mock_session = MagicMock()
+        mock_session.config.getoption.side_effect = lambda name: {
+            "--preflight-cache-ttl": 0,
+            "--skip-artifactory-check": True,
+        }[name]
+
+        with pytest.raises(RuntimeError, match="run in progress"):
+            run_session_preflight(session=mock_session, admin_client=MagicMock())
+
+        mock_deploy_namespace.assert_not_called()
+        mock_deploy_config_map.assert_not_called()
+
+
 class TestGetCnvVersionExplorerUrl:
     """Test cases for get_cnv_version_explorer_url function"""
 
@@ -0,0 +1,182 @@
+"""Unit tests for vm_diagnostics module"""
+
+import json
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+import yaml
+from ocp_resources.virtual_machine import VirtualMachine
+
+from utilities.vm_diagnostics import (
+    CAPTURED,
+    FAILED,
+    GUEST_CONSOLE_LOG_CONTAINER,
+    SKIPPED,
+    TIMED_OUT,
+    VM_DIAGNOSTICS_MANIFEST_FILE,
+    collect_vms_diagnostics,
+)
+
+ALERTS = {
+    "data": {
+        "alerts": [
+            {"labels": {"alertname": "KubeVirtVMIExcessiveMigrations"}, "state": "firing"},
+            {"labels": {"alertname": "VirtHandlerDaemonSetRolloutFailing"}, "state": "pending"},
+        ]
+    }
+}
+
+
+def _diagnostics_vm(name, printable_status=VirtualMachine.Status.RUNNING, console_log=True):
+    vm = MagicMock()
+    vm.name = name
+    vm.namespace = "test-namespace"
+    vm.instance.get.return_value = {"printableStatus": printable_status}
+    vm.vmi.exists = printable_status == VirtualMachine.Status.RUNNING
+    vm.vmi.instance.to_dict.return_value = {"kind": "VirtualMachineInstance", "metadata": {"name": name}}
+    launcher_pod = vm.vmi.get_virt_launcher_pod.return_value
+    containers = [{"name": "compute"}] + ([{"name": GUEST_CONSOLE_LOG_CONTAINER}] if console_log else [])
+    launcher_pod.instance.to_dict.return_value = {"kind": "Pod", "spec": {"containers": containers}}
+    launcher_pod.log.return_value = "login:"
+    return vm
+
+
+@pytest.fixture()
+def mock_virtctl():
+    with patch("utilities.vm_diagnostics.utilities.infra.run_virtctl_command") as mock_virtctl:
+        mock_virtctl.return_value = (True, "", "")
+        yield mock_virtctl
+
+
+@pytest.fixture()
+def mock_prometheus():
+    with patch("utilities.vm_diagnostics.utilities.prometheus_client.get_prometheus_client") as mock_prometheus:
+        mock_prometheus.return_value.alerts.return_value = ALERTS
+        yield mock_prometheus
+
+
+@pytest.fixture()
+def mock_write_to_file():
+    with patch("utilities.vm_diagnostics.write_to_file") as mock_write_to_file:
+        yield mock_write_to_file
+
+
+def _artifacts_by_name(artifacts, vm_name):
+    return {artifact.name: artifact for artifact in artifacts if artifact.vm_name == vm_name}
+
+
+class TestCollectVmsDiagnostics:
+    """Test cases for collect_vms_diagnostics function"""
+
+    def test_all_artifacts_captured(self, tmp_path, mock_virtctl, mock_prometheus, mock_write_to_file):
+        """Test that every artifact of every VM and the firing alerts are captured"""
+        artifacts = collect_vms_diagnostics(
+            vms=[_diagnostics_vm(name="vm-a"), _diagnostics_vm(name="vm-b")],
+            admin_client=MagicMock(),
+            target_dir=str(tmp_path),
+        )
+
+        assert len(artifacts) == 9
+        assert all(artifact.status == CAPTURED for artifact in artifacts)
+        vm_artifacts = _artifacts_by_name(artifacts=artifacts, vm_name="vm-a")
+        with open(vm_artifacts["vmi"].path) as fd:
+            assert yaml.safe_load(fd)["metadata"]["name"] == "vm-a"
+        with open(vm_artifacts["guest_console_tail"].path) as fd:
+            assert fd.read() == "login:"
+        assert mock_virtctl.call_count == 2
+        with open(tmp_path / "firing_alerts.json") as fd:
+            assert [alert["state"] for alert in json.load(fd)] == ["firing"]
+
+    def test_manifest_written(self, tmp_path, mock_virtctl, mock_prometheus, mock_write_to_file):
+        """Test that a single manifest describes the captured artifacts"""
+        collect_vms_diagnostics(vms=[_diagnostics_vm(name="vm-a")], admin_client=MagicMock(), target_dir=str(tmp_path))
+
+        mock_write_to_file.assert_called_once()
+        assert mock_write_to_file.call_args.kwargs["file_name"] == VM_DIAGNOSTICS_MANIFEST_FILE
+        assert mock_write_to_file.call_args.kwargs["base_directory"] == str(tmp_path)
+        manifest = json.loads(mock_write_to_file.call_args.kwargs["content"])
+        assert [entry["name"] for entry in manifest] == [
+            "firing_alerts",
+            "screenshot",
+            "vmi",
+            "launcher_pod",
+            "guest_console_tail",
+        ]
+        assert "started_at" not in manifest[0]
+
+    def test_stopped_vm_artifacts_skipped(self, tmp_path, mock_virtctl, mock_prometheus, mock_write_to_file):
+        """Test that artifacts that need a running VM are skipped for a stopped VM"""
+        artifacts = collect_vms_diagnostics(
+            vms=[_diagnostics_vm(name="vm-a", printable_status=VirtualMachine.Status.STOPPED)],
+            admin_client=MagicMock(),
+            target_dir=str(tmp_path),
+        )
+
+        vm_artifacts = _artifacts_by_name(artifacts=artifacts, vm_name="vm-a")
+        assert {artifact.status for artifact in vm_artifacts.values()} == {SKIPPED}
+        assert "Stopped" in vm_artifacts["screenshot"].reason
+        mock_virtctl.assert_not_called()
+
+    def test_guest_console_log_disabled(self, tmp_path, mock_virtctl, mock_prometheus, mock_write_to_file):
+        """Test that the console tail is skipped when the guest console log container is missing"""
+        artifacts = collect_vms_diagnostics(
+            vms=[_diagnostics_vm(name="vm-a", console_log=False)], admin_client=MagicMock(), target_dir=str(tmp_path)
+        )
+
+        assert _artifacts_by_name(artifacts=artifacts, vm_name="vm-a")["guest_console_tail"].status == SKIPPED
+
+    def test_failed_artifact(self, tmp_path, mock_virtctl, mock_prometheus, mock_write_to_file):
+        """Test that a failed artifact is recorded without failing the collection"""
+        mock_virtctl.return_value = (False, "", "connection refused")
+
+        artifacts = collect_vms_diagnostics(
+            vms=[_diagnostics_vm(name="vm-a")], admin_client=MagicMock(), target_dir=str(tmp_path)
+        )
+
+        vm_artifacts = _artifacts_by_name(artifacts=artifacts, vm_name="vm-a")
+        assert vm_artifacts["screenshot"].status == FAILED
+        assert "connection refused" in vm_artifacts["screenshot"].reason
+        assert vm_artifacts["vmi"].status == CAPTURED
+
+    def test_artifact_timeout(self, tmp_path, mock_virtctl, mock_prometheus, mock_write_to_file):
+        """Test that an artifact exceeding its timeout is recorded as timed out and not waited for"""
+        release_event = threading.Event()
+        mock_virtctl.side_effect = lambda **kwargs: release_event.wait(timeout=10) and (True, "", "")
+
+        try:
+            artifacts = collect_vms_diagnostics(
+                vms=[_diagnostics_vm(name="vm-a")],
+                admin_client=MagicMock(),
+                target_dir=str(tmp_path),
+                artifact_timeout=1,
+            )
+        finally:
+            release_event.set()
+
+        vm_artifacts = _artifacts_by_name(artifacts=artifacts, vm_name="vm-a")
+        assert vm_artifacts["screenshot"].status == TIMED_OUT
+        assert vm_artifacts["vmi"].status == CAPTURED
+
+    def test_collection_timeout(self, tmp_path, mock_virtctl, mock_prometheus, mock_write_to_file):
+        """Test that artifacts queued behind workers stuck on timed out artifacts are recorded as timed out"""
+        release_event = threading.Event()
+        mock_virtctl.side_effect = lambda **kwargs: release_event.wait(timeout=30) and (True, "", "")
+
+        try:
+            artifacts = collect_vms_diagnostics(
+                vms=[_diagnostics_vm(name="vm-a"), _diagnostics_vm(name="vm-b")],
+                admin_client=MagicMock(),
+                target_dir=str(tmp_path),
+                max_workers=2,
+                artifact_timeout=1,
+            )
+            assert not release_event.is_set()
+        finally:
+            release_event.set()
+
+        vm_artifacts = _artifacts_by_name(artifacts=artifacts, vm_name="vm-b")
+        assert vm_artifacts["screenshot"].status == TIMED_OUT
+        assert vm_artifacts["vmi"].status == TIMED_OUT
+        assert vm_artifacts["vmi"].reason == "not captured within the 5s collection timeout"
+        assert vm_artifacts["vmi"].duration is None
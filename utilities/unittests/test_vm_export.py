@@ -0,0 +1,167 @@
+"""Unit tests for vm_export module"""
+
+import hashlib
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from utilities.vm_export import VMExportClient, get_file_sha256
+
+CONTENT = bytes(range(256)) * 40
+CONTENT_SHA256 = hashlib.sha256(CONTENT).hexdigest()
+VOLUME_URL = "https://export.example.com/volumes/disk/disk.img.gz"
+EXTERNAL_LINKS = {
+    "cert": "CERT",
+    "manifests": [
+        {"type": "all", "url": "https://export.example.com/all"},
+        {"type": "auth-header-secret", "url": "https://export.example.com/secret"},
+    ],
+    "volumes": [
+        {
+            "name": "disk",
+            "formats": [
+                {"format": "raw", "url": "https://export.example.com/volumes/disk/disk.img"},
+                {"format": "gzip", "url": VOLUME_URL},
+            ],
+        }
+    ],
+}
+
+
+def _response(status_code=200, headers=None, content=b"", text=""):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.text = text
+    response.iter_content.side_effect = lambda chunk_size: (
+        content[offset : offset + chunk_size] for offset in range(0, len(content), chunk_size)
+    )
+    response.__enter__.return_value = response
+    return response
+
+
+def _ranged_get(url, headers=None, stream=False, timeout=None):
+    start, end = headers["Range"].removeprefix("bytes=").split("-")
+    return _response(status_code=206, content=CONTENT[int(start) : int(end) + 1])
+
+
+@pytest.fixture()
+def vmexport_client():
+    with patch("utilities.vm_export.requests.Session"):
+        with VMExportClient(external_links=EXTERNAL_LINKS, token="token", ca_cert_file="/tmp/ca.crt") as client:
+            yield client
+
+
+class TestVMExportClient:
+    """Test cases for VMExportClient class"""
+
+    def test_session_configuration(self, vmexport_client):
+        """Test that the session is authenticated and verifies the export CA"""
+        assert vmexport_client.session.verify == "/tmp/ca.crt"
+        vmexport_client.session.headers.update.assert_called_once_with({
+            "x-kubevirt-export-token": "token",
+            "Accept-Encoding": "identity",
+        })
+
+    def test_session_closed_on_exit(self):
+        """Test that the session is closed when leaving the context"""
+        with patch("utilities.vm_export.requests.Session") as mock_session_class:
+            with VMExportClient(external_links=EXTERNAL_LINKS, token="token", ca_cert_file="/tmp/ca.crt"):
+                pass
+
+        mock_session_class.return_value.close.assert_called_once()
+
+    def test_get_manifest_url(self, vmexport_client):
+        """Test resolving a manifest URL by type"""
+        assert (
+            vmexport_client.get_manifest_url(manifest_type="auth-header-secret") == "https://export.example.com/secret"
+        )
+
+    def test_get_manifest_url_not_found(self, vmexport_client):
+        """Test that a missing manifest type raises AssertionError"""
+        with pytest.raises(AssertionError, match="Manifest url 'missing'"):
+            vmexport_client.get_manifest_url(manifest_type="missing")
+
+    def test_get_volume_url(self, vmexport_client):
+        """Test resolving a volume URL by name and format"""
+        assert vmexport_client.get_volume_url(volume_name="disk") == VOLUME_URL
+        assert vmexport_client.get_volume_url(volume_format="raw").endswith("disk.img")
+
+    def test_get_volume_url_not_found(self, vmexport_client):
+        """Test that a missing volume raises AssertionError"""
+        with pytest.raises(AssertionError, match="Volume 'other' in format 'gzip' not found"):
+            vmexport_client.get_volume_url(volume_name="other")
+
+    def test_get_manifests(self, vmexport_client):
+        """Test that the manifest YAML documents are parsed"""
+        vmexport_client.session.get.return_value = _response(text="kind: ConfigMap\n---\nkind: VirtualMachine\n---\n")
+
+        manifests = vmexport_client.get_manifests(url="https://export.example.com/all")
+
+        assert manifests == [{"kind": "ConfigMap"}, {"kind": "VirtualMachine"}]
+
+    def test_download_volume_ranged(self, vmexport_client, tmp_path):
+        """Test that a volume is downloaded in ranged chunks when the server supports ranges"""
+        vmexport_client.session.head.return_value = _response(
+            headers={"Content-Length": str(len(CONTENT)), "Accept-Ranges": "bytes"}
+        )
+        vmexport_client.session.get.side_effect = _ranged_get
+        destination = tmp_path / "disk.img.gz"
+
+        sha256 = vmexport_client.download_volume(
+            url=VOLUME_URL, destination=str(destination), chunk_size=1000, expected_sha256=CONTENT_SHA256
+        )
+
+        assert destination.read_bytes() == CONTENT
+        assert sha256 == CONTENT_SHA256
+        assert vmexport_client.session.get.call_count == 11
+
+    def test_download_volume_streamed(self, vmexport_client, tmp_path):
+        """Test that a volume is streamed in one request when the server does not support ranges"""
+        vmexport_client.session.head.return_value = _response()
+        vmexport_client.session.get.return_value = _response(content=CONTENT)
+        destination = tmp_path / "disk.img.gz"
+
+        vmexport_client.download_volume(url=VOLUME_URL, destination=str(destination))
+
+        assert destination.read_bytes() == CONTENT
+        vmexport_client.session.get.assert_called_once_with(url=VOLUME_URL, stream=True, timeout=60)
+
+    def test_download_volume_size_mismatch(self, vmexport_client, tmp_path):
+        """Test that a truncated download raises AssertionError"""
+        vmexport_client.session.head.return_value = _response(headers={"Content-Length": str(len(CONTENT) + 1)})
+        vmexport_client.session.get.return_value = _response(content=CONTENT)
+
+        with pytest.raises(AssertionError, match="expected"):
+            vmexport_client.download_volume(url=VOLUME_URL, destination=str(tmp_path / "disk.img.gz"))
+
+    def test_download_volume_checksum_mismatch(self, vmexport_client, tmp_path):
+        """Test that a checksum mismatch raises AssertionError"""
+        vmexport_client.session.head.return_value = _response()
+        vmexport_client.session.get.return_value = _response(content=CONTENT)
+
+        with pytest.raises(AssertionError, match="sha256"):
+            vmexport_client.download_volume(
+                url=VOLUME_URL, destination=str(tmp_path / "disk.img.gz"), expected_sha256="0" * 64
+            )
+
+    def test_download_range_not_partial_content(self, vmexport_client, tmp_path):
+        """Test that a server ignoring the Range header is detected"""
+        vmexport_client.session.head.return_value = _response(
+            headers={"Content-Length": str(len(CONTENT)), "Accept-Ranges": "bytes"}
+        )
+        vmexport_client.session.get.return_value = _response(content=CONTENT)
+
+        with pytest.raises(AssertionError, match="Range request"):
+            vmexport_client.download_volume(url=VOLUME_URL, destination=str(tmp_path / "disk.img.gz"))
+
+
+class TestGetFileSha256:
+    """Test cases for get_file_sha256 function"""
+
+    def test_get_file_sha256(self, tmp_path):
+        """Test sha256 of a local file"""
+        file_path = tmp_path / "file"
+        file_path.write_bytes(CONTENT)
+
+        assert get_file_sha256(file_path=str(file_path)) == CONTENT_SHA256
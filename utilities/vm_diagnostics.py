@@ -0,0 +1,282 @@
+"""
+Concurrent diagnostics collection for a set of VMs.
+
+For every VM, a VNC screenshot, the VMI and virt-launcher pod state and the guest console log tail are captured;
+the firing alerts are captured once for the whole set. All artifacts are captured in a bounded worker pool, each
+with its own timeout, and a single manifest describes what was captured.
+"""
+
+import json
+import logging
+import math
+import os
+import shlex
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass
+from functools import partial
+
+import yaml
+from kubernetes.dynamic import DynamicClient
+from ocp_resources.virtual_machine import VirtualMachine
+
+import utilities.infra
+import utilities.prometheus_client
+from utilities.constants.timeouts import TIMEOUT_1MIN
+from utilities.data_collector import write_to_file
+
+LOGGER = logging.getLogger(__name__)
+
+VM_DIAGNOSTICS_WORKERS = 8
+VM_DIAGNOSTICS_MANIFEST_FILE = "vm_diagnostics_manifest.json"
+GUEST_CONSOLE_LOG_CONTAINER = "guest-console-log"
+GUEST_CONSOLE_TAIL_LINES = 200
+CAPTURED = "captured"
+SKIPPED = "skipped"
+FAILED = "failed"
+TIMED_OUT = "timeout"
+
+
+class VMDiagnosticSkipped(Exception):
+    """Raised by an artifact capture when the artifact does not apply to the VM state."""
+
+
+@dataclass
+class DiagnosticArtifact:
+    name: str
+    vm_name: str | None = None
+    namespace: str | None = None
+    path: str | None = None
+    status: str | None = None
+    duration: float | None = None
+    reason: str | None = None
+    started_at: float | None = None
+
+
+def _vm_artifact_path(target_dir: str, vm: VirtualMachine, file_name: str) -> str:
+    vm_dir = os.path.join(target_dir, f"{vm.namespace}-{vm.name}")
+    os.makedirs(vm_dir, exist_ok=True)
+    return os.path.join(vm_dir, file_name)
+
+
+def _capture_screenshot(vm: VirtualMachine, path: str, timeout: int) -> None:
+    printable_status = vm.instance.get("status", {}).get("printableStatus")
+    if printable_status not in (VirtualMachine.Status.RUNNING, VirtualMachine.Status.MIGRATING):
+        raise VMDiagnosticSkipped(f"VM status is '{printable_status}'")
+
+    command_success, _, error = utilities.infra.run_virtctl_command(
+        command=shlex.split(f"vnc screenshot {vm.name} -f {path}"), namespace=vm.namespace, timeout=timeout
+    )
+    assert command_success, f"virtctl vnc screenshot failed: {error}"
+
+
+def _capture_vmi(vm: VirtualMachine, path: str) -> None:
+    if not vm.vmi.exists:
+        raise VMDiagnosticSkipped("VMI does not exist")
+
+    with open(path, "w") as fd:
+        yaml.safe_dump(vm.vmi.instance.to_dict(), fd)
+
+
+def _capture_launcher_pod(vm: VirtualMachine, path: str, admin_client: DynamicClient) -> None:
+    if not vm.vmi.exists:
+        raise VMDiagnosticSkipped("VMI does not exist")
+
+    with open(path, "w") as fd:
+        yaml.safe_dump(vm.vmi.get_virt_launcher_pod(privileged_client=admin_client).instance.to_dict(), fd)
+
+
+def _capture_guest_console_tail(vm: VirtualMachine, path: str, admin_client: DynamicClient) -> None:
+    if not vm.vmi.exists:
+        raise VMDiagnosticSkipped("VMI does not exist")
+
+    launcher_pod = vm.vmi.get_virt_launcher_pod(privileged_client=admin_client)
+    if GUEST_CONSOLE_LOG_CONTAINER not in [
+        container["name"] for container in launcher_pod.instance.to_dict()["spec"]["containers"]
+    ]:
+        raise VMDiagnosticSkipped("guest console log is not enabled")
+
+    with open(path, "w") as fd:
+        fd.write(launcher_pod.log(container=GUEST_CONSOLE_LOG_CONTAINER, tail_lines=GUEST_CONSOLE_TAIL_LINES))
+
+
+def _capture_firing_alerts(path: str) -> None:
+    alerts = utilities.prometheus_client.get_prometheus_client().alerts()
+    with open(path, "w") as fd:
+        json.dump(
+            [alert for alert in alerts["data"]["alerts"] if alert.get("state") == "firing"],
+            fd,
+            indent=2,
+        )
+
+
+class VMDiagnosticsCollector:
+    def __init__(
+        self,
+        admin_client: DynamicClient,
+        target_dir: str,
+        max_workers: int = VM_DIAGNOSTICS_WORKERS,
+        artifact_timeout: int = TIMEOUT_1MIN,
+    ) -> None:
+        """
+        Capture diagnostics artifacts concurrently, each bounded by a timeout.
+
+        An artifact that runs longer than the timeout is recorded as timed out and no longer waited for; its
+        worker finishes in the background and its result is ignored. Workers stuck on timed out artifacts do not
+        take new ones, so the whole collection is bounded too: artifacts not started by then are recorded as timed
+        out.
+
+        Args:
+            admin_client: Cluster admin client.
+            target_dir: Directory of the artifacts and the manifest.
+            max_workers: Maximum number of artifacts captured concurrently.
+            artifact_timeout: Timeout in seconds of each artifact.
+        """
+        self.admin_client = admin_client
+        self.target_dir = target_dir
+        self.max_workers = max_workers
+        self.artifact_timeout = artifact_timeout
+        self.artifacts: list[DiagnosticArtifact] = []
+        self._lock = threading.Lock()
+
+    def _finish_artifact(self, artifact: DiagnosticArtifact, status: str, reason: str | None = None) -> None:
+        with self._lock:
+            # A timed out artifact keeps its status when its worker finishes later
+            if artifact.status is None:
+                artifact.status = status
+                artifact.reason = reason
+                if artifact.started_at:
+                    artifact.duration = round(time.monotonic() - artifact.started_at, 2)
+
+    def _capture(self, artifact: DiagnosticArtifact, capture: Callable[[], None]) -> None:
+        artifact.started_at = time.monotonic()
+        try:
+            capture()
+        except VMDiagnosticSkipped as skip_reason:
+            self._finish_artifact(artifact=artifact, status=SKIPPED, reason=str(skip_reason))
+        except Exception as exp:
+            LOGGER.warning(
+                f"[DATA_COLLECTOR] Failed to capture {artifact.name} for {artifact.namespace}/{artifact.vm_name}: {exp}"
+            )
+            self._finish_artifact(artifact=artifact, status=FAILED, reason=str(exp))
+        else:
+            self._finish_artifact(artifact=artifact, status=CAPTURED)
+
+    def _vm_captures(self, vm: VirtualMachine) -> list[tuple[DiagnosticArtifact, Callable[[], None]]]:
+        captures = []
+        for name, file_name, capture in (
+            ("screenshot", "screenshot.png", partial(_capture_screenshot, vm=vm, timeout=self.artifact_timeout)),
+            ("vmi", "vmi.yaml", partial(_capture_vmi, vm=vm)),
+            (
+                "launcher_pod",
+                "virt-launcher.yaml",
+                partial(_capture_launcher_pod, vm=vm, admin_client=self.admin_client),
+            ),
+            (
+                "guest_console_tail",
+                "guest-console.log",
+                partial(_capture_guest_console_tail, vm=vm, admin_client=self.admin_client),
+            ),
+        ):
+            path = _vm_artifact_path(target_dir=self.target_dir, vm=vm, file_name=file_name)
+            captures.append((
+                DiagnosticArtifact(name=name, vm_name=vm.name, namespace=vm.namespace, path=path),
+                partial(capture, path=path),
+            ))
+        return captures
+
+    def collect(self, vms: list[VirtualMachine]) -> list[DiagnosticArtifact]:
+        """
+        Capture the diagnostics of the VMs and the firing alerts, and write the manifest.
+
+        Args:
+            vms: VMs to capture diagnostics for.
+
+        Returns:
+            list[DiagnosticArtifact]: The captured, skipped, failed and timed out artifacts.
+        """
+        os.makedirs(self.target_dir, exist_ok=True)
+        alerts_path = os.path.join(self.target_dir, "firing_alerts.json")
+        captures = [
+            (
+                DiagnosticArtifact(name="firing_alerts", path=alerts_path),
+                partial(_capture_firing_alerts, path=alerts_path),
+            )
+        ]
+        for vm in vms:
+            captures.extend(self._vm_captures(vm=vm))
+
+        LOGGER.info(f"[DATA_COLLECTOR] Capturing {len(captures)} diagnostics artifacts for {len(vms)} VMs")
+        # Time to capture all the artifacts if each one of them ran until its timeout
+        collection_timeout = self.artifact_timeout * math.ceil(len(captures) / self.max_workers)
+        collection_deadline = time.monotonic() + collection_timeout
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="vm-diagnostics")
+        futures = {
+            executor.submit(self._capture, artifact=artifact, capture=capture): artifact
+            for artifact, capture in captures
+        }
+        pending = set(futures)
+        while pending:
+            _, pending = wait(pending, timeout=1, return_when=FIRST_COMPLETED)
+            now = time.monotonic()
+            for future in list(pending):
+                artifact = futures[future]
+                if artifact.started_at and now - artifact.started_at > self.artifact_timeout:
+                    self._finish_artifact(
+                        artifact=artifact, status=TIMED_OUT, reason=f"not captured within {self.artifact_timeout}s"
+                    )
+                    pending.discard(future)
+            if pending and now > collection_deadline:
+                LOGGER.warning(
+                    f"[DATA_COLLECTOR] {len(pending)} diagnostics artifacts not captured within {collection_timeout}s"
+                )
+                for future in pending:
+                    self._finish_artifact(
+                        artifact=futures[future],
+                        status=TIMED_OUT,
+                        reason=f"not captured within the {collection_timeout}s collection timeout",
+                    )
+                break
+        executor.shutdown(wait=False, cancel_futures=True)
+
+        self.artifacts = [artifact for artifact, _ in captures]
+        write_to_file(
+            file_name=VM_DIAGNOSTICS_MANIFEST_FILE,
+            content=json.dumps(
+                [
+                    {key: value for key, value in asdict(artifact).items() if key != "started_at"}
+                    for artifact in self.artifacts
+                ],
+                indent=2,
+            ),
+            base_directory=self.target_dir,
+        )
+        return self.artifacts
+
+
+def collect_vms_diagnostics(
+    vms: list[VirtualMachine],
+    admin_client: DynamicClient,
+    target_dir: str,
+    max_workers: int = VM_DIAGNOSTICS_WORKERS,
+    artifact_timeout: int = TIMEOUT_1MIN,
+) -> list[DiagnosticArtifact]:
+    """
+    Capture screenshots, VMI and virt-launcher pod state and guest console tail of VMs, and the firing alerts,
+    concurrently into `target_dir` with a `vm_diagnostics_manifest.json` describing what was captured.
+
+    Args:
+        vms: VMs to capture diagnostics for.
+        admin_client: Cluster admin client.
+        target_dir: Directory of the artifacts and the manifest.
+        max_workers: Maximum number of artifacts captured concurrently.
+        artifact_timeout: Timeout in seconds of each artifact.
+
+    Returns:
+        list[DiagnosticArtifact]: The captured, skipped, failed and timed out artifacts.
+    """
+    return VMDiagnosticsCollector(
+        admin_client=admin_client, target_dir=target_dir, max_workers=max_workers, artifact_timeout=artifact_timeout
+    ).collect(vms=vms)
@@ -0,0 +1,227 @@
+"""
+VirtualMachineExport client.
+
+Resolves the export links of a VirtualMachineExport and downloads its manifests and volumes over
+one authenticated TLS session. Volumes are streamed to disk, in parallel ranged chunks when the export
+server supports range requests, and verified against the advertised size.
+"""
+
+import hashlib
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Self
+
+import bitmath
+import requests
+import yaml
+from requests.adapters import HTTPAdapter
+
+from utilities.constants.timeouts import TIMEOUT_1MIN
+
+LOGGER = logging.getLogger(__name__)
+
+EXPORT_TOKEN_HEADER = "x-kubevirt-export-token"
+DOWNLOAD_CHUNK_SIZE = 64 * 1024 * 1024
+DOWNLOAD_PARALLELISM = 4
+STREAM_READ_SIZE = 1024 * 1024
+
+
+class VMExportClient:
+    def __init__(
+        self,
+        external_links: dict[str, Any],
+        token: str,
+        ca_cert_file: str,
+        parallelism: int = DOWNLOAD_PARALLELISM,
+    ) -> None:
+        """
+        Client for the external links of a ready VirtualMachineExport.
+
+        Args:
+            external_links: VirtualMachineExport status.links.external.
+            token: Export token.
+            ca_cert_file: Path to the export server CA certificate (status.links.external.cert).
+            parallelism: Number of concurrent ranged requests per volume download.
+
+        Examples:
+            with VMExportClient(external_links=links, token=token, ca_cert_file=cert_file) as vmexport_client:
+                vmexport_client.download_volume(url=vmexport_client.get_volume_url(), destination="disk.img.gz")
+        """
+        self.external_links = external_links
+        self.parallelism = parallelism
+        self.session = requests.Session()
+        self.session.verify = ca_cert_file
+        # identity: download gzip volumes as they are, without transparent decompression
+        self.session.headers.update({EXPORT_TOKEN_HEADER: token, "Accept-Encoding": "identity"})
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=parallelism)
+        self.session.mount(prefix="https://", adapter=adapter)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.session.close()
+
+    def get_manifest_url(self, manifest_type: str) -> str:
+        """
+        Get the URL of an export manifest.
+
+        Args:
+            manifest_type: Manifest type, e.g. "all" or "auth-header-secret".
+
+        Returns:
+            str: Manifest URL.
+        """
+        url = next(
+            (
+                manifest.get("url")
+                for manifest in self.external_links.get("manifests", [])
+                if manifest["type"] == manifest_type
+            ),
+            None,
+        )
+        assert url, f"Manifest url '{manifest_type}' in vmexport external links {self.external_links} not found"
+        return url
+
+    def get_volume_url(self, volume_name: str | None = None, volume_format: str = "gzip") -> str:
+        """
+        Get the download URL of an exported volume.
+
+        Args:
+            volume_name: Volume name, defaults to the first exported volume.
+            volume_format: Export format, e.g. "raw", "gzip", "dir" or "tar.gz".
+
+        Returns:
+            str: Volume URL.
+        """
+        volumes = self.external_links.get("volumes", [])
+        volume = next((volume for volume in volumes if volume_name in (None, volume["name"])), {})
+        url = next(
+            (
+                volume_format_dict["url"]
+                for volume_format_dict in volume.get("formats", [])
+                if volume_format_dict["format"] == volume_format
+            ),
+            None,
+        )
+        assert url, f"Volume '{volume_name}' in format '{volume_format}' not found in vmexport volumes {volumes}"
+        return url
+
+    def get_manifests(self, url: str) -> list[dict[str, Any]]:
+        """
+        Download and parse an export manifest.
+
+        Args:
+            url: Manifest URL, see get_manifest_url.
+
+        Returns:
+            list: Resource dicts of the manifest.
+        """
+        response = self.session.get(url=url, headers={"Accept": "application/yaml"}, timeout=TIMEOUT_1MIN)
+        response.raise_for_status()
+        return [resource_dict for resource_dict in yaml.safe_load_all(response.text) if resource_dict]
+
+    def download_volume(
+        self,
+        url: str,
+        destination: str,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        expected_sha256: str | None = None,
+    ) -> str:
+        """
+        Download an exported volume to a local file and verify its size and checksum.
+
+        When the export server advertises the content length and range support, chunks are downloaded
+        in parallel and written at their offsets; otherwise the volume is streamed in a single request.
+
+        Args:
+            url: Volume URL, see get_volume_url.
+            destination: Local file path.
+            chunk_size: Size of each ranged request.
+            expected_sha256: Expected sha256 of the downloaded file, not verified if None.
+
+        Returns:
+            str: sha256 of the downloaded file.
+
+        Raises:
+            AssertionError: If the downloaded size does not match the advertised content length,
+                or the checksum does not match expected_sha256.
+        """
+        head_response = self.session.head(url=url, timeout=TIMEOUT_1MIN, allow_redirects=True)
+        head_response.raise_for_status()
+        content_length = int(head_response.headers.get("Content-Length", 0))
+        supports_ranges = head_response.headers.get("Accept-Ranges") == "bytes"
+
+        start_time = time.monotonic()
+        if content_length and supports_ranges:
+            LOGGER.info(f"Downloading {content_length} bytes from {url} in {chunk_size} bytes ranges")
+            with open(destination, "wb") as destination_file:
+                destination_file.truncate(content_length)
+            offsets = range(0, content_length, chunk_size)
+            with ThreadPoolExecutor(max_workers=self.parallelism) as executor:
+                # list() propagates exceptions raised by the download threads
+                list(
+                    executor.map(
+                        lambda offset: self._download_range(
+                            url=url,
+                            destination=destination,
+                            offset=offset,
+                            length=min(chunk_size, content_length - offset),
+                        ),
+                        offsets,
+                    )
+                )
+        else:
+            LOGGER.info(f"Streaming {url}, the export server does not support range requests")
+            with self.session.get(url=url, stream=True, timeout=TIMEOUT_1MIN) as response:
+                response.raise_for_status()
+                with open(destination, "wb") as destination_file:
+                    destination_file.writelines(response.iter_content(chunk_size=STREAM_READ_SIZE))
+
+        duration = time.monotonic() - start_time
+        downloaded_size = os.path.getsize(destination)
+        assert not content_length or downloaded_size == content_length, (
+            f"Downloaded {downloaded_size} bytes from {url}, expected {content_length}"
+        )
+        LOGGER.info(
+            f"Downloaded {downloaded_size} bytes in {duration:.2f}s "
+            f"({bitmath.Byte(downloaded_size).to_MiB().value / max(duration, 0.001):.2f} MiB/s)"
+        )
+        sha256 = get_file_sha256(file_path=destination)
+        assert expected_sha256 in (None, sha256), f"{destination} sha256 is {sha256}, expected {expected_sha256}"
+        return sha256
+
+    def _download_range(self, url: str, destination: str, offset: int, length: int) -> None:
+        with self.session.get(
+            url=url,
+            headers={"Range": f"bytes={offset}-{offset + length - 1}"},
+            stream=True,
+            timeout=TIMEOUT_1MIN,
+        ) as response:
+            response.raise_for_status()
+            assert response.status_code == requests.codes.partial_content, (
+                f"Range request for {url} returned {response.status_code}"
+            )
+            with open(destination, "r+b") as destination_file:
+                destination_file.seek(offset)
+                received = 0
+                for data in response.iter_content(chunk_size=STREAM_READ_SIZE):
+                    destination_file.write(data)
+                    received += len(data)
+        assert received == length, f"Received {received} bytes for range {offset}+{length} of {url}"
+
+
+def get_file_sha256(file_path: str) -> str:
+    """
+    Compute the sha256 of a local file without loading it into memory.
+
+    Args:
+        file_path: Local file path.
+
+    Returns:
+        str: Hex digest.
+    """
+    with open(file_path, "rb") as file_to_hash:
+        return hashlib.file_digest(file_to_hash, "sha256").hexdigest()